@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""
+conftest.py
+-----------
+Společné nastavení testů: pytest díky tomuto souboru přidá složku source/ do sys.path,
+takže testy importují moduly stejně jako aplikace (utils., elements., …).
+"""
@@ -13,14 +13,12 @@ Poskytuje funkce pro:
     • přenastavení barvy textu a obrysu,
     • aktivaci a deaktivaci tlačítka,
     • získání rozměrů a pozice tlačítka,
-    • změnu souřadnic a fontu textu.
+    • změnu souřadnic, velikosti a fontu textu.
 """
 
 import glob_var
 import pygame
 
-pygame.init()
-
 
 class Button:
     """
@@ -192,6 +190,11 @@ class Button:
         """Přenastaví y souřadnici tlačítka."""
         self.rect.y = y
 
+    def set_size(self, width, height):
+        """Přenastaví šířku a výšku tlačítka (levý horní roh zůstává)."""
+        self.rect.width = width
+        self.rect.height = height
+
     def change_font(self, font):
 
         self.font = font
@@ -9,7 +9,8 @@ Obsahuje:
         zahrnuje výběr myší, kreslení bodu, tvorbu spojení a reset stavu,
     • Grid2DPoint – specializace pro 2D grid (půdorys, nárys, bokorys),
     • Grid3DPoint – specializace pro 3D grid (sloupec, řádek, vrstva),
-    • metody pro interaktivní klikání, kreslení a zvýraznění bodů.
+    • metody pro interaktivní klikání, kreslení a zvýraznění bodů,
+    • nearest_first – pořadí bodů pro kliknutí (nejbližší bod ke kurzoru první).
 """
 
 import math
@@ -20,7 +21,17 @@ from elements.connection import Connection2D
 from elements.connection import Connection3D
 from utils.geometry import draw_dashed_line
 
-pygame.init()
+HOVER_SPACING_RATIO = 0.45  # dosah myši nejvýš tato část vzdálenosti k nejbližšímu sousednímu bodu
+
+
+def nearest_first(points: list, mouse_pos: tuple[float, float]) -> list:
+    """
+    Seřadí body podle vzdálenosti od kurzoru.
+    U hustších mřížek (a v šikmém 3D promítání) se dosahy bodů mohou překrývat,
+    kliknutí pak dostane nejbližší bod.
+    """
+    mouse_x, mouse_y = mouse_pos
+    return sorted(points, key=lambda point: (point.x - mouse_x) ** 2 + (point.y - mouse_y) ** 2)
 
 
 class GridPoint:
@@ -59,11 +70,17 @@ class GridPoint:
         self.hover_color = hover_color
         self.selected = False
         self.enabled = enabled  # zapínání/vypínání
+        self.hover_limit = math.inf  # horní mez dosahu myši podle hustoty mřížky (viz set_spacing)
 
     # -------------------------
     # Společné metody
     # -------------------------
 
+    def set_spacing(self, spacing: float):
+        """Omezí dosah myši podle vzdálenosti k nejbližšímu sousednímu bodu mřížky (v pixelech)."""
+        self.hover_limit = HOVER_SPACING_RATIO * spacing
+        self.hover_radius = int(min(glob_var.LINE_WIDTH * 5, self.hover_limit))
+
     def is_mouse_near(self, mouse_pos: tuple[float, float]) -> bool:
         """Zjistí, zda je kurzor myši v dosahu bodu."""
         mouse_x, mouse_y = mouse_pos
@@ -163,7 +180,7 @@ class GridPoint:
         Pokud je při tom stisknutý Ctrl, čára se kreslí čárkovaně.
         """
         self.radius = int(glob_var.RADIUS)
-        self.hover_radius = int(glob_var.LINE_WIDTH * 5)
+        self.hover_radius = int(min(glob_var.LINE_WIDTH * 5, self.hover_limit))
         self.highlighted_radius = int(glob_var.LINE_WIDTH * 1.5)
 
         line_width = int(glob_var.LINE_WIDTH)
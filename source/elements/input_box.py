@@ -17,8 +17,6 @@ Obsahuje:
 import glob_var
 import pygame
 
-pygame.init()
-
 
 class InputBox:
     """
@@ -6,14 +6,36 @@ level_data.py
 Správa dat o levelech pro Cubiq🧊.
 
 Třída LevelData umožňuje:
-    • načítat úlohy z JSON souboru,
-    • seskupovat levely podle kapitol,
-    • poskytovat seznam všech levelů nebo seznam kapitol s názvy a levely.
+    • načítat úlohy ze sdíleného katalogu úloh (TaskCatalog),
+    • seskupovat levely podle kapitol v přirozeném pořadí ("1.2" před "1.10"),
+    • při přidání / smazání úlohy vložit nebo odebrat jeden level (pozice přes bisect, seznamy
+      se kopírují – O(n) v počtu levelů kapitoly, viz _insert_level),
+    • poskytovat seznam všech levelů (cachovaná n-tice), kapitolu a pořadí levelu v O(1),
+    • najít předchozí / následující level v O(1) (odkazy na sousedy, i při mezerách v číslování),
+    • předávat změny katalogu (přidání, úprava, smazání úlohy) obrazovkám,
+    • poskytovat předpočítanou obtížnost levelu (z katalogu úloh).
 
 """
 
-import json
-from utils.fun_for_making_exe import resource_path, writable_path
+import bisect
+
+from elements.task_catalog import get_catalog
+
+
+def level_key(level: str) -> tuple:
+    """
+    Přirozený řadicí klíč levelu: "1.10" je za "1.9" (čísla se porovnávají jako čísla).
+    Nečíselné části se řadí za číselné.
+    """
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in level.split("."))
+
+
+def level_chapter(level: str) -> int | None:
+    """Vrátí číslo kapitoly levelu ("2.5" → 2), nebo None pro jiný formát ID."""
+    chapter = level.split(".")[0]
+    if chapter.isdigit() and str(int(chapter)) == chapter:
+        return int(chapter)
+    return None
 
 
 class LevelData:
@@ -23,7 +45,8 @@ class LevelData:
     Načítá úlohy z JSON a poskytuje seznam kapitol a levelů.
     """
 
-    def __init__(self, data_file: str = "data.json", chapter_titles: list[str] = None):
+    def __init__(self, data_file: str = "data.json", chapter_titles: list[str] = None,
+                 chapter_levels: list[list[str]] = None):
         """
         Inicializace LevelData.
 
@@ -31,6 +54,8 @@ class LevelData:
             data_file (str): cesta k JSON souboru s daty o levelech
             chapter_titles (list[str], optional): seznam názvů kapitol;
                                                 default ["Tutoriál", "Úsečky", "Rovinné útvary", "Tělesa"]
+            chapter_levels (list[list[str]], optional): už seřazené levely kapitol ze snímku
+                                                startu (utils/warm_start.py); bez něj se seskupí z katalogu
 
         Attributes:
             chapters (list[dict]): seznam kapitol, každá jako {"title": ..., "levels": [...]}
@@ -38,63 +63,244 @@ class LevelData:
         self.data_file = data_file
         self.chapter_titles = chapter_titles or ["Tutoriál", "Úsečky", "Mnohoúhelníky", "Mnohostěny"]
         self.chapters = []  # seznam slovníků: {"title": ..., "levels": [...]}
+        self._listeners: list = []
 
-        self._load_data()
+        # index levelů
+        self._chapter_of: dict[str, int] = {}  # level → index kapitoly
+        self._all_levels: tuple[str, ...] | None = None  # všechny levely v pořadí (cache)
+        self._ordinal_of: dict[str, int] | None = None  # level → pořadí v _all_levels (cache)
+        self._neighbors: dict[str, tuple] | None = None  # level → (předchozí, následující) (cache)
+
+        self._load_data(chapter_levels)
+        get_catalog(self.data_file).add_listener(self._on_catalog_event)
 
     def update(self):
         self._load_data()
 
-    def _load_data(self):
+    def _load_data(self, chapter_levels: list[list[str]] = None):
         """
-        Načte JSON a připraví seznam kapitol s levely.
+        Převezme ID úloh ze sdíleného katalogu a připraví seznam kapitol s levely.
 
         Postup:
             - seskupí levely podle kapitoly,
-            - seřadí je uvnitř kapitoly podle čísla,
+            - seřadí je uvnitř kapitoly přirozeně podle čísla,
             - vytvoří seznam kapitol s názvem a seznamem levelů.
+
+        Args:
+            chapter_levels (list[list[str]], optional): levely kapitol ze snímku startu
+                (už seskupené a seřazené, první dva kroky se přeskočí)
         """
-        with open(writable_path(self.data_file), "r", encoding="utf-8") as f:
-            data = json.load(f)
+        catalog = get_catalog(self.data_file)
+        self.meta = catalog.get_meta()
 
-        # ignoruj metadata
-        if "_meta" in data:
-            self.meta = data["_meta"]
-            del data["_meta"]
+        if chapter_levels is not None:
+            chapter_levels = {i: list(levels) for i, levels in enumerate(chapter_levels) if levels}
         else:
-            self.meta = {"version": "unknown"}
+            task_ids = catalog.task_ids()  # metadata katalog odděluje sám
 
-        # dočasně seskupíme levely podle kapitoly (0,1,2,...)
-        chapter_levels = {}
-        for key in data.keys():
-            chapter_index = key.split(".")[0]
-            chapter_levels.setdefault(chapter_index, []).append(key)
+            # dočasně seskupíme levely podle kapitoly (0,1,2,...)
+            chapter_levels = {}
+            for key in task_ids:
+                chapter_index = level_chapter(key)
+                if chapter_index is not None:
+                    chapter_levels.setdefault(chapter_index, []).append(key)
 
-        # seřadíme levely uvnitř kapitoly
-        for chapter_index in chapter_levels:
-            chapter_levels[chapter_index].sort(key=lambda s: tuple(int(x) for x in s.split('.')))
+            # seřadíme levely uvnitř kapitoly
+            for levels in chapter_levels.values():
+                levels.sort(key=level_key)
 
         # vytvoříme seznam kapitol s názvem a seznamem levelů
-        max_chapters = max(len(chapter_levels), len(self.chapter_titles))
-        self.chapters = []
-        for i in range(max_chapters):
-            title = self.chapter_titles[i] if i < len(self.chapter_titles) else f"Kapitola {i}"
-            levels = chapter_levels.get(str(i), [])
-            self.chapters.append({
-                "title": title,
-                "levels": levels
-            })
+        max_chapters = max(max(chapter_levels, default=-1) + 1, len(self.chapter_titles))
+        self.chapters = [
+            self._make_chapter(i, chapter_levels.get(i, []))
+            for i in range(max_chapters)
+        ]
+        self._chapter_of = {
+            level: chapter_index
+            for chapter_index, levels in chapter_levels.items()
+            for level in levels
+        }
+        self._invalidate_order()
+
+    def _make_chapter(self, index: int, levels: list[str]) -> dict:
+        title = self.chapter_titles[index] if index < len(self.chapter_titles) else f"Kapitola {index}"
+        return {"title": title, "levels": levels}
+
+    def _invalidate_order(self):
+        """Zahodí cache pořadí levelů (po přidání nebo smazání levelu)."""
+        self._all_levels = None
+        self._ordinal_of = None
+        self._neighbors = None
+
+    # ------------------------
+    # Přidání a smazání levelu
+    # ------------------------
+    def _insert_level(self, level: str):
+        """
+        Vloží level na správné místo v kapitole (bisect podle přirozeného klíče).
+
+        Vznikne nový seznam kapitol a nový seznam levelů dotčené kapitoly (kopie při zápisu):
+        obrazovky, které starý seznam právě procházejí, ho tak dál mohou bezpečně číst.
+        Pozici najde bisect v O(log n), kopie seznamu je ale O(n) v počtu levelů kapitoly
+        (vložení do seznamu na místě by bylo O(n) stejně) – při stovkách úloh a úpravách
+        z editoru to nevadí. Cache pořadí levelů se skládá znovu až při dalším dotazu.
+        """
+        chapter_index = level_chapter(level)
+        if chapter_index is None or level in self._chapter_of:
+            return
+
+        chapters = list(self.chapters)
+        while len(chapters) <= chapter_index:
+            chapters.append(self._make_chapter(len(chapters), []))
+
+        levels = list(chapters[chapter_index]["levels"])
+        bisect.insort(levels, level, key=level_key)
+        chapters[chapter_index] = {**chapters[chapter_index], "levels": levels}
+
+        self.chapters = chapters
+        self._chapter_of[level] = chapter_index
+        self._invalidate_order()
+
+    def _remove_level(self, level: str):
+        """
+        Odebere level z jeho kapitoly (pozice se najde přes bisect). Stejně jako
+        _insert_level vytvoří nové seznamy místo úpravy starých – O(n) v počtu levelů kapitoly.
+        """
+        chapter_index = self._chapter_of.pop(level, None)
+        if chapter_index is None:
+            return
+
+        chapters = list(self.chapters)
+        levels = list(chapters[chapter_index]["levels"])
+        key = level_key(level)
+        position = bisect.bisect_left(levels, key, key=level_key)
+        if position < len(levels) and levels[position] == level:
+            del levels[position]
+        else:  # duplicitní klíč (např. "1.02" a "1.2")
+            levels.remove(level)
+        chapters[chapter_index] = {**chapters[chapter_index], "levels": levels}
+
+        # prázdné kapitoly za posledním názvem nezobrazujeme
+        while len(chapters) > len(self.chapter_titles) and not chapters[-1]["levels"]:
+            chapters.pop()
+
+        self.chapters = chapters
+        self._invalidate_order()
+
+    # ------------------------
+    # Události změn
+    # ------------------------
+    def add_listener(self, listener):
+        """
+        Přidá posluchače změn levelů (obrazovky, které se mají upravit bez znovuvytvoření).
 
-    def get_all_levels(self) -> list[str]:
+        Args:
+            listener (callable): volá se jako listener(event, level), kde event je
+                "added", "changed", "deleted" nebo "reloaded" (level je pak None)
+        """
+        self._listeners.append(listener)
+
+    def _on_catalog_event(self, event: str, task_id: str | None):
+        """
+        Změna v katalogu úloh. Při přidání nebo smazání úlohy vznikne nový seznam
+        kapitol (starý se nemění, takže ho obrazovky mohou dál bezpečně procházet).
+        """
+        if event == "added":
+            self._insert_level(task_id)
+        elif event == "deleted":
+            self._remove_level(task_id)
+        elif event == "reloaded":
+            self._load_data()
+        for listener in list(self._listeners):
+            listener(event, task_id)
+
+    # ------------------------
+    # Dotazy
+    # ------------------------
+    def get_all_levels(self) -> tuple[str, ...]:
+        """
+        Vrátí všechny levely ve formě ('0.1', '0.2', ...).
+        N-tice se skládá jen po změně levelů, jinak se vrací uložená.
+
+        Returns:
+            tuple[str, ...]: všechny levely ve všech kapitolách
+        """
+        if self._all_levels is None:
+            self._all_levels = tuple(level for chapter in self.chapters for level in chapter["levels"])
+        return self._all_levels
+
+    def has_level(self, level: str) -> bool:
+        """Vrátí True, pokud level existuje."""
+        return level in self._chapter_of
+
+    def get_chapter_of(self, level: str) -> int | None:
+        """Vrátí index kapitoly levelu, nebo None pokud level neexistuje."""
+        return self._chapter_of.get(level)
+
+    def get_ordinal(self, level: str) -> int | None:
+        """Vrátí pořadí levelu mezi všemi levely (od 0), nebo None pokud level neexistuje."""
+        if self._ordinal_of is None:
+            self._ordinal_of = {level: i for i, level in enumerate(self.get_all_levels())}
+        return self._ordinal_of.get(level)
+
+    def _neighbor_links(self) -> dict[str, tuple]:
+        """Odkazy na sousední levely v celkovém pořadí (skládají se jen po změně levelů)."""
+        if self._neighbors is None:
+            levels = self.get_all_levels()
+            self._neighbors = {
+                level: (levels[i - 1] if i > 0 else None,
+                        levels[i + 1] if i + 1 < len(levels) else None)
+                for i, level in enumerate(levels)
+            }
+        return self._neighbors
+
+    def get_prev_level(self, level: str, same_chapter: bool = True) -> str | None:
+        """
+        Vrátí předchozí level.
+
+        Args:
+            level (str): aktuální level
+            same_chapter (bool): jen v rámci stejné kapitoly; jinak i z předchozí kapitoly
+
+        Returns:
+            str | None: předchozí level, nebo None pokud žádný není
+        """
+        prev_level = self._neighbor_links().get(level, (None, None))[0]
+        if same_chapter and prev_level is not None and self._chapter_of[prev_level] != self._chapter_of[level]:
+            return None
+        return prev_level
+
+    def get_next_level(self, level: str, same_chapter: bool = True) -> str | None:
         """
-        Vrátí seznam všech levelů ve formě ['0.1', '0.2', ...].
+        Vrátí následující level.
+
+        Args:
+            level (str): aktuální level
+            same_chapter (bool): jen v rámci stejné kapitoly; jinak i z další kapitoly
 
         Returns:
-            list[str]: všechny levely ve všech kapitolách
+            str | None: následující level, nebo None pokud žádný není
         """
-        levels = []
-        for chapter in self.chapters:
-            levels.extend(chapter["levels"])
-        return levels
+        next_level = self._neighbor_links().get(level, (None, None))[1]
+        if same_chapter and next_level is not None and self._chapter_of[next_level] != self._chapter_of[level]:
+            return None
+        return next_level
+
+    def chapter_has_levels(self, chapter_index: int) -> bool:
+        """Vrátí True, pokud kapitola existuje a má alespoň jeden level."""
+        return 0 <= chapter_index < len(self.chapters) and bool(self.chapters[chapter_index]["levels"])
+
+    def get_difficulty(self, level: str) -> dict | None:
+        """Vrátí obtížnost levelu (viz TaskCatalog.difficulty), nebo None, pokud není spočítaná."""
+        return get_catalog(self.data_file).difficulty(level)
+
+    def has_difficulties(self) -> bool:
+        """Vrátí True, pokud je spočítaná obtížnost aspoň jednoho levelu (jinak se teprve počítá)."""
+        return get_catalog(self.data_file).has_difficulties()
+
+    def get_difficulty_version(self) -> int:
+        """Číslo, které se zvýší při každé změně obtížností (po dopočítání na pozadí)."""
+        return get_catalog(self.data_file).difficulty_version
 
     def get_chapters(self) -> list[dict]:
         """
@@ -7,16 +7,76 @@ Správa pokroku hráčů pro hru Cubiq🧊.
 
 Třída PlayerProgress umožňuje:
     • načítat pokrok hráčů z JSON souboru,
-    • ukládat jaké levely hráč dokončil,
+    • ukládat jaké levely hráč dokončil (zápis na pozadí, atomicky, viz utils/write_behind.py),
+    • v režimu deníku připisovat každou změnu jako jeden řádek do resolved_tasks.journal
+      a deník na pozadí zhušťovat do resolved_tasks.json,
+    • v rozděleném režimu ukládat každého hráče do vlastního malého souboru
+      (resolved_tasks.players/) a načítat jen hráče, se kterým se pracuje,
     • přidávat nové hráče,
     • získat informace o konkrétním hráči,
-    • aktualizovat dokončené levely hráče.
+    • aktualizovat dokončené levely hráče,
+    • v O(1) zjistit, zda hráč level dokončil (množina vedle ukládaného seznamu),
+    • cachovat první nevyřešený level v každé kapitole a při dokončení levelu ho jen posunout.
 """
 
+import hashlib
 import json
 import os
+import threading
 
 from utils.fun_for_making_exe import writable_path, resource_path
+from utils.write_behind import atomic_write, get_writer
+
+JOURNAL_SUFFIX = ".journal"
+COMPACTING_SUFFIX = ".compacting"
+JOURNAL_COMPACT_BYTES = 64 * 1024  # od této velikosti deníku se spustí zhuštění
+SHARDS_SUFFIX = ".players"  # složka se soubory jednotlivých hráčů
+DIRECTORY_FILE = "index.json"  # seznam hráčů: jméno → soubor hráče
+
+
+def _apply_entry(players: dict, entry: dict):
+    """Provede jednu změnu z deníku ({"p": hráč} nebo {"p": hráč, "l": level})."""
+    player = players.setdefault(entry["p"], {"completed_levels": []})
+    if "l" in entry:
+        levels = player.setdefault("completed_levels", [])
+        if entry["l"] not in levels:
+            levels.append(entry["l"])
+
+
+def _read_journal(path: str) -> tuple[list[dict], int]:
+    """
+    Přečte změny z deníku.
+
+    Useknutý poslední řádek (pád uprostřed zápisu) se přeskočí
+    a soubor se na konci posledního celého řádku zkrátí, aby se
+    další řádek nepřipsal za poškozená data.
+
+    Returns:
+        tuple: (seznam změn, počet přeskočených poškozených řádků)
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return [], 0
+
+    entries = []
+    skipped = 0
+    complete_end = raw.rfind(b"\n") + 1
+    for line in raw[:complete_end].splitlines():
+        try:
+            entry = json.loads(line.decode("utf-8"))
+            if not isinstance(entry.get("p"), str):
+                raise ValueError("chybí hráč")
+            entries.append(entry)
+        except (ValueError, AttributeError):
+            skipped += 1
+
+    if complete_end < len(raw):
+        skipped += 1
+        with open(path, "r+b") as f:
+            f.truncate(complete_end)
+    return entries, skipped
 
 
 class PlayerProgress:
@@ -25,17 +85,61 @@ class PlayerProgress:
 
     Umožňuje načítat a ukládat dokončené levely každého hráče
     a spravovat seznam hráčů.
+
+    V režimu deníku (journal=True) se při uložení jen připíší nové změny
+    do deníku (jeden krátký řádek na změnu). Při načtení se deník přehraje
+    přes poslední snímek (resolved_tasks.json); jakmile deník přeroste
+    compact_bytes, zapíše se na pozadí nový snímek a deník začne znovu.
+
+    V rozděleném režimu (sharded=True) má každý hráč vlastní soubor ve složce
+    resolved_tasks.players/ a složka obsahuje i seznam hráčů (index.json).
+    Při načtení se čte jen seznam hráčů; soubor hráče se načte až při práci
+    s ním a při uložení se zapíšou jen soubory změněných hráčů. Atribut
+    players pak obsahuje jen už načtené hráče. Pokud složka ještě neexistuje,
+    převedou se do ní hráči z resolved_tasks.json.
     """
 
-    def __init__(self, file_path: str = "resolved_tasks.json"):
+    def __init__(self, file_path: str = "resolved_tasks.json", journal: bool = False,
+                 compact_bytes: int = JOURNAL_COMPACT_BYTES, sharded: bool = False):
         """
         Inicializuje správu pokroku.
 
         Args:
             file_path (str): cesta k JSON souboru s pokrokem hráčů.
+            journal (bool): ukládat změny do deníku místo přepisování celého souboru
+            compact_bytes (int): velikost deníku, od které se deník zhustí do snímku
+            sharded (bool): ukládat každého hráče do vlastního souboru
+
+        Raises:
+            ValueError: pokud je zapnutý deník i rozdělené ukládání zároveň
         """
+        if journal and sharded:
+            raise ValueError("Deník a rozdělené ukládání pokroku nelze zapnout zároveň.")
+
         self.file_path = file_path
+        self.journal = journal
+        self.journal_path = os.path.splitext(file_path)[0] + JOURNAL_SUFFIX
+        self.compact_bytes = compact_bytes
+        self.sharded = sharded
+        self.shards_path = os.path.splitext(file_path)[0] + SHARDS_SUFFIX
         self.players: dict[str, dict] = {}
+        self._journal_entries: list[dict] = []  # změny, které ještě nejsou v deníku
+        self._journal_buffer: list[bytes] = []  # řádky předané vláknu zapisovače
+        self._journal_lock = threading.Lock()
+        self._directory: dict[str, str] = {}  # rozdělený režim: jméno → soubor hráče
+        self._dirty_players: set[str] = set()  # rozdělený režim: hráči se změnami k uložení
+
+        # množina dokončených levelů pro každého hráče (ukládá se jen seznam)
+        self._completed: dict[str, set[str]] = {}
+        # hráč → (kapitoly, pozice levelů, první nevyřešený level v každé kapitole)
+        self._first_unsolved: dict[str, tuple] = {}
+
+        self.journal_stats = {
+            "appended": 0,  # připsané řádky
+            "replayed": 0,  # řádky přehrané při načtení
+            "skipped": 0,  # poškozené řádky (např. useknutý poslední řádek po pádu)
+            "compactions": 0,  # počet zhuštění deníku
+        }
         self.load_progress()
 
     def load_progress(self):
@@ -43,19 +147,209 @@ class PlayerProgress:
         Načte pokrok všech hráčů z JSON souboru.
         Pokud soubor neexistuje, vytvoří prázdný slovník.
         """
+        self.flush()  # nejdřív dopsat, co ještě čeká na zápis
+        self._completed = {}
+        self._first_unsolved = {}
+        if self.sharded:
+            self._load_directory()
+            return
+
         if os.path.exists(self.file_path):
             with open(writable_path(self.file_path), "r", encoding="utf-8") as f:
                 self.players = json.load(f)
         else:
             self.players = {}
 
+        self._journal_entries = []
+        if self.journal:
+            journal = writable_path(self.journal_path)
+            compacting = journal + COMPACTING_SUFFIX
+            interrupted = os.path.exists(compacting)
+            # nejdřív deník z nedokončeného zhuštění, pak aktuální deník
+            self._replay_journal(compacting)
+            self._replay_journal(journal)
+            if interrupted:
+                # zhuštění bylo přerušeno → snímek se všemi změnami zapíšeme hned
+                atomic_write(writable_path(self.file_path), self._snapshot_bytes())
+                os.remove(compacting)
+                open(journal, "wb").close()
+
+    # ------------------------
+    # Rozdělené ukládání (soubor pro každého hráče)
+    # ------------------------
+    @staticmethod
+    def _shard_name(name: str) -> str:
+        """Vrátí název souboru hráče (jméno může obsahovat libovolné znaky)."""
+        return "player_" + hashlib.sha1(name.encode("utf-8")).hexdigest()[:16] + ".json"
+
+    @staticmethod
+    def _json_bytes(data) -> bytes:
+        """Serializuje data jako JSON se stejnými konci řádků jako v textovém režimu."""
+        return json.dumps(data, indent=4, ensure_ascii=False).replace("\n", os.linesep).encode("utf-8")
+
+    def _directory_path(self) -> str:
+        return writable_path(os.path.join(self.shards_path, DIRECTORY_FILE))
+
+    def _shard_path(self, name: str) -> str:
+        return writable_path(os.path.join(self.shards_path, self._directory[name]))
+
+    def _load_directory(self):
+        """Načte jen seznam hráčů; pokud složka chybí, převede do ní resolved_tasks.json."""
+        self.players = {}
+        self._dirty_players = set()
+        try:
+            with open(self._directory_path(), "r", encoding="utf-8") as f:
+                self._directory = json.load(f)["players"]
+        except (OSError, ValueError, KeyError):
+            self._directory = {}
+            self._migrate_single_file()
+
+    def _migrate_single_file(self):
+        """Rozdělí pokrok ze společného souboru (starý formát) do souborů jednotlivých hráčů."""
+        if not os.path.exists(writable_path(self.file_path)):
+            return
+        with open(writable_path(self.file_path), "r", encoding="utf-8") as f:
+            players = json.load(f)
+
+        os.makedirs(writable_path(self.shards_path), exist_ok=True)
+        for name, data in players.items():
+            self._directory[name] = self._shard_name(name)
+            atomic_write(self._shard_path(name), self._json_bytes(data))
+        # seznam hráčů až nakonec – dokud není zapsaný, převod se při dalším spuštění zopakuje
+        atomic_write(self._directory_path(), self._json_bytes({"players": self._directory}))
+        self.players = players
+
+    def _load_player(self, name: str):
+        """V rozděleném režimu načte soubor hráče, pokud ještě načtený není."""
+        if not self.sharded or name in self.players or name not in self._directory:
+            return
+        try:
+            with open(self._shard_path(name), "r", encoding="utf-8") as f:
+                self.players[name] = json.load(f)
+        except (OSError, ValueError):
+            self.players[name] = {"completed_levels": []}
+
+    def _save_shards(self):
+        """Předá k zápisu soubory změněných hráčů (a seznam hráčů, pokud přibyl nový)."""
+        if not self._dirty_players:
+            return
+        os.makedirs(writable_path(self.shards_path), exist_ok=True)
+
+        new_players = [name for name in self._dirty_players if name not in self._directory]
+        for name in new_players:
+            self._directory[name] = self._shard_name(name)
+        for name in self._dirty_players:
+            get_writer().submit(self._shard_path(name), self._json_bytes(self.players[name]))
+        if new_players:
+            get_writer().submit(self._directory_path(), self._json_bytes({"players": self._directory}))
+        self._dirty_players = set()
+
+    def _snapshot_bytes(self) -> bytes:
+        """Vrátí obsah JSON souboru s pokrokem všech hráčů."""
+        return self._json_bytes(self.players)
+
     def save_progress(self):
         """
-        Uloží pokrok všech hráčů do JSON souboru.
+        Předá pokrok všech hráčů k uložení do JSON souboru.
+
+        Soubor se zapíše na pozadí po krátké prodlevě; více uložení
+        těsně po sobě se sloučí do jednoho zápisu. V režimu deníku
+        se jen připíší nové změny (O(1) na změnu), v rozděleném
+        režimu se zapíšou jen soubory změněných hráčů.
+        """
+        if self.journal:
+            self._append_journal()
+        elif self.sharded:
+            self._save_shards()
+        else:
+            get_writer().submit(writable_path(self.file_path), self._snapshot_bytes())
+
+    def flush(self):
+        """Okamžitě zapíše pokrok, který ještě čeká na zápis (např. při ukončení aplikace)."""
+        if self.sharded or self.journal:
+            get_writer().flush()  # souborů hráčů (nebo deník a snímek) může čekat víc
+        else:
+            get_writer().flush(writable_path(self.file_path))
+
+    # ------------------------
+    # Deník změn
+    # ------------------------
+    def _record(self, entry: dict):
+        """Zapamatuje si změnu, která se při příštím uložení připíše do deníku (nebo souboru hráče)."""
+        if self.journal:
+            self._journal_entries.append(entry)
+        elif self.sharded:
+            self._dirty_players.add(entry["p"])
+
+    def _replay_journal(self, path: str):
+        """Přehraje deník přes načtený snímek (viz _read_journal)."""
+        entries, skipped = _read_journal(path)
+        for entry in entries:
+            _apply_entry(self.players, entry)
+        self.journal_stats["replayed"] += len(entries)
+        self.journal_stats["skipped"] += skipped
+
+    def _append_journal(self):
+        """Předá čekající změny vláknu zapisovače, které je připíše na konec deníku."""
+        if not self._journal_entries:
+            return
+
+        lines = b"".join(
+            json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            for entry in self._journal_entries
+        )
+        with self._journal_lock:
+            self._journal_buffer.append(lines)
+        self.journal_stats["appended"] += len(self._journal_entries)
+        self._journal_entries = []
+        get_writer().submit_job(writable_path(self.journal_path), self._write_journal, size=len(lines))
+
+    def _write_journal(self):
+        """Připíše řádky z bufferu na konec deníku; velký deník zhustí (běží ve vlákně zapisovače)."""
+        with self._journal_lock:
+            lines = b"".join(self._journal_buffer)
+            self._journal_buffer = []
+        if not lines:
+            return
+
+        with open(writable_path(self.journal_path), "ab") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+
+        if size >= self.compact_bytes:
+            self._compact_journal()
+
+    def _compact_journal(self):
+        """
+        Zhustí deník do nového snímku (běží ve vlákně zapisovače).
+
+        Deník se přejmenuje (.compacting), nové řádky jdou do prázdného deníku.
+        Nový snímek vznikne ze snímku na disku a přejmenovaného deníku (pokrok
+        v paměti se mezitím může měnit); přejmenovaný deník se smaže až po zápisu.
+        Když aplikace mezitím spadne, při načtení se přehrají oba deníky.
         """
-        with open(writable_path(self.file_path), "w", encoding="utf-8") as f:
-            json.dump(self.players, f, indent=4, ensure_ascii=False)
+        snapshot_path = writable_path(self.file_path)
+        journal = writable_path(self.journal_path)
+        compacting = journal + COMPACTING_SUFFIX
+        os.replace(journal, compacting)
+
+        players = {}
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                players = json.load(f)
+        entries, _ = _read_journal(compacting)
+        for entry in entries:
+            _apply_entry(players, entry)
+
+        atomic_write(snapshot_path, self._json_bytes(players))
+        os.remove(compacting)
+        self.journal_stats["compactions"] += 1
 
+    # ------------------------
+    # Hráči a levely
+    # ------------------------
     def add_player(self, name: str):
         """
         Přidá hráče, pokud ještě neexistuje.
@@ -63,8 +357,10 @@ class PlayerProgress:
         Args:
             name (str): jméno hráče
         """
+        self._load_player(name)
         if name not in self.players:
             self.players[name] = {"completed_levels": []}
+            self._record({"p": name})
 
     def get_player(self, name: str) -> dict:
         """
@@ -76,24 +372,106 @@ class PlayerProgress:
         Returns:
             dict: informace o hráči, např. {"completed_levels": [...]}
         """
+        self._load_player(name)
         if name not in self.players:
             self.add_player(name)
         return self.players[name]
 
-    def update_player_level(self, name: str, level: str):
+    def update_player_level(self, name: str, level: str) -> bool:
         """
         Označí daný level jako dokončený pro konkrétního hráče.
 
         Args:
             name (str): jméno hráče
             level (str): označení levelu
+
+        Returns:
+            bool: True, pokud level předtím dokončený nebyl (pokrok se změnil)
         """
+        changed = self._mark_completed(name, level)
+        if changed:
+            self._record({"p": name, "l": str(level)})
+        return changed
+
+    def _mark_completed(self, name: str, level: str) -> bool:
+        """Označí level jako dokončený bez zápisu do deníku; vrátí, zda šlo o změnu."""
+        self._load_player(name)
         if name not in self.players:
-            self.add_player(name)
+            self.players[name] = {"completed_levels": []}
 
         if "completed_levels" not in self.players[name]:
             self.players[name]["completed_levels"] = []
 
         level_str = str(level)
-        if level_str not in self.players[name]["completed_levels"]:
+        completed = self._completed_set(name)
+        if level_str not in completed:
             self.players[name]["completed_levels"].append(level_str)
+            completed.add(level_str)
+            self._advance_first_unsolved(name, level_str)
+            return True
+        return False
+
+    # ------------------------
+    # Rychlé dotazy na pokrok
+    # ------------------------
+    def _completed_set(self, name: str) -> set[str]:
+        """Vrátí množinu dokončených levelů hráče (sestaví ji jen poprvé)."""
+        if name not in self._completed:
+            self._load_player(name)
+            levels = self.players.get(name, {}).get("completed_levels", [])
+            self._completed[name] = {str(level) for level in levels}
+        return self._completed[name]
+
+    def is_completed(self, name: str, level) -> bool:
+        """
+        Zjistí, zda hráč daný level dokončil.
+
+        Args:
+            name (str): jméno hráče
+            level (str): označení levelu
+
+        Returns:
+            bool: True, pokud je level mezi dokončenými
+        """
+        return str(level) in self._completed_set(name)
+
+    def first_unsolved_levels(self, name: str, chapters: list[dict]) -> list[str]:
+        """
+        Vrátí první nevyřešený level v každé kapitole (kapitoly bez nevyřešeného levelu vynechá).
+
+        Výsledek se cachuje pro daný seznam kapitol (LevelData.get_chapters())
+        a při dokončení levelu se jen posune (viz _advance_first_unsolved).
+
+        Args:
+            name (str): jméno hráče
+            chapters (list[dict]): kapitoly jako {"title": ..., "levels": [...]}
+        """
+        cached = self._first_unsolved.get(name)
+        if cached is None or cached[0] is not chapters:
+            completed = self._completed_set(name)
+            positions = {}  # level → (index kapitoly, pozice v kapitole)
+            firsts = []
+            for chapter_index, chapter in enumerate(chapters):
+                first = None
+                for position, level in enumerate(chapter["levels"]):
+                    positions[level] = (chapter_index, position)
+                    if first is None and level not in completed:
+                        first = level
+                firsts.append(first)
+            cached = (chapters, positions, firsts)
+            self._first_unsolved[name] = cached
+        return [level for level in cached[2] if level is not None]
+
+    def _advance_first_unsolved(self, name: str, level: str):
+        """Po dokončení levelu posune první nevyřešený level jen v jeho kapitole."""
+        cached = self._first_unsolved.get(name)
+        if cached is None or level not in cached[1]:
+            return
+        chapters, positions, firsts = cached
+        chapter_index, position = positions[level]
+        if firsts[chapter_index] != level:
+            return
+
+        completed = self._completed_set(name)
+        levels = chapters[chapter_index]["levels"]
+        firsts[chapter_index] = next((lvl for lvl in levels[position + 1:] if lvl not in completed), None)
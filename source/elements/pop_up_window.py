@@ -17,6 +17,7 @@ Obsahuje:
 import pygame
 import glob_var
 from elements.button import Button
+from utils.initiating_length import get_font
 
 
 class PopUpWindow:
@@ -33,7 +34,7 @@ class PopUpWindow:
         # font
         self.font_name = glob_var.FONT_NAME
         self.base_font_size = glob_var.POP_UP_FONT_SIZE
-        self.font = pygame.font.SysFont(self.font_name, self.base_font_size)
+        self.font = get_font(self.font_name, self.base_font_size)
 
         # pozadí a barvy
         self.bg_color = (15, 15, 15)
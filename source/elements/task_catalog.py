@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+task_catalog.py
+---------------
+
+Sdílený katalog úloh pro Cubiq🧊.
+
+Třída TaskCatalog umožňuje:
+    • načíst seznam úloh z úložiště (TaskStore) jen jednou pro celý běh aplikace,
+    • znovu ho načíst jen tehdy, když se úložiště změní (mtime a velikost souboru, commit v SQLite),
+    • jednotlivé úlohy číst až při prvním dotazu – z data.json přes index,
+      z binární banky (data.cubq) nebo z SQLite databáze (viz elements/task_store.py),
+    • poskytovat data jednotlivých úloh (pro TaskData) a seznam ID úloh (pro LevelData),
+    • sledovat metriky načítání (počet načtení, doba parsování, počet dotazů),
+    • převzít celý katalog ze snímku startu (utils/warm_start.py) bez čtení úložiště,
+    • poskytovat předpočítanou obtížnost úloh (mezipaměť z utils/difficulty.py) a obtížnosti,
+      které v mezipaměti chybí (nová kopie hry, upravená úloha), dopočítat na pozadí,
+    • ukládat a mazat úlohy (editor) a ohlásit změnu posluchačům
+      ("added", "changed", "deleted", případně "reloaded" po změně souboru zvenčí).
+
+Funkce get_catalog(filepath) vrací jednu sdílenou instanci pro každý soubor.
+Katalog je chráněný zámkem – úlohy z něj čte i vlákno pro přednačítání (task_prefetch.py).
+"""
+
+import threading
+import time
+
+from elements.task_store import get_task_store
+
+
+class TaskCatalog:
+    """
+    Sdílený katalog úloh načtený z úložiště (data.json, binární banka nebo SQLite).
+
+    Attributes:
+        filepath (str): cesta k JSON souboru s úlohami
+        store (TaskStore): úložiště, ze kterého se úlohy čtou
+        tasks (dict[str, dict]): už dekódovaná data úloh podle task_id (bez "_meta")
+        meta (dict): metadata databáze úloh ("_meta")
+        metrics (dict): metriky načítání
+    """
+
+    def __init__(self, filepath: str = "data.json"):
+        self.filepath = filepath
+        self.tasks: dict[str, dict] = {}
+        self.meta: dict = {"version": "unknown"}
+        self.store = get_task_store(filepath)
+        self._task_ids: list[str] = []
+        self._known_ids: set[str] = set()
+        self._signature = None
+        self._listeners: list = []
+        self._lock = threading.RLock()
+        # obtížnosti se nemění na místě, jen se nahradí novým slovníkem → čtou se bez zámku
+        self._difficulties: dict[str, dict] | None = None  # načte se až při prvním dotazu
+        self.difficulty_version = 0  # zvýší se při každé změně obtížností (pro obrazovku levelů)
+        self._difficulty_thread: threading.Thread | None = None  # běžící přepočet (None = neběží)
+        self._difficulties_stale = False  # během přepočtu se změnila úloha → přepočítat znovu
+
+        self.metrics = {
+            "loads": 0,  # kolikrát se soubor skutečně parsoval
+            "last_load_ms": 0.0,  # doba posledního načtení
+            "total_load_ms": 0.0,  # celková doba všech načtení
+            "file_size": 0,  # velikost souboru při posledním načtení (B)
+            "task_count": 0,  # počet úloh
+            "lookups": 0,  # počet dotazů na úlohu
+            "decoded_tasks": 0,  # počet úloh přečtených z úložiště jednotlivě
+            "index_builds": 0,  # kolikrát se index musel sestavit
+            "index_used": False,  # zda se při posledním načtení použil platný index
+            "binary": False,  # zda se při posledním načtení použila binární banka
+            "sqlite": False,  # zda jsou úlohy v SQLite databázi
+            "primed": False,  # zda se katalog převzal ze snímku startu
+        }
+
+    # ------------------------
+    # Načítání a invalidace
+    # ------------------------
+    def _file_signature(self):
+        """Vrátí podpis úložiště (u JSON cesta, mtime a velikost), podle kterého se pozná změna."""
+        return self.store.signature()
+
+    def refresh(self):
+        """Načte soubor znovu, pokud se od posledního načtení změnil."""
+        with self._lock:
+            signature = self._file_signature()
+            if signature != self._signature:
+                self._load(signature)
+
+    def invalidate(self):
+        """Vynutí nové načtení při příštím dotazu (např. po uložení v editoru)."""
+        self._signature = None
+
+    def _load(self, signature):
+        """
+        Načte seznam úloh z úložiště; jednotlivé úlohy se čtou až při prvním dotazu
+        (JSON s indexem, binární banka, SQLite), případně jsou už naparsované celé.
+        """
+        start = time.perf_counter()
+        reloaded = self._signature is not None
+
+        self.meta, self._task_ids = self.store.load()
+        self._known_ids = set(self._task_ids)
+        self.tasks = {}
+        self._difficulties = None
+        self.metrics.update(self.store.info)
+        self._signature = signature
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.metrics["loads"] += 1
+        self.metrics["last_load_ms"] = elapsed_ms
+        self.metrics["total_load_ms"] += elapsed_ms
+        self.metrics["file_size"] = signature[2] if len(signature) == 3 else 0
+        self.metrics["task_count"] = len(self._task_ids)
+
+        if reloaded:
+            # soubor se změnil mimo katalog → posluchači si musí vše načíst znovu
+            self._emit("reloaded", None)
+
+    def prime(self, meta: dict, task_ids: list[str], tasks: dict[str, dict]):
+        """
+        Převezme katalog ze snímku startu místo načtení úložiště.
+        Volá se jen tehdy, když snímek odpovídá aktuálnímu souboru s úlohami
+        (další změna souboru se pozná podle podpisu úložiště jako obvykle).
+
+        Args:
+            meta (dict): metadata databáze úloh
+            task_ids (list[str]): ID úloh v pořadí ze souboru
+            tasks (dict[str, dict]): data všech úloh
+        """
+        with self._lock:
+            self.meta = meta
+            self._task_ids = list(task_ids)
+            self._known_ids = set(self._task_ids)
+            self.tasks = dict(tasks)
+            self._signature = self._file_signature()
+            self.metrics["primed"] = True
+            self.metrics["task_count"] = len(self._task_ids)
+
+    def export_tasks(self) -> tuple[dict, list[str], dict[str, dict]]:
+        """
+        Vrátí celý katalog (pro snímek startu); úlohy, které se ještě nečetly, se načtou.
+
+        Returns:
+            tuple: (metadata, ID úloh v pořadí ze souboru, data úloh podle ID)
+        """
+        self.refresh()
+        with self._lock:
+            task_ids = list(self._task_ids)
+            tasks = {task_id: self.get_task(task_id, refresh=False) for task_id in task_ids}
+            return self.meta, task_ids, tasks
+
+    # ------------------------
+    # Události změn
+    # ------------------------
+    def add_listener(self, listener):
+        """
+        Přidá posluchače změn katalogu.
+
+        Args:
+            listener (callable): volá se jako listener(event, task_id), kde event je
+                "added", "changed", "deleted" nebo "reloaded" (task_id je pak None)
+        """
+        self._listeners.append(listener)
+
+    def _emit(self, event: str, task_id: str | None):
+        for listener in list(self._listeners):
+            listener(event, task_id)
+
+    # ------------------------
+    # Změny úloh
+    # ------------------------
+    def save_task(self, task_id: str, task: dict, callback=None):
+        """
+        Uloží úlohu do úložiště (na pozadí) a rovnou ji zapíše i do katalogu,
+        takže se katalog nemusí načítat znovu.
+
+        Args:
+            task_id (str): ID úlohy
+            task (dict): data úlohy
+            callback (callable, optional): zavolá se po zápisu na disk (viz TaskStore.save_task)
+        """
+        self.refresh()
+        task_id = str(task_id)
+        with self._lock:
+            added = task_id not in self._known_ids
+
+            self.store.save_task(task_id, task, callback)
+            self.tasks[task_id] = task
+            if self._difficulties is not None:
+                self._forget_difficulty(task_id)  # obsah se změnil – přepočítá se na pozadí
+            if added:
+                self._task_ids.append(task_id)
+                self._known_ids.add(task_id)
+            self._signature = self._file_signature()
+            self.metrics["task_count"] = len(self._task_ids)
+
+        self._emit("added" if added else "changed", task_id)
+        self._schedule_difficulties()
+
+    def delete_task(self, task_id: str, callback=None) -> bool:
+        """
+        Smaže úlohu z úložiště i z katalogu.
+
+        Returns:
+            bool: True pokud úloha existovala
+        """
+        self.refresh()
+        task_id = str(task_id)
+
+        with self._lock:
+            deleted = self.store.delete_task(task_id, callback)
+            self.tasks.pop(task_id, None)
+            if self._difficulties is not None and task_id in self._difficulties:
+                self._forget_difficulty(task_id)
+            if task_id in self._known_ids:
+                self._known_ids.discard(task_id)
+                self._task_ids.remove(task_id)
+            self._signature = self._file_signature()
+            self.metrics["task_count"] = len(self._task_ids)
+
+        if deleted:
+            self._emit("deleted", task_id)
+        return deleted
+
+    # ------------------------
+    # Dotazy
+    # ------------------------
+    def task_ids(self) -> list[str]:
+        """Vrátí ID všech úloh v pořadí ze souboru (stačí k tomu index)."""
+        self.refresh()
+        with self._lock:
+            return list(self._task_ids)
+
+    def get_task(self, task_id: str, refresh: bool = True) -> dict:
+        """
+        Vrátí data jedné úlohy (slovník z JSON). Data se nesmí měnit na místě.
+
+        Args:
+            task_id (str): ID úlohy
+            refresh (bool): nejdřív ověřit, zda se úložiště nezměnilo; vlákno na pozadí
+                dává False, aby případné události změn vznikaly jen v hlavním vlákně
+
+        Raises:
+            KeyError: pokud úloha v souboru není
+        """
+        if refresh:
+            self.refresh()
+
+        with self._lock:
+            self.metrics["lookups"] += 1
+
+            task_id = str(task_id)
+            if task_id not in self.tasks:
+                if task_id not in self._known_ids:
+                    raise KeyError(f"Úloha '{task_id}' nebyla nalezena v {self.filepath}.")
+                self.tasks[task_id] = self.store.read_task(task_id)
+                self.metrics["decoded_tasks"] += 1
+            return self.tasks[task_id]
+
+    def difficulty(self, task_id: str) -> dict | None:
+        """
+        Vrátí předpočítanou obtížnost úlohy ({"score", "level", "features", "hash"}),
+        nebo None, pokud ještě nebyla spočítaná (dopočítává se na pozadí).
+        """
+        return self._loaded_difficulties().get(str(task_id))
+
+    def has_difficulties(self) -> bool:
+        """Vrátí True, pokud je spočítaná obtížnost aspoň jedné úlohy."""
+        return bool(self._loaded_difficulties())
+
+    def _loaded_difficulties(self) -> dict[str, dict]:
+        """
+        Vrátí aktuální slovník obtížností (bez zámku – na přepočet se nečeká);
+        při prvním dotazu načte mezipaměť a chybějící obtížnosti dopočítá na pozadí.
+        """
+        difficulties = self._difficulties
+        if difficulties is not None:
+            return difficulties
+        from utils.difficulty import load_difficulties
+
+        with self._lock:
+            if self._difficulties is None:
+                self._difficulties = load_difficulties(self.filepath)
+                self.difficulty_version += 1
+                if not self._known_ids <= self._difficulties.keys():
+                    self._schedule_difficulties()
+            return self._difficulties
+
+    def _forget_difficulty(self, task_id: str):
+        """Zahodí obtížnost upravené nebo smazané úlohy (nový slovník, volá se pod zámkem)."""
+        self._difficulties = {key: value for key, value in self._difficulties.items() if key != task_id}
+        self.difficulty_version += 1
+
+    def _schedule_difficulties(self):
+        """
+        Spustí přepočet obtížností ve vlákně na pozadí (utils/difficulty.update_difficulties,
+        přepočítají se jen úlohy bez platné obtížnosti) a výsledek uloží do mezipaměti.
+        Pokud přepočet už běží, proběhne po něm ještě jednou.
+        """
+        with self._lock:
+            if self._difficulties is None:
+                return  # obtížnosti zatím nikdo nepotřeboval
+            if self._difficulty_thread is not None:
+                self._difficulties_stale = True  # běžící přepočet to zjistí, než skončí
+                return
+            self._difficulties_stale = False
+            self._difficulty_thread = threading.Thread(target=self._update_difficulties,
+                                                       name="cubiq-difficulty", daemon=True)
+            self._difficulty_thread.start()
+
+    def _update_difficulties(self):
+        """Přepočítá chybějící obtížnosti (běží ve vlákně na pozadí, bez dalších procesů)."""
+        from utils.difficulty import save_difficulties, update_difficulties
+
+        try:
+            while True:
+                with self._lock:
+                    meta = self.meta
+                    task_ids = list(self._task_ids)
+                    cached = dict(self._difficulties or {})
+                    self._difficulties_stale = False
+
+                # úlohy se čtou po jedné (krátký zámek na úlohu), hlavní vlákno tak nečeká
+                all_data = {"_meta": meta}
+                for task_id in task_ids:
+                    try:
+                        all_data[task_id] = self.get_task(task_id, refresh=False)
+                    except KeyError:
+                        pass  # úloha se mezitím smazala
+                difficulties, _ = update_difficulties(all_data, cached, jobs=0)
+
+                with self._lock:
+                    if self._difficulties_stale:
+                        continue  # mezitím se změnila úloha → spočítat znovu z aktuálních dat
+                    if self._difficulties is not None:
+                        self._difficulties = difficulties
+                        self.difficulty_version += 1
+                    # konec přepočtu se rozhodne pod stejným zámkem jako _schedule_difficulties
+                    self._difficulty_thread = None
+                save_difficulties(difficulties, self.filepath)
+                return
+        except Exception as e:  # chyba přepočtu nesmí zablokovat další přepočty
+            print(f"Přepočet obtížností se nepodařil: {e}")
+            with self._lock:
+                self._difficulty_thread = None
+
+    def get_meta(self) -> dict:
+        """Vrátí metadata databáze úloh."""
+        self.refresh()
+        return self.meta
+
+
+# sdílené katalogy podle cesty k souboru
+_catalogs: dict[str, TaskCatalog] = {}
+
+
+def get_catalog(filepath: str = "data.json") -> TaskCatalog:
+    """Vrátí sdílený katalog úloh pro daný soubor (vytvoří ho jen poprvé)."""
+    if filepath not in _catalogs:
+        _catalogs[filepath] = TaskCatalog(filepath)
+    return _catalogs[filepath]
@@ -6,30 +6,31 @@ task_data.py
 Správa a rozbalení dat jedné úlohy v aplikaci Cubiq🧊.
 
 Třída TaskData poskytuje:
-    • načtení úlohy z JSON souboru podle task_id,
+    • načtení úlohy podle task_id ze sdíleného katalogu úloh (TaskCatalog),
     • 2D reprezentace (půdorys, nárys, bokorys) s Connection2D objekty,
     • 3D řešení s rozbalením indexů na Grid3DPoint a Connection3D,
     • přístup k textu úlohy a sub_id (druhá část task_id),
+    • velikost mřížky úlohy (klíč "size", výchozí 3 body v jednom směru),
     • podporu pro různé typy úloh: "2D_to_3D", "3D_to_2D", "tutorial".
 """
 
-import json
-from utils.fun_for_making_exe import resource_path, writable_path
-
 from elements.connection import Connection2D, Connection3D
 from elements.gridpoint import Grid2DPoint, Grid3DPoint
+from elements.task_catalog import get_catalog
+from utils.projection import task_size
 
 
 class TaskData:
     """
     Reprezentuje data jednoho úkolu pro Cubiq.
 
-    Načítá konkrétní úlohu z JSON souboru a rozbalí její řešení
-    z indexů na 3D souřadnice.
+    Načítá konkrétní úlohu ze sdíleného katalogu (JSON se parsuje jen jednou)
+    a rozbalí její řešení z indexů na 3D souřadnice.
 
     Args:
         task_id (str | int): identifikátor úlohy (např. "1.4")
         filepath (str, optional): cesta k JSON souboru s úlohami; default "data.json"
+        refresh (bool, optional): ověřit změnu úložiště před čtením (vlákno na pozadí dává False)
 
     Attributes:
         data (dict): načtená data úlohy z JSON, obsahuje:
@@ -47,27 +48,25 @@ class TaskData:
         data3d -> list[list[list[int]]]: původní indexové 3D "řešení"
         unpacked_data3d -> list[list[tuple[int,int,int]]]: rozbalená 3D řešení
         text -> str: text zadání úlohy
+        size -> int: počet bodů mřížky v jednom směru
         sub_id -> int: druhá část task_id jako celé číslo (např. "1.4" → 4)
     """
 
-    def __init__(self, task_id, filepath="data.json"):
+    def __init__(self, task_id, filepath="data.json", refresh=True):
         self.filepath = filepath
         self.task_id = str(task_id)
-        self.data = self._load_json()
+        self.data = self._load_json(refresh)
         self._unpack_data3d()
         self._unpack_2d_connections()
 
-    def _load_json(self) -> dict:
-        """Načte JSON a vrátí data pro dané task_id."""
-        with open(writable_path(self.filepath), "r", encoding="utf-8") as f:
-            all_data = json.load(f)
-
-        self.meta = all_data.get("_meta", {"version": "unknown"})
-
-        if self.task_id not in all_data:
-            raise KeyError(f"Úloha '{self.task_id}' nebyla nalezena v {self.filepath}.")
+    def _load_json(self, refresh=True) -> dict:
+        """Vrátí data pro dané task_id ze sdíleného katalogu úloh."""
+        catalog = get_catalog(self.filepath)
+        task = catalog.get_task(self.task_id, refresh=refresh)
+        self.meta = catalog.get_meta() if refresh else catalog.meta
 
-        return all_data[self.task_id]
+        # mělká kopie – rozbalená spojení se přidávají jen do této instance
+        return dict(task)
 
     def _unpack_data3d(self):
         """Rozbalí 3D "řešení" z JSON, včetně volitelného parametru dashed."""
@@ -146,6 +145,10 @@ class TaskData:
     def text(self):
         return self.data.get("text", "")
 
+    @property
+    def size(self):
+        return task_size(self.data)
+
     @property
     def sub_id(self):
         """
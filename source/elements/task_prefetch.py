@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+task_prefetch.py
+----------------
+
+Přednačítání úloh na pozadí pro Cubiq🧊.
+
+Třída TaskPrefetcher umožňuje:
+    • ve vlákně na pozadí připravit úlohy, na které hráč nejspíš přejde
+      (předchozí a následující úloha, první nevyřešená úloha v každé kapitole),
+    • připravit TaskData (rozbalená spojení) i vykreslený text zadání,
+    • držet připravené úlohy v omezené LRU cache (nejdéle nepoužité se zahodí),
+    • zahodit úlohu po její změně v editoru,
+    • sledovat počítadla (zásahy cache, připravené a zahozené úlohy).
+
+Přechod na přednačtenou úlohu tak v hlavním vlákně nic neparsuje ani nezalamuje text.
+"""
+
+import threading
+from collections import OrderedDict
+
+from elements.task_data import TaskData
+from utils.layout import layout_task_text
+
+
+class PreparedTask:
+    """
+    Úloha připravená k zobrazení.
+
+    Attributes:
+        task (TaskData): data úlohy
+        geometry (tuple): parametry rozložení, pro které se text vykreslil
+        text_surfaces (list): vykreslené řádky textu zadání
+        text_positions (list): pozice řádků
+    """
+
+    def __init__(self, task: TaskData, geometry: tuple, text_surfaces: list, text_positions: list):
+        self.task = task
+        self.geometry = geometry
+        self.text_surfaces = text_surfaces
+        self.text_positions = text_positions
+
+
+class TaskPrefetcher:
+    """
+    Přednačítání úloh ve vlákně na pozadí s omezenou LRU cache.
+
+    Attributes:
+        filepath (str): cesta k souboru s úlohami
+        max_entries (int): nejvyšší počet připravených úloh v cache
+        stats (dict): počítadla
+    """
+
+    def __init__(self, filepath: str = "data.json", max_entries: int = 16):
+        self.filepath = filepath
+        self.max_entries = max_entries
+        self._prepared: OrderedDict[str, PreparedTask] = OrderedDict()
+        self._queue: list[tuple[str, tuple]] = []  # (task_id, geometry) v pořadí priority
+        self._generation = 0  # zvýší se při zahození úloh (rozpracovaná příprava se pak nepoužije)
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+        self.stats = {
+            "requested": 0,  # kolik úloh se vyžádalo k přípravě
+            "prepared": 0,  # kolik úloh vlákno připravilo
+            "hits": 0,  # kolikrát se úloha vzala z cache
+            "misses": 0,  # kolikrát v cache nebyla
+            "evicted": 0,  # kolik úloh se z cache vyhodilo (LRU)
+            "errors": 0,  # úlohy, které se připravit nepodařilo
+        }
+
+    # ------------------------
+    # Hlavní vlákno
+    # ------------------------
+    def request(self, task_ids, geometry: tuple):
+        """
+        Naplánuje přípravu úloh (první v seznamu mají přednost).
+        Úlohy, které už jsou v cache pro stejné rozložení, se přeskočí.
+
+        Args:
+            task_ids (iterable[str]): ID úloh (None se ignoruje)
+            geometry (tuple): parametry rozložení textu (viz utils.layout.task_text_geometry)
+        """
+        with self._cond:
+            if self._closed:
+                return
+            wanted = []
+            for task_id in task_ids:
+                if task_id is None or any(task_id == queued for queued, _ in wanted):
+                    continue
+                prepared = self._prepared.get(task_id)
+                if prepared is not None and prepared.geometry == geometry:
+                    continue
+                wanted.append((task_id, geometry))
+            if not wanted:
+                return
+
+            self.stats["requested"] += len(wanted)
+            new_ids = {task_id for task_id, _ in wanted}
+            older = [item for item in self._queue if item[0] not in new_ids]
+            self._queue = (wanted + older)[:self.max_entries]
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def get(self, task_id: str) -> PreparedTask | None:
+        """Vrátí připravenou úlohu (a označí ji jako naposledy použitou), nebo None."""
+        with self._cond:
+            prepared = self._prepared.get(str(task_id))
+            if prepared is None:
+                self.stats["misses"] += 1
+                return None
+            self._prepared.move_to_end(prepared.task.task_id)
+            self.stats["hits"] += 1
+            return prepared
+
+    def put(self, prepared: PreparedTask):
+        """Uloží úlohu připravenou v hlavním vlákně (návrat na ni pak bude okamžitý)."""
+        with self._cond:
+            self._store(prepared)
+
+    def discard(self, task_id: str | None = None):
+        """
+        Zahodí připravenou úlohu (např. po úpravě v editoru).
+
+        Args:
+            task_id (str, optional): ID úlohy; bez parametru se zahodí všechny
+        """
+        with self._cond:
+            self._generation += 1
+            if task_id is None:
+                self._prepared.clear()
+                self._queue.clear()
+            else:
+                self._prepared.pop(task_id, None)
+                self._queue = [item for item in self._queue if item[0] != task_id]
+
+    def close(self):
+        """Ukončí vlákno na pozadí (rozpracovaná úloha se dokončí)."""
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    # ------------------------
+    # Vlákno na pozadí
+    # ------------------------
+    def _ensure_thread(self):
+        """Spustí vlákno, pokud ještě neběží (volá se pod zámkem)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="cubiq-prefetch", daemon=True)
+            self._thread.start()
+
+    def _store(self, prepared: PreparedTask):
+        """Vloží úlohu do cache a vyhodí nejdéle nepoužité (volá se pod zámkem)."""
+        self._prepared[prepared.task.task_id] = prepared
+        self._prepared.move_to_end(prepared.task.task_id)
+        while len(self._prepared) > self.max_entries:
+            self._prepared.popitem(last=False)
+            self.stats["evicted"] += 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                task_id, geometry = self._queue.pop(0)
+                generation = self._generation
+
+            try:
+                # katalog se neobnovuje – události změn patří hlavnímu vláknu
+                task = TaskData(task_id, self.filepath, refresh=False)
+                surfaces, positions = layout_task_text(task.text, geometry)
+            except Exception as e:  # chyba v jedné úloze nesmí ukončit vlákno
+                with self._cond:
+                    self.stats["errors"] += 1
+                print(f"Přednačtení úlohy {task_id} se nepodařilo: {e}")
+                continue
+
+            with self._cond:
+                if generation == self._generation and not self._closed:
+                    self._store(PreparedTask(task, geometry, surfaces, positions))
+                    self.stats["prepared"] += 1
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+task_session.py
+---------------
+
+Rozpracovaný stav úloh pro Cubiq🧊.
+
+Obsahuje:
+    • pack_state() / unpack_state() – kompaktní kanonický zápis uživatelských spojení
+      (3D a tři 2D pohledy) do bajtů: každé spojení je jedno číslo, spojení jsou seřazená,
+    • connections_from_codes() – převod zpět na spojení nad body aktuálního gridu,
+    • třídu TaskSession – uložený stav jedné úlohy (spojení, vybraný bod, historie pro zpět),
+    • třídu SessionCache – omezenou LRU cache stavů podle (hráč, úloha) s volitelným
+      odkládáním vyhozených stavů na disk.
+
+Návrat k rozpracované úloze tak obnoví spojení rovnou z cache.
+"""
+
+import base64
+import hashlib
+import json
+import os
+from array import array
+from collections import OrderedDict
+
+from elements.connection import Connection2D, Connection3D
+from utils.fun_for_making_exe import writable_path
+from utils.write_behind import get_writer
+
+GRID_KEYS = ("3d", "p", "n", "b")  # pořadí částí stavu: 3D spojení, půdorys, nárys, bokorys
+
+
+# ==================================================
+# KOMPAKTNÍ ZÁPIS SPOJENÍ
+# ==================================================
+
+def _point_index(point, size: int) -> int:
+    """Index bodu v mřížce size×size(×size) (col, row, případně lay)."""
+    return point.col + size * (point.row + size * getattr(point, "lay", 0))
+
+
+def _connection_codes(connections, size: int, point_count: int) -> list[int]:
+    """Zakóduje spojení jako seřazená čísla (menší index bodu, větší index bodu, dashed)."""
+    codes = []
+    for conn in connections:
+        a = _point_index(conn.point_a, size)
+        b = _point_index(conn.point_b, size)
+        if a > b:
+            a, b = b, a
+        codes.append((a * point_count + b) * 2 + int(bool(conn.dashed)))
+    codes.sort()
+    return codes
+
+
+def pack_state(size: int, connections_3d, pudorys, narys, bokorys) -> bytes:
+    """
+    Zapíše uživatelská spojení kompaktně a kanonicky (stejná spojení → stejné bajty).
+
+    Args:
+        size (int): počet bodů mřížky v jednom směru (3 pro 3×3×3)
+        connections_3d (list[Connection3D]): 3D spojení
+        pudorys, narys, bokorys (list[Connection2D]): spojení ve 2D pohledech
+
+    Returns:
+        bytes: [size, počty spojení ve 4 částech, kódy spojení...] jako uint32
+    """
+    parts = [_connection_codes(connections_3d, size, size ** 3)]
+    parts += [_connection_codes(conns, size, size ** 2) for conns in (pudorys, narys, bokorys)]
+    data = array("I", [size] + [len(codes) for codes in parts])
+    for codes in parts:
+        data.extend(codes)
+    return data.tobytes()
+
+
+def unpack_state(blob: bytes) -> tuple[int, list[list[int]]]:
+    """
+    Rozbalí bajty z pack_state().
+
+    Returns:
+        tuple: (size, [kódy 3D spojení, kódy půdorysu, kódy nárysu, kódy bokorysu])
+    """
+    data = array("I")
+    data.frombytes(blob)
+    size, counts = data[0], data[1:5]
+    parts = []
+    position = 5
+    for count in counts:
+        parts.append(list(data[position:position + count]))
+        position += count
+    return size, parts
+
+
+def connections_from_codes(codes: list[int], points: list, size: int, is_3d: bool) -> list:
+    """
+    Převede kódy spojení zpět na spojení nad skutečnými body gridu.
+
+    Args:
+        codes (list[int]): kódy z unpack_state()
+        points (list): body gridu (Grid3DPoint nebo Grid2DPoint)
+        size (int): počet bodů mřížky v jednom směru
+        is_3d (bool): 3D spojení (jinak 2D)
+
+    Returns:
+        list[Connection3D] | list[Connection2D]: spojení (neznámé body se přeskočí)
+    """
+    point_count = size ** 3 if is_3d else size ** 2
+    by_index = {_point_index(point, size): point for point in points}
+    connection_class = Connection3D if is_3d else Connection2D
+
+    connections = []
+    for code in codes:
+        pair, dashed = divmod(code, 2)
+        a, b = divmod(pair, point_count)
+        if a in by_index and b in by_index:
+            connections.append(connection_class(by_index[a], by_index[b], dashed=bool(dashed)))
+    return connections
+
+
+# ==================================================
+# ULOŽENÝ STAV ÚLOHY
+# ==================================================
+
+class TaskSession:
+    """
+    Rozpracovaný stav jedné úlohy.
+
+    Attributes:
+        state (bytes): uživatelská spojení (pack_state)
+        selection (tuple | None): vybraný bod jako (grid, index bodu), grid je "3d"/"p"/"n"/"b"
+        undo (list[bytes]): předchozí stavy spojení (nejstarší první)
+    """
+
+    __slots__ = ("state", "selection", "undo")
+
+    def __init__(self, state: bytes, selection: tuple | None = None, undo: list[bytes] = None):
+        self.state = state
+        self.selection = selection
+        self.undo = undo or []
+
+    def size_in_bytes(self) -> int:
+        """Přibližná velikost uložených dat (pro počítadla)."""
+        return len(self.state) + sum(len(blob) for blob in self.undo)
+
+    def to_json(self) -> dict:
+        encode = lambda blob: base64.b64encode(blob).decode("ascii")
+        return {
+            "state": encode(self.state),
+            "selection": list(self.selection) if self.selection is not None else None,
+            "undo": [encode(blob) for blob in self.undo],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "TaskSession":
+        selection = data.get("selection")
+        return cls(
+            base64.b64decode(data["state"]),
+            tuple(selection) if selection is not None else None,
+            [base64.b64decode(blob) for blob in data.get("undo", [])],
+        )
+
+
+class SessionCache:
+    """
+    Omezená LRU cache rozpracovaných úloh podle (hráč, úloha).
+
+    Stav se při návratu k úloze z cache vyjme (take) a při odchodu z úlohy znovu
+    uloží (put). Když je cache plná, nejdéle nepoužitý stav se zahodí, případně
+    (je-li zadána složka spill_dir) se na pozadí zapíše na disk.
+
+    Attributes:
+        max_entries (int): nejvyšší počet stavů v paměti
+        spill_dir (str | None): složka pro odložené stavy (None = neodkládat)
+        stats (dict): počítadla
+    """
+
+    def __init__(self, max_entries: int = 32, spill_dir: str | None = None):
+        self.max_entries = max_entries
+        self.spill_dir = writable_path(spill_dir) if spill_dir else None
+        self._sessions: OrderedDict[tuple, TaskSession] = OrderedDict()
+
+        self.stats = {
+            "stored": 0,  # kolikrát se stav uložil
+            "restored": 0,  # kolikrát se stav obnovil z paměti
+            "restored_from_disk": 0,  # kolikrát se stav obnovil z odložených souborů
+            "evicted": 0,  # kolik stavů se z paměti vyhodilo
+            "spilled": 0,  # kolik z nich se odložilo na disk
+            "bytes": 0,  # velikost stavů v paměti
+        }
+
+    def put(self, player: str, task_id: str, session: TaskSession):
+        """Uloží stav úlohy (jako naposledy použitý)."""
+        key = (player, str(task_id))
+        old = self._sessions.pop(key, None)
+        if old is not None:
+            self.stats["bytes"] -= old.size_in_bytes()
+        self._sessions[key] = session
+        self.stats["stored"] += 1
+        self.stats["bytes"] += session.size_in_bytes()
+
+        while len(self._sessions) > self.max_entries:
+            evicted_key, evicted = self._sessions.popitem(last=False)
+            self.stats["evicted"] += 1
+            self.stats["bytes"] -= evicted.size_in_bytes()
+            if self.spill_dir is not None:
+                self._spill(evicted_key, evicted)
+
+    def take(self, player: str, task_id: str) -> TaskSession | None:
+        """Vyjme uložený stav úlohy (z paměti, případně z disku), nebo vrátí None."""
+        key = (player, str(task_id))
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            self.stats["restored"] += 1
+            self.stats["bytes"] -= session.size_in_bytes()
+            return session
+
+        if self.spill_dir is not None:
+            session = self._unspill(key)
+            if session is not None:
+                self.stats["restored_from_disk"] += 1
+        return session
+
+    def clear(self):
+        """Zahodí všechny stavy v paměti."""
+        self._sessions.clear()
+        self.stats["bytes"] = 0
+
+    # ------------------------
+    # Odkládání na disk
+    # ------------------------
+    def _spill_path(self, key: tuple) -> str:
+        """Soubor odloženého stavu (jméno hráče a ID úlohy jen jako hash)."""
+        digest = hashlib.sha1(json.dumps(key, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.spill_dir, f"session_{digest}.json")
+
+    def _spill(self, key: tuple, session: TaskSession):
+        path = self._spill_path(key)
+        os.makedirs(self.spill_dir, exist_ok=True)
+        data = json.dumps(session.to_json()).encode("utf-8")
+        get_writer().submit(path, data)
+        self.stats["spilled"] += 1
+
+    def _unspill(self, key: tuple) -> TaskSession | None:
+        path = self._spill_path(key)
+        writer = get_writer()
+        writer.flush(path)  # odložení mohlo ještě čekat na zápis
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                session = TaskSession.from_json(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # stav je znovu v TaskScreen → soubor smazat (přes zapisovač, aby se nepředběhl se zápisem)
+        writer.submit_job(path, lambda: os.remove(path) if os.path.exists(path) else None)
+        return session
@@ -0,0 +1,629 @@
+# -*- coding: utf-8 -*-
+"""
+task_store.py
+-------------
+
+Úložiště úloh pro Cubiq🧊.
+
+Obsahuje:
+    • TaskStore – společné rozhraní úložiště (čtení seznamu úloh, čtení, uložení a smazání jedné úlohy),
+    • JsonTaskStore – úlohy v data.json (s indexem, případně z binární banky data.cubq),
+    • SqliteTaskStore – úlohy v SQLite databázi (data.db), jeden řádek na úlohu,
+    • get_task_store(filepath) – sdílené úložiště pro daný soubor (sám pozná, který backend použít),
+    • import_json_to_sqlite / export_sqlite_to_json – převod mezi data.json a data.db.
+
+SQLite se použije, pokud je soubor sám SQLite databází (nebo má příponu .db),
+nebo pokud vedle data.json leží data.db. Úpravy v editoru jsou v SQLite
+transakce nad jediným řádkem, takže pád aplikace při ukládání databázi nepoškodí.
+
+Uložení i smazání úlohy se na disk zapíše na pozadí (utils/write_behind.py);
+úložiště do té doby vrací už upravená data z paměti.
+
+Spuštění (ze složky source/):
+    python -m elements.task_store import data.json data.db
+    python -m elements.task_store export data.db data.json
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+from utils.binary_bank import BinaryBank, binary_path_for, is_binary_bank
+from utils.fun_for_making_exe import writable_path
+from utils.task_index import build_index, load_index, read_task, write_tasks_json
+from utils.write_behind import get_writer
+
+SQLITE_SUFFIX = ".db"
+SQLITE_MAGIC = b"SQLite format 3\x00"
+
+# klíče úlohy, které mají v SQLite vlastní sloupec (v tomto pořadí jsou i v data.json)
+_TASK_COLUMNS = ("text", "task_type", "pudorys", "narys", "bokorys", "data3d")
+_JSON_COLUMNS = ("pudorys", "narys", "bokorys", "data3d")
+
+_DELETED = object()  # značka smazané úlohy, která ještě není zapsaná na disku
+
+
+class TaskStore:
+    """
+    Společné rozhraní úložiště úloh.
+
+    TaskCatalog přes něj čte, editor přes něj ukládá. Úložiště samo nic
+    necachuje nad rámec toho, co potřebuje ke čtení jednotlivých úloh.
+
+    Attributes:
+        info (dict): informace o posledním načtení (pro metriky katalogu)
+    """
+
+    info: dict = {}
+
+    def signature(self):
+        """Vrátí hodnotu, která se změní, kdykoli se změní obsah úložiště."""
+        raise NotImplementedError
+
+    def load(self) -> tuple[dict, list[str]]:
+        """
+        Připraví úložiště ke čtení.
+
+        Returns:
+            tuple: (metadata, seznam ID úloh)
+        """
+        raise NotImplementedError
+
+    def read_task(self, task_id: str) -> dict:
+        """Vrátí data jedné úlohy ve stejné podobě jako v data.json (KeyError, pokud chybí)."""
+        raise NotImplementedError
+
+    def save_task(self, task_id: str, task: dict, callback=None):
+        """
+        Uloží (vytvoří nebo přepíše) jednu úlohu. Na disk se zapíše na pozadí.
+
+        Args:
+            task_id (str): ID úlohy
+            task (dict): data úlohy ve stejné podobě jako v data.json
+            callback (callable, optional): zavolá se po zápisu jako callback(key, ok)
+        """
+        raise NotImplementedError
+
+    def delete_task(self, task_id: str, callback=None) -> bool:
+        """Smaže jednu úlohu (na disku na pozadí); vrátí False, pokud úloha neexistovala."""
+        raise NotImplementedError
+
+    def export_all(self) -> dict:
+        """Vrátí všechna data včetně "_meta" ve stejné podobě jako data.json."""
+        meta, task_ids = self.load()
+        all_data = {"_meta": meta}
+        for task_id in task_ids:
+            all_data[task_id] = self.read_task(task_id)
+        return all_data
+
+    def close(self):
+        """Uvolní otevřené soubory."""
+
+
+# ==================================================
+# JSON
+# ==================================================
+
+class JsonTaskStore(TaskStore):
+    """
+    Úlohy v data.json.
+
+    Při čtení se použije index (data.json.idx) nebo aktuální binární banka
+    (data.cubq); uložení přepíše celý soubor (atomicky přes dočasný soubor).
+
+    Uložení i smazání si v hlavním vlákně jen zapamatuje upravenou úlohu (_overlay);
+    načtení všech úloh, sloučení s úpravami a přepis celého souboru udělá vlákno
+    zapisovače (více uložení po sobě se sloučí do jednoho zápisu). Po prvním zápisu
+    drží úložiště všechna data v paměti a čte z nich. Úpravy po jedné úloze
+    bez přepisu celé banky umí jen SqliteTaskStore.
+
+    Podpis úložiště je stav souboru na disku; vlastní zápisy ho nemění
+    (po zápisu se zapamatuje nový stav souboru), změna souboru zvenku ano.
+    """
+
+    def __init__(self, filepath: str = "data.json"):
+        self.filepath = filepath
+        self._bank = None  # otevřená binární banka, pokud se používá
+        self._offsets: dict[str, tuple[int, int]] = {}  # task_id → (start, end) v bajtech
+        self._parsed: dict[str, dict] = {}  # úlohy naparsované celé (bez indexu)
+        self._meta: dict = {}  # metadata z posledního načtení souboru
+        self._task_ids: list[str] | None = None  # ID úloh z posledního načtení souboru
+        self._all_data: dict | None = None  # po prvním zápisu: všechna data (platí místo souboru)
+        self._overlay: dict = {}  # task_id → úloha (nebo _DELETED), která ještě není v souboru
+        self._lock = threading.Lock()  # _overlay a _all_data mění i vlákno zapisovače
+        self._loaded_stat = None  # (cesta, mtime, velikost) souboru při posledním načtení
+        self._written_stat = None  # (cesta, mtime, velikost) souboru po posledním vlastním zápisu
+        self._pending_writes = 0  # vlastní zápisy, které ještě nejsou na disku
+        self._stat_lock = threading.Lock()  # stav zápisů mění i vlákno zapisovače
+        self.info = {
+            "index_used": False,  # zda se při posledním načtení použil platný index
+            "index_builds": 0,  # kolikrát se index musel sestavit
+            "binary": False,  # zda se při posledním načtení použila binární banka
+        }
+
+    def _source_path(self) -> tuple[str, bool]:
+        """
+        Určí, ze kterého souboru se mají úlohy číst.
+
+        Binární banka se použije, pokud je soubor sám binární bankou, nebo pokud
+        vedle něj leží banka (data.cubq), která není starší než JSON
+        (po uložení v editoru je novější JSON a použije se ten).
+
+        Returns:
+            tuple: (cesta k souboru, zda jde o binární banku)
+        """
+        path = writable_path(self.filepath)
+        if is_binary_bank(path):
+            return path, True
+
+        binary_path = writable_path(binary_path_for(self.filepath))
+        try:
+            binary_mtime = os.stat(binary_path).st_mtime_ns
+        except OSError:
+            return path, False
+        try:
+            json_mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return binary_path, True
+        return (binary_path, True) if binary_mtime >= json_mtime else (path, False)
+
+    def _source_stat(self) -> tuple[str, int, int]:
+        """Vrátí (cesta, mtime, velikost) souboru, ze kterého se úlohy čtou."""
+        path, _ = self._source_path()
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def signature(self):
+        """
+        Vrátí (cesta, mtime, velikost) zdrojového souboru. Vlastní zápisy (čekající
+        i dokončené) se hlásí stavem z posledního načtení, takže podpis změní jen
+        změna souboru zvenku (jiná instance editoru, git pull, generátor úloh).
+        """
+        with self._stat_lock:
+            if self._pending_writes and self._loaded_stat is not None:
+                return self._loaded_stat
+            stat = self._source_stat()
+            return self._loaded_stat if stat == self._written_stat else stat
+
+    def _changed_outside(self) -> bool:
+        """Zda se soubor od posledního načtení nebo vlastního zápisu změnil zvenku."""
+        with self._stat_lock:
+            if self._pending_writes:
+                return False  # čekající zápis soubor stejně přepíše
+            try:
+                stat = self._source_stat()
+            except OSError:
+                return False
+            return stat not in (self._loaded_stat, self._written_stat)
+
+    def load(self) -> tuple[dict, list[str]]:
+        """
+        Načte seznam úloh z indexu nebo z binární banky; pokud index chybí
+        nebo neodpovídá souboru, naparsuje celý JSON soubor a index sestaví.
+        """
+        with self._lock:
+            all_data = self._all_data
+            overlay = dict(self._overlay)
+        if all_data is not None or overlay:
+            if not self._changed_outside():
+                if all_data is not None:
+                    meta = all_data.get("_meta", {"version": "unknown"})
+                    task_ids = [task_id for task_id in all_data if task_id != "_meta"]
+                else:
+                    meta, task_ids = self._meta, self._task_ids or []
+                if overlay:
+                    # úpravy, které ještě nejsou v souboru (nové úlohy na konec, jako při zápisu)
+                    known = set(task_ids)
+                    task_ids = [task_id for task_id in task_ids if overlay.get(task_id) is not _DELETED]
+                    task_ids += [task_id for task_id, task in overlay.items()
+                                 if task is not _DELETED and task_id not in known]
+                return meta, task_ids
+            with self._lock:
+                self._all_data = None  # soubor se změnil zvenku → data v paměti už neplatí
+
+        if self._bank is not None:
+            self._bank.close()
+            self._bank = None
+        self._parsed = {}
+
+        path, binary = self._source_path()
+        with self._stat_lock:
+            self._loaded_stat = self._source_stat()
+            self._written_stat = None
+        self.info["binary"] = binary
+        index = None if binary else load_index(self.filepath)
+        self.info["index_used"] = index is not None
+        if binary:
+            # úlohy se dekódují až při prvním dotazu přímo z namapovaného souboru
+            self._bank = BinaryBank(path)
+            index = {"meta": self._bank.meta,
+                     "tasks": [[task_id, None, None] for task_id in self._bank.task_ids()]}
+        elif index is None:
+            try:
+                index, all_data = build_index(self.filepath)
+                self.info["index_builds"] += 1
+            except OSError:
+                # index nelze zapsat (např. složka jen pro čtení) → bez indexu
+                with open(path, "r", encoding="utf-8") as f:
+                    all_data = json.load(f)
+                index = {"meta": all_data.get("_meta", {"version": "unknown"}),
+                         "tasks": [[key, None, None] for key in all_data if key != "_meta"]}
+            all_data.pop("_meta", None)
+            self._parsed = all_data
+
+        self._offsets = {task_id: (start, end) for task_id, start, end in index["tasks"]}
+        self._meta = index["meta"]
+        self._task_ids = [task_id for task_id, _, _ in index["tasks"]]
+        return self._meta, list(self._task_ids)
+
+    def read_task(self, task_id: str) -> dict:
+        with self._lock:
+            task = self._overlay.get(task_id)
+            all_data = self._all_data
+        if task is _DELETED:
+            raise KeyError(task_id)
+        if task is not None:
+            return task
+        if all_data is not None:
+            return all_data[task_id]
+        return self._read_source(task_id)
+
+    def _read_source(self, task_id: str) -> dict:
+        """Přečte úlohu ze souboru načteného posledním load() (bez úprav v paměti)."""
+        if task_id in self._parsed:
+            return self._parsed[task_id]
+        if self._bank is not None:
+            return self._bank.get_task(task_id)
+        start, end = self._offsets[task_id]
+        return read_task(self.filepath, start, end)
+
+    def _read_all(self) -> dict:
+        """
+        Načte všechna data ze souboru (pokud existuje), aby se dala zapsat zpět.
+        Volá se ve vlákně zapisovače; load() se mezitím neopakuje (čekají úpravy).
+        """
+        try:
+            if self._task_ids is None:
+                self.load()  # úložiště se ještě nenačetlo
+            all_data = {"_meta": self._meta}
+            for task_id in self._task_ids:
+                all_data[task_id] = self._read_source(task_id)
+            return all_data
+        except FileNotFoundError:
+            return {}
+
+    def _write_behind(self, task_id: str, value, callback=None):
+        """
+        Zapamatuje si úpravu v paměti; načtení všech dat, sloučení s úpravami
+        a zápis celého souboru předá vláknu na pozadí.
+        """
+        with self._lock:
+            self._overlay[task_id] = value
+        with self._stat_lock:
+            self._pending_writes += 1
+
+        def write():
+            with self._lock:
+                base = self._all_data
+                overlay = dict(self._overlay)
+            all_data = dict(base if base is not None else self._read_all())
+            for key, task in overlay.items():
+                if task is _DELETED:
+                    all_data.pop(key, None)
+                else:
+                    all_data[key] = task
+            write_tasks_json(all_data, self.filepath)  # zapíše i index úloh
+            with self._lock:
+                self._all_data = all_data
+                # novější úprava téže úlohy zůstává v paměti, dokud se nezapíše i ona
+                for key, task in overlay.items():
+                    if self._overlay.get(key) is task:
+                        del self._overlay[key]
+            with self._stat_lock:
+                self._written_stat = self._source_stat()
+                if self._loaded_stat is None:  # soubor předtím neexistoval
+                    self._loaded_stat = self._written_stat
+
+        def written(key, ok):
+            with self._stat_lock:
+                self._pending_writes -= 1
+            if callback is not None:
+                callback(key, ok)
+
+        get_writer().submit_job(writable_path(self.filepath), write, written)
+
+    def save_task(self, task_id: str, task: dict, callback=None):
+        self._write_behind(task_id, task, callback)
+
+    def delete_task(self, task_id: str, callback=None) -> bool:
+        try:
+            self.read_task(task_id)
+        except (KeyError, FileNotFoundError):
+            return False
+        self._write_behind(task_id, _DELETED, callback)
+        return True
+
+    def close(self):
+        get_writer().flush(writable_path(self.filepath))
+        if self._bank is not None:
+            self._bank.close()
+            self._bank = None
+
+
+# ==================================================
+# SQLITE
+# ==================================================
+
+def _split_level(task_id: str) -> tuple[int | None, int | None]:
+    """Rozdělí task_id "x.y" na (kapitola, číslo) pro index; jiné ID → (None, None)."""
+    try:
+        chapter, number = task_id.split(".")
+        return int(chapter), int(number)
+    except ValueError:
+        return None, None
+
+
+def _level_sort_key(task_id: str) -> tuple:
+    """Řadicí klíč se stejným pořadím jako ORDER BY chapter, number, task_id (NULL první)."""
+    chapter, number = _split_level(task_id)
+    return chapter is not None, chapter or 0, number is not None, number or 0, task_id
+
+
+class SqliteTaskStore(TaskStore):
+    """
+    Úlohy v SQLite databázi (režim WAL).
+
+    Každá úloha je jeden řádek tabulky tasks; půdorys, nárys, bokorys a řešení
+    jsou uložené jako JSON ve vlastních sloupcích. Seznam úloh se čte přes
+    index (chapter, number), pořadí řádků (rowid) odpovídá pořadí v data.json.
+
+    Úpravy se zapisují na pozadí (jedna transakce na úlohu, čekající úpravy
+    stejné úlohy se sloučí); do zápisu se čtou z paměti (_overlay).
+    """
+
+    def __init__(self, path: str = "data.db"):
+        self.path = path
+        # spojení používá i vlákno zapisovače → přístup jen pod zámkem
+        self._conn = sqlite3.connect(writable_path(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._overlay: dict = {}  # task_id → úloha (nebo _DELETED), která ještě není v databázi
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " task_id TEXT PRIMARY KEY,"
+                " chapter INTEGER,"
+                " number INTEGER,"
+                " text TEXT,"
+                " task_type TEXT,"
+                " pudorys TEXT,"
+                " narys TEXT,"
+                " bokorys TEXT,"
+                " data3d TEXT,"
+                " extra TEXT)"  # ostatní klíče úlohy (JSON), aby převod byl bezeztrátový
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_by_level ON tasks (chapter, number)")
+        self._writes = 0  # vlastní zápisy (PRAGMA data_version je nevidí)
+        self.info = {"sqlite": True}
+
+    def signature(self):
+        """Vrátí (data_version, počet vlastních zápisů) – mění se při každém commitu."""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self._writes
+
+    def load(self) -> tuple[dict, list[str]]:
+        with self._lock:
+            meta = {key: json.loads(value) for key, value in self._conn.execute("SELECT key, value FROM meta")}
+            task_ids = [row[0] for row in self._conn.execute(
+                "SELECT task_id FROM tasks ORDER BY chapter, number, task_id")]
+            overlay = dict(self._overlay)
+
+        if overlay:
+            # úpravy, které ještě nejsou v databázi
+            task_ids = [task_id for task_id in task_ids if task_id not in overlay]
+            task_ids += [task_id for task_id, task in overlay.items() if task is not _DELETED]
+            task_ids.sort(key=_level_sort_key)
+        return meta or {"version": "unknown"}, task_ids
+
+    @staticmethod
+    def _row_to_task(row) -> dict:
+        """Složí úlohu z řádku tabulky (sloupec NULL = klíč v úloze nebyl)."""
+        task = {}
+        for key, value in zip(_TASK_COLUMNS, row):
+            if value is not None:
+                task[key] = json.loads(value) if key in _JSON_COLUMNS else value
+        if row[-1] is not None:
+            task.update(json.loads(row[-1]))
+        return task
+
+    @staticmethod
+    def _task_to_row(task_id: str, task: dict) -> tuple:
+        """Rozloží úlohu na hodnoty sloupců tabulky tasks."""
+        values = []
+        for key in _TASK_COLUMNS:
+            value = task.get(key)
+            if value is not None and key in _JSON_COLUMNS:
+                value = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+            values.append(value)
+        extra = {key: value for key, value in task.items() if key not in _TASK_COLUMNS}
+        return (task_id, *_split_level(task_id), *values,
+                json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    def read_task(self, task_id: str) -> dict:
+        with self._lock:
+            task = self._overlay.get(task_id)
+            if task is None:
+                row = self._conn.execute(
+                    "SELECT text, task_type, pudorys, narys, bokorys, data3d, extra FROM tasks WHERE task_id = ?",
+                    (task_id,)).fetchone()
+        if task is _DELETED or (task is None and row is None):
+            raise KeyError(task_id)
+        return task if task is not None else self._row_to_task(row)
+
+    def _upsert(self, task_id: str, task: dict):
+        """Vloží nebo přepíše řádek úlohy (přepsání zachová rowid, tedy i pořadí)."""
+        self._conn.execute(
+            "INSERT INTO tasks (task_id, chapter, number, text, task_type, pudorys, narys, bokorys, data3d, extra)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (task_id) DO UPDATE SET"
+            " chapter = excluded.chapter, number = excluded.number, text = excluded.text,"
+            " task_type = excluded.task_type, pudorys = excluded.pudorys, narys = excluded.narys,"
+            " bokorys = excluded.bokorys, data3d = excluded.data3d, extra = excluded.extra",
+            self._task_to_row(task_id, task))
+
+    def _write_behind(self, task_id: str, value, callback=None):
+        """Zapamatuje si úpravu v paměti a transakci předá vláknu na pozadí."""
+        with self._lock:
+            self._overlay[task_id] = value
+        self._writes += 1
+
+        def job():
+            with self._lock:
+                with self._conn:  # jedna transakce nad jedním řádkem
+                    if value is _DELETED:
+                        self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+                    else:
+                        self._upsert(task_id, value)
+                # novější úprava téže úlohy zůstává v paměti, dokud se nezapíše i ona
+                if self._overlay.get(task_id) is value:
+                    del self._overlay[task_id]
+
+        get_writer().submit_job((writable_path(self.path), task_id), job, callback)
+
+    def save_task(self, task_id: str, task: dict, callback=None):
+        self._write_behind(task_id, task, callback)
+
+    def delete_task(self, task_id: str, callback=None) -> bool:
+        try:
+            self.read_task(task_id)
+        except KeyError:
+            return False
+        self._write_behind(task_id, _DELETED, callback)
+        return True
+
+    def _flush(self):
+        """Počká, až se zapíšou všechny čekající úpravy (před hromadnými operacemi)."""
+        if self._overlay:
+            get_writer().flush()
+
+    def replace_all(self, all_data: dict):
+        """Nahradí celý obsah databáze daty ve formátu data.json (jedna transakce)."""
+        meta = all_data.get("_meta", {"version": "unknown"})
+        self._flush()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM meta")
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                                   [(key, json.dumps(value, ensure_ascii=False)) for key, value in meta.items()])
+            for task_id, task in all_data.items():
+                if task_id != "_meta":
+                    self._upsert(task_id, task)
+        self._writes += 1
+
+    def export_all(self) -> dict:
+        self._flush()
+        meta, _ = self.load()
+        all_data = {"_meta": meta}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task_id, text, task_type, pudorys, narys, bokorys, data3d, extra FROM tasks ORDER BY rowid"
+            ).fetchall()
+        for row in rows:
+            all_data[row[0]] = self._row_to_task(row[1:])
+        return all_data
+
+    def close(self):
+        self._flush()
+        self._conn.close()
+
+
+# ==================================================
+# VÝBĚR ÚLOŽIŠTĚ
+# ==================================================
+
+def _is_sqlite(path: str) -> bool:
+    """Zjistí podle hlavičky, zda je soubor SQLite databáze."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+def sqlite_path_for(filepath: str) -> str:
+    """Vrátí cestu k SQLite databázi vedle JSON souboru (data.json → data.db)."""
+    return os.path.splitext(filepath)[0] + SQLITE_SUFFIX
+
+
+# sdílená úložiště podle cesty k souboru
+_stores: dict[str, TaskStore] = {}
+
+
+def get_task_store(filepath: str = "data.json") -> TaskStore:
+    """
+    Vrátí sdílené úložiště úloh pro daný soubor (vytvoří ho jen poprvé).
+
+    SQLite se použije, pokud má soubor příponu .db, je SQLite databází,
+    nebo pokud vedle něj leží data.db; jinak se použije JSON.
+    """
+    if filepath not in _stores:
+        if filepath.endswith(SQLITE_SUFFIX) or _is_sqlite(writable_path(filepath)):
+            _stores[filepath] = SqliteTaskStore(filepath)
+        elif os.path.exists(writable_path(sqlite_path_for(filepath))):
+            _stores[filepath] = SqliteTaskStore(sqlite_path_for(filepath))
+        else:
+            _stores[filepath] = JsonTaskStore(filepath)
+    return _stores[filepath]
+
+
+def import_json_to_sqlite(json_path="data.json", db_path=None) -> str:
+    """Naimportuje data.json do SQLite databáze (obsah databáze nahradí); vrátí cestu k ní."""
+    db_path = db_path or sqlite_path_for(json_path)
+    store = JsonTaskStore(json_path)
+    try:
+        all_data = store.export_all()
+    finally:
+        store.close()
+
+    database = SqliteTaskStore(db_path)
+    try:
+        database.replace_all(all_data)
+    finally:
+        database.close()
+    return db_path
+
+
+def export_sqlite_to_json(db_path="data.db", json_path="data.json") -> str:
+    """Vyexportuje SQLite databázi do data.json (včetně indexu); vrátí cestu k souboru."""
+    database = SqliteTaskStore(db_path)
+    try:
+        all_data = database.export_all()
+    finally:
+        database.close()
+    write_tasks_json(all_data, json_path)
+    return json_path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Úložiště úloh Cubiq🧊")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    to_db = commands.add_parser("import", help="naimportuje data.json do SQLite databáze")
+    to_db.add_argument("json_path", nargs="?", default="data.json")
+    to_db.add_argument("db_path", nargs="?", default=None)
+
+    to_json = commands.add_parser("export", help="vyexportuje SQLite databázi do data.json")
+    to_json.add_argument("db_path", nargs="?", default="data" + SQLITE_SUFFIX)
+    to_json.add_argument("json_path", nargs="?", default="data.json")
+
+    args = parser.parse_args()
+    if args.command == "import":
+        print(import_json_to_sqlite(args.json_path, args.db_path))
+    else:
+        print(export_sqlite_to_json(args.db_path, args.json_path))
@@ -8,9 +8,8 @@ Slouží k uchování základních konstant (velikost okna, font apod.),
 které jsou sdílené napříč moduly aplikace.
 """
 
-import pygame
-
-pygame.init()
+# Verze aplikace (zvýšit s každým vydáním .exe – podle ní se zahodí starý snímek startu)
+APP_VERSION = "1.0"
 
 # Velikost hlavního okna (1000 * 650)
 SCREEN_WIDTH = 1000
@@ -20,10 +19,11 @@ SCREEN_HEIGHT = 650
 FONT_NAME = "Gabriola"
 FONT_SIZE = 35
 
-FONT = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
+# fonty se vytvoří až po pygame.init() v App (utils/initiating_length.set_window_size)
+FONT = None
 
 POP_UP_FONT_SIZE = int(FONT_SIZE//2)
-POP_UP_FONT = pygame.font.SysFont(FONT_NAME, POP_UP_FONT_SIZE)
+POP_UP_FONT = None
 
 # výchozí x a y odsazení především tlačítek od okraje obrazovky
 X_OFFSET = 50
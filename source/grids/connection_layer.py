@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+connection_layer.py
+-------------------
+
+Předvykreslená vrstva spojení pro hru Cubiq🧊.
+
+Obsahuje třídu ConnectionLayer, která:
+    • vykreslí skupiny spojení (2D i 3D) do vlastní průhledné plochy,
+    • plochu znovu vykreslí jen při změně spojení, barvy, šířky nebo velikosti okna,
+    • v každém framu pouze zkopíruje (blit) oblast, kde spojení leží.
+"""
+
+import pygame
+from elements.connection import Connection3D
+from grids import grid_2d, grid_3d
+
+
+class ConnectionLayer:
+    """
+    Cachovaná vrstva s vykreslenými spojeními.
+
+    Attributes:
+        surface (pygame.Surface | None): průhledná plocha s vykreslenými spojeními
+        dirty_rect (pygame.Rect | None): oblast plochy, ve které něco je
+        renders (int): kolikrát se vrstva skutečně překreslila (pro ladění)
+    """
+
+    def __init__(self):
+        self.surface = None
+        self.dirty_rect = None
+        self.renders = 0
+        self._key = None
+
+    def invalidate(self):
+        """Vynutí překreslení vrstvy při příštím draw."""
+        self._key = None
+
+    @staticmethod
+    def _make_key(screen_size, groups):
+        """
+        Vrátí klíč, podle kterého se pozná, zda se vrstva musí překreslit.
+        Obsahuje pozice bodů na obrazovce, takže se mění i při změně rozložení.
+        """
+        key_groups = []
+        for connections, color, width in groups:
+            conns_key = tuple(
+                (conn.point_a.x, conn.point_a.y, conn.point_b.x, conn.point_b.y, bool(conn.dashed))
+                for conn in connections
+            )
+            key_groups.append((conns_key, tuple(color), int(width)))
+        return screen_size, tuple(key_groups)
+
+    def _render(self, screen_size, groups):
+        """Vykreslí všechny skupiny spojení do průhledné plochy."""
+        if self.surface is None or self.surface.get_size() != screen_size:
+            self.surface = pygame.Surface(screen_size, pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+
+        self.dirty_rect = None
+        for connections, color, width in groups:
+            if not connections:
+                continue
+
+            if isinstance(connections[0], Connection3D):
+                grid_3d.draw_connections(connections, self.surface, color, width)
+            else:
+                grid_2d.draw_lines_from_connections(self.surface, connections, color, width)
+
+            # oblast skupiny = obálka bodů + poloměr koncového bodu
+            padding = int(width) * 2 + 2
+            xs = [x for conn in connections for x in (conn.point_a.x, conn.point_b.x)]
+            ys = [y for conn in connections for y in (conn.point_a.y, conn.point_b.y)]
+            rect = pygame.Rect(min(xs) - padding, min(ys) - padding,
+                               max(xs) - min(xs) + 2 * padding, max(ys) - min(ys) + 2 * padding)
+            self.dirty_rect = rect if self.dirty_rect is None else self.dirty_rect.union(rect)
+
+        if self.dirty_rect is not None:
+            self.dirty_rect = self.dirty_rect.clip(self.surface.get_rect())
+        self.renders += 1
+
+    def draw(self, screen: pygame.Surface, groups):
+        """
+        Vykreslí vrstvu na obrazovku, případně ji předtím překreslí.
+
+        Args:
+            screen (pygame.Surface): plocha pro vykreslení
+            groups (list[tuple]): seznam (connections, color, width);
+                connections jsou Connection2D nebo Connection3D s reálnými body (x, y)
+        """
+        screen_size = screen.get_size()
+        key = self._make_key(screen_size, groups)
+        if key != self._key:
+            self._render(screen_size, groups)
+            self._key = key
+
+        if self.dirty_rect is not None:
+            screen.blit(self.surface, self.dirty_rect.topleft, self.dirty_rect)
@@ -7,7 +7,7 @@ Nástroje pro vykreslování 2D gridů v editoru a hře Cubiq🧊.
 
 Obsahuje funkce, které:
     • počítají velikosti čtverců a pozice gridů na obrazovce,
-    • generují 3×3 body pro půdorys, nárys a bokorys,
+    • generují N×N body pro půdorys, nárys a bokorys (N podle úlohy, výchozí 3),
     • vykreslují mřížku s body a spojovacími čarami,
     • přidávají popisky pod jednotlivé 2D gridy,
     • vykreslují úsečky podle seznamu Connection2D,
@@ -22,6 +22,8 @@ import pygame
 from elements.connection import Connection2D
 from elements.gridpoint import Grid2DPoint
 from utils.geometry import draw_dashed_line
+from utils.grid_math import grid_spacing
+from utils.projection import DEFAULT_SIZE
 
 
 def count_square_length() -> int:
@@ -67,29 +69,54 @@ def find_left_upper_corners(square_length: int, centre_x: int = None, centre_y:
     return p, n, b
 
 
-def create_2d_points(start: list[int], square_length: int) -> list[Grid2DPoint]:
+def create_2d_points(start: list[int], square_length: int, size: int = DEFAULT_SIZE) -> list[Grid2DPoint]:
     """
-    Vytvoří 3×3 body gridu pro 2D mřížku.
+    Vytvoří size×size body gridu pro 2D mřížku.
 
     Args:
         start (list[int]): levý horní roh gridu [x, y]
-        square_length (int): velikost jedné strany čtverce
+        square_length (int): velikost jedné strany čtverce mřížky 3×3 (grid má vždy 2 × square_length)
+        size (int): počet bodů v jednom směru
 
     Returns:
-        list[Grid2DPoint]: seznam všech bodů gridu
+        list[Grid2DPoint]: seznam všech bodů gridu (pořadí col, pak row)
     """
+    spacing = grid_spacing(square_length, size)
     points = []
-    for row in range(3):
-        for col in range(3):
-            x = start[0] + col * square_length
-            y = start[1] + row * square_length
-            points.append(Grid2DPoint(x, y, col, row))
+    for row in range(size):
+        for col in range(size):
+            x = start[0] + col * spacing
+            y = start[1] + row * spacing
+            point = Grid2DPoint(x, y, col, row)
+            point.set_spacing(spacing)
+            points.append(point)
     return points
 
 
-def create_all_2d_points():
+def grid_size_of(points: list[Grid2DPoint]) -> int:
+    """Počet bodů v jednom směru podle bodů mřížky (poslední bod má největší col i row)."""
+    return points[-1].col + 1 if points else 0
+
+
+def reproject_2d_points(points: list[Grid2DPoint], start: list[int], square_length: int):
+    """
+    Přepočítá souřadnice (x, y) existujících bodů 2D mřížky, body zůstávají stejné objekty.
+
+    Args:
+        points (list[Grid2DPoint]): body mřížky
+        start (list[int]): nový levý horní roh gridu [x, y]
+        square_length (int): nová velikost jedné strany čtverce mřížky 3×3
+    """
+    spacing = grid_spacing(square_length, grid_size_of(points))
+    for point in points:
+        point.x = start[0] + point.col * spacing
+        point.y = start[1] + point.row * spacing
+        point.set_spacing(spacing)
+
+
+def create_all_2d_points(size: int = DEFAULT_SIZE):
     """
-        Vytvoří všechny 3 3×3 body gridu pro 2D mřížku.
+        Vytvoří body všech 3 size×size gridů pro 2D mřížku.
         Returns:
         3x list[Grid2DPoint]: seznam všech bodů gridu půdorysu, nárysu a bokorysu
     """
@@ -97,16 +124,26 @@ def create_all_2d_points():
     l_square_length = count_square_length()
     p, n, b = find_left_upper_corners(l_square_length)
 
-    p_points = create_2d_points(p, l_square_length)
-    n_points = create_2d_points(n, l_square_length)
-    b_points = create_2d_points(b, l_square_length)
+    p_points = create_2d_points(p, l_square_length, size)
+    n_points = create_2d_points(n, l_square_length, size)
+    b_points = create_2d_points(b, l_square_length, size)
 
     return p_points, n_points, b_points
 
 
+def reproject_all_2d_points(p_points, n_points, b_points):
+    """Přepočítá souřadnice bodů všech tří 2D gridů pro aktuální velikost okna."""
+    l_square_length = count_square_length()
+    p, n, b = find_left_upper_corners(l_square_length)
+
+    reproject_2d_points(p_points, p, l_square_length)
+    reproject_2d_points(n_points, n, l_square_length)
+    reproject_2d_points(b_points, b, l_square_length)
+
+
 def draw_2d_grid(screen: pygame.Surface, points: list[Grid2DPoint], mouse_pos=None, gridpoints_enabled=True):
     """
-    Vykreslí 3x3 grid s body a čarami.
+    Vykreslí grid (size×size podle bodů) s body a čarami.
 
     Args:
         screen: pygame surface, kam se kreslí
@@ -114,7 +151,7 @@ def draw_2d_grid(screen: pygame.Surface, points: list[Grid2DPoint], mouse_pos=No
         mouse_pos (tuple[int, int]): aktuální pozice kurzoru myši
         gridpoints_enabled (bool): zapínání/vypínání interaktivnosti
     """
-    rows = cols = 3
+    rows = cols = grid_size_of(points)
     line_color = (50, 50, 50)
     line_width = int(glob_var.LINE_GRID_WIDTH)
 
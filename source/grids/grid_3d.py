@@ -7,7 +7,7 @@ Nástroje pro práci s 3D mřížkou v editoru a hře Cubiq🧊.
 
 Obsahuje funkce a třídy, které:
     • počítají rozměry a pozice 3D gridu na obrazovce,
-    • generují body 3×3×3 a vykreslují mřížku s body a spojovacími čarami,
+    • generují body N×N×N (N podle úlohy, výchozí 3) a vykreslují mřížku s body a spojovacími čarami,
     • spravují uživatelská spojení (přidávání, mazání, slučování),
     • provádějí matematické operace v prostoru (kolinearita, vzdálenosti),
     • porovnávají uživatelské řešení se správným.
@@ -20,8 +20,10 @@ import pygame
 from elements.connection import Connection3D
 from elements.gridpoint import Grid3DPoint
 from utils.geometry import draw_dashed_line
+from utils.grid_math import grid_spacing
+from utils.projection import DEFAULT_SIZE
 
-GRID_SIZE = 3
+GRID_SIZE = DEFAULT_SIZE  # výchozí počet bodů v jednom směru (úloha může mít jiný, viz TaskData.size)
 
 
 # ===============================
@@ -87,49 +89,82 @@ def find_left_upper_corner_in_middle_of_screen_width(square_length: int, length_
 # Práce s body a mřížkou
 # ===============================
 
-def create_3d_points(in_middle=False) -> list:
+def create_3d_points(in_middle=False, size: int = GRID_SIZE) -> list:
     """
-    Vytvoří 3d mřížku 3×3×3 bodů.
+    Vytvoří 3d mřížku size×size×size bodů.
     Vrací seznam objektů GridPoint se souřadnicemi (x, y)
     a indexy (col, row, lay).
 
-        :param in_middle:    jestli to vykreslit uprostřed (pro tutoriál)
     Args:
-        start (list[float]): levý horní roh mřížky [x, y]
-        square_length (int): délka jedné strany čtverce
-        length_of_shift_to_3d (float): posun mezi vrstvami
+        in_middle (bool): zda je mřížka vykreslena uprostřed (pro tutoriál)
+        size (int): počet bodů v jednom směru (mřížka zabírá stejné místo pro každou velikost)
 
     Returns:
-        list[GridPoint]: seznam všech bodů 3d mřížky
+        list[GridPoint]: seznam všech bodů 3d mřížky (pořadí col, pak row, pak lay)
 
 
     """
-    square_length = count_square_length()
-    length_of_shift_to_3d = count_length_of_shift_to_3d(square_length)
-
-    if not in_middle:
-        start = find_left_upper_corner(square_length, length_of_shift_to_3d)
-    else:
-        start = find_left_upper_corner_in_middle_of_screen_width(square_length, length_of_shift_to_3d)
+    project, spacing = _make_projection_3d(in_middle, size)
 
-    cols = rows = layers = GRID_SIZE
+    cols = rows = layers = size
     points = []
 
     for lay in range(layers):
-        actual_start = [
-            start[0] + (length_of_shift_to_3d * lay),
-            start[1] - (length_of_shift_to_3d * lay)
-        ]
         for row in range(rows):
             for col in range(cols):
-                x = actual_start[0] + col * square_length
-                y = actual_start[1] + row * square_length
+                x, y = project(col, row, lay)
                 point = Grid3DPoint(x, y, col, row, lay)
+                point.set_spacing(spacing)
                 points.append(point)
 
     return points
 
 
+def grid_size_of(points: list) -> int:
+    """Počet bodů v jednom směru podle bodů mřížky (poslední bod má největší col, row i lay)."""
+    return points[-1].col + 1 if points else 0
+
+
+def reproject_3d_points(points: list, in_middle=False) -> None:
+    """
+    Přepočítá souřadnice (x, y) existujících bodů 3d mřížky pro aktuální velikost okna.
+    Body (a tedy i spojení, která na ně odkazují) zůstávají stejné objekty.
+
+    Args:
+        points (list): body mřížky (Grid3DPoint)
+        in_middle (bool): zda je mřížka vykreslena uprostřed (pro tutoriál)
+    """
+    project, spacing = _make_projection_3d(in_middle, grid_size_of(points))
+    for point in points:
+        point.x, point.y = project(point.col, point.row, point.lay)
+        point.set_spacing(spacing)
+
+
+def _make_projection_3d(in_middle=False, size: int = GRID_SIZE):
+    """
+    Vrátí funkci (col, row, lay) → (x, y) pro aktuální velikost okna a nejmenší
+    vzdálenost sousedních bodů na obrazovce (sousední vrstvy jsou blíž než sousední sloupce).
+    """
+    square_length = count_square_length()
+    length_of_shift_to_3d = count_length_of_shift_to_3d(square_length)
+
+    if not in_middle:
+        start = find_left_upper_corner(square_length, length_of_shift_to_3d)
+    else:
+        start = find_left_upper_corner_in_middle_of_screen_width(square_length, length_of_shift_to_3d)
+
+    # mřížka size×size×size zabírá stejné místo jako 3×3×3, body jsou jen hustší
+    spacing = grid_spacing(square_length, size)
+    shift = grid_spacing(length_of_shift_to_3d, size)
+
+    def project(col, row, lay):
+        x = start[0] + (shift * lay) + col * spacing
+        y = start[1] - (shift * lay) + row * spacing
+        return x, y
+
+    return project, min(spacing, shift * math.sqrt(2))
+
+
 def draw_3d_grid(screen: "pygame.Surface", points: list,
                  mouse_pos: tuple[int, int] = None, gridpoints_enabled=True) -> None:
     """
@@ -141,7 +176,7 @@ def draw_3d_grid(screen: "pygame.Surface", points: list,
         mouse_pos (tuple[int, int]): aktuální pozice kurzoru myši
         gridpoints_enabled (bool): zapínání/vypínání interaktivity bodů
     """
-    cols = rows = layers = GRID_SIZE
+    cols = rows = layers = grid_size_of(points)
     line_color = (50, 50, 50)
     line_width = int(glob_var.LINE_GRID_WIDTH)
 
@@ -8,59 +8,89 @@ Datum poslední úpravy: 2026-02-06
 
 Popis:
     Tento modul obsahuje hlavní třídu `App`, která zajišťuje:
-        • Inicializaci Pygame a herního okna
-        • Inicializaci pomocných tříd a tříd obrazovek
+        • Inicializaci Pygame (jen jednou) a herního okna (s možností změny velikosti)
+        • Inicializaci pomocných tříd a startovací obrazovky; ostatní obrazovky
+          (a moduly editoru) se vytvoří / naimportují až při prvním použití
+        • Měření doby startu (--startup-report, viz utils/startup_report.py)
+        • Snímek startu – katalog úloh, levely, fonty a rozložení z minulého běhu
+          (vypne se přepínačem --no-snapshot, viz utils/warm_start.py)
         • Správu obrazovek (Start, Levels, Task)
-        • Načítání a ukládání pokroku hráče
+        • Načítání a ukládání pokroku hráče (zápis na pozadí)
         • Řízení hlavního herního cyklu
 """
 
+import time
+
+_START = time.perf_counter()  # začátek startu aplikace (před importy)
+
 import sys
 
 import glob_var
 import pygame
-from elements.level_data import LevelData
 from elements.players_progress import PlayerProgress
-from screens.edit_question_screen import EditQuestionScreen
-from screens.levels_screen import LevelsScreen
 from screens.start_screen import StartScreen
-from screens.task_screen import TaskScreen
-from screens.edit_screen import EditScreen
-from utils.data_creating_fun import create_empty_task
-from utils.initiating_length import initiate_length
+from utils.initiating_length import initiate_length, set_window_size
+from utils.layout import get_layout
+from utils.startup_report import StartupTimer
+from utils.warm_start import apply_fonts, apply_layout, load_snapshot, prime_catalog, update_snapshot
+from utils.write_behind import get_writer
 
 
 class App:
     """Hlavní třída hry Cubiq – zajišťuje běh aplikace a přepínání obrazovek."""
 
-    def __init__(self):
-        """Inicializace Pygame, obrazovek a základního stavu hry."""
+    def __init__(self, startup_report: bool = False, exit_after_first_frame: bool = False,
+                 use_snapshot: bool = True):
+        """
+        Inicializace Pygame, startovací obrazovky a základního stavu hry.
+
+        Args:
+            startup_report (bool): po prvním snímku vypsat časy startu
+            exit_after_first_frame (bool): po prvním snímku aplikaci ukončit (měření startu)
+            use_snapshot (bool): použít (a při ukončení uložit) snímek startu
+        """
+        self.startup = StartupTimer(_START)
+        self.startup.mark("importy")
+        self.startup_report = startup_report
+        self.exit_after_first_frame = exit_after_first_frame
+
         # ----------------------------
-        # Inicializace Pygame
+        # Inicializace Pygame (jediné volání pygame.init() v celé aplikaci)
         # ----------------------------
         pygame.init()
+        self.startup.mark("pygame.init")
 
         info = pygame.display.Info()
+        self.display_size = (info.current_w, info.current_h)
+
+        # snímek startu z minulého běhu (None = chybí, je zastaralý nebo vypnutý)
+        self.use_snapshot = use_snapshot
+        self.snapshot = load_snapshot(self.display_size) if use_snapshot else None
+        if self.snapshot is not None:
+            apply_fonts(self.snapshot)
         initiate_length(info)
+        if self.snapshot is not None:
+            apply_layout(self.snapshot)
+        self.startup.mark("snímek startu" if self.snapshot is not None else "bez snímku startu")
 
-        self.screen = pygame.display.set_mode((glob_var.SCREEN_WIDTH, glob_var.SCREEN_HEIGHT))
+        self.screen = pygame.display.set_mode((glob_var.SCREEN_WIDTH, glob_var.SCREEN_HEIGHT), pygame.RESIZABLE)
         pygame.display.set_caption("Cubiq🧊")
         self.clock = pygame.time.Clock()
+        self.startup.mark("okno")
 
         # ----------------------------
-        # Inicializace pomocných tříd
-        # ----------------------------
-        self.player_progress = PlayerProgress()
-        self.level_data = LevelData()
-
-        # ----------------------------
-        # Vytvoření instancí obrazovek
+        # Inicializace pomocných tříd a startovací obrazovky
         # ----------------------------
+        self.player_progress = PlayerProgress(sharded=True)  # na sdíleném počítači hodně hráčů
         self.start_screen = StartScreen(self.player_progress)
-        self.levels_screen = LevelsScreen(self.player_progress, self.level_data)
-        self.task_screen = TaskScreen(self.level_data)
-        self.edit_question_screen = EditQuestionScreen()
-        self.edit_screen = EditScreen(self.level_data)
+        self.startup.mark("startovací obrazovka")
+
+        # data úloh a ostatní obrazovky se vytvoří až při prvním použití
+        self._level_data = None
+        self._levels_screen = None
+        self._task_screen = None
+        self._edit_question_screen = None
+        self._edit_screen = None
 
         # ----------------------------
         # Proměnné pro řízení hry
@@ -70,10 +100,80 @@ class App:
         self.player_name = None
         self.running = True
 
-    def _update_data(self):
-        self.level_data.update()
-        self.levels_screen = LevelsScreen(self.player_progress, self.level_data)
-        self.task_screen = TaskScreen(self.level_data)
+    # ----------------------------
+    # Obrazovky vytvářené až při prvním použití
+    # ----------------------------
+    def _build_screen(self, screen):
+        """Předá nově vytvořené obrazovce aktuální rozložení (okno mohlo mezitím změnit velikost)."""
+        screen.apply_layout(get_layout())
+        return screen
+
+    @property
+    def level_data(self):
+        if self._level_data is None:
+            from elements.level_data import LevelData
+
+            chapter_levels = None
+            if self.snapshot is not None:
+                chapter_levels = prime_catalog(self.snapshot)  # katalog ze snímku místo data.json
+            self._level_data = LevelData(chapter_levels=chapter_levels)
+        return self._level_data
+
+    @property
+    def levels_screen(self):
+        if self._levels_screen is None:
+            from screens.levels_screen import LevelsScreen
+            self._levels_screen = self._build_screen(LevelsScreen(self.player_progress, self.level_data))
+        return self._levels_screen
+
+    @property
+    def task_screen(self):
+        if self._task_screen is None:
+            from screens.task_screen import TaskScreen
+            self._task_screen = self._build_screen(TaskScreen(self.level_data))
+        return self._task_screen
+
+    @property
+    def edit_question_screen(self):
+        # editor používá jen admin → moduly editoru se importují až tady
+        if self._edit_question_screen is None:
+            from screens.edit_question_screen import EditQuestionScreen
+            self._edit_question_screen = self._build_screen(EditQuestionScreen())
+        return self._edit_question_screen
+
+    @property
+    def edit_screen(self):
+        if self._edit_screen is None:
+            from screens.edit_screen import EditScreen
+            self._edit_screen = self._build_screen(EditScreen(self.level_data))
+        return self._edit_screen
+
+    def _resize(self, width, height):
+        """
+        Změní velikost okna, přepočítá rozložení a předá ho všem obrazovkám.
+        Body gridů se přepočítají na místě, takže rozpracovaná úloha se neztratí.
+        """
+        set_window_size(width, height)
+        self.screen = pygame.display.set_mode((glob_var.SCREEN_WIDTH, glob_var.SCREEN_HEIGHT), pygame.RESIZABLE)
+
+        layout = get_layout()
+        for screen in (self.start_screen, self._levels_screen, self._task_screen,
+                       self._edit_question_screen, self._edit_screen):
+            if screen is not None:
+                screen.apply_layout(layout)
+
+    def _prefetch_first_unsolved(self):
+        """Na pozadí připraví první nevyřešenou úlohu každé kapitoly (na ty hráč nejspíš klikne)."""
+        self.task_screen.prefetch(
+            self.player_progress.first_unsolved_levels(self.player_name, self.level_data.get_chapters()))
+
+    def _first_frame_done(self):
+        """Zaznamená dobu do prvního snímku (a případně vypíše přehled startu)."""
+        self.startup.mark("první snímek")
+        if self.startup_report:
+            print(self.startup.report())
+        if self.exit_after_first_frame:
+            self.running = False
 
     def run(self):
         """Spustí hlavní herní smyčku - zajišťuje přepínání obrazovek."""
@@ -81,11 +181,17 @@ class App:
             events = pygame.event.get()
 
             # ------------------------
-            # Globální události (ukončení)
+            # Globální události (ukončení, změna velikosti okna)
             # ------------------------
+            new_size = None
             for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == pygame.VIDEORESIZE:
+                    new_size = (event.w, event.h)  # stačí poslední velikost z framu
+
+            if new_size is not None:
+                self._resize(*new_size)
 
             # ------------------------
             # OBRAZOVKA: START
@@ -100,8 +206,9 @@ class App:
                     if self.player_name == "admin":
                         for level in self.level_data.get_all_levels():
                             self.player_progress.update_player_level(self.player_name, level)
-                            self.player_progress.save_progress()
+                        self.player_progress.save_progress()
                     self.player_progress.add_player(self.player_name)
+                    self._prefetch_first_unsolved()
                     self.current_screen = "levels"
 
             # ------------------------
@@ -131,8 +238,7 @@ class App:
                     self.task_screen.reset_task()
 
                 # Kontrola, zda level už byl vyřešen
-                player_data = self.player_progress.get_player(self.player_name)
-                was_resolved = str(self.selected_level) in map(str, player_data["completed_levels"])
+                was_resolved = self.player_progress.is_completed(self.player_name, self.selected_level)
 
                 # Vykreslení úlohy
                 resolved = self.task_screen.draw(
@@ -142,32 +248,35 @@ class App:
                     player_name=self.player_name
                 )
 
-                # Uložení pokroku po dokončení
-                if resolved:
-                    self.player_progress.update_player_level(self.player_name, self.selected_level)
+                # Uložení pokroku po dokončení (jen při první změně, zápis proběhne na pozadí)
+                if resolved and self.player_progress.update_player_level(self.player_name, self.selected_level):
                     self.player_progress.save_progress()
 
-                # Návrat na obrazovku LEVELS
+                # Návrat na obrazovku LEVELS (pokrok v paměti je aktuální, soubor není třeba číst)
                 if escape_pressed:
                     self.selected_level = None
-                    self.player_progress.load_progress()
                     self.levels_screen.update_buttons(self.player_name)
+                    self._prefetch_first_unsolved()
                     self.current_screen = "levels"
 
             # ------------------------
             # OBRAZOVKA: EDIT QUESTION
             # ------------------------
             elif self.current_screen == "edit_question":
-                self.edit_question_screen.draw(self.screen, self.level_data)
+                # stav posledního uložení jen z už vytvořeného editoru (jinak by se editor vytvořil zbytečně)
+                save_status = self._edit_screen.save_status if self._edit_screen is not None else ""
+                self.edit_question_screen.draw(self.screen, self.level_data, status=save_status)
                 new_level_id, escape_pressed = self.edit_question_screen.handle_events(events, self.level_data)
                 # Pokud stiskl Escape → návrat na Levels
                 if escape_pressed:
                     self.current_screen = "levels"
                 # Pokud uživatel něco zadal (neprázdný text)
                 if new_level_id:
-                    if new_level_id not in self.level_data.get_all_levels():
+                    if not self.level_data.has_level(new_level_id):
+                        from utils.data_creating_fun import create_empty_task
+
+                        # katalog ohlásí novou úlohu → LevelsScreen přidá jedno tlačítko
                         create_empty_task(new_level_id)
-                        self._update_data()
                         if self.player_name == "admin":
                             self.player_progress.update_player_level(self.player_name, new_level_id)
                             self.player_progress.save_progress()
@@ -181,15 +290,23 @@ class App:
                 self.edit_screen.draw(self.screen, self.selected_level)
                 escape_pressed = self.edit_screen.handle_events(events)
                 if escape_pressed:
-                    self._update_data()
                     self.current_screen = "edit_question"
 
             # ------------------------
             # Aktualizace obrazovky
             # ------------------------
             pygame.display.flip()
+            if self.startup.elapsed_ms("první snímek") is None:
+                self._first_frame_done()
             self.clock.tick(60)
 
+        # zastavit přednačítání úloh a zapsat vše, co ještě čeká na zápis (pokrok i úlohy z editoru)
+        if self._task_screen is not None:
+            self._task_screen.prefetcher.close()
+        if self.use_snapshot:
+            get_writer().flush()  # snímek musí odpovídat souborům na disku
+            update_snapshot(self.snapshot, self.display_size, self._level_data)
+        get_writer().close()
         pygame.quit()
         sys.exit()
 
@@ -198,5 +315,7 @@ class App:
 # Spouštěcí sekce
 # ======================================================================
 if __name__ == "__main__":
-    App().run()
+    App(startup_report="--startup-report" in sys.argv,
+        exit_after_first_frame="--exit-after-first-frame" in sys.argv,
+        use_snapshot="--no-snapshot" not in sys.argv).run()
 
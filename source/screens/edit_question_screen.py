@@ -10,7 +10,8 @@ Obsahuje třídu EditQuestionScreen, která:
     • umožňuje zadání pouze validního ID (formát x.y a kontrola existujících levelů),
     • aktivuje tlačítko Načíst/Vytvořit pouze pro validní ID,
     • detekuje stisky Enter a Escape, Backspace a běžné psaní,
-    • blikající kurzor a návrat zadaného textu uživatelem.
+    • blikající kurzor a návrat zadaného textu uživatelem,
+    • zobrazuje stav posledního uložení úlohy z editoru (např. "Úloha 1.2 byla uložena.").
 """
 
 import pygame
@@ -38,23 +39,39 @@ class EditQuestionScreen:
         self.enter_pressed = False
         self.result_text = ""
 
+        # input box a tlačítko Načíst/Vytvořit
+        box_rect, btn_rect = self._rects()
+        self.input_box = InputBox(*box_rect, max_length=5)
+        self.btn_load = Button(*btn_rect, "Načíst/Vytvořit")
+
+        # časovač pro blikání kurzoru v InputBoxu
+        self.clock = pygame.time.Clock()
+        self.dt = self.clock.tick(120)  # ms od posledního frame
+
+    @staticmethod
+    def _rects():
+        """Vrátí (x, y, w, h) input boxu a tlačítka Načíst/Vytvořit pro aktuální velikost okna."""
         # Rozměry input boxu
         box_width = 100
         box_height = (2 / 3) * glob_var.BTN_HEIGHT
         box_x = glob_var.SCREEN_WIDTH // 2 - box_width // 2
         box_y = glob_var.SCREEN_HEIGHT // 2 - box_height // 2
-        self.input_box = InputBox(box_x, box_y, box_width, box_height, max_length=5)
 
         # Tlačítko Načíst/Vytvořit
         btn_width = 250
         btn_height = glob_var.BTN_HEIGHT
         btn_x = glob_var.SCREEN_WIDTH // 2 - btn_width // 2
         btn_y = box_y + box_height + 30
-        self.btn_load = Button(btn_x, btn_y, btn_width, btn_height, "Načíst/Vytvořit")
 
-        # časovač pro blikání kurzoru v InputBoxu
-        self.clock = pygame.time.Clock()
-        self.dt = self.clock.tick(120)  # ms od posledního frame
+        return (box_x, box_y, box_width, box_height), (btn_x, btn_y, btn_width, btn_height)
+
+    def apply_layout(self, layout):
+        """Převezme nové rozložení obrazovky (při změně velikosti okna), zadaný text zůstane."""
+        box_rect, btn_rect = self._rects()
+        self.input_box.rect = pygame.Rect(box_rect)
+        self.input_box.y = self.input_box.rect.y
+        self.btn_load.rect = pygame.Rect(btn_rect)
+        self.btn_load.change_font(glob_var.FONT)
 
     def is_valid_id(self, text: str, level_data) -> bool:
         """Validuje, zda text má formát x.y a existuje kapitola s x-1."""
@@ -72,15 +89,14 @@ class EditQuestionScreen:
         ):
             return False
 
-        all_levels = level_data.get_all_levels()
-        if text in all_levels:
+        if level_data.has_level(text):
             return True
 
         x = int(x_str)
         prev_x = x - 1
 
         # existuje alespoň jeden level s x-1 ?
-        return any(level.startswith(f"{prev_x}.") for level in all_levels)
+        return level_data.chapter_has_levels(prev_x)
 
     def handle_events(self, events, level_data) -> tuple[str, bool]:
         """
@@ -115,12 +131,13 @@ class EditQuestionScreen:
 
         return self.result_text, escape_pressed
 
-    def draw(self, screen: pygame.Surface, level_data):
+    def draw(self, screen: pygame.Surface, level_data, status: str = ""):
         """
         Spustí hlavní smyčku editoru.
 
         Args:
             screen (pygame.Surface): surface, kam se vykresluje
+            status (str): stav posledního uložení z editoru (zobrazí se pod tlačítkem)
 
         """
         self.input_box.update(self.dt)
@@ -137,3 +154,9 @@ class EditQuestionScreen:
             self.btn_load.disable()
         self.btn_load.draw(screen)
 
+        # stav uložení pod tlačítkem
+        if status:
+            status_surface = glob_var.FONT.render(status, True, (180, 180, 180))
+            screen.blit(status_surface, (glob_var.SCREEN_WIDTH // 2 - status_surface.get_width() // 2,
+                                         self.btn_load.rect.bottom + 30))
+
@@ -8,6 +8,10 @@ Editorová obrazovka úlohy (Edit) pro hru Cubiq🧊.
 Obsahuje třídu EditScreen, která:
     • umožňuje vytvářet a upravovat 2D pohledy (půdorys, nárys, bokorys) a 3D mřížku,
     • poskytuje tlačítka pro ukládání, mazání, vyčištění a přepínání 2D/3D,
+    • umí spočítat půdorys, nárys a bokorys z 3D spojení (tlačítko "Pohledy z 3D"),
+    • umí najít 3D řešení k nakresleným pohledům (tlačítko "3D z pohledů", se Shiftem všechna;
+      hledá se ve vlákně na pozadí a jen do mřížky INTERACTIVE_MAX_SIZE z utils/reconstruction.py),
+    • přepíná velikost mřížky úlohy (tlačítko "Mřížka N×N", MIN_SIZE až MAX_SIZE bodů v jednom směru),
     • spravuje InputBox pro zadání textu úlohy,
     • mapuje spojení mezi body na skutečné GridPoint objekty,
     • zpracovává události myši a klávesnice (levé/pravé tlačítko, ESC, Enter),
@@ -15,17 +19,23 @@ Obsahuje třídu EditScreen, která:
 """
 
 import sys
+import threading
+import time
 
 import glob_var
 import pygame
 from elements.button import Button
 from elements.connection import Connection2D, Connection3D
+from elements.gridpoint import nearest_first
 from elements.task_data import TaskData
 from elements.input_box import InputBox
 from grids import grid_2d, grid_3d
 from utils import grid_fun, grid_math
 from utils.UI import MouseClickHandler
+from utils.layout import get_layout
 from utils.data_creating_fun import save_task_to_json, delete_from_json
+from utils.projection import (DEFAULT_SIZE, MAX_SIZE, MIN_SIZE, connections_3d_from_segments,
+                              connections_from_segments, project_to_json)
 
 
 class EditScreen:
@@ -43,6 +53,7 @@ class EditScreen:
         # pro 3D
         self.points = []
         self.user_connections = []
+        self.other_solutions = []  # další řešení do data3d (z tlačítka 3D z pohledů)
 
         # pro 2D
         self.p_points = []
@@ -53,6 +64,7 @@ class EditScreen:
         self.active_grid = None  # None = žádný aktivní, "p"/"n"/"b"/"c" = aktivní grid (c jako cube)
 
         self.current_task = None  # bude obsahovat instanci TaskData
+        self.size = DEFAULT_SIZE  # počet bodů mřížky v jednom směru (z úlohy, mění se tlačítkem)
 
         # tlačítka pro ukládání a mazání, x a y se dopočítají
         width = height = glob_var.BTN_HEIGHT
@@ -68,8 +80,23 @@ class EditScreen:
         clean_width = width * 2
         self.btn_clean = Button(0, 0, clean_width, height, "Vyčistit")
 
-        # Y souřadnice čáry
-        self.line_y = (4 * glob_var.SCREEN_HEIGHT) // 5
+        # tlačítko pro výpočet 2D pohledů z 3D spojení
+        self.btn_generate = Button(0, 0, width * 3, height, "Pohledy z 3D")
+
+        # tlačítko pro nalezení 3D řešení k 2D pohledům
+        self.btn_solve = Button(0, 0, width * 3, height, "3D z pohledů")
+        self.solve_status = ""
+        self._solve_thread = None  # vlákno, které právě hledá 3D řešení
+        self._solve_started = 0.0  # kdy hledání začalo (pro stav "Hledám…")
+        self._solve_generation = 0  # zvýší se při změně úlohy – starší výsledek se zahodí
+        self._solve_result = None  # (generace, řešení, stav) z vlákna, ještě nepřevzatý
+
+        # tlačítko pro změnu velikosti mřížky (vymaže nakreslená spojení)
+        self.btn_size = Button(0, 0, width * 3, height, self._size_label())
+
+        # Y souřadnice čáry (nastaví se v apply_layout)
+        self.line_y = None
+        self.layout = None
 
         # řeší dvojklik
         self.mouse_click_handler = MouseClickHandler(double_click_interval=400)
@@ -83,6 +110,54 @@ class EditScreen:
         self.clock = pygame.time.Clock()
         self.dt = self.clock.tick(120)  # ms od posledního frame
 
+        # stav posledního uložení / smazání (zápis probíhá na pozadí)
+        self.save_status = ""
+
+        self.apply_layout(get_layout())
+
+    # ------------------------
+    # Rozložení obrazovky
+    # ------------------------
+    def apply_layout(self, layout):
+        """
+        Převezme rozložení obrazovky (při vytvoření a při změně velikosti okna).
+        Existující body gridů i rozepsaný text úlohy zůstanou zachovány.
+        """
+        self.layout = layout
+        self.line_y = layout.line_y
+        self.margin_x_button = glob_var.X_OFFSET
+
+        size = glob_var.BTN_HEIGHT
+        for button in (self.btn_delete, self.btn_save, self.btn_clean):
+            button.set_size(size * 2, size)
+            button.change_font(glob_var.FONT)
+        self.btn_change.set_size(size, (5 / 6) * size)
+        self.btn_change.change_font(glob_var.FONT)
+        self.btn_generate.set_size(size * 3, size)
+        self.btn_generate.change_font(glob_var.FONT)
+        self.btn_solve.set_size(size * 3, size)
+        self.btn_solve.change_font(glob_var.FONT)
+        self.btn_size.set_size(size * 3, size)
+        self.btn_size.change_font(glob_var.FONT)
+
+        # tlačítka Smazat a Uložit vycentrovaná mezi čárou a spodním okrajem
+        self.btn_delete.set_x(self.margin_x_button)
+        self.btn_delete.set_y(layout.bottom_center_y - self.btn_delete.get_height() // 2)
+        self.btn_save.set_x(layout.width - self.margin_x_button - self.btn_delete.get_width())
+        self.btn_save.set_y(layout.bottom_center_y - self.btn_save.get_height() // 2)
+
+        # existující body se jen přepočítají
+        if self.points:
+            grid_3d.reproject_3d_points(self.points)
+        if self.p_points:
+            grid_2d.reproject_all_2d_points(self.p_points, self.n_points, self.b_points)
+
+        # InputBox se posune, rozepsaný text zůstane
+        if hasattr(self, 'task_input_box'):
+            self.task_input_box.rect = pygame.Rect(self._task_input_box_rect())
+            self.task_input_box.y = self.task_input_box.rect.y
+            self.task_input_box.width = self.task_input_box.rect.width
+
     # ------------------------
     # "namapování" bodů na skutečné GridPoint objekty
     # ------------------------
@@ -136,12 +211,28 @@ class EditScreen:
         return mapped
 
     def _ensure_grids_initialized(self):
-        """Inicializuje 3D a 2D gridy pouze jednou."""
+        """Inicializuje 3D a 2D gridy pouze jednou (znovu jen při změně velikosti mřížky)."""
+        if self.points and grid_3d.grid_size_of(self.points) != self.size:
+            self.points = []
+        if self.p_points and grid_2d.grid_size_of(self.p_points) != self.size:
+            self.p_points = self.n_points = self.b_points = []
+
         if not self.points:
-            self.points = grid_3d.create_3d_points()
+            self.points = grid_3d.create_3d_points(size=self.size)
 
         if not self.p_points:
-            self.p_points, self.n_points, self.b_points = grid_2d.create_all_2d_points()
+            self.p_points, self.n_points, self.b_points = grid_2d.create_all_2d_points(self.size)
+
+    def _size_label(self) -> str:
+        return f"Mřížka {self.size}×{self.size}"
+
+    def _next_size(self):
+        """Přepne velikost mřížky (dokola MIN_SIZE až MAX_SIZE); nakreslená spojení se vymažou."""
+        self._clear_all_user_connections()
+        self.size = self.size + 1 if self.size < MAX_SIZE else MIN_SIZE
+        self.btn_size.text = self._size_label()
+        self._ensure_grids_initialized()
+        self._update_solve_button()
 
     # ------------------------
     # Načtení úlohy
@@ -153,7 +244,13 @@ class EditScreen:
         elif self.current_task.task_type == "3D_to_2D":
             self.btn_change.text = "<--"
 
+        self.size = self.current_task.size
+        self.btn_size.text = self._size_label()
         self._ensure_grids_initialized()
+        self.other_solutions = []
+        self.solve_status = ""
+        self._solve_generation += 1
+        self._update_solve_button()
 
         # map connections → reálné body s x,y,z
         self.user_connections = self._map_connections_to_points_3d(self.current_task.connections_3d, self.points)
@@ -169,10 +266,96 @@ class EditScreen:
     # ------------------------
     def _clear_all_user_connections(self):
         self.user_connections.clear()
+        self.other_solutions.clear()
+        self.solve_status = ""
+        self._solve_generation += 1  # hledání, které ještě běží, už se nepoužije
         self.user_pudorys_connections.clear()
         self.user_narys_connections.clear()
         self.user_bokorys_connections.clear()
 
+    def _generate_views_from_3d(self):
+        """
+        Nahradí půdorys, nárys a bokorys pohledy spočítanými z 3D spojení
+        (skryté hrany čárkovaně, viz utils/projection.py).
+        """
+        views = project_to_json([conn.make_data_connection_for_json() for conn in self.user_connections], self.size)
+        self.user_pudorys_connections = connections_from_segments(views["pudorys"], self.p_points)
+        self.user_narys_connections = connections_from_segments(views["narys"], self.n_points)
+        self.user_bokorys_connections = connections_from_segments(views["bokorys"], self.b_points)
+
+    def _solutions_from_views(self, all_solutions=False):
+        """
+        Spustí hledání 3D řešení k nakresleným pohledům (viz utils/reconstruction.py) ve vlákně
+        na pozadí. První řešení se pak zobrazí ve 3D gridu, ostatní se uloží do data3d spolu
+        s ním (viz _collect_solutions).
+
+        Args:
+            all_solutions (bool): uložit všechna nalezená řešení, jinak jen kanonickou podmnožinu
+        """
+        if not self.btn_solve.enabled:
+            return  # hledání už běží, nebo je mřížka moc velká
+
+        task = {
+            "pudorys": [conn.make_data_connection_for_json() for conn in self.user_pudorys_connections],
+            "narys": [conn.make_data_connection_for_json() for conn in self.user_narys_connections],
+            "bokorys": [conn.make_data_connection_for_json() for conn in self.user_bokorys_connections],
+            "data3d": [[conn.make_data_connection_for_json() for conn in self.user_connections]],
+            "size": self.size,
+        }
+        generation = self._solve_generation
+        self._solve_result = None
+        self._solve_started = time.perf_counter()
+        self._solve_thread = threading.Thread(target=self._solve_job, args=(task, all_solutions, generation),
+                                              name="cubiq-reconstruction", daemon=True)
+        self._solve_thread.start()
+        self._update_solve_button()
+
+    def _solve_job(self, task, all_solutions, generation):
+        """Najde 3D řešení (běží ve vlákně na pozadí, výsledek jen předá hlavnímu vláknu)."""
+        from utils.reconstruction import reconstruct_task
+
+        try:
+            result = reconstruct_task(task, task["size"])
+            solutions = result.solutions if all_solutions else result.canonical(task["data3d"], task["size"])
+            more = "+" if result.truncated else ""
+            status = f"Řešení: {len(solutions)} z {result.count}{more}"
+            print(f"{status} ({result.mode}, {result.elapsed_ms:.0f} ms)")
+        except Exception as e:  # chyba hledání nesmí shodit editor
+            print(f"Hledání 3D řešení se nepodařilo: {e}")
+            solutions, status = [], "Hledání se nepodařilo!"
+        self._solve_result = (generation, solutions, status)
+
+    def _collect_solutions(self):
+        """Převezme výsledek hledání z vlákna (volá se z hlavní smyčky před vykreslením)."""
+        if self._solve_thread is None:
+            return
+        if self._solve_thread.is_alive():
+            elapsed = time.perf_counter() - self._solve_started
+            self.solve_status = f"Hledám 3D řešení… {elapsed:.0f} s"
+            return
+        self._solve_thread = None
+        self._update_solve_button()
+        result, self._solve_result = self._solve_result, None
+        if result is None or result[0] != self._solve_generation:
+            return  # úloha se mezitím změnila
+        _, solutions, self.solve_status = result
+        if solutions:
+            self.user_connections = connections_3d_from_segments(solutions[0], self.points)
+            self.other_solutions = solutions[1:]
+
+    def _update_solve_button(self):
+        """Tlačítko 3D z pohledů je vypnuté, když hledání běží nebo je mřížka na hledání moc velká."""
+        from utils.reconstruction import INTERACTIVE_MAX_SIZE
+
+        running = self._solve_thread is not None and self._solve_thread.is_alive()
+        if running:
+            self.btn_solve.disable()
+        elif self.size > INTERACTIVE_MAX_SIZE:
+            self.btn_solve.disable()
+            self.solve_status = f"3D z pohledů jen do mřížky {INTERACTIVE_MAX_SIZE}×{INTERACTIVE_MAX_SIZE}"
+        else:
+            self.btn_solve.enable()
+
     def reset_task(self):
         """Vymaže data aktuální úlohy před načtením nové."""
         self.points.clear()
@@ -194,7 +377,7 @@ class EditScreen:
 
         # --- 3D body ---
         if self.active_grid is None or self.active_grid == "c":
-            for point in self.points:
+            for point in nearest_first(self.points, mouse_pos):
                 new_conn, clicked = point.click(self.points, mouse_pos, event, self.user_connections)
                 if clicked:
                     self.active_grid = "c"
@@ -216,7 +399,7 @@ class EditScreen:
 
             for points_list, user_conns, grid_key in grids:
                 if self.active_grid is None or self.active_grid == grid_key:
-                    for point in points_list:
+                    for point in nearest_first(points_list, mouse_pos):
                         new_conn, clicked = point.click(points_list, mouse_pos, event, user_conns)
                         if clicked:
                             self.active_grid = grid_key
@@ -264,22 +447,47 @@ class EditScreen:
         n_connections = self.user_narys_connections
         b_connections = self.user_bokorys_connections
         d_connections = [self.user_connections]
+        d_connections += [connections_3d_from_segments(solution, self.points) for solution in self.other_solutions]
 
-        save_task_to_json(task_id, text, task_type, p_connections, n_connections, b_connections, d_connections)
+        self.save_status = f"Ukládám úlohu {task_id}…"
+        save_task_to_json(task_id, text, task_type, p_connections, n_connections, b_connections, d_connections,
+                          callback=self._status_callback(f"Úloha {task_id} byla uložena."), size=self.size)
+
+    def _status_callback(self, done_text):
+        """
+        Vrátí callback, který po zápisu na disk nastaví stav uložení.
+        Volá se z vlákna zapisovače, proto jen přepíše text.
+        """
+        def callback(key, ok):
+            self.save_status = done_text if ok else "Uložení se nepodařilo!"
+        return callback
 
     def _handle_buttons_down(self, task, event) -> bool:
         clicked_delete = self.btn_delete.click(event)
         clicked_save = self.btn_save.click(event)
         clicked_change = self.btn_change.click(event)
         clicked_clean = self.btn_clean.click(event)
+        clicked_generate = self.btn_generate.click(event)
+        clicked_solve = self.btn_solve.click(event)
+        clicked_size = self.btn_size.click(event)
         escape_pressed = False
 
         if clicked_clean:
             self._clear_all_user_connections()
 
+        if clicked_generate:
+            self._generate_views_from_3d()
+
+        if clicked_solve:
+            self._solutions_from_views(all_solutions=bool(pygame.key.get_mods() & pygame.KMOD_SHIFT))
+
+        if clicked_size and not str(task.task_id).startswith("0."):
+            self._next_size()
+
         if clicked_delete:
             print("smazání příkladu")
-            delete_from_json(task.task_id)
+            self.save_status = f"Mažu úlohu {task.task_id}…"
+            delete_from_json(task.task_id, callback=self._status_callback(f"Úloha {task.task_id} byla smazána."))
             escape_pressed = True
 
         elif clicked_save:
@@ -345,6 +553,9 @@ class EditScreen:
                 self.btn_save.click(event)
                 self.btn_change.click(event)
                 self.btn_clean.click(event)
+                self.btn_generate.click(event)
+                self.btn_solve.click(event)
+                self.btn_size.click(event)
 
                 self._handle_mouse_down_for_grids(mouse_pos, event)
 
@@ -377,21 +588,10 @@ class EditScreen:
     # ======================================================
 
     def draw_buttons(self, screen, current_task):
-        """Vykreslí tlačítka < a > vedle textu, fixně vycentrovaná mezi čárou a spodním okrajem okna."""
-        margin_x = self.margin_x_button
-        line_y = self.line_y
-        bottom_y = glob_var.SCREEN_HEIGHT
-
-        # vertikální střed mezi čárou a spodním okrajem
-        center_y = line_y + (bottom_y - line_y) // 2
-
-        # nastavení pozice tlačítek
-        self.btn_delete.set_x(margin_x)
-        self.btn_delete.set_y(center_y - self.btn_delete.get_height() // 2)
-
-        self.btn_save.set_x(glob_var.SCREEN_WIDTH - margin_x - self.btn_delete.get_width())
-        self.btn_save.set_y(center_y - self.btn_save.get_height() // 2)
-
+        """
+        Vykreslí tlačítka Smazat a Uložit, fixně vycentrovaná mezi čárou a spodním okrajem okna.
+        Pozice tlačítek se nastavují v apply_layout.
+        """
         self.btn_save.enable()
         self.btn_delete.draw(screen)
         self.btn_save.draw(screen)
@@ -408,13 +608,39 @@ class EditScreen:
         self.btn_clean.set_y(y)
         self.btn_clean.draw(screen)
 
-    def draw_task_text(self, screen, text):
+        # Pohledy z 3D vpravo od Vyčistit
+        self.btn_generate.set_x(x + self.btn_clean.get_width() + x_spacing)
+        self.btn_generate.set_y(y)
+        self.btn_generate.draw(screen)
+
+    def _draw_solve_controls(self, screen, task):
         """
-        Vykreslí text zadání úlohy vycentrovaný mezi čárou a spodním okrajem okna
-        a odsazený od tlačítek Smazat a Uložit, pomocí jednoho InputBoxu.
+        Vykreslí tlačítko 3D z pohledů vpravo nahoře (ve výšce ID úlohy), vlevo od něj
+        velikost mřížky (ne u tutoriálů) a pod ním počet nalezených 3D řešení.
+        """
+        right_x = glob_var.SCREEN_WIDTH - glob_var.X_OFFSET // 2
+        x_spacing = 20
+
+        self.btn_solve.set_x(right_x - self.btn_solve.get_width())
+        self.btn_solve.set_y((1 / 5) * glob_var.Y_OFFSET)
+        self.btn_solve.draw(screen)
+
+        if task is not None and not str(task.task_id).startswith("0."):
+            self.btn_size.set_x(self.btn_solve.rect.x - x_spacing - self.btn_size.get_width())
+            self.btn_size.set_y(self.btn_solve.rect.y)
+            self.btn_size.draw(screen)
+
+        if self.solve_status:
+            surf = glob_var.FONT.render(self.solve_status, True, (255, 255, 255))
+            screen.blit(surf, (right_x - surf.get_width(), self.btn_solve.rect.bottom + glob_var.LINE_WIDTH * 2))
+
+    def _task_input_box_rect(self):
+        """
+        Vrátí (x, y, w, h) InputBoxu s textem zadání – vycentrovaného mezi čárou
+        a spodním okrajem okna a odsazeného od tlačítek Smazat a Uložit.
         """
         margin_x = self.btn_delete.get_width() + self.margin_x_button + 40
-        line_y = (4 * glob_var.SCREEN_HEIGHT) // 5
+        line_y = self.line_y
         bottom_y = glob_var.SCREEN_HEIGHT
         max_width = glob_var.SCREEN_WIDTH - 2 * margin_x
 
@@ -424,16 +650,24 @@ class EditScreen:
         # vertikálně vycentrovaný y
         box_y = line_y + ((bottom_y - line_y) - box_height) // 2
 
+        return margin_x, box_y, max_width, box_height
+
+    def draw_task_text(self, screen, text):
+        """
+        Vykreslí text zadání úlohy vycentrovaný mezi čárou a spodním okrajem okna
+        a odsazený od tlačítek Smazat a Uložit, pomocí jednoho InputBoxu.
+        """
         # maximální počet znaků
         max_length = 200
 
         # vytvoření InputBoxu
         if not hasattr(self, 'task_input_box'):
+            x, y, w, h = self._task_input_box_rect()
             self.task_input_box = InputBox(
-                x=margin_x,
-                y=box_y,
-                w=max_width,
-                h=box_height,
+                x=x,
+                y=y,
+                w=w,
+                h=h,
                 text=text,
                 max_length=max_length
             )
@@ -451,8 +685,8 @@ class EditScreen:
 
     def _draw_2d_grids(self, screen, task, mouse_pos):
         """Vykreslí všechny 2D pohledy (půdorys, nárys, bokorys)."""
-        l_square_length = grid_2d.count_square_length()
-        p_pos, n_pos, b_pos = grid_2d.find_left_upper_corners(l_square_length)
+        l_square_length = self.layout.square_2d
+        p_pos, n_pos, b_pos = self.layout.corners_2d
 
         # Napárování spojů z TaskData → reálné body
         p_conns = self._map_connections_to_points_2d(self.user_pudorys_connections, self.p_points)
@@ -476,7 +710,7 @@ class EditScreen:
 
     def _draw_separator_and_text(self, screen, task):
         """Vykreslí oddělovací čáru a text zadání."""
-        y = (4 * glob_var.SCREEN_HEIGHT) // 5
+        y = self.line_y
         pygame.draw.line(screen, (100, 100, 100), (0, y), (glob_var.SCREEN_WIDTH, y), 2)
 
         if task.text.strip():
@@ -556,6 +790,7 @@ class EditScreen:
         Vykreslí úkol na obrazovku.
         """
         self._ensure_task_loaded(task_id)
+        self._collect_solutions()
 
         task = self.current_task
         screen.fill((0, 0, 0))
@@ -567,6 +802,7 @@ class EditScreen:
 
         # ID úlohy nahoře uprostřed
         self._draw_id(screen, task)
+        self._draw_solve_controls(screen, task)
 
         self._draw_2d_grids(screen, task, mouse_pos)
         self._draw_3d_part(screen, task, mouse_pos)
@@ -9,6 +9,10 @@ Třída LevelsScreen umožňuje:
     • vytvořit tlačítka pro jednotlivé levely,
     • nastavit jejich stav (aktivní / neaktivní) podle pokroku hráče,
     • zpracovávat události myši a kolečka (scrollování),
+    • po přidání nebo smazání úlohy jen přidat / odebrat jedno tlačítko (události katalogu),
+    • řadit levely v kapitolách podle ID nebo podle obtížnosti a filtrovat je podle
+      stupně obtížnosti (předpočítaná obtížnost z utils/difficulty.py; dokud se obtížnosti
+      počítají na pozadí, jsou řazení a filtr vypnuté),
     • vykreslit obrazovku s názvy kapitol a tlačítky.
 """
 
@@ -16,6 +20,9 @@ import glob_var
 import pygame
 from elements.button import Button
 
+SORT_LABELS = {"id": "Řazení: ID", "difficulty": "Řazení: obtížnost"}
+DIFFICULTY_FILTERS = (None, 1, 2, 3, 4, 5)  # None = všechny levely
+
 
 class LevelsScreen:
     """
@@ -48,7 +55,9 @@ class LevelsScreen:
 
         # Seznam tlačítek a stav inicializace
         self.buttons: list[Button] = []
+        self._buttons_by_level: dict[str, Button] = {}
         self.initialized: bool = False
+        self.player_name: str | None = None
 
         # Posun obrazovky (scroll)
         self.scroll_y: int = 0
@@ -64,6 +73,121 @@ class LevelsScreen:
                               (self.top_bar_height - btn_add_height) // 2,
                               btn_add_width, btn_add_height, "+")
 
+        # řazení a filtr podle obtížnosti (vlevo od "+")
+        self.sort_by: str = "id"
+        self.difficulty_filter: int | None = None
+        self.btn_sort = Button(0, 0, btn_add_width * 4, btn_add_height, SORT_LABELS[self.sort_by])
+        self.btn_filter = Button(0, 0, btn_add_width * 4, btn_add_height, self._filter_label())
+        self._difficulty_version: int | None = None  # verze obtížností, podle které jsou levely rozmístěné
+        self._place_top_buttons(glob_var.SCREEN_WIDTH)
+
+        # přidání / smazání úlohy v editoru → přeskupení tlačítek
+        self.level_data.add_listener(self._on_level_event)
+
+    # ------------------------
+    # Rozložení obrazovky
+    # ------------------------
+    def apply_layout(self, layout):
+        """
+        Převezme nové rozložení obrazovky (při změně velikosti okna).
+        Tlačítka levelů se znovu rozmístí při dalším handle_events.
+        """
+        self.x_offset = glob_var.X_OFFSET
+        self.button_height = glob_var.BTN_HEIGHT * 1.05
+
+        btn_add_width = btn_add_height = self.button_height
+        self.btn_add.set_size(btn_add_width, btn_add_height)
+        self.btn_add.set_x(layout.width - btn_add_width - self.x_offset)
+        self.btn_add.set_y((self.top_bar_height - btn_add_height) // 2)
+        self.btn_add.change_font(glob_var.FONT)
+        for button in (self.btn_sort, self.btn_filter):
+            button.set_size(btn_add_width * 4, btn_add_height)
+            button.change_font(glob_var.FONT)
+        self._place_top_buttons(layout.width)
+
+        self.initialized = False
+        self.scroll_y = 0
+
+    def _place_top_buttons(self, width: int):
+        """Umístí tlačítka řazení a filtru v horním baru vlevo od tlačítka "+"."""
+        spacing = 20
+        y = (self.top_bar_height - self.btn_add.get_height()) // 2
+        self.btn_filter.set_x(width - self.x_offset - self.btn_add.get_width() - spacing - self.btn_filter.get_width())
+        self.btn_filter.set_y(y)
+        self.btn_sort.set_x(self.btn_filter.rect.x - spacing - self.btn_sort.get_width())
+        self.btn_sort.set_y(y)
+
+    # ------------------------
+    # Řazení a filtr podle obtížnosti
+    # ------------------------
+    def _filter_label(self) -> str:
+        if not self.btn_sort.enabled:
+            return "Obtížnost: počítá se"
+        return "Obtížnost: vše" if self.difficulty_filter is None else f"Obtížnost: {self.difficulty_filter}"
+
+    def _sync_difficulties(self):
+        """
+        Po změně obtížností (dopočítání na pozadí, úprava úlohy v editoru) znovu rozmístí
+        levely. Dokud není spočítaná obtížnost žádného levelu, jsou řazení a filtr vypnuté.
+        """
+        ready = self.level_data.has_difficulties()
+        version = self.level_data.get_difficulty_version()
+        if version == self._difficulty_version:
+            return
+        self._difficulty_version = version
+
+        for button in (self.btn_sort, self.btn_filter):
+            if ready:
+                button.enable()
+            else:
+                button.disable()
+        if not ready:
+            self.sort_by = "id"
+            self.difficulty_filter = None
+            self.btn_sort.text = SORT_LABELS[self.sort_by]
+        self.btn_filter.text = self._filter_label()
+        if self.sort_by != "id" or self.difficulty_filter is not None:
+            self._refresh_levels()
+
+    def _visible_levels(self, levels: list[str]) -> list[str]:
+        """
+        Levely kapitoly tak, jak se zobrazí: jen levely se zvoleným stupněm obtížnosti,
+        případně seřazené podle skóre obtížnosti. Levely bez spočítané obtížnosti (právě
+        upravená úloha) filtr neskryje a při řazení jsou na konci.
+        """
+        if self.sort_by == "id" and self.difficulty_filter is None:
+            return levels
+
+        difficulties = {level: self.level_data.get_difficulty(level) for level in levels}
+        if self.difficulty_filter is not None:
+            levels = [level for level in levels
+                      if difficulties[level] is None or difficulties[level]["level"] == self.difficulty_filter]
+        if self.sort_by == "difficulty":
+            # sorted() je stabilní – stejně těžké levely zůstanou v pořadí podle ID
+            levels = sorted(levels, key=lambda level: (difficulties[level] is None,
+                                                       difficulties[level]["score"] if difficulties[level] else 0))
+        return levels
+
+    def _toggle_sort(self):
+        self.sort_by = "difficulty" if self.sort_by == "id" else "id"
+        self.btn_sort.text = SORT_LABELS[self.sort_by]
+        self._refresh_levels()
+
+    def _next_filter(self):
+        position = DIFFICULTY_FILTERS.index(self.difficulty_filter)
+        self.difficulty_filter = DIFFICULTY_FILTERS[(position + 1) % len(DIFFICULTY_FILTERS)]
+        self.btn_filter.text = self._filter_label()
+        self._refresh_levels()
+
+    def _refresh_levels(self):
+        """Po změně řazení nebo filtru znovu rozmístí tlačítka levelů (od začátku seznamu)."""
+        if not self.initialized:
+            return
+        self.scroll_y = 0
+        self._place_buttons()
+        if self.player_name is not None:
+            self.update_buttons(self.player_name)
+
     # ------------------------
     # "namapování" levlů na skutečné Buttons objekty
     # ------------------------
@@ -74,20 +198,12 @@ class LevelsScreen:
         Args:
             player_name: jméno hráče, jehož pokrok se kontroluje
         """
-        player_data = self.player_progress.get_player(player_name)
-        completed_levels: list[str] = player_data.get("completed_levels", [])
-
-        # první nevyřešené levely v každé kapitole
-        current_levels: list[str] = []
-        for chapter in self.chapters:
-            for level in chapter["levels"]:
-                if level not in completed_levels:
-                    current_levels.append(level)
-                    break
+        # první nevyřešené levely v každé kapitole (cachované v PlayerProgress)
+        current_levels = set(self.player_progress.first_unsolved_levels(player_name, self.chapters))
 
         # aktualizace tlačítek
         for button in self.buttons:
-            if button.get_text() in completed_levels:
+            if self.player_progress.is_completed(player_name, button.get_text()):
                 button.enable()
                 button.change_color(text_color=(255, 215, 0), border_color=(255, 215, 0))
             elif button.get_text() in current_levels:
@@ -106,7 +222,23 @@ class LevelsScreen:
         if player_name != "admin":
             self.btn_add.disable()
 
-        self.buttons.clear()
+        self.player_name = player_name
+        self._buttons_by_level.clear()
+        self._place_buttons()
+        self.initialized = True
+
+        # inicializace stavu tlačítek podle pokroku hráče
+        self.update_buttons(player_name)
+
+    def _place_buttons(self):
+        """
+        Rozmístí tlačítka levelů po kapitolách. Existující tlačítka se jen posunou,
+        nové se vytvoří (při přidání úlohy tak vznikne jediné tlačítko).
+        """
+        old_buttons = self._buttons_by_level
+        self._buttons_by_level = {}
+        self.buttons = []
+        self.chapter_positions = []
 
         # Rozměry tlačítek a vzdálenosti
         button_width = button_height = self.button_height
@@ -120,13 +252,15 @@ class LevelsScreen:
         max_per_row = (glob_var.SCREEN_WIDTH - 2 * min_x_offset + spacing_x) // (button_width + spacing_x)
         x_offset = (glob_var.SCREEN_WIDTH - (max_per_row * (button_width + spacing_x) - spacing_x)) / 2
 
+        positions = []  # (label, x, y) bez posunu scrollem
         for chapter_index, chapter in enumerate(self.chapters):
             chapter_start_y = start_y
             self.chapter_positions.append((chapter_index, chapter_start_y))
 
-            levels = chapter["levels"]
+            levels = self._visible_levels(chapter["levels"])
             level_count = len(levels)
 
+            y = chapter_start_y
             for row_start in range(0, level_count, int(max_per_row)):
                 row_level_count = min(max_per_row, level_count - row_start)
                 row_index = row_start // max_per_row
@@ -134,21 +268,37 @@ class LevelsScreen:
 
                 for i in range(int(row_level_count)):
                     x = x_offset + i * (button_width + spacing_x)
-                    label = levels[row_start + i]
-                    self.buttons.append(Button(x, y, button_width, button_height, label))
+                    positions.append((levels[row_start + i], x, y))
 
             # posun start_y na další kapitolu
             start_y = y + button_height + chapter_spacing
 
-        self.initialized = True
-
         # maximální posun = celková výška obsahu - výška obrazovky
-        total_height = max(button.get_bottom() for button in self.buttons) + 50
+        total_height = (max(y for _, _, y in positions) + int(button_height) + 50) if positions else 0
         visible_height = glob_var.SCREEN_HEIGHT - self.top_bar_height
         self.max_scroll = max(0, total_height - visible_height)
-
-        # inicializace stavu tlačítek podle pokroku hráče
-        self.update_buttons(player_name)
+        self.scroll_y = max(self.scroll_y, -self.max_scroll)
+
+        for label, x, y in positions:
+            button = old_buttons.get(label)
+            if button is None:
+                button = Button(x, y, button_width, button_height, label)
+            button.set_x(x)
+            button.set_y(y)
+            button.scroll(self.scroll_y)
+            self._buttons_by_level[label] = button
+            self.buttons.append(button)
+
+    def _on_level_event(self, event: str, level: str):
+        """
+        Změna v katalogu úloh (viz LevelData.add_listener): po přidání nebo smazání
+        úlohy se tlačítka jen přeskupí, bez nového vytváření obrazovky.
+        """
+        self.chapters = self.level_data.get_chapters()
+        if event != "changed" and self.initialized:
+            self._place_buttons()
+            if self.player_name is not None:
+                self.update_buttons(self.player_name)
 
     # ============================================
     # Události myši a klávesnice
@@ -166,12 +316,19 @@ class LevelsScreen:
         """
         if not self.initialized:
             self.initialize_buttons(player_name)
+        self._sync_difficulties()
 
         selected_level: str | None = None
         for event in events:
             if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP) and event.button == 1:
                 if self.btn_add.click(event):
                     return "+"
+                if self.btn_sort.click(event):
+                    self._toggle_sort()
+                    continue
+                if self.btn_filter.click(event):
+                    self._next_filter()
+                    continue
                 for button in self.buttons:
                     if button.click(event):
                         selected_level = button.get_text()
@@ -233,6 +390,10 @@ class LevelsScreen:
         screen.blit(label, (self.x_offset, (self.top_bar_height - name.get_height()) // 2))
         screen.blit(name, (self.x_offset + label.get_width() + 10, (self.top_bar_height - name.get_height()) // 2))
 
+        # řazení a filtr podle obtížnosti
+        self.btn_sort.draw(screen)
+        self.btn_filter.draw(screen)
+
         # tlačítko "+" vpravo
         if player_name == "admin":
             self.btn_add.draw(screen)
@@ -36,26 +36,46 @@ class StartScreen:
         self.player_progress = player_progress
 
         # tlačítko Start
+        self.start_button = Button(*self._start_button_rect(), "Přihlásit se")
+
+        # input box pro jméno hráče
+        self.input_box = InputBox(*self._input_box_rect())
+
+        # jméno hráče, bude zadáno přes InputBox
+        self.player_name = ""
+
+        # časovač pro blikání kurzoru v InputBoxu
+        self.clock = pygame.time.Clock()
+        self.dt = self.clock.tick(120)  # ms od posledního frame
+
+    # ------------------------
+    # Rozložení obrazovky
+    # ------------------------
+    @staticmethod
+    def _start_button_rect():
+        """Vrátí (x, y, w, h) tlačítka Start pro aktuální velikost okna."""
         start_button_width = 200
         start_button_height = glob_var.BTN_HEIGHT
         x_start_button = (glob_var.SCREEN_WIDTH - start_button_width) // 2
         y_start_button = ((glob_var.SCREEN_HEIGHT - start_button_height) // 2) + (glob_var.SCREEN_HEIGHT // 4)
-        self.start_button = Button(x_start_button, y_start_button,
-                                   start_button_width, start_button_height, "Přihlásit se")
+        return x_start_button, y_start_button, start_button_width, start_button_height
 
-        # input box pro jméno hráče
+    @staticmethod
+    def _input_box_rect():
+        """Vrátí (x, y, w, h) InputBoxu pro jméno hráče pro aktuální velikost okna."""
         input_width = 400
         input_height = (2/3)*glob_var.BTN_HEIGHT
         x_input = (glob_var.SCREEN_WIDTH - input_width) // 2
         y_input = (glob_var.SCREEN_HEIGHT // 2) - input_height
-        self.input_box = InputBox(x_input, y_input, input_width, input_height)
+        return x_input, y_input, input_width, input_height
 
-        # jméno hráče, bude zadáno přes InputBox
-        self.player_name = ""
+    def apply_layout(self, layout):
+        """Převezme nové rozložení obrazovky (při změně velikosti okna), zadané jméno zůstane."""
+        self.start_button.rect = pygame.Rect(self._start_button_rect())
+        self.start_button.change_font(glob_var.FONT)
 
-        # časovač pro blikání kurzoru v InputBoxu
-        self.clock = pygame.time.Clock()
-        self.dt = self.clock.tick(120)  # ms od posledního frame
+        self.input_box.rect = pygame.Rect(self._input_box_rect())
+        self.input_box.y = self.input_box.rect.y
 
     # ============================================
     # Události myši a klávesnice
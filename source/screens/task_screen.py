@@ -9,6 +9,8 @@ Obsahuje třídu TaskScreen, která:
     • zobrazuje 2D pohledy (půdorys, nárys, bokorys) a 3D mřížku,
     • umožňuje uživateli spojovat body v prostoru a kontroluje řešení,
     • vykresluje text úlohy a navigační tlačítka,
+    • po stisku "Nápověda" zvýrazní jednu chybějící, přebývající nebo špatně čárkovanou
+      úsečku vůči nejbližšímu uznanému řešení (utils/hints.py),
     • zpracovává události myši a klávesnice.
 """
 
@@ -17,9 +19,15 @@ import pygame
 import glob_var
 from elements.button import Button
 from elements.connection import Connection2D, Connection3D
+from elements.gridpoint import nearest_first
 from elements.task_data import TaskData
+from elements.task_prefetch import PreparedTask, TaskPrefetcher
+from elements.task_session import SessionCache, TaskSession, connections_from_codes, pack_state, unpack_state
 from grids import grid_2d, grid_3d
+from grids.connection_layer import ConnectionLayer
 from utils import grid_fun
+from utils.hints import HintEngine, connections_to_segments
+from utils.layout import get_layout, layout_task_text, task_text_geometry
 from utils.UI import MouseClickHandler
 from elements.pop_up_window import PopUpWindow
 
@@ -37,6 +45,17 @@ class TaskScreen:
         # správa kapitol a levlů
         self.level_data = level_data
         self.levels = self.level_data.get_all_levels()
+        self.level_data.add_listener(self._on_level_event)
+
+        # sousední úlohy se připravují na pozadí (TaskData i vykreslený text)
+        self.prefetcher = TaskPrefetcher(self.level_data.data_file)
+
+        # rozpracované úlohy (spojení, vybraný bod, historie pro Ctrl+Z) – návrat k úloze je obnoví
+        self.sessions = SessionCache(max_entries=32)
+        self.undo_history: list[bytes] = []
+        self.max_undo = 50
+        self.player_name = ""
+        self._session_task_id = None  # úloha, ke které patří aktuální uživatelská spojení
 
         # pro 3D
         self.points = []
@@ -66,8 +85,16 @@ class TaskScreen:
         clean_width = width * 2
         self.btn_clean = Button(0, 0, clean_width, height, "Vyčistit")
 
-        # y souřadnice čáry
-        self.line_y = (4 * glob_var.SCREEN_HEIGHT) // 5
+        # tlačítko Nápověda – zvýrazní jeden rozdíl od nejbližšího řešení
+        self.btn_hint = Button(0, 0, width * 2.5, height, "Nápověda")
+        self.hint_engine = None  # HintEngine aktuální úlohy
+        self.hint = None  # zvýrazněný prvek (Hint), zruší se další úpravou
+        self._hint_state = None  # stav spojení (pack_state), ze kterého hint_engine vychází
+
+        # y souřadnice čáry (nastaví se v apply_layout)
+        self.line_y = None
+        self.layout = None
+        self.points_in_middle = False  # 3D grid uprostřed obrazovky (tutoriál 0.1)
 
         # řeší dvojklik
         self.mouse_click_handler = MouseClickHandler(double_click_interval=400)
@@ -103,6 +130,68 @@ class TaskScreen:
         # správa načtení výsledku když admin
         self.loaded = False
 
+        # předvykreslené vrstvy spojení (zadání úlohy a uživatelská spojení)
+        self.task_layer = ConnectionLayer()
+        self.user_layer = ConnectionLayer()
+
+        self.apply_layout(get_layout())
+
+    # ------------------------
+    # Rozložení obrazovky
+    # ------------------------
+    def apply_layout(self, layout):
+        """
+        Převezme rozložení obrazovky (při vytvoření a při změně velikosti okna).
+
+        Nastaví pozice tlačítek, a pokud už existují body gridů, přepočítá
+        jejich souřadnice na místě – uživatelská spojení tak zůstanou zachována.
+        """
+        self.layout = layout
+        self.line_y = layout.line_y
+        self.margin_x_button = glob_var.BTN_HEIGHT
+
+        # velikosti a fonty tlačítek závisí na velikosti okna
+        size = glob_var.BTN_HEIGHT
+        for button in (self.btn_prev, self.btn_next, self.btn_home, self.pop_btn_draw):
+            button.set_size(size, size)
+            button.change_font(glob_var.FONT)
+        self.btn_clean.set_size(size * 2, size)
+        self.btn_hint.set_size(size * 2.5, size)
+        for button in (self.btn_clean, self.btn_hint):
+            button.change_font(glob_var.FONT)
+        for button in (self.pop_btn_p, self.pop_btn_n, self.pop_btn_b):
+            button.set_size(size // 2.5, size // 2.5)
+
+        # tlačítka < a >
+        self.btn_prev.set_x(layout.prev_button_pos[0])
+        self.btn_prev.set_y(layout.prev_button_pos[1])
+        self.btn_next.set_x(layout.next_button_pos[0])
+        self.btn_next.set_y(layout.next_button_pos[1])
+
+        # tlačítko domů
+        self.btn_home.change_font(layout.symbol_font)
+        self.btn_home.set_x(layout.width - self.btn_home.get_width() - glob_var.BTN_HEIGHT)
+        self.btn_home.set_y((1 / 2) * glob_var.BTN_HEIGHT)
+
+        # tlačítka "?" u 2D gridů
+        for button, (x, y) in zip((self.pop_btn_p, self.pop_btn_n, self.pop_btn_b), layout.pop_up_positions):
+            button.set_x(x)
+            button.set_y(y)
+            button.change_font(glob_var.POP_UP_FONT)
+
+        # tlačítko nápovědy kreslení
+        self.pop_btn_draw.set_x(int(layout.width - glob_var.BTN_HEIGHT * 3.5))
+        self.pop_btn_draw.set_y(glob_var.BTN_HEIGHT // 2)
+
+        # existující body se jen přepočítají
+        if self.points:
+            grid_3d.reproject_3d_points(self.points, in_middle=self.points_in_middle)
+        if self.p_points:
+            grid_2d.reproject_all_2d_points(self.p_points, self.n_points, self.b_points)
+
+        if self.current_task is not None and self.current_task.text.strip():
+            self.prepare_task_text(self.current_task.text)
+
     # ------------------------
     # Reset úlohy
     # ------------------------
@@ -119,10 +208,12 @@ class TaskScreen:
         self.user_bokorys_connections.clear()
 
     def reset_task(self):
-        """Vymaže data aktuální úlohy před načtením nové."""
+        """Uloží rozpracovaný stav aktuální úlohy a vymaže její data před načtením nové."""
+        self._save_session()
         self._clear_all_points()
         self.current_task = None
         self.just_resolved = False
+        self.hint = None
         self._clear_all_user_connections()
         # správa načtení výsledku když admin
         self.loaded = False
@@ -132,6 +223,116 @@ class TaskScreen:
         self.pop_up_b.hide()
         self.pop_up_draw.hide()
     # ------------------------
+    # Rozpracovaný stav úlohy a krok zpět
+    # ------------------------
+    def _pack_user_state(self) -> bytes:
+        """Uživatelská spojení v kompaktním kanonickém tvaru (viz elements/task_session.py)."""
+        return pack_state(grid_3d.grid_size_of(self.points), self.user_connections, self.user_pudorys_connections,
+                          self.user_narys_connections, self.user_bokorys_connections)
+
+    def _restore_user_state(self, blob: bytes):
+        """Obnoví uživatelská spojení z pack_state() nad body aktuálních gridů."""
+        size, (codes_3d, codes_p, codes_n, codes_b) = unpack_state(blob)
+        if size != grid_3d.grid_size_of(self.points):
+            return  # stav z mřížky jiné velikosti (úloha se mezitím změnila v editoru)
+        self.user_connections = connections_from_codes(codes_3d, self.points, size, is_3d=True)
+        for conns, codes, points in (
+                (self.user_pudorys_connections, codes_p, self.p_points),
+                (self.user_narys_connections, codes_n, self.n_points),
+                (self.user_bokorys_connections, codes_b, self.b_points),
+        ):
+            conns[:] = connections_from_codes(codes, points, size, is_3d=False)
+
+    def _grids_by_key(self) -> dict:
+        return {"3d": self.points, "p": self.p_points, "n": self.n_points, "b": self.b_points}
+
+    def _save_session(self):
+        """Uloží spojení, vybraný bod a historii aktuální úlohy do cache rozpracovaných úloh."""
+        if self._session_task_id is None:
+            return
+        state = self._pack_user_state()
+        if unpack_state(state)[1] != [[], [], [], []] or self.undo_history:
+            selection = None
+            for grid_key, points in self._grids_by_key().items():
+                index = next((i for i, point in enumerate(points) if point.selected), None)
+                if index is not None:
+                    selection = (grid_key, index)
+                    break
+            self.sessions.put(self.player_name, self._session_task_id,
+                              TaskSession(state, selection, list(self.undo_history)))
+        self._session_task_id = None
+        self.undo_history = []
+
+    def _restore_session(self, task_id: str):
+        """Obnoví rozpracovaný stav úlohy, pokud je v cache."""
+        session = self.sessions.take(self.player_name, task_id)
+        if session is None:
+            return
+        self._restore_user_state(session.state)
+        self.undo_history = list(session.undo)
+        if session.selection is not None:
+            grid_key, index = session.selection
+            points = self._grids_by_key().get(grid_key, [])
+            if index < len(points):
+                points[index].selected = True
+                if grid_key != "3d":
+                    self.active_grid = grid_key
+
+    def _push_undo(self, state: bytes):
+        """Přidá stav před změnou do historie (nejstarší se zahodí)."""
+        self.undo_history.append(state)
+        if len(self.undo_history) > self.max_undo:
+            del self.undo_history[0]
+
+    def _undo(self):
+        """Krok zpět – vrátí spojení do stavu před poslední změnou."""
+        if self.undo_history:
+            self._restore_user_state(self.undo_history.pop())
+
+    # ------------------------
+    # Nápověda
+    # ------------------------
+    def _hint_parts(self) -> dict:
+        """Uživatelská spojení podle částí nápovědy – ve stejném pořadí jako v pack_state()."""
+        return {"3d": self.user_connections, "pudorys": self.user_pudorys_connections,
+                "narys": self.user_narys_connections, "bokorys": self.user_bokorys_connections}
+
+    def _update_hints(self, state: bytes | None = None):
+        """
+        Po úpravě spojení předá hint_engine jen změněné části (3D nebo jeden pohled)
+        a zruší zvýraznění předchozí nápovědy.
+        """
+        if self.hint_engine is None:
+            return
+        if state is None:
+            state = self._pack_user_state()
+        if state == self._hint_state:
+            return
+        old_parts = unpack_state(self._hint_state)[1] if self._hint_state is not None else None
+        new_parts = unpack_state(state)[1]
+        for index, (part, connections) in enumerate(self._hint_parts().items()):
+            if old_parts is None or old_parts[index] != new_parts[index]:
+                self.hint_engine.update(part, connections_to_segments(connections))
+        self._hint_state = state
+        self.hint = None
+
+    def _show_hint(self):
+        """Vybere jeden rozdíl od nejbližšího řešení ke zvýraznění."""
+        self._update_hints()
+        self.hint = self.hint_engine.hint() if self.hint_engine is not None else None
+
+    def _on_level_event(self, event: str, level: str | None):
+        """
+        Změna v katalogu úloh (editor): aktualizuje seznam levelů a zahodí jen
+        změněnou úlohu – načte se znovu při příštím vykreslení, uživatelská spojení zůstanou.
+        """
+        if event != "changed":
+            self.levels = self.level_data.get_all_levels()
+        self.prefetcher.discard(level)
+        if self.current_task is not None and (level is None or level == self.current_task.task_id):
+            self.current_task = None
+
+    # ------------------------
     # "namapování" bodů na skutečné GridPoint objekty
     # ------------------------
 
@@ -189,7 +390,7 @@ class TaskScreen:
 
     def _handle_2d_to_3d_mouse_down(self, mouse_pos, event):
         clicked_any = False
-        for point in self.points:
+        for point in nearest_first(self.points, mouse_pos):
             new_conn, clicked = point.click(self.points, mouse_pos, event, self.user_connections)
             if new_conn:
                 self.user_connections.append(new_conn)
@@ -216,7 +417,7 @@ class TaskScreen:
 
         for points_list, user_conns, grid_key in grids:
             if self.active_grid is None or self.active_grid == grid_key:
-                for point in points_list:
+                for point in nearest_first(points_list, mouse_pos):
                     new_conn, clicked = point.click(points_list, mouse_pos, event, user_conns)
                     if clicked:
                         self.active_grid = grid_key
@@ -253,6 +454,7 @@ class TaskScreen:
         clicked_next = self.btn_next.click(event)
         clicked_home = self.btn_home.click(event)
         clicked_clean = self.btn_clean.click(event)
+        clicked_hint = self.btn_hint.click(event)
         clicked_pop_n = self.pop_btn_n.click(event)
         clicked_pop_p = self.pop_btn_p.click(event)
         clicked_pop_b = self.pop_btn_b.click(event)
@@ -274,30 +476,24 @@ class TaskScreen:
         if clicked_clean:
             self._clear_all_user_connections()
 
+        if clicked_hint:
+            self._show_hint()
+
         if clicked_home:
             escape_pressed = True
 
         elif clicked_prev or (event.type == pygame.KEYDOWN and event.key == pygame.K_LEFT):
-            chapter, sub = task.task_id.split(".")
-            sub = int(sub)
-            if sub > 1:
-                new_task_id = f"{chapter}.{sub - 1}"
+            # předchozí existující level v kapitole (i při mezerách v číslování)
+            new_task_id = self.level_data.get_prev_level(task.task_id) or ""
 
         elif clicked_next or (event.type == pygame.KEYDOWN and event.key == pygame.K_RIGHT):
             if self.btn_next.enabled:
-                chapter, sub = task.task_id.split(".")
-                current_chapter = None
-                for chap in self.level_data.get_chapters():
-                    if any(level.startswith(chapter + ".") for level in chap["levels"]):
-                        current_chapter = chap
-                        break
-                if current_chapter:
-                    levels = current_chapter["levels"]
-                    current_index = levels.index(task.task_id)
-                    if current_index < len(levels) - 1:
-                        new_task_id = levels[current_index + 1]
-                    else:
-                        escape_pressed = True
+                next_task_id = self.level_data.get_next_level(task.task_id)
+                if next_task_id is not None:
+                    new_task_id = next_task_id
+                elif self.level_data.has_level(task.task_id):
+                    # poslední level kapitoly → návrat na výběr levelů
+                    escape_pressed = True
         else:
             new_task_id = ""
         return new_task_id, escape_pressed
@@ -326,10 +522,24 @@ class TaskScreen:
             # -----------------------------
             # ESC
             # -----------------------------
+            # stav spojení před událostí myši (pro krok zpět)
+            state_before = None
+            if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                state_before = self._pack_user_state()
+
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                # rozpracovaný stav zůstane v cache, obrazovka se vyčistí
+                self._save_session()
                 self._clear_all_user_connections()
                 escape_pressed = True
 
+            # -----------------------------
+            # Ctrl+Z – krok zpět
+            # -----------------------------
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+                self._undo()
+                self._update_hints()
+
             # -----------------------------
             # Šipky dopředu a dozadu – posouvání úlohy dpředu nebo dozadu
             # -----------------------------
@@ -349,6 +559,7 @@ class TaskScreen:
                 self.btn_next.click(event)
                 self.btn_home.click(event)
                 self.btn_clean.click(event)
+                self.btn_hint.click(event)
                 self.pop_btn_n.click(event)
                 self.pop_btn_p.click(event)
                 self.pop_btn_b.click(event)
@@ -395,6 +606,12 @@ class TaskScreen:
                         grid_fun.change_dashed_of_connection(conns, mouse_pos)
                         grid_fun.merge_if_double_connections_2d(conns)
 
+            if state_before is not None:
+                state_after = self._pack_user_state()
+                if state_before != state_after:
+                    self._push_undo(state_before)
+                    self._update_hints(state_after)
+
         return escape_pressed, new_task_id
 
     # ======================================================
@@ -402,21 +619,10 @@ class TaskScreen:
     # ======================================================
 
     def draw_buttons(self, screen, current_task, was_resolved=False, is_currently_resolved=False):
-        """Vykreslí tlačítka < a > vedle textu, fixně vycentrovaná mezi čárou a spodním okrajem okna."""
-        margin_x = self.margin_x_button
-        line_y = (4 * glob_var.SCREEN_HEIGHT) // 5  # Y souřadnice čáry
-        bottom_y = glob_var.SCREEN_HEIGHT
-
-        # vertikální střed mezi čárou a spodním okrajem
-        center_y = line_y + (bottom_y - line_y) // 2
-
-        # nastavení pozice tlačítek
-        self.btn_prev.set_x(margin_x)
-        self.btn_prev.set_y(center_y - self.btn_prev.get_height() // 2)
-
-        self.btn_next.set_x(glob_var.SCREEN_WIDTH - margin_x - self.btn_prev.get_width())
-        self.btn_next.set_y(center_y - self.btn_next.get_height() // 2)
-
+        """
+        Vykreslí tlačítka < a > vedle textu, fixně vycentrovaná mezi čárou a spodním okrajem okna.
+        Pozice tlačítek se nastavují v apply_layout.
+        """
         # pokud byla úloha již vyřešená anebo je aktuálně vyřešená, umožni zmáčknutí tlačítka
         if was_resolved or is_currently_resolved or self.just_resolved:
             self.btn_next.enable()
@@ -433,20 +639,11 @@ class TaskScreen:
             self.btn_next.disable()
 
         # vykreslení tlačítek
-        if current_task.sub_id > 1:
+        if self.level_data.get_prev_level(current_task.task_id) is not None:
             self.btn_prev.draw(screen)
         self.btn_next.draw(screen)
 
     def draw_home_button(self, screen):
-        x_offset = glob_var.BTN_HEIGHT
-        y_offset = (1 / 2) * glob_var.BTN_HEIGHT
-        x = glob_var.SCREEN_WIDTH - self.btn_home.get_width() - x_offset
-        y = y_offset
-
-        self.btn_home.change_font(pygame.font.SysFont("Segoe UI Symbol", glob_var.FONT_SIZE))
-
-        self.btn_home.set_x(x)
-        self.btn_home.set_y(y)
         self.btn_home.draw(screen)
 
     def draw_clean_button(self, screen, task):
@@ -463,48 +660,52 @@ class TaskScreen:
         self.btn_clean.set_y(y)
         self.btn_clean.draw(screen)
 
-    def draw_pop_up_buttons(self, screen, p_pos, n_pos, b_pos, l_square_length):
-        def shift_to_pop_x(left_grid_corner):
-            x, y = left_grid_corner
-            pop_x = x + 1.9 * l_square_length
-            pop_y = y + 2.5 * l_square_length
-            return pop_x, pop_y
-
-        # vypočítat nové pozice tlačítek
-        n_x, n_y = shift_to_pop_x(n_pos)
-        p_x, p_y = shift_to_pop_x(p_pos)
-        b_x, b_y = shift_to_pop_x(b_pos)
-
-        # nastavit pozice
-        self.pop_btn_n.set_x(n_x)
-        self.pop_btn_n.set_y(n_y)
-
-        self.pop_btn_p.set_x(p_x)
-        self.pop_btn_p.set_y(p_y)
-
-        self.pop_btn_b.set_x(b_x)
-        self.pop_btn_b.set_y(b_y)
-
-        # nastavit menší font
-        self.pop_btn_n.change_font(glob_var.POP_UP_FONT)
-        self.pop_btn_p.change_font(glob_var.POP_UP_FONT)
-        self.pop_btn_b.change_font(glob_var.POP_UP_FONT)
-
-        # vykreslit
+        # Nápověda vlevo od tlačítka Vyčistit, u 3D_to_2D nad ním (vpravo je popisek půdorysu)
+        spacing = glob_var.BTN_HEIGHT // 4
+        hint_y = y
+        if x < 0:
+            hint_x = -1000
+        elif task.task_type == "3D_to_2D":
+            hint_x = x
+            hint_y = y - self.btn_hint.get_height() - spacing
+        else:
+            hint_x = x - spacing - self.btn_hint.get_width()
+        self.btn_hint.set_x(hint_x)
+        self.btn_hint.set_y(hint_y)
+        self.btn_hint.draw(screen)
+
+    def draw_hint(self, screen):
+        """Zvýrazní prvek nápovědy v gridu a nad tlačítkem Nápověda vypíše, co s ním udělat."""
+        hint = self.hint
+        if hint is None:
+            return
+        color = {"missing": glob_var.GREEN, "wrong_dash": glob_var.BLUE, "extra": glob_var.RED}[hint.kind]
+        width = glob_var.LINE_SOLUTION_WIDTH
+
+        if hint.part == "3d":
+            by_coords = {(point.col, point.row, point.lay): point for point in self.points}
+            if hint.a in by_coords and hint.b in by_coords:
+                grid_3d.draw_connections([Connection3D(by_coords[hint.a], by_coords[hint.b], dashed=hint.dashed)],
+                                         screen, color, width)
+        else:
+            points = {"pudorys": self.p_points, "narys": self.n_points, "bokorys": self.b_points}[hint.part]
+            by_coords = {(point.col, point.row): point for point in points}
+            if hint.a in by_coords and hint.b in by_coords:
+                grid_2d.draw_lines_from_connections(
+                    screen, [Connection2D(by_coords[hint.a], by_coords[hint.b], dashed=hint.dashed)], color, width)
+
+        text = glob_var.FONT.render(hint.text, True, color)
+        x = self.btn_hint.rect.centerx - text.get_width() // 2
+        x = max(0, min(x, glob_var.SCREEN_WIDTH - text.get_width()))
+        screen.blit(text, (x, self.btn_hint.rect.y - text.get_height() - 10))
+
+    def draw_pop_up_buttons(self, screen):
+        """Vykreslí tlačítka "?" u 2D gridů (pozice a font se nastavují v apply_layout)."""
         self.pop_btn_n.draw(screen)
         self.pop_btn_p.draw(screen)
         self.pop_btn_b.draw(screen)
 
     def draw_pop_up_draw_button(self, screen):
-        # vypočítat nové pozice tlačítek
-        x = int(glob_var.SCREEN_WIDTH - glob_var.BTN_HEIGHT * 3.5)
-        y = glob_var.BTN_HEIGHT // 2
-
-        # nastavit pozice
-        self.pop_btn_draw.set_x(x)
-        self.pop_btn_draw.set_y(y)
-
-        # vykreslit
         self.pop_btn_draw.draw(screen)
 
     def draw_pop_up_windows(self, screen, task):
@@ -592,65 +793,19 @@ class TaskScreen:
             x = ((glob_var.SCREEN_WIDTH - surf.get_width()) // 2)
             screen.blit(surf, (x, y))
 
-    def prepare_task_text(self, text):
-        """Vykreslí text zadání úlohy vycentrovaný mezi čárou a spodním okrajem okna a odsazený od tlačítek < a >."""
-        font = glob_var.FONT
-        color = (230, 230, 230)
-
+    def _text_geometry(self) -> tuple:
+        """Parametry rozložení textu zadání pro aktuální velikost okna (viz utils.layout)."""
         # margin_x = šířka tlačítek + x_offset talčítka + rezerva
         margin_x = self.btn_prev.get_width() + self.margin_x_button + 40
-        line_y = (4 * glob_var.SCREEN_HEIGHT) // 5  # Y souřadnice čáry
-        bottom_y = glob_var.SCREEN_HEIGHT  # dolní okraj
-        max_width = glob_var.SCREEN_WIDTH - 2 * margin_x
-        line_spacing = 5  # mezera mezi řádky
-        padding_top = 8  # mezera od čáry nad textem
-
-        available_height = bottom_y - line_y - padding_top
-
-        font_size = font.get_height()
-        min_font_size = 16
-
-        # Zmenšování fontu, pokud text přeteče
-        while font_size >= min_font_size:
-            font = pygame.font.SysFont("Gabriola", font_size)
-
-            words = text.split(" ")
-            lines = []
-            current_line = ""
-            for word in words:
-                test_line = current_line + word + " "
-                if font.size(test_line)[0] <= max_width:
-                    current_line = test_line
-                else:
-                    lines.append(current_line.strip())
-                    current_line = word + " "
-            if current_line:
-                lines.append(current_line.strip())
-
-            total_text_height = (
-                    sum(font.size(line)[1] for line in lines)
-                    + line_spacing * (len(lines) - 1)
-            )
-
-            if total_text_height <= available_height:
-                break
-
-            font_size -= 1
-
-        # Vertikální pozice
-        top_y = line_y + padding_top + (available_height - total_text_height) // 2
+        return task_text_geometry(self.layout, margin_x)
 
-        # Připravit seznam povrchů
-        self.task_text_surfaces = []
-        self.task_text_positions = []
+    def prepare_task_text(self, text):
+        """Vykreslí text zadání úlohy vycentrovaný mezi čárou a spodním okrajem okna a odsazený od tlačítek < a >."""
+        self.task_text_surfaces, self.task_text_positions = layout_task_text(text, self._text_geometry())
 
-        y = top_y
-        for line in lines:
-            surf = font.render(line, True, color)
-            x = margin_x + (max_width - surf.get_width()) // 2
-            self.task_text_surfaces.append(surf)
-            self.task_text_positions.append((x, y))
-            y += surf.get_height() + line_spacing
+    def prefetch(self, task_ids):
+        """Připraví úlohy na pozadí (např. první nevyřešené úlohy kapitol z obrazovky levelů)."""
+        self.prefetcher.request(task_ids, self._text_geometry())
 
     def draw_task_text(self, screen):
         """Vykreslí předem připravené povrchy textu."""
@@ -660,16 +815,37 @@ class TaskScreen:
     def _ensure_task_loaded(self, task_id):
         """Načte TaskData pouze při změně úlohy, NERESERTUJE uživatelská spojení."""
         if self.current_task is None or self.current_task.task_id != str(task_id):
-            # Vytvoření nové úlohy
-            self.current_task = TaskData(task_id)
-
-            # Zde se připraví text – počítá se jen jednou
-            if self.current_task.text.strip():
-                self.prepare_task_text(self.current_task.text)
+            geometry = self._text_geometry()
+            prepared = self.prefetcher.get(task_id)
+            if prepared is None:
+                # Úloha není přednačtená → vytvoří se hned
+                prepared = PreparedTask(TaskData(task_id, self.level_data.data_file), None, [], [])
+            self.current_task = prepared.task
+            self.hint_engine = HintEngine.for_task(self.current_task.data)
+            self._hint_state = None
+            self.hint = None
+
+            # Zde se připraví text – počítá se jen jednou (přednačtený text jen při jiné velikosti okna)
+            if prepared.geometry != geometry:
+                prepared.text_surfaces, prepared.text_positions = layout_task_text(self.current_task.text, geometry)
+                prepared.geometry = geometry
+                self.prefetcher.put(prepared)
+            self.task_text_surfaces = prepared.text_surfaces
+            self.task_text_positions = prepared.text_positions
+
+            # na pozadí se připraví sousední úlohy
+            self.prefetcher.request((self.level_data.get_next_level(self.current_task.task_id),
+                                     self.level_data.get_prev_level(self.current_task.task_id)), geometry)
 
             # body 2D/3D se inicializují až pokud ještě nejsou
             self._ensure_grids_initialized(task_id)
 
+            # úloha se jen znovu načetla (např. po úpravě v editoru) → spojení zůstávají
+            if self._session_task_id == self.current_task.task_id:
+                self._update_hints()
+                return
+            self._session_task_id = self.current_task.task_id
+
             # --- Tutorial: předvyplněné user_connections ---
             if self.current_task.task_type == "tutorial":
                 tutorial_connections = {
@@ -684,29 +860,42 @@ class TaskScreen:
                         Connection3D(a, b, dashed=False) for a, b in tutorial_connections[self.current_task.task_id]
                     ]
 
+            # rozpracovaná úloha → obnovení spojení, vybraného bodu a historie
+            self._restore_session(self.current_task.task_id)
+            self._update_hints()
+
     def _ensure_grids_initialized(self, task_id):
-        """Inicializuje 3D a 2D gridy pouze jednou."""
+        """Inicializuje 3D a 2D gridy pouze jednou (znovu jen při jiné velikosti mřížky úlohy)."""
+        size = self.current_task.size
+        if self.points and grid_3d.grid_size_of(self.points) != size:
+            # úloha má po úpravě v editoru jinou mřížku → dosavadní spojení na ni nepasují
+            self._clear_all_points()
+            self._clear_all_user_connections()
+
         if not self.points:
-            if task_id == "0.1":
-                self.points = grid_3d.create_3d_points(in_middle=True)
-            else:
-                self.points = grid_3d.create_3d_points()
+            self.points_in_middle = (task_id == "0.1")
+            self.points = grid_3d.create_3d_points(in_middle=self.points_in_middle, size=size)
 
         if not self.p_points:
-            self.p_points, self.n_points, self.b_points = grid_2d.create_all_2d_points()
+            self.p_points, self.n_points, self.b_points = grid_2d.create_all_2d_points(size)
 
     def _draw_2d_grids(self, screen, task, mouse_pos, player_name):
-        """Vykreslí všechny 2D pohledy (půdorys, nárys, bokorys)."""
+        """
+        Vykreslí všechny 2D pohledy (půdorys, nárys, bokorys).
+
+        Returns:
+            list[tuple]: skupiny (connections, color, width) zadání pro self.task_layer
+        """
         green = glob_var.GREEN
         blue = glob_var.BLUE
         red = glob_var.RED
         p_color = n_color = b_color = (255, 255, 255)
 
-        l_square_length = grid_2d.count_square_length()
-        p_pos, n_pos, b_pos = grid_2d.find_left_upper_corners(l_square_length)
+        l_square_length = self.layout.square_2d
+        p_pos, n_pos, b_pos = self.layout.corners_2d
 
         if task.task_type != "tutorial":
-            self.draw_pop_up_buttons(screen, p_pos, n_pos, b_pos, l_square_length)
+            self.draw_pop_up_buttons(screen)
 
         # Napárování spojů z TaskData → reálné body
         p_conns = self._map_connections_to_points_2d(task.pudorys_connections, self.p_points)
@@ -726,13 +915,15 @@ class TaskScreen:
             ("Bokorys", b_pos, self.b_points, b_conns, "b", b_color),
         ]
 
+        layer_groups = []
         for title, pos, points, conns, grid_key, color in grids:
             if task.task_type == "2D_to_3D" or (
                     (task.task_type == "tutorial") and (
                     task.task_id in ("0.5", "0.6", "0.9", "0.7", "0.8", "0.10", "0.2", "0.3", "0.4"))):
-                grid_2d.draw_task(screen, pos, l_square_length, title, conns, points,
-                                  mouse_pos=None, gridpoints_enabled=False, connections_color=color,
-                                  connections_width=glob_var.LINE_WIDTH)
+                # spojení zadání se vykreslí přes předvykreslenou vrstvu
+                grid_2d.draw_task(screen, pos, l_square_length, title, [], points,
+                                  mouse_pos=None, gridpoints_enabled=False)
+                layer_groups.append((conns, color, glob_var.LINE_WIDTH))
             else:  # 3D_to_2D
                 grid_2d.draw_task(screen, pos, l_square_length, title, [], points, mouse_pos=mouse_pos,
                                   gridpoints_enabled=(self.active_grid in (None, grid_key)),
@@ -744,9 +935,16 @@ class TaskScreen:
             self.user_bokorys_connections = b_conns
             self.loaded = True
 
+        return layer_groups
 
     def _draw_3d_part(self, screen, task, mouse_pos, player_name):
-        """Vykreslí 3D mřížku a případně i řešení."""
+        """
+        Vykreslí 3D mřížku a připraví případně i řešení.
+
+        Returns:
+            list[tuple]: skupiny (connections, color, width) zadání pro self.task_layer
+        """
+        layer_groups = []
 
         show_active_grid = (
                 task.task_type == "2D_to_3D" or
@@ -762,7 +960,7 @@ class TaskScreen:
                 self.loaded = True
         else:
             grid_3d.draw_3d_grid(screen, self.points, gridpoints_enabled=False)
-            grid_3d.draw_connections(conns, screen, line_width=glob_var.LINE_WIDTH)
+            layer_groups.append((conns, (255, 255, 255), glob_var.LINE_WIDTH))
 
         # barevné zvýraznění řešení
         color_map = {
@@ -773,7 +971,9 @@ class TaskScreen:
 
         if task.task_id in color_map and task.unpacked_data3d[1] and len(task.unpacked_data3d[1]) > 1:
             conns = self._map_connections_to_points_3d(task.unpacked_data3d[1], self.points)
-            grid_3d.draw_connections(conns, screen, line_color=color_map[task.task_id], line_width=glob_var.LINE_WIDTH)
+            layer_groups.append((conns, color_map[task.task_id], glob_var.LINE_WIDTH))
+
+        return layer_groups
 
     def _draw_separator_and_text(self, screen):
         """Vykreslí oddělovací čáru a předpočítaný text zadání."""
@@ -786,6 +986,8 @@ class TaskScreen:
     def _check_and_draw_solution(self, screen, task):
         """
         Zkontroluje řešení, nastaví styl a vykreslí uživatelská spojení.
+        Uživatelská spojení se kreslí přes self.user_layer, která se překreslí
+        jen při změně spojení nebo barvy (např. zezlátnutí po vyřešení).
 
         Returns:
             bool: True pokud je řešení správné
@@ -799,19 +1001,19 @@ class TaskScreen:
 
         if task.task_type == "2D_to_3D" or (
                 (task.task_type == "tutorial") and (task.task_id in ("0.5", "0.6", "0.9", "0.7", "0.8", "0.10"))):
-            if grid_fun.check_3d_solution(self.user_connections, task.unpacked_data3d):
+            if grid_fun.check_3d_solution(self.user_connections, task.unpacked_data3d, task.size):
                 resolved = True
 
             if resolved:
                 color = (255, 215, 0)
                 self.just_resolved = True
                 width = int(glob_var.LINE_SOLUTION_WIDTH)
-            grid_3d.draw_connections(self.user_connections, screen, color, width)
+            self.user_layer.draw(screen, [(self.user_connections, color, width)])
 
         elif task.task_type == "3D_to_2D":
-            pudorys_ok = grid_fun.check_2d_solution(self.user_pudorys_connections, task.pudorys_connections)
-            narys_ok = grid_fun.check_2d_solution(self.user_narys_connections, task.narys_connections)
-            bokorys_ok = grid_fun.check_2d_solution(self.user_bokorys_connections, task.bokorys_connections)
+            pudorys_ok = grid_fun.check_2d_solution(self.user_pudorys_connections, task.pudorys_connections, task.size)
+            narys_ok = grid_fun.check_2d_solution(self.user_narys_connections, task.narys_connections, task.size)
+            bokorys_ok = grid_fun.check_2d_solution(self.user_bokorys_connections, task.bokorys_connections, task.size)
 
             resolved = pudorys_ok and narys_ok and bokorys_ok
 
@@ -820,9 +1022,11 @@ class TaskScreen:
                 self.just_resolved = True
                 width = int(glob_var.LINE_SOLUTION_WIDTH)
 
-            grid_2d.draw_lines_from_connections(screen, self.user_pudorys_connections, color, width)
-            grid_2d.draw_lines_from_connections(screen, self.user_narys_connections, color, width)
-            grid_2d.draw_lines_from_connections(screen, self.user_bokorys_connections, color, width)
+            self.user_layer.draw(screen, [
+                (self.user_pudorys_connections, color, width),
+                (self.user_narys_connections, color, width),
+                (self.user_bokorys_connections, color, width),
+            ])
 
         return resolved
 
@@ -836,6 +1040,7 @@ class TaskScreen:
         Returns:
             bool: True pokud je úkol vyřešen během tohoto vykreslení
         """
+        self.player_name = player_name
         self._ensure_task_loaded(task_id)
 
         task = self.current_task
@@ -843,12 +1048,16 @@ class TaskScreen:
 
         mouse_pos = pygame.mouse.get_pos()
 
+        task_layer_groups = []
         if not (task.task_type == "tutorial" and task.task_id == "0.1"):
-            self._draw_2d_grids(screen, task, mouse_pos, player_name)
-        self._draw_3d_part(screen, task, mouse_pos, player_name)
+            task_layer_groups += self._draw_2d_grids(screen, task, mouse_pos, player_name)
+        task_layer_groups += self._draw_3d_part(screen, task, mouse_pos, player_name)
+        self.task_layer.draw(screen, task_layer_groups)
         self._draw_separator_and_text(screen)
 
         resolved = self._check_and_draw_solution(screen, task)
+        if resolved:
+            self.hint = None
 
         self.draw_buttons(
             screen,
@@ -861,6 +1070,7 @@ class TaskScreen:
             self.draw_pop_up_draw_button(screen)
             if task_id not in ("0.7", "0.8", "0.10"):
                 self.draw_clean_button(screen, task)
+                self.draw_hint(screen)
         self._draw_id(screen, task, was_resolved, resolved)
         self._draw_arrow(screen, task)
 
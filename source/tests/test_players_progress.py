@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+test_players_progress.py
+------------------------
+Testy obnovy deníku pokroku hráčů (PlayerProgress(journal=True)) po pádu aplikace:
+    • useknutý poslední řádek deníku,
+    • nedokončené zhuštění (zbylý soubor .compacting),
+    • připisování do deníku po obnově.
+
+Spuštění (ze složky source/):
+    python -m pytest -q tests
+"""
+
+import json
+
+import pytest
+
+from elements.players_progress import COMPACTING_SUFFIX, PlayerProgress, _read_journal
+
+
+def _line(entry: dict) -> bytes:
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+@pytest.fixture
+def paths(tmp_path):
+    """Cesty ke snímku, deníku a přejmenovanému deníku v dočasné složce."""
+    snapshot = tmp_path / "resolved_tasks.json"
+    journal = tmp_path / "resolved_tasks.journal"
+    compacting = tmp_path / ("resolved_tasks.journal" + COMPACTING_SUFFIX)
+    return snapshot, journal, compacting
+
+
+def _progress(snapshot, **kwargs) -> PlayerProgress:
+    return PlayerProgress(str(snapshot), journal=True, **kwargs)
+
+
+def test_truncated_last_line_is_skipped_and_cut(paths):
+    snapshot, journal, _ = paths
+    complete = _line({"p": "Anna"}) + _line({"p": "Anna", "l": "1.1"})
+    journal.write_bytes(complete + b'{"p":"Anna","l":"1.')  # pád uprostřed zápisu
+
+    progress = _progress(snapshot)
+
+    assert progress.players == {"Anna": {"completed_levels": ["1.1"]}}
+    assert progress.journal_stats["replayed"] == 2
+    assert progress.journal_stats["skipped"] == 1
+    assert journal.read_bytes() == complete
+
+
+def test_truncated_only_line_leaves_empty_journal(paths):
+    snapshot, journal, _ = paths
+    journal.write_bytes(b'{"p":"An')
+
+    entries, skipped = _read_journal(str(journal))
+
+    assert (entries, skipped) == ([], 1)
+    assert journal.read_bytes() == b""
+
+
+def test_leftover_compacting_is_replayed_and_removed(paths):
+    snapshot, journal, compacting = paths
+    snapshot.write_text(json.dumps({"Anna": {"completed_levels": ["1.1"]}}), encoding="utf-8")
+    # zhuštění spadlo po přejmenování deníku, nový deník už má další změnu
+    compacting.write_bytes(_line({"p": "Anna", "l": "1.2"}) + _line({"p": "Bob"}))
+    journal.write_bytes(_line({"p": "Bob", "l": "2.1"}))
+
+    progress = _progress(snapshot)
+
+    expected = {"Anna": {"completed_levels": ["1.1", "1.2"]}, "Bob": {"completed_levels": ["2.1"]}}
+    assert progress.players == expected
+    assert json.loads(snapshot.read_text(encoding="utf-8")) == expected
+    assert not compacting.exists()
+    assert journal.read_bytes() == b""
+
+
+def test_append_after_recovery_starts_on_clean_line(paths):
+    snapshot, journal, _ = paths
+    journal.write_bytes(_line({"p": "Anna", "l": "1.1"}) + b'{"p":"Anna","l"')
+
+    progress = _progress(snapshot)
+    assert progress.update_player_level("Anna", "1.2")
+    progress.save_progress()
+    progress.flush()
+
+    lines = journal.read_bytes().splitlines()
+    assert [json.loads(line) for line in lines] == [{"p": "Anna", "l": "1.1"}, {"p": "Anna", "l": "1.2"}]
+
+    reloaded = _progress(snapshot)
+    assert reloaded.players == {"Anna": {"completed_levels": ["1.1", "1.2"]}}
+    assert reloaded.journal_stats["skipped"] == 0
+
+
+def test_compaction_writes_snapshot_and_empties_journal(paths):
+    snapshot, journal, compacting = paths
+    progress = _progress(snapshot, compact_bytes=1)
+    progress.update_player_level("Anna", "1.1")
+    progress.save_progress()
+    progress.flush()
+
+    assert progress.journal_stats["compactions"] == 1
+    assert json.loads(snapshot.read_text(encoding="utf-8")) == {"Anna": {"completed_levels": ["1.1"]}}
+    assert not compacting.exists()
+    assert not journal.exists() or journal.read_bytes() == b""
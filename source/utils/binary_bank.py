@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+"""
+binary_bank.py
+--------------
+Binární formát databáze úloh pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • převod data.json → binární banku (.cubq) a zpět bez ztráty informací,
+    • čtení binární banky přes mmap (bez kopírování celého souboru do paměti),
+    • porovnání rychlosti studeného startu a přepnutí úlohy s JSON (benchmark).
+
+Formát (little-endian):
+    hlavička:   b"CUBQ", uint16 verze, uint16 rezerva, uint32 počet úloh, uint32 délka meta,
+                meta (JSON, UTF-8)
+    tabulka:    pro každou úlohu uint16 délka ID, ID (UTF-8), uint32 offset, uint32 délka záznamu
+    záznam:     uint8 typ úlohy (bit 6 = úloha má klíč "size", pak následuje uint8 velikost mřížky),
+                uint32 délka textu, text (UTF-8),
+                3× pohled (půdorys, nárys, bokorys): uint16 počet úseček, úsečky po 5 B,
+                uint16 počet řešení, každé: uint16 počet úseček, úsečky po 7 B
+    úsečka:     souřadnice bodů po uint8 (col,row[,lay] pro A i B) + uint8 příznaky
+                (bit 0 = čárkovaná, bit 1 = úsečka má v JSON třetí prvek dashed)
+
+Úloha, kterou nejde zapsat kompaktně beze ztráty (jiné klíče, neobvyklé hodnoty),
+se uloží jako záznam typu RAW s původním JSON. Verze 2 přidala velikost mřížky (klíč "size");
+banky verze 1 se dál čtou beze změny.
+
+Spuštění (ze složky source/):
+    python -m utils.binary_bank to-bin data.json data.cubq
+    python -m utils.binary_bank to-json data.cubq data.json
+    python -m utils.binary_bank bench data.json [--tasks 5000]
+"""
+
+import json
+import mmap
+import os
+import struct
+
+from utils.fun_for_making_exe import writable_path
+
+MAGIC = b"CUBQ"
+VERSION = 2
+READABLE_VERSIONS = (1, 2)
+BINARY_SUFFIX = ".cubq"
+
+_HEADER = struct.Struct("<4sHHII")
+_ID_LEN = struct.Struct("<H")
+_TABLE_ENTRY = struct.Struct("<II")
+_COUNT = struct.Struct("<H")
+_TEXT_LEN = struct.Struct("<I")
+_SEGMENT_2D = struct.Struct("<5B")
+_SEGMENT_3D = struct.Struct("<7B")
+
+_TASK_TYPES = ["tutorial", "3D_to_2D", "2D_to_3D", ""]
+_TYPE_RAW = 255
+_TYPE_HAS_SIZE = 0x40
+_VIEWS = ("pudorys", "narys", "bokorys")
+_TASK_KEYS = ["text", "task_type", "pudorys", "narys", "bokorys", "data3d"]
+_SIZED_TASK_KEYS = _TASK_KEYS + ["size"]
+
+FLAG_DASHED = 1
+FLAG_HAS_DASHED = 2
+
+
+def binary_path_for(filepath: str) -> str:
+    """Vrátí cestu k binární bance vedle JSON souboru (data.json → data.cubq)."""
+    return os.path.splitext(filepath)[0] + BINARY_SUFFIX
+
+
+def is_binary_bank(path: str) -> bool:
+    """Zjistí podle hlavičky, zda je soubor binární banka úloh."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+# ==================================================
+# ZÁPIS
+# ==================================================
+
+def _pack_segments(segments, dimension: int) -> bytes:
+    """Zabalí úsečky [[a], [b], d] do bajtů; ValueError pokud to nejde beze ztráty."""
+    packer = _SEGMENT_3D if dimension == 3 else _SEGMENT_2D
+    parts = [_COUNT.pack(len(segments))]
+    for segment in segments:
+        if len(segment) not in (2, 3):
+            raise ValueError("neobvyklá úsečka")
+        a, b = segment[0], segment[1]
+        if len(a) != dimension or len(b) != dimension:
+            raise ValueError("neobvyklý rozměr bodu")
+        flags = 0
+        if len(segment) == 3:
+            if segment[2] not in (0, 1) or isinstance(segment[2], bool):
+                raise ValueError("neobvyklá hodnota dashed")
+            flags = FLAG_HAS_DASHED | (FLAG_DASHED if segment[2] == 1 else 0)
+        # struct ověří rozsah 0..255, int kontroluje i typ (např. 1.0)
+        if not all(type(c) is int for c in (*a, *b)):
+            raise ValueError("neobvyklá souřadnice")
+        parts.append(packer.pack(*a, *b, flags))
+    return b"".join(parts)
+
+
+def _encode_task(task: dict) -> bytes:
+    """Zakóduje jednu úlohu; pokud to nejde kompaktně beze ztráty, uloží ji jako RAW JSON."""
+    try:
+        keys = list(task.keys())
+        if keys not in (_TASK_KEYS, _SIZED_TASK_KEYS) or task["task_type"] not in _TASK_TYPES:
+            raise ValueError("neobvyklé klíče úlohy")
+        text = task["text"].encode("utf-8")
+        if keys == _SIZED_TASK_KEYS:
+            head = bytes([_TASK_TYPES.index(task["task_type"]) | _TYPE_HAS_SIZE, task["size"]])
+        else:
+            head = bytes([_TASK_TYPES.index(task["task_type"])])
+        parts = [head, _TEXT_LEN.pack(len(text)), text]
+        for view in _VIEWS:
+            parts.append(_pack_segments(task[view], 2))
+        parts.append(_COUNT.pack(len(task["data3d"])))
+        for solution in task["data3d"]:
+            parts.append(_pack_segments(solution, 3))
+        record = b"".join(parts)
+        # pojistka: záznam se musí přesně vrátit do původní podoby
+        if json.dumps(_decode_task(memoryview(record), 0), ensure_ascii=False) != json.dumps(task, ensure_ascii=False):
+            raise ValueError("převod není bezeztrátový")
+        return record
+    except (ValueError, TypeError, KeyError, AttributeError, struct.error):
+        raw = json.dumps(task, ensure_ascii=False).encode("utf-8")
+        return bytes([_TYPE_RAW]) + _TEXT_LEN.pack(len(raw)) + raw
+
+
+def write_binary_bank(all_data: dict, path: str):
+    """
+    Zapíše všechny úlohy (včetně "_meta") do binární banky.
+
+    Args:
+        all_data (dict): data ve stejné podobě jako v data.json
+        path (str): cílový soubor
+    """
+    meta = json.dumps(all_data.get("_meta", {"version": "unknown"}), ensure_ascii=False).encode("utf-8")
+    tasks = [(task_id, _encode_task(task)) for task_id, task in all_data.items() if task_id != "_meta"]
+
+    table_size = sum(_ID_LEN.size + len(task_id.encode("utf-8")) + _TABLE_ENTRY.size for task_id, _ in tasks)
+    offset = _HEADER.size + len(meta) + table_size
+
+    header = [_HEADER.pack(MAGIC, VERSION, 0, len(tasks), len(meta)), meta]
+    table = []
+    for task_id, record in tasks:
+        encoded_id = task_id.encode("utf-8")
+        table.append(_ID_LEN.pack(len(encoded_id)) + encoded_id + _TABLE_ENTRY.pack(offset, len(record)))
+        offset += len(record)
+
+    with open(path, "wb") as f:
+        f.write(b"".join(header + table + [record for _, record in tasks]))
+
+
+# ==================================================
+# ČTENÍ
+# ==================================================
+
+def _unpack_segments(buffer, position: int, dimension: int) -> tuple[list, int]:
+    """Rozbalí úsečky z bufferu do JSON podoby [[a], [b], d]; vrátí i novou pozici."""
+    unpacker = _SEGMENT_3D if dimension == 3 else _SEGMENT_2D
+    (count,) = _COUNT.unpack_from(buffer, position)
+    position += _COUNT.size
+    segments = []
+    for values in unpacker.iter_unpack(buffer[position:position + count * unpacker.size]):
+        a = list(values[:dimension])
+        b = list(values[dimension:2 * dimension])
+        flags = values[-1]
+        if flags & FLAG_HAS_DASHED:
+            segments.append([a, b, 1 if flags & FLAG_DASHED else 0])
+        else:
+            segments.append([a, b])
+    return segments, position + count * unpacker.size
+
+
+def _decode_task(buffer, position: int) -> dict:
+    """Dekóduje jeden záznam úlohy začínající na dané pozici."""
+    task_type = buffer[position]
+    size = None
+    position += 1
+    if task_type != _TYPE_RAW and task_type & _TYPE_HAS_SIZE:
+        task_type &= ~_TYPE_HAS_SIZE
+        size = buffer[position]
+        position += 1
+    (text_len,) = _TEXT_LEN.unpack_from(buffer, position)
+    position += _TEXT_LEN.size
+    text = bytes(buffer[position:position + text_len]).decode("utf-8")
+    position += text_len
+
+    if task_type == _TYPE_RAW:
+        return json.loads(text)
+
+    task = {"text": text, "task_type": _TASK_TYPES[task_type]}
+    for view in _VIEWS:
+        task[view], position = _unpack_segments(buffer, position, 2)
+
+    (solution_count,) = _COUNT.unpack_from(buffer, position)
+    position += _COUNT.size
+    task["data3d"] = []
+    for _ in range(solution_count):
+        solution, position = _unpack_segments(buffer, position, 3)
+        task["data3d"].append(solution)
+    if size is not None:
+        task["size"] = size
+    return task
+
+
+class BinaryBank:
+    """
+    Binární banka úloh otevřená přes mmap.
+
+    Při otevření se čte jen hlavička a tabulka ID; jednotlivé úlohy se
+    dekódují přímo z namapovaného souboru až při dotazu.
+
+    Attributes:
+        path (str): cesta k souboru
+        meta (dict): metadata databáze úloh
+        offsets (dict[str, tuple[int, int]]): task_id → (offset, délka záznamu)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, version, _, task_count, meta_len = _HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC or version not in READABLE_VERSIONS:
+            self.close()
+            raise ValueError(f"Soubor {path} není binární banka úloh verze {VERSION}.")
+
+        position = _HEADER.size
+        self.meta = json.loads(bytes(self._view[position:position + meta_len]).decode("utf-8"))
+        position += meta_len
+
+        self.offsets: dict[str, tuple[int, int]] = {}
+        for _ in range(task_count):
+            (id_len,) = _ID_LEN.unpack_from(self._view, position)
+            position += _ID_LEN.size
+            task_id = bytes(self._view[position:position + id_len]).decode("utf-8")
+            position += id_len
+            self.offsets[task_id] = _TABLE_ENTRY.unpack_from(self._view, position)
+            position += _TABLE_ENTRY.size
+
+    def task_ids(self) -> list[str]:
+        """Vrátí ID všech úloh v pořadí z tabulky."""
+        return list(self.offsets.keys())
+
+    def get_task(self, task_id: str) -> dict:
+        """Dekóduje jednu úlohu do stejné podoby, jakou má v data.json."""
+        offset, length = self.offsets[task_id]
+        return _decode_task(self._view[offset:offset + length], 0)
+
+    def close(self):
+        """Uvolní mmap a zavře soubor."""
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+
+# ==================================================
+# PŘEVODNÍKY
+# ==================================================
+
+def json_to_binary(json_path="data.json", binary_path=None) -> str:
+    """Převede data.json na binární banku; vrátí cestu k vytvořenému souboru."""
+    binary_path = binary_path or binary_path_for(json_path)
+    with open(writable_path(json_path), "r", encoding="utf-8") as f:
+        all_data = json.load(f)
+    write_binary_bank(all_data, writable_path(binary_path))
+    return binary_path
+
+
+def binary_to_json(binary_path="data.cubq", json_path="data.json") -> str:
+    """Převede binární banku zpět na data.json (včetně indexu); vrátí cestu k souboru."""
+    from utils.task_index import write_tasks_json
+
+    bank = BinaryBank(writable_path(binary_path))
+    try:
+        all_data = {"_meta": bank.meta}
+        for task_id in bank.task_ids():
+            all_data[task_id] = bank.get_task(task_id)
+    finally:
+        bank.close()
+    write_tasks_json(all_data, json_path)
+    return json_path
+
+
+# ==================================================
+# BENCHMARK
+# ==================================================
+
+def benchmark(json_path="data.json", task_count=None, repeat=200):
+    """
+    Porovná studený start (otevření banky + seznam úloh + první úloha)
+    a přepnutí úlohy (načtení jedné úlohy) pro JSON a binární banku.
+
+    Args:
+        json_path (str): zdrojový data.json
+        task_count (int, optional): nafouknutí banky kopiemi úloh na daný počet
+        repeat (int): počet opakování měření
+    """
+    import random
+    import tempfile
+    import time
+
+    from utils.task_index import build_index, read_task, write_tasks_json
+
+    with open(writable_path(json_path), "r", encoding="utf-8") as f:
+        source = json.load(f)
+
+    all_data = {"_meta": source.pop("_meta", {"version": "unknown"})}
+    if task_count:
+        templates = list(source.values())
+        for i in range(task_count):
+            all_data[f"{10 + i // 1000}.{i % 1000 + 1}"] = templates[i % len(templates)]
+    else:
+        all_data.update(source)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_json = os.path.join(tmp, "bench.json")
+        bench_bin = os.path.join(tmp, "bench" + BINARY_SUFFIX)
+        write_tasks_json(all_data, bench_json)
+        write_binary_bank(all_data, bench_bin)
+        task_ids = [task_id for task_id in all_data if task_id != "_meta"]
+        picks = [random.choice(task_ids) for _ in range(repeat)]
+
+        def measure(fn):
+            start = time.perf_counter()
+            for task_id in picks:
+                fn(task_id)
+            return (time.perf_counter() - start) * 1000 / repeat
+
+        def json_cold(task_id):
+            with open(bench_json, "r", encoding="utf-8") as f:
+                return json.load(f)[task_id]
+
+        index, _ = build_index(bench_json)
+        offsets = {task_id: (start, end) for task_id, start, end in index["tasks"]}
+
+        def index_cold(task_id):
+            with open(bench_json + ".idx", "r", encoding="utf-8") as f:
+                task_offsets = {t: (s, e) for t, s, e in json.load(f)["tasks"]}
+            return read_task(bench_json, *task_offsets[task_id])
+
+        def binary_cold(task_id):
+            bank = BinaryBank(bench_bin)
+            try:
+                return bank.get_task(task_id)
+            finally:
+                bank.close()
+
+        bank = BinaryBank(bench_bin)
+        results = [
+            ("JSON (celý soubor)", measure(json_cold), measure(json_cold)),
+            ("JSON + index", measure(index_cold), measure(lambda t: read_task(bench_json, *offsets[t]))),
+            ("binární (mmap)", measure(binary_cold), measure(bank.get_task)),
+        ]
+        bank.close()
+
+        print(f"Úloh: {len(task_ids)}, JSON: {os.path.getsize(bench_json)} B, "
+              f"binární: {os.path.getsize(bench_bin)} B")
+        print(f"{'formát':<22}{'studený start [ms]':>20}{'přepnutí úlohy [ms]':>22}")
+        for name, cold, switch in results:
+            print(f"{name:<22}{cold:>20.3f}{switch:>22.4f}")
+        return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Binární banka úloh Cubiq🧊")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    to_bin = commands.add_parser("to-bin", help="převede data.json na binární banku")
+    to_bin.add_argument("json_path", nargs="?", default="data.json")
+    to_bin.add_argument("binary_path", nargs="?", default=None)
+
+    to_json = commands.add_parser("to-json", help="převede binární banku na data.json")
+    to_json.add_argument("binary_path", nargs="?", default="data" + BINARY_SUFFIX)
+    to_json.add_argument("json_path", nargs="?", default="data.json")
+
+    bench = commands.add_parser("bench", help="porovná rychlost JSON a binární banky")
+    bench.add_argument("json_path", nargs="?", default="data.json")
+    bench.add_argument("--tasks", type=int, default=None, help="nafouknout banku na daný počet úloh")
+    bench.add_argument("--repeat", type=int, default=200)
+
+    args = parser.parse_args()
+    if args.command == "to-bin":
+        print(json_to_binary(args.json_path, args.binary_path))
+    elif args.command == "to-json":
+        print(binary_to_json(args.binary_path, args.json_path))
+    else:
+        benchmark(args.json_path, args.tasks, args.repeat)
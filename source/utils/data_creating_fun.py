@@ -5,32 +5,26 @@ data_creating_fun.py
 Pomocné funkce pro aplikaci Cubiq🧊.
 
 Obsahuje nástroje pro:
-    • vytvoření, úpravu a mazání úloh v JSON souborech
+    • vytvoření, úpravu a mazání úloh v úložišti úloh (data.json nebo SQLite databáze);
+      na disk se zapisuje na pozadí, o dokončení zápisu informuje volitelný callback(key, ok);
+      změny jdou přes katalog úloh, který o nich dá vědět obrazovkám (bez jejich znovuvytvoření)
 """
 
-import json
-import os
+from elements.task_catalog import get_catalog
+from utils.projection import DEFAULT_SIZE
 
-from utils.fun_for_making_exe import resource_path, writable_path
 
-
-def create_empty_task(task_id: str, filepath="data.json"):
+def create_empty_task(task_id: str, filepath="data.json", callback=None):
     """
-    Vytvoří novou prázdnou úlohu v JSON souboru se zadaným task_id.
+    Vytvoří novou prázdnou úlohu v úložišti úloh se zadaným task_id.
 
     Args:
         task_id (str): ID úlohy ve formátu "x.x", např. "1.5"
         filepath (str): cesta k JSON souboru
+        callback (callable, optional): zavolá se po zápisu na disk jako callback(key, ok)
     """
-    # Načti existující data, pokud existují
-    if os.path.exists(filepath):
-        with open(writable_path(filepath), "r", encoding="utf-8") as f:
-            all_data = json.load(f)
-    else:
-        all_data = {}
-
     # Nová úloha s minimální strukturou
-    all_data[task_id] = {
+    task = {
         "text": "text k úloze",
         "task_type": "3D_to_2D",
         "pudorys": [],
@@ -39,9 +33,8 @@ def create_empty_task(task_id: str, filepath="data.json"):
         "data3d": [[]]
     }
 
-    # Ulož zpět do JSON
-    with open(writable_path(filepath), "w", encoding="utf-8") as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=4)
+    # Ulož do úložiště (v SQLite jen jeden řádek) a ohlas přidání úlohy
+    get_catalog(filepath).save_task(task_id, task, callback)
 
     print(f"Úloha '{task_id}' byla vytvořena v {filepath}.")
 
@@ -58,15 +51,10 @@ def save_task_to_json(
         n_connections: list,
         b_connections: list,
         d_connections: list[list],
-        filepath="data.json"
+        filepath="data.json",
+        callback=None,
+        size=DEFAULT_SIZE
 ):
-    # Načtení existujících dat
-    if os.path.exists(filepath):
-        with open(writable_path(filepath), "r", encoding="utf-8") as f:
-            all_data = json.load(f)
-    else:
-        all_data = {}
-
     # Převod dat
     pudorys = make_data_connections_for_json(p_connections)
     narys = make_data_connections_for_json(n_connections)
@@ -79,7 +67,7 @@ def save_task_to_json(
     ]
 
     # Uložení úlohy
-    all_data[task_id] = {
+    task = {
         "text": text,
         "task_type": task_type,
         "pudorys": pudorys,
@@ -87,32 +75,24 @@ def save_task_to_json(
         "bokorys": bokorys,
         "data3d": data3d
     }
+    # velikost mřížky se ukládá jen u jiné než výchozí (starší úlohy klíč "size" nemají)
+    if size != DEFAULT_SIZE:
+        task["size"] = size
 
-    # Zápis do souboru
-    with open(writable_path(filepath), "w", encoding="utf-8") as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=4)
+    # Zápis do úložiště (v SQLite jedna transakce nad jedním řádkem) a ohlášení změny
+    get_catalog(filepath).save_task(task_id, task, callback)
 
     print(f"Úloha '{task_id}' byla uložena do {filepath}.")
 
 
-def delete_from_json(task_id, filepath="data.json"):
+def delete_from_json(task_id, filepath="data.json", callback=None):
     """
-    Smaže všechny data úlohy s daným task_id z JSON souboru.
+    Smaže všechny data úlohy s daným task_id z úložiště úloh.
     task_id musí být string!
     """
 
-    # Načti existující data
-    with open(writable_path(filepath), "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Zkontroluj, jestli task_id existuje
-    if task_id in data:
-        del data[task_id]
+    if get_catalog(filepath).delete_task(task_id, callback):
         print(f"Úloha {task_id} byla smazána.")
     else:
         print(f"Úloha {task_id} nebyla nalezena.")
 
-    # Ulož zpět
-    with open(writable_path(filepath), "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-
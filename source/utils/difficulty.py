@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+difficulty.py
+-------------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • odhad obtížnosti úlohy z jejího obsahu (skóre a stupeň 1–5),
+    • mezipaměť obtížností vedle souboru s úlohami (data.json → data.json.difficulty),
+    • dávkový přepočet celé banky v procesech (ProcessPoolExecutor) – přepočítají se jen úlohy,
+      jejichž otisk obsahu (content_hash z utils/validate_bank.py) se od minula změnil.
+
+Obtížnost se skládá z:
+    segments         – počet úseček řešení (sloučené úsečky jako v data3d),
+    dashed           – počet čárkovaných (skrytých) hran řešení,
+    occluded         – počet čárkovaných úseček v pohledech,
+    alternatives     – počet dalších 3D řešení k pohledům (jen úlohy 2D_to_3D, viz utils/reconstruction.py),
+    ambiguous_views  – počet pohledů, ve kterých se hrany řešení překrývají nebo splývají do bodu
+                       (z pohledu nejde poznat, kolik hran a v jaké hloubce leží za sebou).
+
+Aplikace obtížnosti jen čte (TaskCatalog.difficulty); přepočítávají se dávkou.
+
+Spuštění (ze složky source/):
+    python -m utils.difficulty data.json
+    python -m utils.difficulty data.json --jobs 4 --force
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.fun_for_making_exe import writable_path
+from utils.projection import (DEFAULT_SIZE, VIEWS, get_lattice, masks_to_segments, project_point, solution_masks,
+                              task_size, view_masks)
+from utils.validate_bank import canonical_key, content_hash
+
+CACHE_VERSION = 2  # zvýšit při změně vah nebo složek obtížnosti (stará mezipaměť se pak zahodí)
+CACHE_SUFFIX = ".difficulty"
+
+# váhy jednotlivých složek skóre
+WEIGHTS = {"segments": 0.5, "dashed": 1.0, "occluded": 0.5, "alternatives": 3.0, "ambiguous_views": 1.0}
+MAX_ALTERNATIVES = 3  # víc alternativních řešení už úlohu dál neztěžuje (jen se jich víc uzná)
+# horní meze skóre pro stupně 1–4 (vyšší skóre = stupeň 5)
+LEVEL_BOUNDS = (2.0, 5.0, 10.0, 16.0)
+LEVELS = (1, 2, 3, 4, 5)
+
+CHUNK_SIZE = 16  # úloh na jednu dávku pro proces (hledání řešení je pomalejší než kontrola banky)
+MIN_PARALLEL_TASKS = 64  # menší počet úloh se počítá v hlavním procesu
+MAX_NODES = 2000  # nejvyšší počet stavů hledání alternativních řešení na úlohu
+
+
+# ==================================================
+# OBTÍŽNOST JEDNÉ ÚLOHY
+# ==================================================
+
+def _ambiguous_views(masks, size: int) -> int:
+    """Počet pohledů, ve kterých se některé hrany řešení promítnou na sebe nebo do bodu."""
+    lattice, lattice_2d = get_lattice(size, 3), get_lattice(size)
+    pieces = []
+    lines = masks.solid | masks.dashed
+    while lines:
+        low = lines & -lines
+        pieces.append([lattice.coords(end) for end in lattice.piece(low.bit_length() - 1)])
+        lines ^= low
+    ambiguous = 0
+    for view in VIEWS:
+        covered = 0
+        for a, b in pieces:
+            pa, pb = project_point(view, a, size), project_point(view, b, size)
+            mask = lattice_2d.segment_mask(pa, pb) if pa != pb else 0
+            if not mask or mask & covered:
+                ambiguous += 1
+                break
+            covered |= mask
+    return ambiguous
+
+
+def difficulty_features(task: dict, size: int = DEFAULT_SIZE, max_nodes: int | None = MAX_NODES) -> dict:
+    """
+    Složky obtížnosti úlohy (viz popis modulu).
+
+    Args:
+        task (dict): úloha jako v data.json
+        size (int): počet bodů mřížky v jednom směru (pokud ho úloha neurčuje klíčem "size")
+        max_nodes (int, optional): nejvyšší počet stavů hledání alternativních řešení
+    """
+    from utils.reconstruction import reconstruct_task
+
+    size = task_size(task, size)
+
+    solution = next((solution for solution in task.get("data3d", []) if solution), [])
+    merged = masks_to_segments(solution_masks(solution, size), size, 3)
+    occluded = sum(1 for view in VIEWS for segment in masks_to_segments(view_masks(task.get(view, []), size), size)
+                   if segment[2])
+
+    alternatives = 0
+    if task.get("task_type") == "2D_to_3D" and solution:
+        result = reconstruct_task(task, size, max_nodes=max_nodes)
+        alternatives = max(result.count, len(task["data3d"])) - 1
+
+    return {
+        "segments": len(merged),
+        "dashed": sum(1 for segment in merged if segment[2]),
+        "occluded": occluded,
+        "alternatives": alternatives,
+        "ambiguous_views": _ambiguous_views(solution_masks(solution, size), size) if solution else 0,
+    }
+
+
+def difficulty_score(features: dict) -> float:
+    """Vážený součet složek obtížnosti."""
+    capped = dict(features, alternatives=min(features["alternatives"], MAX_ALTERNATIVES))
+    return round(sum(WEIGHTS[name] * value for name, value in capped.items()), 1)
+
+
+def difficulty_level(score: float) -> int:
+    """Stupeň obtížnosti 1–5 podle skóre."""
+    return next((level for level, bound in zip(LEVELS, LEVEL_BOUNDS) if score <= bound), LEVELS[-1])
+
+
+def task_difficulty(task: dict, size: int = DEFAULT_SIZE) -> dict:
+    """
+    Obtížnost úlohy, jak se ukládá do mezipaměti.
+
+    Returns:
+        dict: {"hash": otisk obsahu, "score": skóre, "level": stupeň 1–5, "features": složky}
+    """
+    features = difficulty_features(task, size)
+    score = difficulty_score(features)
+    return {"hash": content_hash(canonical_key(task, size)), "score": score,
+            "level": difficulty_level(score), "features": features}
+
+
+# ==================================================
+# MEZIPAMĚŤ
+# ==================================================
+
+def cache_path(filepath: str) -> str:
+    """Vrátí cestu k mezipaměti obtížností vedle souboru s úlohami (data.json → data.json.difficulty)."""
+    return writable_path(filepath + CACHE_SUFFIX)
+
+
+def load_difficulties(filepath: str = "data.json") -> dict[str, dict]:
+    """Načte uložené obtížnosti úloh (prázdný slovník, pokud mezipaměť chybí nebo má jinou verzi)."""
+    try:
+        with open(cache_path(filepath), encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("tasks", {})
+
+
+def save_difficulties(difficulties: dict[str, dict], filepath: str = "data.json"):
+    """Zapíše obtížnosti úloh (atomicky, přes sdílený zapisovač)."""
+    from utils.write_behind import get_writer
+
+    data = json.dumps({"version": CACHE_VERSION, "tasks": difficulties}, ensure_ascii=False)
+    get_writer().submit(cache_path(filepath), data.encode("utf-8"))
+
+
+# ==================================================
+# DÁVKOVÝ PŘEPOČET
+# ==================================================
+
+def _difficulty_chunk(items: list[tuple[str, dict]], size: int) -> list[tuple[str, dict | None]]:
+    """Spočítá obtížnosti dávky úloh (běží v procesu z ProcessPoolExecutor)."""
+    results = []
+    for task_id, task in items:
+        try:
+            results.append((task_id, task_difficulty(task, size)))
+        except Exception:  # poškozená úloha (viz validate_bank) obtížnost nemá
+            results.append((task_id, None))
+    return results
+
+
+def update_difficulties(all_data: dict, cached: dict[str, dict], size: int = DEFAULT_SIZE, jobs: int | None = None,
+                        force: bool = False) -> tuple[dict[str, dict], dict]:
+    """
+    Přepočítá obtížnosti úloh, jejichž obsah se od uložení změnil (nebo chybí).
+
+    Args:
+        all_data (dict): úlohy jako v data.json (klíč "_meta" se přeskočí)
+        cached (dict): dosavadní obtížnosti (viz load_difficulties)
+        size (int): počet bodů mřížky v jednom směru
+        jobs (int, optional): počet procesů (None = podle počtu jader, 0 nebo 1 = bez dalších procesů)
+        force (bool): přepočítat všechny úlohy
+
+    Returns:
+        tuple: (obtížnosti všech úloh, report)
+    """
+    start = time.perf_counter()
+    difficulties = {}
+    stale = []
+    for task_id, task in all_data.items():
+        if task_id == "_meta":
+            continue
+        try:
+            task_hash = content_hash(canonical_key(task, size))
+        except Exception:
+            continue
+        previous = cached.get(task_id)
+        if not force and previous is not None and previous.get("hash") == task_hash:
+            difficulties[task_id] = previous
+        else:
+            stale.append((task_id, task))
+
+    workers = (os.cpu_count() or 1) if jobs is None else jobs
+    if workers <= 1 or len(stale) < MIN_PARALLEL_TASKS:
+        results = _difficulty_chunk(stale, size)
+        workers = 0
+    else:
+        chunks = [stale[i:i + CHUNK_SIZE] for i in range(0, len(stale), CHUNK_SIZE)]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_results in pool.map(_difficulty_chunk, chunks, [size] * len(chunks)):
+                results.extend(chunk_results)
+
+    for task_id, difficulty in results:
+        if difficulty is not None:
+            difficulties[task_id] = difficulty
+
+    report = {
+        "tasks": len(difficulties),
+        "recomputed": sum(1 for _, difficulty in results if difficulty is not None),
+        "reused": len(difficulties) - sum(1 for _, difficulty in results if difficulty is not None),
+        "failed": sum(1 for _, difficulty in results if difficulty is None),
+        "jobs": workers,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+    return difficulties, report
+
+
+def update_bank(filepath: str = "data.json", size: int = DEFAULT_SIZE, jobs: int | None = None,
+                force: bool = False) -> tuple[dict[str, dict], dict]:
+    """Přepočítá obtížnosti banky úloh (data.json, binární banka nebo SQLite) a uloží mezipaměť."""
+    from elements.task_store import get_task_store
+    from utils.write_behind import get_writer
+
+    difficulties, report = update_difficulties(get_task_store(filepath).export_all(), load_difficulties(filepath),
+                                               size, jobs, force)
+    save_difficulties(difficulties, filepath)
+    get_writer().flush()
+    return difficulties, report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from elements.level_data import level_key
+
+    parser = argparse.ArgumentParser(description="Obtížnost úloh Cubiq🧊")
+    parser.add_argument("file", nargs="?", default="data.json")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE,
+                        help="počet bodů mřížky v jednom směru (úlohy s klíčem \"size\" mají vlastní)")
+    parser.add_argument("--jobs", type=int, default=None, help="počet procesů (0 = bez procesů)")
+    parser.add_argument("--force", action="store_true", help="přepočítat i nezměněné úlohy")
+    args = parser.parse_args()
+
+    bank_difficulties, bank_report = update_bank(args.file, args.size, args.jobs, args.force)
+    for level_id in sorted(bank_difficulties, key=level_key):
+        entry = bank_difficulties[level_id]
+        print(f"{level_id:>6}  stupeň {entry['level']}  skóre {entry['score']:5.1f}  {entry['features']}")
+    print(f"Úloh: {bank_report['tasks']}, přepočítáno: {bank_report['recomputed']}, "
+          f"převzato: {bank_report['reused']}, procesů: {bank_report['jobs']}, čas: {bank_report['elapsed_ms']:.0f} ms")
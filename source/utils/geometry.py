@@ -5,24 +5,29 @@ geometry.py
 Pomocné funkce pro aplikaci Cubiq🧊.
 
 Obsahuje nástroje pro:
+    • výpočet (a cachování) čárek čárkované čáry
     • kreslení čárkované čáry
 """
 
 import math
+from functools import lru_cache
 
 import pygame
 
 
-def draw_dashed_line(surface, color, start_pos, end_pos, width=1, dash_length=15):
+@lru_cache(maxsize=4096)
+def dash_segments(start_pos, end_pos, width=1, dash_length=15) -> tuple:
     """
-    Nakreslí čárkovanou čáru mezi dvěma body.
+    Spočítá čárky čárkované čáry mezi dvěma body.
+
+    Výsledek se cachuje podle (start_pos, end_pos, width, dash_length),
+    takže se pro stejné spojení nepočítá v každém framu znovu.
 
-    :param surface: pygame.Surface – plocha, na kterou se kreslí
-    :param color: tuple – barva čáry (R, G, B)
     :param start_pos: tuple – počáteční bod (x, y)
     :param end_pos: tuple – koncový bod (x, y)
     :param width: int – tloušťka čáry
     :param dash_length: int – maximální délka čárky
+    :return: tuple – dvojice ((x1, y1), (x2, y2)) pro každou čárku
     """
 
     min_space_length = 10
@@ -48,13 +53,14 @@ def draw_dashed_line(surface, color, start_pos, end_pos, width=1, dash_length=15
 
     # Jednotkový vektor směru
     if distance == 0:
-        return
+        return ()
     dx /= distance
     dy /= distance
 
     # Aktuální pozice
     x, y = x1, y1
     drawn = 0
+    segments = []
 
     while drawn < distance:
         # Délka čárky (zkrátí se, pokud by přesáhla konec)
@@ -62,10 +68,30 @@ def draw_dashed_line(surface, color, start_pos, end_pos, width=1, dash_length=15
         x_end = x + dx * dash_end
         y_end = y + dy * dash_end
 
-        # Nakreslí čárku
-        pygame.draw.line(surface, color, (x, y), (x_end, y_end), width)
+        segments.append(((x, y), (x_end, y_end)))
 
         # Posune se na konec čárky + mezera
         x += dx * (dash_length + space_length)
         y += dy * (dash_length + space_length)
         drawn += dash_length + space_length
+
+    return tuple(segments)
+
+
+def draw_dashed_line(surface, color, start_pos, end_pos, width=1, dash_length=15):
+    """
+    Nakreslí čárkovanou čáru mezi dvěma body.
+
+    :param surface: pygame.Surface – plocha, na kterou se kreslí
+    :param color: tuple – barva čáry (R, G, B)
+    :param start_pos: tuple – počáteční bod (x, y)
+    :param end_pos: tuple – koncový bod (x, y)
+    :param width: int – tloušťka čáry
+    :param dash_length: int – maximální délka čárky
+    :return: pygame.Rect | None – oblast, do které se kreslilo
+    """
+    dirty_rect = None
+    for dash_start, dash_end in dash_segments(tuple(start_pos), tuple(end_pos), width, dash_length):
+        rect = pygame.draw.line(surface, color, dash_start, dash_end, width)
+        dirty_rect = rect if dirty_rect is None else dirty_rect.union(rect)
+    return dirty_rect
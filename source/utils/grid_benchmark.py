@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+grid_benchmark.py
+-----------------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • měření doby jednoho snímku obrazovky úlohy (TaskScreen.draw) pro mřížky N×N×N,
+    • měření doby kontroly po úpravě spojení (sloučení spojení, porovnání s řešeními, nápověda),
+    • porovnání obou časů s rozpočtem jednoho snímku (FRAME_BUDGET_MS, 60 snímků za sekundu).
+
+Pro každou velikost mřížky se do dočasné banky zapíšou dvě úlohy (2D_to_3D a 3D_to_2D)
+s tělesem přes celou mřížku a hráč má nakreslené celé řešení – kreslí se tak nejvíc čar
+a kontrola řešení vždy dojde až k porovnání s řešením. Měří se čas výpočtu snímku
+(bez okna, SDL_VIDEODRIVER=dummy, pokud není nastavený jinak).
+
+Spuštění (ze složky source/):
+    python -m utils.grid_benchmark
+    python -m utils.grid_benchmark --sizes 3 5 8 --frames 120
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from utils.projection import DEFAULT_SIZE, VIEWS, dash_hidden_edges, project_to_json
+from utils.task_generator import convex_hull_edges
+
+FRAME_BUDGET_MS = 16.0  # 60 snímků za sekundu
+DEFAULT_SIZES = (3, 5, 8)
+PLAYER_NAME = "benchmark"
+
+
+# ==================================================
+# ÚLOHY PRO MĚŘENÍ
+# ==================================================
+
+def benchmark_shape(size: int) -> list:
+    """
+    Těleso přes celou mřížku: krychle s uříznutým rohem (šikmé hrany,
+    skryté hrany ve 3D i čárkované úsečky v pohledech).
+    """
+    top = size - 1
+    cut = (top, 0, top)
+    points = [(col, row, lay) for col in (0, top) for row in (0, top) for lay in (0, top) if (col, row, lay) != cut]
+    points += [(max(top - 1, 0), 0, top), (top, min(1, top), top), (top, 0, max(top - 1, 0))]
+    return convex_hull_edges(points)
+
+
+def benchmark_bank(sizes) -> dict:
+    """Banka úloh pro měření: pro každou velikost úloha 2D_to_3D a 3D_to_2D (ID 1.1, 1.2, 1.3, …)."""
+    bank = {"_meta": {"version": "benchmark", "description": "Úlohy pro měření mřížek N×N×N"}}
+    number = 0
+    for size in sizes:
+        solution = dash_hidden_edges(benchmark_shape(size), size)
+        views = project_to_json(solution, size)
+        for task_type in ("2D_to_3D", "3D_to_2D"):
+            number += 1
+            task = {"text": f"Mřížka {size}×{size}×{size}", "task_type": task_type, **views, "data3d": [solution]}
+            if size != DEFAULT_SIZE:
+                task["size"] = size
+            bank[f"1.{number}"] = task
+    return bank
+
+
+# ==================================================
+# MĚŘENÍ
+# ==================================================
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _draw_solution(task_screen, task):
+    """Nakreslí za hráče celé řešení úlohy nad body gridů obrazovky."""
+    from utils.projection import connections_3d_from_segments, connections_from_segments
+
+    if task.task_type == "3D_to_2D":
+        task_screen.user_pudorys_connections = connections_from_segments(task.data["pudorys"], task_screen.p_points)
+        task_screen.user_narys_connections = connections_from_segments(task.data["narys"], task_screen.n_points)
+        task_screen.user_bokorys_connections = connections_from_segments(task.data["bokorys"], task_screen.b_points)
+    else:
+        task_screen.user_connections = connections_3d_from_segments(task.data3d[0], task_screen.points)
+
+
+def _edit_times(task_screen, task) -> list[float]:
+    """
+    Doba jedné úpravy (ms): spojení se odebere a znovu přidá, pak se spojení sloučí,
+    porovnají s řešením a přepočítá se nápověda – stejně jako po kliknutí v TaskScreen.
+    """
+    from utils import grid_fun
+    from utils.hints import HintEngine, connections_to_segments
+
+    engine = HintEngine.for_task(task.data)
+    if task.task_type == "3D_to_2D":
+        parts = [(view, getattr(task_screen, f"user_{view}_connections")) for view in VIEWS]
+    else:
+        parts = [("3d", task_screen.user_connections)]
+
+    times = []
+    for part, connections in parts:
+        for index in range(len(connections)):
+            edited = connections[:index] + connections[index + 1:]
+            start = time.perf_counter()
+            edited.append(connections[index])
+            if part == "3d":
+                edited = grid_fun.merge_if_double_connections_3d(edited)
+                resolved = grid_fun.check_3d_solution(edited, task.unpacked_data3d, task.size)
+            else:
+                grid_fun.merge_if_double_connections_2d(edited)
+                resolved = grid_fun.check_2d_solution(edited, getattr(task, f"{part}_connections"), task.size)
+            engine.update(part, connections_to_segments(edited))
+            engine.hint()
+            times.append((time.perf_counter() - start) * 1000)
+            if not resolved:
+                raise RuntimeError(f"Řešení úlohy {task.task_id} neprošlo kontrolou.")
+    return times
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, frames: int = 120, width: int = 1766, height: int = 994) -> list[dict]:
+    """
+    Změří dobu snímku a kontroly pro zadané velikosti mřížky.
+
+    Args:
+        sizes (tuple[int]): velikosti mřížky (počet bodů v jednom směru)
+        frames (int): počet měřených snímků na úlohu
+        width, height (int): velikost okna
+
+    Returns:
+        list[dict]: pro každou úlohu {"size", "task_type", "frame_ms": (průměr, p95, max),
+                    "check_ms": (průměr, p95, max), "segments": počet úseček řešení}
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    from elements.level_data import LevelData
+    from screens.task_screen import TaskScreen
+    from utils.initiating_length import set_window_size
+    from utils.layout import get_layout
+
+    pygame.init()
+    set_window_size(width, height)
+    import glob_var
+    screen = pygame.display.set_mode((glob_var.SCREEN_WIDTH, glob_var.SCREEN_HEIGHT))
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        bank_path = os.path.join(directory, "benchmark.json")
+        with open(bank_path, "w", encoding="utf-8") as f:
+            json.dump(benchmark_bank(sizes), f, ensure_ascii=False)
+
+        task_screen = TaskScreen(LevelData(bank_path))
+        task_screen.apply_layout(get_layout())
+        for task_id in task_screen.levels:
+            task_screen.reset_task()
+            task_screen.draw(screen, task_id, player_name=PLAYER_NAME)  # načtení úlohy a gridů
+            task = task_screen.current_task
+            _draw_solution(task_screen, task)
+
+            frame_times = []
+            for _ in range(frames):
+                start = time.perf_counter()
+                task_screen.draw(screen, task_id, player_name=PLAYER_NAME)
+                frame_times.append((time.perf_counter() - start) * 1000)
+            check_times = _edit_times(task_screen, task)
+
+            results.append({
+                "size": task.size,
+                "task_type": task.task_type,
+                "segments": len(task.data3d[0]),
+                "frame_ms": (sum(frame_times) / len(frame_times), _percentile(frame_times, 0.95), max(frame_times)),
+                "check_ms": (sum(check_times) / len(check_times), _percentile(check_times, 0.95), max(check_times)),
+            })
+        task_screen.reset_task()
+    pygame.quit()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Doba snímku a kontroly řešení Cubiq🧊 pro mřížky N×N×N")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--frames", type=int, default=120, help="počet měřených snímků na úlohu")
+    parser.add_argument("--width", type=int, default=1766)
+    parser.add_argument("--height", type=int, default=994)
+    args = parser.parse_args()
+
+    over_budget = False
+    for result in run_benchmark(tuple(args.sizes), args.frames, args.width, args.height):
+        frame_mean, frame_p95, frame_max = result["frame_ms"]
+        check_mean, check_p95, check_max = result["check_ms"]
+        ok = frame_p95 <= FRAME_BUDGET_MS and check_max <= FRAME_BUDGET_MS
+        over_budget |= not ok
+        print(f"N={result['size']:<2} {result['task_type']:<8} úseček {result['segments']:>3}  "
+              f"snímek {frame_mean:5.2f} / p95 {frame_p95:5.2f} / max {frame_max:5.2f} ms  "
+              f"kontrola {check_mean:5.2f} / p95 {check_p95:5.2f} / max {check_max:5.2f} ms  "
+              f"{'OK' if ok else 'PŘES ROZPOČET'}")
+    print(f"Rozpočet snímku: {FRAME_BUDGET_MS:.0f} ms")
+    sys.exit(1 if over_budget else 0)
@@ -13,43 +13,31 @@ Obsahuje:
 
 import math
 
-from utils.grid_math import merge_all, merge_segments_nd, distance_to_line
+from utils.grid_math import line_key_nd, merge_all, merge_segments_nd, distance_to_line
+from utils.projection import DEFAULT_SIZE, solution_masks, view_masks
 
 
 # ==================================================
 # ŘEŠENÍ A KONTROLA
 # ==================================================
 
-def check_3d_solution(user_connections, solutions):
-    """Ověří, zda uživatelská spojení odpovídají alespoň jednomu řešení 3D úlohy."""
+def _as_segments(connections) -> list:
+    return [conn.make_data_connection_for_json() for conn in connections]
 
-    def merge_to_set(connections):
-        return set(merge_all(connections,
-                             lambda a, b: merge_segments_nd(a, b, lambda p: (p.col, p.row, p.lay), type(a))))
 
-    user_set = merge_to_set(user_connections)
-
-    for solution in solutions:
-        sol_set = merge_to_set(solution)
-        if user_set == sol_set:
-            return True
-    return False
-
-
-def check_2d_solution(user_connections, solution_connections):
-    """Ověří, zda uživatelská spojení odpovídají řešení 2D úlohy."""
-
-    def merge_to_set(connections):
-        return set(merge_all(connections,
-                             lambda a, b: merge_segments_nd(a, b, lambda p: (p.col, p.row), type(a))))
+def check_3d_solution(user_connections, solutions, size: int = DEFAULT_SIZE):
+    """
+    Ověří, zda uživatelská spojení odpovídají alespoň jednomu řešení 3D úlohy.
+    Porovnávají se kanonické masky (utils/projection.py), takže nezáleží na tom,
+    jak jsou úsečky rozdělené nebo seřazené.
+    """
+    user_masks = solution_masks(_as_segments(user_connections), size)
+    return any(user_masks == solution_masks(_as_segments(solution), size) for solution in solutions)
 
-    user_set = merge_to_set(user_connections)
-    sol_set = merge_to_set(solution_connections)
 
-    if user_set == sol_set:
-        return True
-    else:
-        return False
+def check_2d_solution(user_connections, solution_connections, size: int = DEFAULT_SIZE):
+    """Ověří, zda uživatelská spojení odpovídají řešení 2D úlohy (porovnání masek jako u 3D)."""
+    return view_masks(_as_segments(user_connections), size) == view_masks(_as_segments(solution_connections), size)
 
 
 # ==================================================
@@ -100,11 +88,21 @@ def change_dashed_of_connection(connections, mouse_pos, max_dist=6):
         nearest_connection.dashed = not nearest_connection.dashed
 
 
+def _coords_2d(point):
+    return point.col, point.row
+
+
+def _coords_3d(point):
+    return point.col, point.row, point.lay
+
+
 def merge_if_double_connections_2d(connections):
     return merge_all(connections,
-                     lambda a, b: merge_segments_nd(a, b, lambda p: (p.col, p.row), type(a)))
+                     lambda a, b: merge_segments_nd(a, b, _coords_2d, type(a)),
+                     lambda conn: line_key_nd(conn, _coords_2d))
 
 
 def merge_if_double_connections_3d(connections):
     return merge_all(connections,
-                     lambda a, b: merge_segments_nd(a, b, lambda p: (p.col, p.row, p.lay), type(a)))
+                     lambda a, b: merge_segments_nd(a, b, _coords_3d, type(a)),
+                     lambda conn: line_key_nd(conn, _coords_3d))
@@ -10,6 +10,8 @@ Obsahuje pomocné nástroje pro gridy 2D i 3D.
 
 import math
 
+from utils.projection import DEFAULT_SIZE
+
 
 # ==================================================
 # OBECNÁ GEOMETRIE (2D i 3D)
@@ -22,6 +24,14 @@ def distance_nd(a: tuple, b: tuple) -> float:
     return math.sqrt(sum((b[i] - a[i]) ** 2 for i in range(len(a))))
 
 
+def grid_spacing(square_length: float, size: int) -> float:
+    """
+    Vzdálenost sousedních bodů mřížky o size bodech v jednom směru. Mřížka zabírá
+    na obrazovce vždy stejné místo jako výchozí mřížka 3×3 (2 × square_length).
+    """
+    return square_length * (DEFAULT_SIZE - 1) / (size - 1)
+
+
 def distance_to_line(mouse_pos: tuple,
                      line_point_a: tuple,
                      line_point_b: tuple) -> float:
@@ -84,45 +94,56 @@ def are_colinear_nd(*points: tuple) -> bool:
 # OPERACE SE SPOJENÍMI (ND)
 # ==================================================
 
+def _main_axis(*coords: tuple) -> int:
+    """Osa, ve které se body (na jedné přímce) nejvíc liší – podle ní se úsečky porovnávají jako intervaly."""
+    return max(range(len(coords[0])), key=lambda axis: max(c[axis] for c in coords) - min(c[axis] for c in coords))
+
+
+def _interval(point_a: tuple, point_b: tuple, axis: int) -> tuple:
+    return min(point_a[axis], point_b[axis]), max(point_a[axis], point_b[axis])
+
+
+def is_point_on_segment_nd(point: tuple, point_a: tuple, point_b: tuple) -> bool:
+    """
+    Zjistí, zda bod leží na úsečce (včetně krajních bodů), 2D i 3D.
+    """
+    if not are_colinear_nd(point_a, point_b, point):
+        return False
+    return all(min(a, b) <= c <= max(a, b) for c, a, b in zip(point, point_a, point_b))
+
+
 def overlaps_nd(conn1, conn2, get_coords):
     """
-    Zjistí, zda se dvě úsečky v gridu překrývají (2D i 3D).
+    Zjistí, zda se dvě úsečky v gridu překrývají (2D i 3D) – mají společnou část
+    nenulové délky; bod se s úsečkou překrývá, pokud na ní leží.
     """
     p1 = get_coords(conn1.point_a)
     p2 = get_coords(conn1.point_b)
     p3 = get_coords(conn2.point_a)
     p4 = get_coords(conn2.point_b)
 
-    def find_point_in_between(point_a, point_b):
-        # bod mezi existuje jen pokud se souřadnice liší o 2
-        for x, y in zip(point_a, point_b):
-            if abs(x - y) not in (0, 2):
-                return None
-
-        return tuple((x + y) // 2 for x, y in zip(point_a, point_b))
-
     # speciální případ, pro bod
-    if (p1 == p2) and ((p1 == p3 or p1 == p4) or (p1 == find_point_in_between(p3, p4))):
-        return True
-    elif (p3 == p4) and ((p3 == p1 or p3 == p2) or (p3 == find_point_in_between(p1, p2))):
-        return True
+    if p1 == p2:
+        return is_point_on_segment_nd(p1, p3, p4)
+    elif p3 == p4:
+        return is_point_on_segment_nd(p3, p1, p2)
 
     if not are_colinear_nd(p1, p2, p3, p4):
         return False
 
-    # musí sdílet alespoň jeden bod
-    if not (p1 == p3 or p1 == p4 or p2 == p3 or p2 == p4):
-        return False
-
-    # ignorujeme jednoprvkové úsečky
-    return distance_nd(p1, p2) > 1 or distance_nd(p3, p4) > 1
+    # společná část intervalů na přímce (pouhý dotyk v krajním bodě se nepočítá)
+    axis = _main_axis(p1, p2, p3, p4)
+    low1, high1 = _interval(p1, p2, axis)
+    low2, high2 = _interval(p3, p4, axis)
+    return min(high1, high2) - max(low1, low2) > 0
 
 
 def merge_segments_nd(conn1, conn2, get_coords, ConnectionClass):
     """
     Pokusí se sloučit dvě úsečky ND (2D nebo 3D) do jedné delší,
-    pokud leží na jedné přímce a mají stejný typ čáry (plná/čárkovaná).
-    Pokud se liší dashed stav a překrývají, zachová aktuálnější (conn2).
+    pokud leží na jedné přímce, dotýkají se nebo překrývají a mají stejný typ čáry (plná/čárkovaná).
+    Pokud se liší dashed stav a překrývají, zachová aktuálnější (conn2)
+    a z conn1 zůstanou jen části mimo conn2.
     """
     # body jako n-tice pro výpočty
     p1 = get_coords(conn1.point_a)
@@ -142,25 +163,27 @@ def merge_segments_nd(conn1, conn2, get_coords, ConnectionClass):
 
     # speciální případ: různé dashed
     if conn1.dashed != conn2.dashed:
-        if overlaps_nd(conn1, conn2, get_coords):
-            d1 = distance_nd(p1, p2)
-            d2 = distance_nd(p3, p4)
-
-            if d1 > d2:
-                # najdi společné body
-                remaining_points = [pt for pt in [p1, p2] if pt not in [p3, p4]] + \
-                                   [pt for pt in [p3, p4] if pt not in [p1, p2]]
-                if len(remaining_points) == 2:
-                    conn1.point_a = point_map[remaining_points[0]]
-                    conn1.point_b = point_map[remaining_points[1]]
-                return conn2, conn1
-            elif d1 < d2:
-                return conn2
-            else:
-                return None
-        else:
+        if not overlaps_nd(conn1, conn2, get_coords) or {p1, p2} == {p3, p4}:
             return None
 
+        # části conn1 před a za conn2 (na větší mřížce může conn2 ležet uprostřed conn1)
+        axis = _main_axis(p1, p2, p3, p4)
+        start, end = sorted((p1, p2), key=lambda point: point[axis])
+        low, high = sorted((p3, p4), key=lambda point: point[axis])
+        remaining = []
+        if start[axis] < low[axis]:
+            remaining.append((start, low))
+        if high[axis] < end[axis]:
+            remaining.append((high, end))
+
+        if not remaining:
+            return conn2
+        conn1.point_a, conn1.point_b = point_map[remaining[0][0]], point_map[remaining[0][1]]
+        if len(remaining) == 1:
+            return conn2, conn1
+        return conn2, conn1, ConnectionClass(point_map[remaining[1][0]], point_map[remaining[1][1]],
+                                             dashed=conn1.dashed)
+
     # klasické sloučení
     points = [conn1.point_a, conn1.point_b, conn2.point_a, conn2.point_b]
     coords = [get_coords(p) for p in points]
@@ -168,6 +191,13 @@ def merge_segments_nd(conn1, conn2, get_coords, ConnectionClass):
     if not are_colinear_nd(*coords):
         return None
 
+    # úsečky na jedné přímce, mezi kterými je mezera, zůstanou samostatné
+    axis = _main_axis(*coords)
+    low1, high1 = _interval(coords[0], coords[1], axis)
+    low2, high2 = _interval(coords[2], coords[3], axis)
+    if max(low1, low2) > min(high1, high2):
+        return None
+
     # najdi dva nejvzdálenější body
     max_dist = -1
     max_pair = None
@@ -181,23 +211,49 @@ def merge_segments_nd(conn1, conn2, get_coords, ConnectionClass):
     return ConnectionClass(max_pair[0], max_pair[1], dashed=conn1.dashed)
 
 
-def merge_all(connections, merge_fn):
+def line_key_nd(conn, get_coords):
+    """
+    Přímka, na které úsečka leží (2D i 3D): zkrácený směr s kladnou první nenulovou
+    složkou a bod přímky s nejmenší nezápornou souřadnicí v ose tohoto směru.
+    Úsečky na různých přímkách se nikdy nesloučí; bod (nulová úsečka) vrací None.
+    """
+    a = get_coords(conn.point_a)
+    b = get_coords(conn.point_b)
+    delta = [y - x for x, y in zip(a, b)]
+    steps = math.gcd(*delta)
+    if steps == 0:
+        return None
+    axis = next(axis for axis, component in enumerate(delta) if component)
+    direction = tuple(component // steps * (1 if delta[axis] > 0 else -1) for component in delta)
+    shift = a[axis] // direction[axis]
+    return direction, tuple(x - shift * d for x, d in zip(a, direction))
+
+
+def merge_all(connections, merge_fn, line_key=None):
     """
     Projde seznam spojení a opakovaně je slučuje pomocí merge_fn.
+    S line_key (viz line_key_nd) se merge_fn volá jen pro spojení na stejné přímce
+    a pro body – u větších mřížek a delších seznamů spojení se tak většina dvojic přeskočí.
     """
+    keys = [line_key(conn) for conn in connections] if line_key is not None else None
     i = 0
     while i < len(connections):
         j = i + 1
         while j < len(connections):
+            if keys is not None and keys[i] is not None and keys[j] is not None and keys[i] != keys[j]:
+                j += 1
+                continue
             merged = merge_fn(connections[i], connections[j])
             if merged:
                 connections.pop(j)
                 connections.pop(i)
 
-                if isinstance(merged, tuple):
-                    connections.extend(merged)
-                else:
-                    connections.append(merged)
+                merged = merged if isinstance(merged, tuple) else (merged,)
+                connections.extend(merged)
+                if keys is not None:
+                    keys.pop(j)
+                    keys.pop(i)
+                    keys.extend(line_key(conn) for conn in merged)
 
                 i = -1  # restart cyklu
                 break
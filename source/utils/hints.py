@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+hints.py
+--------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • porovnání rozpracovaného řešení s nejbližším uznaným řešením úlohy
+      (všechna 3D řešení z data3d, u úloh 3D_to_2D všechny tři pohledy najednou),
+    • nejmenší rozdíl – chybějící úsečky, přebývající úsečky a úsečky se špatným čárkováním,
+    • výběr jednoho prvku, který se hráči zvýrazní jako nápověda.
+
+Řešení i uživatelská spojení jsou v kanonickém zápisu z utils/projection.py (bitové masky
+úseček mezi sousedními body mřížky), rozdíl je tak jen několik bitových operací na řešení.
+Po úpravě se znovu zapíše jen změněná část (3D nebo jeden pohled), rozdíly se pak
+přepočítají z uložených masek.
+
+Spuštění (ze složky source/):
+    python -m utils.hints data.json [--task 2.3]
+"""
+
+from utils.projection import DEFAULT_SIZE, VIEWS, get_lattice, solution_masks, task_size, view_masks
+
+# druhy nápovědy v pořadí, v jakém se nabízejí (nejdřív co chybí, nakonec co přebývá)
+HINT_KINDS = ("missing", "wrong_dash", "extra")
+
+HINT_TEXTS = {
+    ("missing", False): "Chybí úsečka",
+    ("missing", True): "Chybí bod",
+    ("wrong_dash", False): "Přepni plná/čárkovaná",
+    ("extra", False): "Přebývající úsečka",
+    ("extra", True): "Přebývající bod",
+}
+
+
+class Hint:
+    """
+    Jeden prvek nápovědy.
+
+    Attributes:
+        kind (str): "missing" / "wrong_dash" / "extra"
+        part (str): "3d" nebo pohled ("pudorys" / "narys" / "bokorys")
+        a, b (tuple): krajní body úsečky (col, row(, lay)); u bodu a == b
+        dashed (bool): jak má prvek vypadat ve správném řešení (u přebývajících jak ho nakreslil hráč)
+    """
+
+    __slots__ = ("kind", "part", "a", "b", "dashed")
+
+    def __init__(self, kind: str, part: str, a: tuple, b: tuple, dashed: bool):
+        self.kind = kind
+        self.part = part
+        self.a = a
+        self.b = b
+        self.dashed = dashed
+
+    @property
+    def text(self) -> str:
+        return HINT_TEXTS[(self.kind, self.a == self.b)]
+
+    def __repr__(self):
+        return f"Hint({self.kind}, {self.part}, {self.a}, {self.b}, dashed={self.dashed})"
+
+
+def connections_to_segments(connections) -> list:
+    """Převede Connection2D/Connection3D na úsečky jako v data.json ([[c,r(,l)],[c,r(,l)],d])."""
+    segments = []
+    for conn in connections:
+        coords = [(point.col, point.row) if not hasattr(point, "lay") else (point.col, point.row, point.lay)
+                  for point in (conn.point_a, conn.point_b)]
+        segments.append([coords[0], coords[1], int(bool(conn.dashed))])
+    return segments
+
+
+def _diff(user, target) -> tuple[int, int, int, int, int]:
+    """
+    Rozdíl masek (ViewMasks) uživatele a řešení.
+
+    Returns:
+        tuple: (chybějící úsečky, přebývající úsečky, špatně čárkované úsečky, chybějící body, přebývající body)
+    """
+    user_lines = user.solid | user.dashed
+    target_lines = target.solid | target.dashed
+    return (target_lines & ~user_lines,
+            user_lines & ~target_lines,
+            (user.solid & target.dashed) | (user.dashed & target.solid),
+            target.points & ~user.points,
+            user.points & ~target.points)
+
+
+def _distance(diff: tuple) -> int:
+    """Velikost rozdílu = počet úseček mezi sousedními body (a bodů), které je třeba změnit."""
+    return sum(mask.bit_count() for mask in diff)
+
+
+class HintEngine:
+    """
+    Nápověda k jedné úloze.
+
+    Cíle jsou uznaná řešení – každý cíl je slovník část → ViewMasks ("3d" pro 3D
+    řešení, názvy pohledů pro úlohy 3D_to_2D). Uživatelský stav se drží ve stejném
+    zápisu a po každé úpravě se aktualizuje jen změněná část.
+
+    Attributes:
+        size (int): počet bodů mřížky v jednom směru
+        targets (list[dict[str, ViewMasks]]): uznaná řešení
+        user (dict[str, ViewMasks]): aktuální uživatelský stav
+        distances (list[int]): velikost rozdílu k jednotlivým cílům
+    """
+
+    def __init__(self, targets: list[dict], size: int = DEFAULT_SIZE):
+        self.size = size
+        self.targets = targets
+        parts = {part for target in targets for part in target}
+        self.user = {part: solution_masks([], size) for part in parts}
+        self._part_distances = [{part: _distance(_diff(self.user[part], target[part])) for part in target}
+                                for target in targets]
+        self.distances = [sum(part_distances.values()) for part_distances in self._part_distances]
+
+    @classmethod
+    def for_task(cls, task: dict, size: int = DEFAULT_SIZE) -> "HintEngine":
+        """
+        Nápověda pro úlohu z data.json: u úloh 3D_to_2D se porovnávají pohledy,
+        jinak uživatelská 3D spojení se všemi řešeními z data3d. Velikost mřížky
+        určuje klíč "size" úlohy (size je jen výchozí hodnota).
+        """
+        size = task_size(task, size)
+        if task.get("task_type") == "3D_to_2D":
+            targets = [{view: view_masks(task.get(view, []), size) for view in VIEWS}]
+        else:
+            targets = [{"3d": solution_masks(solution, size)} for solution in task.get("data3d", []) if solution]
+        return cls(targets, size)
+
+    def update(self, part: str, segments) -> bool:
+        """
+        Přepíše jednu část uživatelského stavu a přepočítá rozdíly.
+
+        Args:
+            part (str): "3d" nebo pohled
+            segments (list): úsečky části jako v data.json (viz connections_to_segments)
+
+        Returns:
+            bool: True, pokud se část změnila
+        """
+        if part not in self.user:
+            return False
+        masks = solution_masks(segments, self.size) if part == "3d" else view_masks(segments, self.size)
+        if masks == self.user[part]:
+            return False
+        self.user[part] = masks
+        for index, target in enumerate(self.targets):
+            part_distances = self._part_distances[index]
+            part_distances[part] = _distance(_diff(masks, target[part]))
+            self.distances[index] = sum(part_distances.values())
+        return True
+
+    def nearest(self) -> int | None:
+        """Index nejbližšího řešení (None, pokud úloha žádné nemá)."""
+        if not self.distances:
+            return None
+        return min(range(len(self.distances)), key=self.distances.__getitem__)
+
+    def distance(self) -> int | None:
+        """Velikost rozdílu k nejbližšímu řešení (0 = vyřešeno)."""
+        nearest = self.nearest()
+        return None if nearest is None else self.distances[nearest]
+
+    def summary(self) -> dict[str, int]:
+        """Počty chybějících, přebývajících a špatně čárkovaných prvků vůči nejbližšímu řešení."""
+        counts = dict.fromkeys(HINT_KINDS, 0)
+        nearest = self.nearest()
+        if nearest is None:
+            return counts
+        for part, target in self.targets[nearest].items():
+            missing, extra, wrong_dash, missing_points, extra_points = _diff(self.user[part], target)
+            counts["missing"] += missing.bit_count() + missing_points.bit_count()
+            counts["extra"] += extra.bit_count() + extra_points.bit_count()
+            counts["wrong_dash"] += wrong_dash.bit_count()
+        return counts
+
+    @staticmethod
+    def _segment_mask(lattice, segment: tuple[int, int]) -> int:
+        return lattice.segment_mask(lattice.coords(segment[0]), lattice.coords(segment[1]))
+
+    def hint(self) -> Hint | None:
+        """
+        Jeden prvek, který se liší od nejbližšího řešení – nejdelší chybějící úsečka,
+        jinak úsečka se špatným čárkováním, jinak přebývající úsečka (body až po úsečkách).
+        """
+        nearest = self.nearest()
+        if nearest is None or self.distances[nearest] == 0:
+            return None
+        target = self.targets[nearest]
+        parts = [part for part in ("3d",) + VIEWS if part in target]
+        diffs = {part: _diff(self.user[part], target[part]) for part in parts}
+
+        for kind in HINT_KINDS:
+            for part in parts:
+                lattice = get_lattice(self.size, 3 if part == "3d" else 2)
+                missing, extra, wrong_dash, _, _ = diffs[part]
+                mask = {"missing": missing, "wrong_dash": wrong_dash, "extra": extra}[kind]
+                if not mask:
+                    continue
+                # nejdelší souvislá úsečka rozdílu (nejvíc sousedních úseček na jedné přímce)
+                start, end = max(lattice.segments(mask), key=lambda segment: self._segment_mask(lattice, segment).bit_count())
+                # jak má úsečka vypadat: podle řešení, přebývající podle hráče
+                source = self.user[part] if kind == "extra" else target[part]
+                dashed = bool(source.dashed & self._segment_mask(lattice, (start, end)))
+                return Hint(kind, part, lattice.coords(start), lattice.coords(end), dashed)
+
+        for kind, point_index in (("missing", 3), ("extra", 4)):
+            for part in parts:
+                points = diffs[part][point_index]
+                if points:
+                    lattice = get_lattice(self.size, 3 if part == "3d" else 2)
+                    point = lattice.coords((points & -points).bit_length() - 1)
+                    return Hint(kind, part, point, point, False)
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Nápověda k úlohám Cubiq🧊")
+    parser.add_argument("file", nargs="?", default="data.json")
+    parser.add_argument("--task", help="vypsat postupné nápovědy k jedné úloze (od prázdného řešení)")
+    args = parser.parse_args()
+
+    with open(args.file, "r", encoding="utf-8") as f:
+        all_data = json.load(f)
+    all_data.pop("_meta", None)
+
+    if args.task:
+        # hráč postupně přidá nebo opraví vše, co nápověda ukáže
+        task_data = all_data[args.task]
+        engine = HintEngine.for_task(task_data)
+        drawn = {part: [] for part in engine.user}
+        step = engine.hint()
+        while step is not None:
+            print(f"{step.text}: {step.part} {step.a} – {step.b}{' (čárkovaně)' if step.dashed else ''}")
+            segments = [s for s in drawn[step.part] if (tuple(s[0]), tuple(s[1])) != (step.a, step.b)]
+            if step.kind != "extra":
+                segments.append([step.a, step.b, int(step.dashed)])
+            drawn[step.part] = segments
+            engine.update(step.part, segments)
+            step = engine.hint()
+        print(f"Vyřešeno, rozdíl {engine.distance()}")
+    else:
+        # doba jedné úpravy: u každé úlohy se postupně odebere a zase přidá každá úsečka řešení
+        from utils.projection import masks_to_segments
+
+        edits = 0
+        slowest_us = 0.0
+        start = time.perf_counter()
+        for task_data in all_data.values():
+            engine = HintEngine.for_task(task_data)
+            if not engine.targets:
+                continue
+            for part, masks in engine.targets[0].items():
+                solution = masks_to_segments(masks, engine.size, 3 if part == "3d" else 2)
+                for index in range(len(solution)):
+                    for segments in (solution[:index] + solution[index + 1:], solution):
+                        edit_start = time.perf_counter()
+                        engine.update(part, segments)
+                        engine.hint()
+                        slowest_us = max(slowest_us, (time.perf_counter() - edit_start) * 1e6)
+                        edits += 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Úprav: {edits}, průměrně {elapsed_ms * 1000 / max(edits, 1):.0f} µs, "
+              f"nejpomalejší {slowest_us:.0f} µs (včetně výběru nápovědy)")
@@ -6,28 +6,75 @@ Iniciace globálních proměnných pro hru Cubiq🧊
 
 Slouží k definování základních konstant (velikost okna, font apod.),
 které jsou sdílené napříč moduly aplikace.
+
+Fonty se vytvářejí přes get_font(): cesta k souboru fontu se hledá mezi
+systémovými fonty jen jednou (případně se převezme ze snímku startu,
+viz utils/warm_start.py), další fonty se už jen otevřou ze souboru.
 """
 
+import os
+
 import glob_var
 import pygame
 
 
+# minimální velikost okna
+MIN_SCREEN_WIDTH = 1000
+MIN_SCREEN_HEIGHT = 650
+
+# cesty k souborům fontů podle názvu (None = font v systému není → výchozí font pygame)
+_font_paths: dict[str, str | None] = {}
+
+
+def get_font(name: str, size: int) -> pygame.font.Font:
+    """
+    Vytvoří font daného názvu a velikosti (stejně jako pygame.font.SysFont).
+    Systémové fonty se prohledají jen při prvním použití názvu.
+    """
+    if name not in _font_paths:
+        _font_paths[name] = pygame.font.match_font(name)
+    return pygame.font.Font(_font_paths[name], size)
+
+
+def font_paths() -> dict[str, str | None]:
+    """Vrátí už nalezené cesty k fontům (pro snímek startu)."""
+    return dict(_font_paths)
+
+
+def set_font_paths(paths: dict[str, str | None]):
+    """Převezme cesty k fontům (ze snímku startu); neexistující soubory se přeskočí."""
+    for name, path in paths.items():
+        if path is None or os.path.exists(path):
+            _font_paths[name] = path
+
+
 def initiate_length(info):
-    glob_var.SCREEN_WIDTH = info.current_w * 0.92 if (info.current_w * 0.8 > 1000) else 1000  # min velikost obrazovky
-    glob_var.SCREEN_HEIGHT = info.current_h * 0.92 if (info.current_h * 0.8 > 650) else 650
+    """Nastaví výchozí velikost okna podle rozlišení displeje a dopočítá odvozené konstanty."""
+    width = info.current_w * 0.92 if (info.current_w * 0.8 > MIN_SCREEN_WIDTH) else MIN_SCREEN_WIDTH
+    height = info.current_h * 0.92 if (info.current_h * 0.8 > MIN_SCREEN_HEIGHT) else MIN_SCREEN_HEIGHT
+    set_window_size(width, height)
+
+
+def set_window_size(width, height):
+    """
+    Nastaví velikost okna (alespoň minimální) a přepočítá odsazení, fonty a šířky čar.
+    Volá se při startu a při každé změně velikosti okna (VIDEORESIZE).
+    """
+    glob_var.SCREEN_WIDTH = max(width, MIN_SCREEN_WIDTH)
+    glob_var.SCREEN_HEIGHT = max(height, MIN_SCREEN_HEIGHT)
 
     glob_var.X_OFFSET = glob_var.Y_OFFSET = 45 + glob_var.SCREEN_WIDTH // 200
     glob_var.BTN_HEIGHT = 40 + glob_var.SCREEN_WIDTH // 60
 
     glob_var.FONT_SIZE = int(25 + glob_var.SCREEN_HEIGHT // 60)
 
-    glob_var.FONT = pygame.font.SysFont(
+    glob_var.FONT = get_font(
         glob_var.FONT_NAME,
         int(glob_var.FONT_SIZE)
     )
 
     glob_var.POP_UP_FONT_SIZE = int(glob_var.FONT_SIZE//1.5)
-    glob_var.POP_UP_FONT = pygame.font.SysFont(
+    glob_var.POP_UP_FONT = get_font(
         glob_var.FONT_NAME,
         glob_var.POP_UP_FONT_SIZE
     )
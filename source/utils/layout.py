@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+layout.py
+---------
+Rozložení obrazovky pro aplikaci Cubiq🧊.
+
+Obsahuje:
+    • třídu Layout – veškerou geometrii obrazovky pro jednu velikost okna
+      (velikosti a pozice 2D/3D gridů, čára nad textem, pozice tlačítek, fonty),
+    • get_layout() – vrátí (a cachuje) Layout pro aktuální velikost okna v glob_var,
+    • prime_layout() – převezme Layout uložený ve snímku startu (utils/warm_start.py),
+    • layout_task_text() – zalomení a vykreslení textu zadání úlohy (fonty se cachují,
+      funkci lze volat i z vlákna na pozadí, viz elements/task_prefetch.py).
+
+Layout se počítá jen jednou pro každou velikost okna (drží se jen posledních
+MAX_LAYOUTS velikostí – při tažení okna myší vznikne Layout pro každou mezivelikost). Obrazovky si ho
+nechávají předat v metodě apply_layout() (při vytvoření a při změně velikosti okna).
+"""
+
+import threading
+from collections import OrderedDict
+
+import glob_var
+import pygame
+from grids import grid_2d, grid_3d
+from utils.initiating_length import get_font
+
+
+SYMBOL_FONT_NAME = "Segoe UI Symbol"
+
+
+class Layout:
+    """
+    Geometrie obrazovky pro jednu velikost okna.
+
+    Attributes:
+        width, height (int): velikost okna
+        line_y (int): Y souřadnice oddělovací čáry nad textem úlohy (4/5 výšky)
+        bottom_center_y (int): svislý střed mezi čárou a spodním okrajem okna
+        square_2d (int): délka čtverce 2D gridů
+        corners_2d (tuple): levé horní rohy (půdorys, nárys, bokorys)
+        pop_up_positions (tuple): pozice tlačítek "?" u (půdorysu, nárysu, bokorysu)
+        square_3d (int): délka čtverce 3D gridu
+        shift_3d (float): posun mezi vrstvami 3D gridu
+        corner_3d (list[float]): levý horní roh 3D gridu vpravo
+        corner_3d_middle (list[float]): levý horní roh 3D gridu uprostřed (tutoriál)
+        prev_button_pos, next_button_pos (tuple): pozice tlačítek < a > na obrazovce úlohy
+        symbol_font_size (int): velikost fontu pro symboly
+        symbol_font (pygame.font.Font): font pro symboly (tlačítko domů)
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+        # čára nad textem úlohy (1/5 obrazovky dole vyhrazena na text k úloze)
+        self.line_y = (4 * height) // 5
+        self.bottom_center_y = self.line_y + (height - self.line_y) // 2
+
+        # 2D gridy
+        self.square_2d = grid_2d.count_square_length()
+        self.corners_2d = grid_2d.find_left_upper_corners(self.square_2d)
+        self.pop_up_positions = tuple(
+            (x + 1.9 * self.square_2d, y + 2.5 * self.square_2d) for x, y in self.corners_2d
+        )
+
+        # 3D grid
+        self.square_3d = grid_3d.count_square_length()
+        self.shift_3d = grid_3d.count_length_of_shift_to_3d(self.square_3d)
+        self.corner_3d = grid_3d.find_left_upper_corner(self.square_3d, self.shift_3d)
+        self.corner_3d_middle = grid_3d.find_left_upper_corner_in_middle_of_screen_width(self.square_3d,
+                                                                                          self.shift_3d)
+
+        # tlačítka < a > (čtvercová, strana BTN_HEIGHT) vycentrovaná mezi čárou a spodním okrajem
+        button_size = glob_var.BTN_HEIGHT
+        button_y = self.bottom_center_y - button_size // 2
+        self.prev_button_pos = (button_size, button_y)
+        self.next_button_pos = (width - button_size - button_size, button_y)
+
+        self.symbol_font_size = glob_var.FONT_SIZE
+        self.symbol_font = get_font(SYMBOL_FONT_NAME, self.symbol_font_size)
+
+    def to_snapshot(self) -> dict:
+        """Vrátí geometrii jako prostá data (čísla, n-tice, seznamy) pro snímek startu."""
+        return {name: value for name, value in vars(self).items() if name != "symbol_font"}
+
+    @classmethod
+    def from_snapshot(cls, data: dict) -> "Layout":
+        """Obnoví Layout ze snímku startu bez přepočítávání geometrie."""
+        layout = cls.__new__(cls)
+        layout.__dict__.update(data)
+        layout.symbol_font = get_font(SYMBOL_FONT_NAME, layout.symbol_font_size)
+        return layout
+
+
+MAX_LAYOUTS = 4  # aktuální velikost, velikost ze snímku startu a pár posledních (okno ↔ celá obrazovka)
+
+# cache rozložení podle velikosti okna (naposledy použité na konci)
+_layouts: OrderedDict[tuple, Layout] = OrderedDict()
+
+
+def _remember(size: tuple, layout: Layout):
+    """Uloží Layout do cache; nejdéle nepoužitý se zahodí."""
+    _layouts[size] = layout
+    _layouts.move_to_end(size)
+    while len(_layouts) > MAX_LAYOUTS:
+        _layouts.popitem(last=False)
+
+
+def get_layout() -> Layout:
+    """Vrátí Layout pro aktuální velikost okna (glob_var), spočítá ho jen poprvé."""
+    size = (glob_var.SCREEN_WIDTH, glob_var.SCREEN_HEIGHT)
+    layout = _layouts.get(size)
+    if layout is None:
+        layout = Layout(*size)
+    _remember(size, layout)
+    return layout
+
+
+def prime_layout(data: dict):
+    """Uloží do cache Layout ze snímku startu (pro velikost okna, pro kterou se spočítal)."""
+    layout = Layout.from_snapshot(data)
+    size = (layout.width, layout.height)
+    if size not in _layouts:
+        _remember(size, layout)
+
+
+# ==================================================
+# TEXT ZADÁNÍ ÚLOHY
+# ==================================================
+
+# fonty textu zadání podle velikosti (vytvářejí se jen jednou, i z vlákna na pozadí)
+_text_fonts: dict[int, pygame.font.Font] = {}
+_text_fonts_lock = threading.Lock()
+
+
+def get_text_font(size: int) -> pygame.font.Font:
+    """Vrátí font textu zadání dané velikosti (vytvoří ho jen poprvé)."""
+    with _text_fonts_lock:
+        font = _text_fonts.get(size)
+        if font is None:
+            font = _text_fonts[size] = get_font(glob_var.FONT_NAME, size)
+        return font
+
+
+def task_text_geometry(layout: Layout, margin_x: int) -> tuple:
+    """
+    Vrátí parametry, na kterých závisí rozložení textu zadání
+    (šířka a výška okna, čára nad textem, okraj, výchozí velikost fontu).
+    Slouží i jako klíč, podle kterého se pozná, že je připravený text stále platný.
+    """
+    return layout.width, layout.height, layout.line_y, margin_x, glob_var.FONT.get_height()
+
+
+def layout_task_text(text: str, geometry: tuple) -> tuple[list, list]:
+    """
+    Zalomí text zadání do řádků a vykreslí ho vycentrovaný mezi čárou a spodním okrajem okna.
+    Pokud se text nevejde, zmenšuje font (nejméně na velikost 16).
+
+    Args:
+        text (str): text zadání
+        geometry (tuple): parametry z task_text_geometry()
+
+    Returns:
+        tuple: (povrchy řádků, jejich pozice (x, y))
+    """
+    width, height, line_y, margin_x, font_size = geometry
+    color = (230, 230, 230)
+    if not text.strip():
+        return [], []
+
+    max_width = width - 2 * margin_x
+    line_spacing = 5  # mezera mezi řádky
+    padding_top = 8  # mezera od čáry nad textem
+
+    available_height = height - line_y - padding_top
+    min_font_size = 16
+
+    # Zmenšování fontu, pokud text přeteče
+    while font_size >= min_font_size:
+        font = get_text_font(font_size)
+
+        words = text.split(" ")
+        lines = []
+        current_line = ""
+        for word in words:
+            test_line = current_line + word + " "
+            if font.size(test_line)[0] <= max_width:
+                current_line = test_line
+            else:
+                lines.append(current_line.strip())
+                current_line = word + " "
+        if current_line:
+            lines.append(current_line.strip())
+
+        total_text_height = (
+                sum(font.size(line)[1] for line in lines)
+                + line_spacing * (len(lines) - 1)
+        )
+
+        if total_text_height <= available_height:
+            break
+
+        font_size -= 1
+
+    # Vertikální pozice
+    top_y = line_y + padding_top + (available_height - total_text_height) // 2
+
+    # Připravit seznam povrchů
+    surfaces = []
+    positions = []
+
+    y = top_y
+    for line in lines:
+        surf = font.render(line, True, color)
+        x = margin_x + (max_width - surf.get_width()) // 2
+        surfaces.append(surf)
+        positions.append((x, y))
+        y += surf.get_height() + line_spacing
+    return surfaces, positions
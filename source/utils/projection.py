@@ -0,0 +1,696 @@
+# -*- coding: utf-8 -*-
+"""
+projection.py
+-------------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • výpočet půdorysu, nárysu a bokorysu z 3D spojení (pravoúhlé promítání na mřížku),
+    • sloučení úseček, které se v pohledu překrývají, a vynechání bodů, které leží na úsečce,
+    • nalezení stěn tělesa z jeho hran a určení skrytých částí hran (čárkovaně)
+      v pohledech i ve 3D gridu,
+    • kanonický zápis pohledu i 3D řešení – bitové masky úseček mezi sousedními body mřížky,
+    • převod pohledu zpět na seznam úseček (jako v data.json) nebo na Connection2D,
+    • velikost mřížky úlohy (klíč "size", MIN_SIZE až MAX_SIZE bodů v jednom směru, výchozí 3).
+(neřeší pygame ani vykreslování)
+
+Souřadnice pohledů (odvozené z úloh v data.json, pro mřížku size×size×size):
+    půdorys  (col, size-1-lay)  – pohled shora, přední strana tělesa je dole
+    nárys    (col, row)         – pohled zepředu
+    bokorys  (lay, row)         – levý bokorys (pohled zprava), kreslí se vlevo od nárysu
+
+Čárkovaně se kreslí úsečka, na kterou se promítají jen skryté hrany; jakmile se
+na stejné místo promítá i viditelná hrana, je úsečka plná. U "plochých" útvarů
+(úsečky, mnohoúhelníky – bez objemu) se čárkování převezme z 3D spojení.
+
+Spuštění (ze složky source/):
+    python -m utils.projection data.json [--task 3.1]
+"""
+
+import bisect
+import itertools
+import math
+from functools import lru_cache
+
+VIEWS = ("pudorys", "narys", "bokorys")
+
+# velikost mřížky (počet bodů v jednom směru); úloha bez klíče "size" má DEFAULT_SIZE
+DEFAULT_SIZE = 3
+MIN_SIZE = 2
+MAX_SIZE = 10
+
+# 3D grid je ve volném rovnoběžném promítání: vrstva dál je posunutá o polovinu délky pod 45° doprava nahoru
+OBLIQUE_SHIFT = 1 / (2 * math.sqrt(2))
+
+# směr k pozorovateli v souřadnicích (col, row, lay): row roste dolů, lay dozadu
+VIEW_DIRECTIONS = {
+    "pudorys": (0, -1, 0),
+    "narys": (0, 0, -1),
+    "bokorys": (1, 0, 0),
+    "3d": (OBLIQUE_SHIFT, -OBLIQUE_SHIFT, -1),  # 3D grid (viditelnost 3D hran, ne pohled úlohy)
+}
+
+
+def task_size(task: dict, default: int = DEFAULT_SIZE) -> int:
+    """Velikost mřížky úlohy z data.json (klíč "size", jinak default)."""
+    return task.get("size", default) if isinstance(task, dict) else default
+
+
+def project_point(view: str, point, size: int = 3) -> tuple[int, int]:
+    """Promítne 3D bod (col, row, lay) do 2D pohledu (col, row); pro "3d" do roviny 3D gridu."""
+    col, row, lay = point
+    if view == "3d":
+        return col + OBLIQUE_SHIFT * lay, row - OBLIQUE_SHIFT * lay
+    if view == "pudorys":
+        return col, size - 1 - lay
+    if view == "narys":
+        return col, row
+    return lay, row
+
+
+# ==================================================
+# 2D MŘÍŽKA A BITOVÉ MASKY
+# ==================================================
+
+class Lattice:
+    """
+    Úsečky mezi sousedními body mřížky size×size (případně size×size×size),
+    na úsečce neleží žádný další bod mřížky. Každá taková úsečka má v maskách
+    jeden bit; libovolná úsečka mezi body mřížky je pak maska několika sousedních
+    úseček na jedné přímce.
+
+    Bity jsou očíslované po směrech (kanonický směr, viz níže) a v rámci směru podle
+    indexu počátečního bodu. Počáteční body jednoho směru tvoří kvádr, takže se číslo
+    bitu i úsečka k bitu spočítají přímo – ani u velkých mřížek (např. 8×8×8 má přes
+    sto tisíc úseček) se nemusí procházet všechny úsečky.
+
+    Attributes:
+        size (int): počet bodů v jednom směru
+        dim (int): rozměr mřížky (2 pro pohledy, 3 pro 3D spojení)
+        directions (list[tuple]): kanonické směry (dx, dy(, dz)) v pořadí bitů
+        piece_count (int): počet úseček (bitů)
+        pieces (list[tuple[int, int]]): dvojice indexů bodů (index = col + size * row (+ size² * lay));
+            počítá se až při prvním použití
+        steps (list[tuple]): směr úsečky (dx, dy(, dz)) od prvního bodu k druhému; až při prvním použití
+    """
+
+    def __init__(self, size: int, dim: int = 2):
+        self.size = size
+        self.dim = dim
+        self._strides = tuple(size ** axis for axis in range(dim))
+        self._segment_masks: dict[tuple[tuple, tuple], int] = {}
+        self._touching: dict[int, int] = {}
+        self._pieces = self._steps = None
+
+        # kanonický směr: první nenulová složka je kladná (ve 2D doprava, případně svisle dolů)
+        self.directions: list[tuple] = []
+        self._direction_of: dict[tuple, int] = {}
+        self._offsets: list[int] = []  # první bit každého směru
+        self._boxes: list[tuple[tuple, tuple, tuple]] = []  # počáteční body směru: (dolní meze, šířky, násobky)
+        count = 0
+        spans = [range(0, size)] + [range(-(size - 1), size)] * (dim - 1)
+        for step in itertools.product(*spans):
+            first = next((component for component in step if component), 0)
+            if first <= 0 or math.gcd(*step) != 1:
+                continue
+            lows = tuple(max(0, -component) for component in step)
+            widths = tuple(size - abs(component) for component in step)
+            multipliers = tuple(math.prod(widths[:axis]) for axis in range(dim))
+            self._direction_of[step] = len(self.directions)
+            self.directions.append(step)
+            self._offsets.append(count)
+            self._boxes.append((lows, widths, multipliers))
+            count += math.prod(widths)
+        self.piece_count = count
+
+    def index(self, *coords: int) -> int:
+        return sum(component * stride for component, stride in zip(coords, self._strides))
+
+    def coords(self, index: int) -> tuple:
+        coords = []
+        for _ in range(self.dim):
+            index, component = divmod(index, self.size)
+            coords.append(component)
+        return tuple(coords)
+
+    # ------------------------
+    # Číslo bitu ↔ úsečka
+    # ------------------------
+    def _bit(self, start: tuple, direction: int) -> int | None:
+        """Bit úsečky z bodu start v kanonickém směru (None, pokud by úsečka vyšla z mřížky)."""
+        lows, widths, multipliers = self._boxes[direction]
+        rank = 0
+        for component, low, width, multiplier in zip(start, lows, widths, multipliers):
+            offset = component - low
+            if not 0 <= offset < width:
+                return None
+            rank += offset * multiplier
+        return self._offsets[direction] + rank
+
+    def piece(self, bit: int) -> tuple[int, int]:
+        """Úsečka bitu jako dvojice indexů bodů (začátek, konec) v kanonickém směru."""
+        direction = bisect.bisect_right(self._offsets, bit) - 1
+        lows, widths, _ = self._boxes[direction]
+        rank = bit - self._offsets[direction]
+        start = []
+        for low, width in zip(lows, widths):
+            rank, offset = divmod(rank, width)
+            start.append(low + offset)
+        step = self.directions[direction]
+        end = [component + delta for component, delta in zip(start, step)]
+        return self.index(*start), self.index(*end)
+
+    def piece_step(self, bit: int) -> tuple:
+        """Kanonický směr úsečky bitu."""
+        return self.directions[bisect.bisect_right(self._offsets, bit) - 1]
+
+    @property
+    def pieces(self) -> list[tuple[int, int]]:
+        if self._pieces is None:
+            self._pieces = [self.piece(bit) for bit in range(self.piece_count)]
+        return self._pieces
+
+    @property
+    def steps(self) -> list[tuple]:
+        if self._steps is None:
+            self._steps = [self.piece_step(bit) for bit in range(self.piece_count)]
+        return self._steps
+
+    def touching_mask(self, index: int) -> int:
+        """Maska úseček, které v bodě začínají nebo končí."""
+        mask = self._touching.get(index)
+        if mask is None:
+            point = self.coords(index)
+            mask = 0
+            for direction, step in enumerate(self.directions):
+                for start in (point, tuple(component - delta for component, delta in zip(point, step))):
+                    bit = self._bit(start, direction)
+                    if bit is not None:
+                        mask |= 1 << bit
+            self._touching[index] = mask
+        return mask
+
+    @property
+    def touching(self) -> list[int]:
+        """Pro každý bod maska úseček, které v něm začínají nebo končí."""
+        return [self.touching_mask(index) for index in range(self.size ** self.dim)]
+
+    def segment_mask(self, a: tuple, b: tuple) -> int:
+        """Maska úsečky mezi body a a b (col, row(, lay)); 0 pro bod."""
+        key = (tuple(a), tuple(b))
+        mask = self._segment_masks.get(key)
+        if mask is None:
+            delta = [b[axis] - a[axis] for axis in range(self.dim)]
+            steps = math.gcd(*delta)
+            mask = 0
+            if steps:
+                unit = tuple(component // steps for component in delta)
+                forward = unit in self._direction_of
+                direction = self._direction_of[unit if forward else tuple(-component for component in unit)]
+                # úsečky v kanonickém směru začínají v bodech a + k·unit (proti směru o bod dál)
+                for k in range(steps) if forward else range(1, steps + 1):
+                    start = tuple(a[axis] + k * unit[axis] for axis in range(self.dim))
+                    mask |= 1 << self._bit(start, direction)
+            self._segment_masks[key] = mask
+        return mask
+
+    def segments(self, mask: int) -> list[tuple[int, int]]:
+        """
+        Rozloží masku na nejdelší úsečky (sousední úsečky na jedné přímce se spojí).
+
+        Returns:
+            list[tuple[int, int]]: dvojice indexů bodů (začátek, konec) v kanonickém směru
+        """
+        result = []
+        remaining = mask
+        while remaining:
+            low = remaining & -remaining
+            bit = low.bit_length() - 1
+            remaining ^= low
+            direction = bisect.bisect_right(self._offsets, bit) - 1
+            step = self.directions[direction]
+            a, b = self.piece(bit)
+            start, end = self.coords(a), self.coords(b)
+
+            # prodloužení oběma směry po úsečkách stejného směru
+            while True:
+                previous = tuple(component - delta for component, delta in zip(start, step))
+                prev = self._bit(previous, direction)
+                if prev is None or not remaining >> prev & 1:
+                    break
+                remaining ^= 1 << prev
+                start = previous
+            while True:
+                following = self._bit(end, direction)
+                if following is None or not remaining >> following & 1:
+                    break
+                remaining ^= 1 << following
+                end = tuple(component + delta for component, delta in zip(end, step))
+            result.append((self.index(*start), self.index(*end)))
+        result.sort()
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_lattice(size: int = 3, dim: int = 2) -> Lattice:
+    """Vrátí (sdílenou) mřížku dané velikosti a rozměru."""
+    return Lattice(size, dim)
+
+
+class ViewMasks:
+    """
+    Kanonický zápis jednoho 2D pohledu (případně 3D řešení, viz solution_masks).
+
+    Attributes:
+        solid (int): maska plných úseček
+        dashed (int): maska čárkovaných úseček (nikdy se nepřekrývá s plnými)
+        points (int): samostatné body (bit = index bodu), které neleží na žádné úsečce
+    """
+
+    __slots__ = ("solid", "dashed", "points")
+
+    def __init__(self, solid: int = 0, dashed: int = 0, points: int = 0):
+        self.solid = solid
+        self.dashed = dashed & ~solid
+        self.points = points
+
+    def key(self) -> tuple[int, int, int]:
+        return self.solid, self.dashed, self.points
+
+    def __eq__(self, other):
+        return isinstance(other, ViewMasks) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"ViewMasks(solid={self.solid:#x}, dashed={self.dashed:#x}, points={self.points:#x})"
+
+
+def _reduce_points(lattice: Lattice, points: int, lines: int) -> int:
+    """Vynechá body, které leží na některé úsečce (jsou její součástí)."""
+    remaining = points
+    while remaining:
+        low = remaining & -remaining
+        if lattice.touching_mask(low.bit_length() - 1) & lines:
+            points &= ~low
+        remaining ^= low
+    return points
+
+
+def _masks(segments, lattice: Lattice) -> ViewMasks:
+    solid = dashed = points = 0
+    for segment in segments:
+        a, b = tuple(segment[0]), tuple(segment[1])
+        is_dashed = len(segment) > 2 and bool(segment[2])
+        if a == b:
+            points |= 1 << lattice.index(*a)
+        elif is_dashed:
+            dashed |= lattice.segment_mask(a, b)
+        else:
+            solid |= lattice.segment_mask(a, b)
+    return ViewMasks(solid, dashed, _reduce_points(lattice, points, solid | dashed))
+
+
+def view_masks(segments_2d, size: int = 3) -> ViewMasks:
+    """
+    Kanonický zápis 2D pohledu z data.json (úsečky [[c,r],[c,r],d]).
+    Překrývající se úsečky se sloučí, plná čára má přednost před čárkovanou.
+    """
+    return _masks(segments_2d, get_lattice(size))
+
+
+def solution_masks(segments_3d, size: int = 3) -> ViewMasks:
+    """
+    Kanonický zápis jednoho 3D řešení z data3d (úsečky [[c,r,l],[c,r,l],d]) nad 3D mřížkou.
+    Dvě řešení se stejnými maskami jsou stejná spojení (jen jinak rozdělená nebo seřazená).
+    """
+    return _masks(segments_3d, get_lattice(size, 3))
+
+
+def masks_to_segments(masks: ViewMasks, size: int = 3, dim: int = 2) -> list:
+    """
+    Převede kanonické masky na seznam úseček ve stejné podobě jako v data.json.
+    Úsečky jsou nejdelší možné a seřazené (plné, čárkované, body).
+    """
+    lattice = get_lattice(size, dim)
+    segments = []
+    for mask, dashed in ((masks.solid, 0), (masks.dashed, 1)):
+        for a, b in lattice.segments(mask):
+            segments.append([list(lattice.coords(a)), list(lattice.coords(b)), dashed])
+    remaining = masks.points
+    while remaining:
+        low = remaining & -remaining
+        point = list(lattice.coords(low.bit_length() - 1))
+        segments.append([point, list(point), 0])
+        remaining ^= low
+    return segments
+
+
+# ==================================================
+# STĚNY TĚLESA A VIDITELNOST
+# ==================================================
+
+_EPS = 1e-9
+
+# kde v části úsečky se určuje viditelnost – kousek vedle středu, aby paprsek k pozorovateli
+# neprošel přesně hranou tělesa (např. hřebenem hranolu), kde se nepozná, zda vede tělesem
+_SAMPLE_AT = 0.5 + 0.0173
+
+
+def _sub(a, b):
+    return a[0] - b[0], a[1] - b[1], a[2] - b[2]
+
+
+def _cross(u, v):
+    return u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0]
+
+
+def _dot(u, v):
+    return u[0] * v[0] + u[1] * v[1] + u[2] * v[2]
+
+
+def _split_edges(segments_3d) -> list[tuple[tuple, tuple]]:
+    """
+    Hrany tělesa bez bodů a duplicit, rozdělené v koncových bodech jiných hran,
+    které na nich leží (hrana přes celou stěnu krychle a hrana z jejího středu).
+    """
+    edges = {tuple(sorted((tuple(segment[0]), tuple(segment[1])))) for segment in segments_3d}
+    edges = {edge for edge in edges if edge[0] != edge[1]}
+    vertices = {point for edge in edges for point in edge}
+
+    result = set()
+    for a, b in edges:
+        delta = _sub(b, a)
+        steps = math.gcd(*delta)
+        # body mřížky na hraně, které jsou zároveň vrcholy jiných hran
+        chain = [a] + [point for point in (
+            tuple(a[axis] + delta[axis] * k // steps for axis in range(3)) for k in range(1, steps)
+        ) if point in vertices] + [b]
+        result.update(zip(chain, chain[1:]))
+    return sorted(result)
+
+
+def _plane_key(normal, point) -> tuple:
+    """Kanonická rovina (normála zkrácená na nesoudělná čísla s kladnou první nenulovou složkou, d)."""
+    divisor = math.gcd(*normal)
+    normal = tuple(component // divisor for component in normal)
+    if next(component for component in normal if component) < 0:
+        normal = tuple(-component for component in normal)
+    return normal, _dot(normal, point)
+
+
+def _plane_faces(plane: tuple, edges: list) -> list[list[tuple]]:
+    """
+    Najde stěny v jedné rovině: omezené oblasti rovinného grafu hran
+    (obchází se vždy po nejbližší hraně proti směru hodinových ručiček).
+
+    Returns:
+        list[list[tuple]]: mnohoúhelníky (vrcholy jako 3D body)
+    """
+    normal, _ = plane
+    drop = max(range(3), key=lambda axis: abs(normal[axis]))
+    axes = [axis for axis in range(3) if axis != drop]
+
+    def flat(point):
+        return point[axes[0]], point[axes[1]]
+
+    neighbors: dict[tuple, list[tuple]] = {}
+    for a, b in edges:
+        neighbors.setdefault(a, []).append(b)
+        neighbors.setdefault(b, []).append(a)
+    for vertex, adjacent in neighbors.items():
+        x, y = flat(vertex)
+        adjacent.sort(key=lambda other: math.atan2(flat(other)[1] - y, flat(other)[0] - x))
+
+    faces = []
+    used = set()
+    for a, b in edges:
+        for start in ((a, b), (b, a)):
+            if start in used:
+                continue
+            cycle = []
+            half_edge = start
+            while half_edge not in used:
+                used.add(half_edge)
+                u, v = half_edge
+                cycle.append(u)
+                around = neighbors[v]
+                w = around[(around.index(u) - 1) % len(around)]
+                half_edge = (v, w)
+            points = [flat(point) for point in cycle]
+            area = sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]))
+            if area > 0:
+                faces.append(cycle)
+    return faces
+
+
+@lru_cache(maxsize=4096)
+def _solid_faces(edges: tuple) -> tuple | None:
+    """
+    Stěny tělesa určeného hranami: uzavřené mnohoúhelníky z hran ležících v jedné rovině.
+
+    Returns:
+        tuple | None: ((rovina, mnohoúhelník), ...), nebo None pro útvar bez objemu
+            (všechny body v jedné rovině)
+    """
+    vertices = sorted({point for edge in edges for point in edge})
+    if len(vertices) < 4:
+        return None
+    base = vertices[0]
+    normal = next((_cross(_sub(p, base), _sub(q, base)) for p in vertices for q in vertices
+                   if _cross(_sub(p, base), _sub(q, base)) != (0, 0, 0)), None)
+    if normal is None or all(_dot(normal, _sub(p, base)) == 0 for p in vertices):
+        return None
+
+    # roviny dané dvojicemi hran se společným bodem
+    planes = set()
+    for i, (a, b) in enumerate(edges):
+        for c, d in edges[i + 1:]:
+            shared = {a, b} & {c, d}
+            if len(shared) != 1:
+                continue
+            (vertex,) = shared
+            normal = _cross(_sub(a if b == vertex else b, vertex), _sub(c if d == vertex else d, vertex))
+            if normal != (0, 0, 0):
+                planes.add(_plane_key(normal, vertex))
+
+    faces = []
+    for plane in sorted(planes):
+        normal, d = plane
+        in_plane = [edge for edge in edges if _dot(normal, edge[0]) == d and _dot(normal, edge[1]) == d]
+        if len(in_plane) >= 3:
+            faces.extend((plane, polygon) for polygon in _plane_faces(plane, in_plane))
+    return tuple(faces)
+
+
+def _inside_polygon(point: tuple[float, float], polygon: list[tuple[float, float]]) -> bool:
+    """Zjistí, zda bod leží uvnitř mnohoúhelníku (body na hranici se nepočítají)."""
+    x, y = point
+    inside = False
+    for (x1, y1), (x2, y2) in zip(polygon, polygon[1:] + polygon[:1]):
+        cross = (x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)
+        if abs(cross) < _EPS and min(x1, x2) - _EPS <= x <= max(x1, x2) + _EPS \
+                and min(y1, y2) - _EPS <= y <= max(y1, y2) + _EPS:
+            return False
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+    return inside
+
+
+def _occluders(faces: tuple, view: str, size: int) -> list:
+    """Stěny, které mohou zakrývat (nejsou s pohledem rovnoběžné), promítnuté do pohledu."""
+    direction = VIEW_DIRECTIONS[view]
+    occluders = []
+    for (normal, d), polygon in faces:
+        facing = _dot(normal, direction)
+        if facing == 0:
+            continue
+        flat = [project_point(view, point, size) for point in polygon]
+        xs, ys = [x for x, _ in flat], [y for _, y in flat]
+        occluders.append((normal, d, facing, flat, (min(xs), max(xs), min(ys), max(ys))))
+    return occluders
+
+
+def _is_hidden(point: tuple, view: str, size: int, occluders: list) -> bool:
+    """Zjistí, zda bod (i neceločíselný) zakrývá některá stěna při pohledu ze směru view."""
+    direction = VIEW_DIRECTIONS[view]
+    x, y = project_point(view, point, size)
+    for normal, d, facing, flat, (min_x, max_x, min_y, max_y) in occluders:
+        if not (min_x < x < max_x and min_y < y < max_y):
+            continue
+        # paprsek bod + t * direction protne rovinu stěny v t > 0 (před bodem)
+        t = (d - _dot(normal, point)) / facing
+        if t > _EPS and _inside_polygon((x, y), flat):
+            return True
+    return False
+
+
+# ==================================================
+# PROMÍTÁNÍ
+# ==================================================
+
+def project_view(segments_3d, view: str, size: int = 3, faces=False) -> ViewMasks:
+    """
+    Spočítá jeden pohled 3D úseček jako kanonické masky.
+
+    Každá úsečka se rozdělí na části mezi sousedními body pohledu; část je plná,
+    pokud je vidět (před ní není žádná stěna tělesa). Útvary bez objemu
+    (úsečky, mnohoúhelníky) žádné stěny nezakrývají – čárkování se převezme z 3D spojení.
+
+    Args:
+        segments_3d (list): úsečky [[c,r,l],[c,r,l],d] (jedno řešení z data3d)
+        view (str): "pudorys", "narys" nebo "bokorys"
+        size (int): velikost mřížky
+        faces: stěny tělesa (_solid_faces), pokud už jsou spočítané pro jiný pohled
+    """
+    lattice = get_lattice(size)
+    if faces is False:
+        faces = _solid_faces(tuple(_split_edges(segments_3d)))
+    occluders = _occluders(faces, view, size) if faces is not None else None
+
+    solid = dashed = points = 0
+    for segment in segments_3d:
+        a3, b3 = segment[0], segment[1]
+        a = project_point(view, a3, size)
+        b = project_point(view, b3, size)
+        if a == b:
+            points |= 1 << lattice.index(*a)
+            continue
+        if occluders is None:
+            if len(segment) > 2 and segment[2]:
+                dashed |= lattice.segment_mask(a, b)
+            else:
+                solid |= lattice.segment_mask(a, b)
+            continue
+
+        # části úsečky mezi sousedními body pohledu (viditelnost se určí v jednom bodě části)
+        steps = math.gcd(abs(b[0] - a[0]), abs(b[1] - a[1]))
+        delta = _sub(b3, a3)
+        for step in range(steps):
+            t0, t1 = step / steps, (step + 1) / steps
+            part = lattice.segment_mask(
+                (a[0] + (b[0] - a[0]) * step // steps, a[1] + (b[1] - a[1]) * step // steps),
+                (a[0] + (b[0] - a[0]) * (step + 1) // steps, a[1] + (b[1] - a[1]) * (step + 1) // steps),
+            )
+            middle = t0 + (t1 - t0) * _SAMPLE_AT
+            middle = tuple(a3[axis] + delta[axis] * middle for axis in range(3))
+            if _is_hidden(middle, view, size, occluders):
+                dashed |= part
+            else:
+                solid |= part
+    return ViewMasks(solid, dashed, _reduce_points(lattice, points, solid | dashed))
+
+
+def project_solution(segments_3d, size: int = 3) -> dict[str, ViewMasks]:
+    """Spočítá všechny tři pohledy jednoho řešení (kanonické masky podle VIEWS)."""
+    faces = _solid_faces(tuple(_split_edges(segments_3d)))
+    return {view: project_view(segments_3d, view, size, faces) for view in VIEWS}
+
+
+def dash_hidden_edges(segments_3d, size: int = 3) -> list:
+    """
+    Nastaví čárkování 3D úseček podle viditelnosti ve 3D gridu (volné rovnoběžné promítání):
+    čárkovaně jsou části hran zakryté stěnou tělesa. Úsečky se rozdělí na části mezi
+    body mřížky (sloučí je solution_masks). Útvary bez objemu se vrátí beze změny.
+
+    Returns:
+        list: úsečky [[c,r,l],[c,r,l],d]
+    """
+    faces = _solid_faces(tuple(_split_edges(segments_3d)))
+    if faces is None:
+        return [[list(segment[0]), list(segment[1]), int(len(segment) > 2 and bool(segment[2]))]
+                for segment in segments_3d]
+    occluders = _occluders(faces, "3d", size)
+
+    result = []
+    for segment in segments_3d:
+        a, b = tuple(segment[0]), tuple(segment[1])
+        delta = _sub(b, a)
+        steps = math.gcd(*delta)
+        if not steps:
+            result.append([list(a), list(a), 0])
+            continue
+        for step in range(steps):
+            start = [a[axis] + delta[axis] * step // steps for axis in range(3)]
+            end = [a[axis] + delta[axis] * (step + 1) // steps for axis in range(3)]
+            middle = tuple(start[axis] + (end[axis] - start[axis]) * _SAMPLE_AT for axis in range(3))
+            result.append([start, end, int(_is_hidden(middle, "3d", size, occluders))])
+    return result
+
+
+def project_to_json(segments_3d, size: int = 3) -> dict[str, list]:
+    """Spočítá pohledy ve stejné podobě jako v data.json ({"pudorys": [...], ...})."""
+    return {view: masks_to_segments(masks, size) for view, masks in project_solution(segments_3d, size).items()}
+
+
+def connections_from_segments(segments_2d, points_2d) -> list:
+    """
+    Převede úsečky pohledu na Connection2D nad skutečnými body 2D gridu.
+
+    Args:
+        segments_2d (list): úsečky [[c,r],[c,r],d]
+        points_2d (list[Grid2DPoint]): body gridu
+    """
+    from elements.connection import Connection2D
+
+    by_coords = {(point.col, point.row): point for point in points_2d}
+    return [
+        Connection2D(by_coords[tuple(a)], by_coords[tuple(b)], dashed=bool(dashed))
+        for a, b, dashed in segments_2d
+        if tuple(a) in by_coords and tuple(b) in by_coords
+    ]
+
+
+def connections_3d_from_segments(segments_3d, points_3d) -> list:
+    """
+    Převede 3D úsečky (jako v data3d) na Connection3D nad skutečnými body 3D gridu.
+
+    Args:
+        segments_3d (list): úsečky [[c,r,l],[c,r,l],d]
+        points_3d (list[Grid3DPoint]): body gridu
+    """
+    from elements.connection import Connection3D
+
+    by_coords = {(point.col, point.row, point.lay): point for point in points_3d}
+    return [
+        Connection3D(by_coords[tuple(a)], by_coords[tuple(b)], dashed=bool(dashed))
+        for a, b, dashed in segments_3d
+        if tuple(a) in by_coords and tuple(b) in by_coords
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Pohledy 3D úloh Cubiq🧊 (půdorys, nárys, bokorys)")
+    parser.add_argument("file", nargs="?", default="data.json")
+    parser.add_argument("--task", help="vypsat spočítané pohledy jedné úlohy")
+    args = parser.parse_args()
+
+    with open(args.file, "r", encoding="utf-8") as f:
+        all_data = json.load(f)
+    all_data.pop("_meta", None)
+
+    if args.task:
+        for view, segments in project_to_json(all_data[args.task]["data3d"][0]).items():
+            print(f"{view}: {json.dumps(segments)}")
+    else:
+        start = time.perf_counter()
+        matches = total = 0
+        for task_id, task in all_data.items():
+            stored = {view: view_masks(task.get(view, [])) for view in VIEWS}
+            for solution in task.get("data3d", []):
+                if not solution:
+                    continue
+                total += 1
+                projected = project_solution(solution)
+                if projected == stored:
+                    matches += 1
+                else:
+                    different = [view for view in VIEWS if projected[view] != stored[view]]
+                    print(f"{task_id}: jiné pohledy {', '.join(different)}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Řešení: {total}, shodných pohledů: {matches}, čas: {elapsed_ms:.1f} ms")
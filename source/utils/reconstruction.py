@@ -0,0 +1,704 @@
+# -*- coding: utf-8 -*-
+"""
+reconstruction.py
+-----------------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • nalezení všech 3D řešení úlohy 2D_to_3D – útvarů na mřížce size×size×size,
+      jejichž půdorys, nárys a bokorys (včetně čárkování) jsou stejné jako zadané pohledy,
+    • prohledávání s bitovými maskami: kandidátní úsečky, propagace podmínek
+      (pokrytí pohledů, žádné volné konce) a ořezávání neplatných větví,
+    • volitelné rozdělení podstromů prohledávání mezi procesy (ProcessPoolExecutor),
+    • výběr kanonické podmnožiny řešení pro data3d (editor).
+
+Útvar se skládá z úseček mezi sousedními body mřížky (viz Lattice v utils/projection.py)
+a samostatných bodů. Protože k pohledům jde vždy přidat další hrany, které se promítnou
+na už nakreslené čáry, hledají se jen nejmenší řešení daného druhu:
+    open    – úsečky (mohou mít volné konce), žádnou úsečku nejde vynechat,
+    cycles  – mnohoúhelníky a lomené čáry bez volných konců,
+    solid   – uzavřená tělesa: každá hrana leží aspoň na dvou stěnách.
+Druh se určí podle řešení autora (data3d), bez něj se zkouší od tělesa po úsečky
+(reconstruct_auto). Výpis "všech" řešení tedy znamená všechna nejmenší řešení daného druhu.
+
+Čárkování 3D hran řešení: u těles podle viditelnosti ve 3D gridu (dash_hidden_edges),
+u plochých útvarů čárkovaně ty hrany, které jsou v některém pohledu čárkované.
+
+Spuštění (ze složky source/):
+    python -m utils.reconstruction data.json
+    python -m utils.reconstruction data.json --task 3.4 --jobs 4
+"""
+
+import heapq
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.projection import (
+    DEFAULT_SIZE, VIEWS, dash_hidden_edges, get_lattice, masks_to_segments, project_point, project_solution,
+    solution_masks, task_size, view_masks, _solid_faces, _split_edges,
+)
+
+MODES = ("open", "cycles", "solid")
+DEFAULT_LIMIT = 1000  # nejvyšší počet hledaných řešení
+MAX_NODES = 5000      # nejvyšší počet navštívených stavů (u velmi nejednoznačných pohledů)
+CANONICAL_COUNT = 3   # nejvyšší počet řešení v kanonické podmnožině (kromě řešení autora)
+# největší mřížka pro hledání z editoru – kandidátů přibývá se size³ (N=8 přes 100 000 úseček)
+INTERACTIVE_MAX_SIZE = 6
+
+
+# ==================================================
+# ZADÁNÍ PRO PROHLEDÁVÁNÍ
+# ==================================================
+
+def _bits(mask: int):
+    """Indexy nastavených bitů masky (od nejnižšího)."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _crossing(first: tuple, second: tuple) -> bool:
+    """Zda se dvě úsečky ((bod, bod), (bod, bod)) protínají mimo své koncové body."""
+    (p1, q1), (p2, q2) = first, second
+    if len({p1, q1, p2, q2}) < 4:
+        return False
+    d1 = tuple(q - p for p, q in zip(p1, q1))
+    d2 = tuple(q - p for p, q in zip(p2, q2))
+    w = tuple(b - a for a, b in zip(p1, p2))
+    normal = (d1[1] * d2[2] - d1[2] * d2[1], d1[2] * d2[0] - d1[0] * d2[2], d1[0] * d2[1] - d1[1] * d2[0])
+    if normal == (0, 0, 0) or sum(a * b for a, b in zip(w, normal)):
+        return False  # rovnoběžné nebo mimoběžné
+
+    def along(direction):
+        cross = (w[1] * direction[2] - w[2] * direction[1], w[2] * direction[0] - w[0] * direction[2],
+                 w[0] * direction[1] - w[1] * direction[0])
+        return sum(a * b for a, b in zip(cross, normal))
+
+    # průsečík p1 + t·d1 = p2 + s·d2, kde t = along(d2) / |n|², s = along(d1) / |n|²
+    length = sum(component * component for component in normal)
+    return 0 < along(d2) < length and 0 < along(d1) < length
+
+
+def _unclosed_vertices(segments: list) -> set[tuple] | None:
+    """
+    Vrcholy hran, které neleží aspoň na dvou stěnách tělesa.
+
+    Returns:
+        set | None: body (col, row, lay); None pro útvar bez objemu
+    """
+    edges = tuple(_split_edges(segments))
+    faces = _solid_faces(edges)
+    if faces is None:
+        return None
+    on_faces = {}
+    for _, polygon in faces:
+        for a, b in zip(polygon, polygon[1:] + polygon[:1]):
+            edge = (a, b) if a < b else (b, a)
+            on_faces[edge] = on_faces.get(edge, 0) + 1
+    return {point for edge in edges if on_faces.get(edge, 0) < 2 for point in edge}
+
+
+class ReconstructionProblem:
+    """
+    Kandidáti a podmínky pro hledání 3D řešení k zadaným pohledům.
+
+    Kandidát je úsečka mezi sousedními body 3D mřížky nebo samostatný bod, jehož průmět
+    leží v každém pohledu na nakreslené čáře (případně v nakresleném bodě). Cíle jsou
+    jednotlivé úsečky a body pohledů; každý cíl musí pokrýt aspoň jeden vybraný kandidát.
+
+    Attributes:
+        size (int): počet bodů mřížky v jednom směru
+        mode (str): druh hledaných útvarů (viz MODES)
+        views (dict[str, ViewMasks]): zadané pohledy
+        candidates (list[tuple]): ("segment", bit úsečky 3D mřížky) nebo ("point", index bodu)
+        cover (list[int]): pro každého kandidáta maska cílů, které pokrývá
+        coverers (list[int]): pro každý cíl maska kandidátů, kteří ho pokrývají
+        touching (dict[int, int]): pro bod 3D mřížky maska kandidátních úseček, které v něm končí
+    """
+
+    def __init__(self, views: dict, size: int = 3, mode: str = "solid"):
+        self.size = size
+        self.mode = mode
+        self.views = views
+        self.lattice = get_lattice(size, 3)
+        lattice_2d = get_lattice(size)
+
+        # cíle: úsečky mezi sousedními body pohledu a samostatné body, přes všechny pohledy
+        target_of = {}
+        for view in VIEWS:
+            for bit in _bits(views[view].solid | views[view].dashed):
+                target_of[(view, "line", bit)] = len(target_of)
+            for index in _bits(views[view].points):
+                target_of[(view, "point", index)] = len(target_of)
+        self.full = (1 << len(target_of)) - 1
+
+        def view_cover(view, a, b) -> int | None:
+            """Cíle, které pokryje průmět úsečky (bodu) a–b v pohledu; None = nepatří do pohledu."""
+            lines = views[view].solid | views[view].dashed
+            pa, pb = project_point(view, a, size), project_point(view, b, size)
+            if pa != pb:
+                mask = lattice_2d.segment_mask(pa, pb)
+                if mask & ~lines:
+                    return None
+                return sum(1 << target_of[(view, "line", bit)] for bit in _bits(mask))
+            index = lattice_2d.index(*pa)
+            if views[view].points >> index & 1:
+                return 1 << target_of[(view, "point", index)]
+            return 0 if lattice_2d.touching[index] & lines else None
+
+        self.candidates: list[tuple[str, int]] = []
+        self.cover: list[int] = []
+        self.ends: list[tuple[int, int] | None] = []
+        shapes = [("segment", bit, self.lattice.pieces[bit]) for bit in range(len(self.lattice.pieces))]
+        shapes += [("point", index, (index, index)) for index in range(size ** 3)]
+        for kind, number, (a, b) in shapes:
+            a, b = self.lattice.coords(a), self.lattice.coords(b)
+            covers = [view_cover(view, a, b) for view in VIEWS]
+            if None in covers:
+                continue
+            mask = covers[0] | covers[1] | covers[2]
+            if kind == "point" and not mask:
+                continue  # bod, který v žádném pohledu není vidět samostatně, jen zbytečně přibývá
+            self.candidates.append((kind, number))
+            self.cover.append(mask)
+            self.ends.append(self.lattice.pieces[number] if kind == "segment" else None)
+        self.all = (1 << len(self.candidates)) - 1
+
+        self.coverers = [0] * len(target_of)
+        for candidate, mask in enumerate(self.cover):
+            for target in _bits(mask):
+                self.coverers[target] |= 1 << candidate
+
+        self.touching: dict[int, int] = {}
+        for candidate, ends in enumerate(self.ends):
+            if ends is not None:
+                for vertex in ends:
+                    self.touching[vertex] = self.touching.get(vertex, 0) | 1 << candidate
+        # směr kandidátní úsečky (úsečky stejného směru na sebe v bodě navazují rovně – bod není roh)
+        self._step = [self.lattice.steps[number] if kind == "segment" else None
+                      for kind, number in self.candidates]
+        self._normals: dict[tuple[int, int], tuple | None] = {}
+
+        # hrany tělesa se smí dotýkat jen ve vrcholech – úsečky, které se kříží, se vylučují
+        self.conflicts = [0] * len(self.candidates)
+        if mode == "solid":
+            segments = [(index, tuple(self.lattice.coords(end) for end in ends))
+                        for index, ends in enumerate(self.ends) if ends is not None]
+            for position, (first, first_ends) in enumerate(segments):
+                for second, second_ends in segments[position + 1:]:
+                    if _crossing(first_ends, second_ends):
+                        self.conflicts[first] |= 1 << second
+                        self.conflicts[second] |= 1 << first
+        self._neighbor_lists: dict[int, tuple[list, list]] = {}
+        self._plane_masks: dict[tuple, int] = {}
+        self._cycles: dict[tuple[int, int], bool] = {}
+
+    # ------------------------
+    # Propagace podmínek
+    # ------------------------
+    def _normal(self, first: int, second: int) -> tuple | None:
+        """Normála roviny dvou kandidátních úseček (None = jsou rovnoběžné)."""
+        key = (first, second) if first < second else (second, first)
+        if key not in self._normals:
+            u, v = self._step[first], self._step[second]
+            normal = (u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0])
+            divisor = math.gcd(*normal)
+            if divisor:
+                sign = 1 if next(component for component in normal if component) > 0 else -1
+                self._normals[key] = tuple(sign * component // divisor for component in normal)
+            else:
+                self._normals[key] = None
+        return self._normals[key]
+
+    def _line_vertices(self, candidate: int) -> tuple[list, list]:
+        """
+        Pro oba konce úsečky body její přímky od konce ven až k okraji mřížky – úsečka
+        mezi sousedními body může být jen částí delší hrany (mřížky od 4×4×4).
+        """
+        step = self._step[candidate]
+        result = []
+        for end, sign in zip(self.ends[candidate], (-1, 1)):
+            point = self.lattice.coords(end)
+            vertices = []
+            while all(0 <= component < self.size for component in point):
+                vertices.append(self.lattice.index(*point))
+                point = tuple(component + sign * delta for component, delta in zip(point, step))
+            result.append(vertices)
+        return tuple(result)
+
+    def _neighbors(self, candidate: int) -> tuple[list, list]:
+        """
+        Pro oba konce úsečky dvojice (bit kandidáta, normála roviny) úseček, které navazují
+        v konci nebo dál na přímce úsečky (hrana tělesa pokračuje rovně a roh má až za ní).
+        """
+        neighbors = self._neighbor_lists.get(candidate)
+        if neighbors is None:
+            neighbors = tuple(
+                [(1 << other, self._normal(candidate, other))
+                 for vertex in vertices
+                 for other in _bits(self.touching.get(vertex, 0) & ~(1 << candidate))]
+                for vertices in self._line_vertices(candidate)
+            )
+            self._neighbor_lists[candidate] = neighbors
+        return neighbors
+
+    def _plane_mask(self, normal: tuple, offset: int) -> int:
+        """Maska kandidátních úseček, které leží v rovině normal · x = offset."""
+        key = (normal, offset)
+        mask = self._plane_masks.get(key)
+        if mask is None:
+            mask = 0
+            for candidate, ends in enumerate(self.ends):
+                if ends is not None and all(
+                        sum(n * c for n, c in zip(normal, self.lattice.coords(end))) == offset for end in ends):
+                    mask |= 1 << candidate
+            self._plane_masks[key] = mask
+        return mask
+
+    def _closes_cycle(self, candidate: int, plane_pool: int) -> bool:
+        """Zda z konce úsečky vede cesta do druhého konce po úsečkách plane_pool (úsečka s nimi tvoří cyklus)."""
+        key = (candidate, plane_pool)
+        result = self._cycles.get(key)
+        if result is None:
+            start, goal = self.ends[candidate]
+            reached = {start}
+            frontier = [start]
+            while frontier and goal not in reached:
+                vertex = frontier.pop()
+                for other in _bits(self.touching[vertex] & plane_pool):
+                    for end in self.ends[other]:
+                        if end not in reached:
+                            reached.add(end)
+                            frontier.append(end)
+            result = self._cycles[key] = goal in reached
+        return result
+
+    def planes_through(self, candidate: int) -> int:
+        """Maska kandidátních úseček ve všech rovinách, ve kterých může úsečka ležet na stěně."""
+        start = self.lattice.coords(self.ends[candidate][0])
+        mask = 0
+        for normal in {normal for neighbors in self._neighbors(candidate) for _, normal in neighbors}:
+            if normal is not None:
+                mask |= self._plane_mask(normal, sum(n * c for n, c in zip(normal, start)))
+        return mask & ~(1 << candidate)
+
+    def on_two_faces(self, candidate: int, pool: int) -> bool:
+        """
+        Zda může úsečka ležet na dvou stěnách tělesa z úseček pool: potřebuje dvě různé
+        roviny, ve kterých s dalšími úsečkami z pool tvoří cyklus.
+        """
+        bit = 1 << candidate
+        normals = {normal for neighbors in self._neighbors(candidate) for other, normal in neighbors
+                   if pool & other and normal is not None}
+        if len(normals) < 2:
+            return False
+        start = self.lattice.coords(self.ends[candidate][0])
+        faces = 0
+        for normal in normals:
+            offset = sum(n * c for n, c in zip(normal, start))
+            if self._closes_cycle(candidate, pool & self._plane_mask(normal, offset) & ~bit):
+                faces += 1
+                if faces == 2:
+                    return True
+        return False
+
+    def vertex_needs(self, vertex: int, chosen: int) -> int:
+        """
+        Co bod útvaru ještě potřebuje: 0 = nic, jinak maska kandidátů, které mu pomohou.
+        Volný konec potřebuje další úsečku (kromě druhu "open"); vrchol tělesa musí mít
+        hrany ve více rovinách, nebo v něm hrana jen rovně pokračuje.
+        """
+        at_vertex = self.touching[vertex] & chosen
+        others = self.touching[vertex] & ~chosen
+        if at_vertex & (at_vertex - 1) == 0:
+            return others if self.mode != "open" else 0
+        if self.mode != "solid":
+            return 0
+
+        edges = list(_bits(at_vertex))
+        normal = next((self._normal(edges[0], other) for other in edges[1:]
+                       if self._normal(edges[0], other) is not None), None)
+        if normal is None:
+            return 0 if len(edges) == 2 else others  # rovné pokračování hrany
+        if any(sum(n * d for n, d in zip(normal, self._step[edge])) for edge in edges):
+            return 0
+        # všechny hrany v jedné rovině – chybí hrana mimo ni
+        return sum(1 << other for other in _bits(others)
+                   if sum(n * d for n, d in zip(normal, self._step[other])))
+
+    def _vertices(self, chosen: int) -> set[int]:
+        return {vertex for candidate in _bits(chosen) if self.ends[candidate] is not None
+                for vertex in self.ends[candidate]}
+
+    def open_vertices(self, chosen: int) -> list[tuple[int, int]]:
+        """Body útvaru, které ještě potřebují další hranu, jako (bod, maska kandidátů z vertex_needs)."""
+        if self.mode == "open":
+            return []
+        result = []
+        for vertex in self._vertices(chosen):
+            needs = self.vertex_needs(vertex, chosen)
+            if needs:
+                result.append((vertex, needs))
+        return result
+
+    def unsupported(self, chosen: int, pool: int) -> list[int]:
+        """Vybrané úsečky, které z úseček pool nemohou ležet na dvou stěnách tělesa."""
+        return [candidate for candidate in _bits(chosen)
+                if self.ends[candidate] is not None and not self.on_two_faces(candidate, pool)]
+
+    def propagate(self, chosen: int, excluded: int, covered: int) -> tuple[int, int, int] | None:
+        """
+        Dosadí vynucené kandidáty (cíl nebo bod útvaru, který už jde doplnit jen jedním kandidátem)
+        a ořízne stavy, ze kterých řešení nevznikne.
+
+        Returns:
+            tuple | None: (chosen, excluded, covered), nebo None, pokud větev nemá řešení
+        """
+        changed = True
+        while changed:
+            changed = False
+            for candidate in _bits(chosen):
+                excluded |= self.conflicts[candidate]
+            if chosen & excluded:
+                return None
+            for target in _bits(self.full & ~covered):
+                available = self.coverers[target] & ~excluded
+                if not available:
+                    return None
+                if available & (available - 1) == 0:
+                    chosen |= available
+                    covered |= self.cover[available.bit_length() - 1]
+                    changed = True
+            for _, needs in self.open_vertices(chosen):
+                available = needs & ~excluded
+                if not available:
+                    return None
+                if available & (available - 1) == 0:
+                    chosen |= available
+                    covered |= self.cover[available.bit_length() - 1]
+                    changed = True
+        if self.mode == "solid" and self.unsupported(chosen, self.all & ~excluded):
+            return None
+        return chosen, excluded, covered
+
+    # ------------------------
+    # Útvar z kandidátů
+    # ------------------------
+    def segments(self, chosen: int) -> list:
+        """Vybraní kandidáti jako 3D úsečky [[c,r,l],[c,r,l],0] (bez čárkování)."""
+        result = []
+        for candidate in _bits(chosen):
+            kind, number = self.candidates[candidate]
+            if kind == "segment":
+                a, b = self.lattice.pieces[number]
+            else:
+                a = b = number
+            result.append([list(self.lattice.coords(a)), list(self.lattice.coords(b)), 0])
+        return result
+
+    def dashed(self, segments: list) -> list:
+        """Nastaví čárkování 3D úseček (tělesa podle viditelnosti, ploché útvary podle pohledů)."""
+        if _solid_faces(tuple(_split_edges(segments))) is not None:
+            return dash_hidden_edges(segments, self.size)
+        lattice_2d = get_lattice(self.size)
+        result = []
+        for a, b, _ in segments:
+            is_dashed = False
+            for view in VIEWS:
+                pa, pb = project_point(view, a, self.size), project_point(view, b, self.size)
+                if pa != pb and lattice_2d.segment_mask(pa, pb) & self.views[view].dashed:
+                    is_dashed = True
+            result.append([a, b, int(is_dashed)])
+        return result
+
+    def solution(self, chosen: int) -> list | None:
+        """Úsečky řešení s čárkováním, pokud dávají přesně zadané pohledy; jinak None."""
+        segments = self.dashed(self.segments(chosen))
+        if project_solution(segments, self.size) != self.views:
+            return None
+        return segments
+
+
+# ==================================================
+# PROHLEDÁVÁNÍ
+# ==================================================
+
+def _branches(problem: ReconstructionProblem, chosen: int, excluded: int, covered: int):
+    """
+    Větve z jednoho stavu (nejvíc omezený cíl nebo bod útvaru; každý kandidát v jedné větvi,
+    předchozí kandidáti se v dalších větvích vyloučí, takže se žádná množina neprojde dvakrát).
+
+    Returns:
+        tuple: (list stavů (chosen, excluded, covered), nalezené řešení nebo None)
+    """
+    best = None
+    for target in _bits(problem.full & ~covered):
+        available = problem.coverers[target] & ~excluded
+        if best is None or available.bit_count() < best.bit_count():
+            best = available
+    for _, needs in problem.open_vertices(chosen):
+        available = needs & ~excluded
+        if best is None or available.bit_count() < best.bit_count():
+            best = available
+    if best is None and problem.mode == "solid":
+        # hrana, která ještě neleží na dvou stěnách – doplní se úsečka v některé rovině hrany
+        for candidate in problem.unsupported(chosen, chosen):
+            available = problem.planes_through(candidate) & ~excluded & ~chosen
+            if best is None or available.bit_count() < best.bit_count():
+                best = available
+
+    if best is None:
+        # pohledy jsou pokryté a útvar nemá volné konce
+        segments = problem.segments(chosen)
+        unclosed = _unclosed_vertices(segments) if problem.mode == "solid" else None
+        if not unclosed:
+            if problem.mode == "solid" and unclosed is None:
+                return [], None  # plochý útvar není těleso
+            return [], problem.solution(chosen)
+        # těleso ještě není uzavřené – přidá se hrana u neuzavřené hrany
+        best = 0
+        for point in unclosed:
+            best |= problem.touching.get(problem.lattice.index(*point), 0)
+        best &= ~excluded & ~chosen
+
+    states = []
+    for candidate in _bits(best):
+        bit = 1 << candidate
+        states.append((chosen | bit, excluded, covered | problem.cover[candidate]))
+        excluded |= bit
+    return states, None
+
+
+def _search(problem: ReconstructionProblem, states: list, limit: int | None,
+            max_nodes: int | None = MAX_NODES) -> tuple[list[int], int, bool]:
+    """
+    Prohledá podstromy z daných stavů, vždy od stavu s nejméně vybranými kandidáty – řešení
+    se tak najdou od nejmenších a větve s už nalezeným řešením se hned oříznou.
+
+    Returns:
+        tuple: (nalezená řešení jako masky kandidátů, počet navštívených stavů,
+                zda hledání skončilo dřív, než prošlo celý strom)
+    """
+    found = []
+    nodes = 0
+    heap = [(state[0].bit_count(), order, state) for order, state in enumerate(states)]
+    heapq.heapify(heap)
+    order = len(heap)
+    while heap:
+        if max_nodes is not None and nodes >= max_nodes:
+            return found, nodes, True
+        state = problem.propagate(*heapq.heappop(heap)[2])
+        nodes += 1
+        # větev obsahuje už nalezené řešení – žádné další řešení v ní nebude nejmenší
+        if state is None or any(solution & state[0] == solution for solution in found):
+            continue
+        children, solution = _branches(problem, *state)
+        if solution is not None:
+            found.append(state[0])
+            if limit is not None and len(found) >= limit:
+                return found, nodes, bool(heap or children)
+        for child in children:
+            heapq.heappush(heap, (child[0].bit_count(), order, child))
+            order += 1
+    return found, nodes, False
+
+
+def _search_job(views_keys: dict, size: int, mode: str, states: list, limit: int | None,
+                max_nodes: int | None):
+    """Prohledání části stromu v jiném procesu (zadání se sestaví znovu z masek pohledů)."""
+    from utils.projection import ViewMasks
+
+    views = {view: ViewMasks(*key) for view, key in views_keys.items()}
+    return _search(ReconstructionProblem(views, size, mode), states, limit, max_nodes)
+
+
+def _minimal(problem: ReconstructionProblem, found: list[int]) -> list[int]:
+    """Vynechá řešení, která obsahují jiné nalezené řešení (nejsou nejmenší)."""
+    found = sorted(set(found), key=lambda chosen: (chosen.bit_count(), chosen))
+    result = []
+    for chosen in found:
+        if not any(smaller & chosen == smaller for smaller in result):
+            result.append(chosen)
+    return result
+
+
+class ReconstructionResult:
+    """
+    Výsledek hledání 3D řešení.
+
+    Attributes:
+        solutions (list[list]): řešení jako v data3d (sloučené úsečky s čárkováním)
+        mode (str): druh hledaných útvarů
+        truncated (bool): hledání skončilo po dosažení limitu řešení nebo stavů (řešení může být víc)
+        nodes (int): počet navštívených stavů prohledávání
+        elapsed_ms (float): doba hledání
+    """
+
+    def __init__(self, solutions: list, mode: str, truncated: bool, nodes: int, elapsed_ms: float):
+        self.solutions = solutions
+        self.mode = mode
+        self.truncated = truncated
+        self.nodes = nodes
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def count(self) -> int:
+        return len(self.solutions)
+
+    def canonical(self, author: list = (), size: int = 3) -> list:
+        """
+        Kanonická podmnožina řešení pro data3d: nalezená řešení autora a k nim
+        nejvýš CANONICAL_COUNT dalších řešení s nejmenším počtem hran.
+
+        Args:
+            author (list): dosavadní řešení úlohy (data3d)
+            size (int): počet bodů mřížky v jednom směru
+        """
+        author_keys = {solution_masks(solution, size) for solution in author}
+        keyed = [(solution_masks(solution, size), solution) for solution in self.solutions]
+        result = [solution for key, solution in keyed if key in author_keys]
+        others = [(key, solution) for key, solution in keyed if key not in author_keys]
+        if others:
+            fewest = min((key.solid | key.dashed).bit_count() for key, _ in others)
+            result += [solution for key, solution in others
+                       if (key.solid | key.dashed).bit_count() == fewest][:CANONICAL_COUNT]
+        return result
+
+
+def figure_mode(segments_3d, size: int = 3) -> str:
+    """Druh útvaru (viz MODES): s volným koncem "open", uzavřené těleso "solid", jinak "cycles"."""
+    lattice = get_lattice(size, 3)
+    masks = solution_masks(segments_3d, size)
+    degrees: dict[int, int] = {}
+    for bit in _bits(masks.solid | masks.dashed):
+        for end in lattice.piece(bit):
+            degrees[end] = degrees.get(end, 0) + 1
+    if 1 in degrees.values():
+        return "open"
+    return "solid" if _unclosed_vertices(segments_3d) == set() else "cycles"
+
+
+def reconstruct(views: dict, size: int = 3, mode: str = "solid", limit: int | None = DEFAULT_LIMIT,
+                jobs: int = 0, max_nodes: int | None = MAX_NODES) -> ReconstructionResult:
+    """
+    Najde všechna nejmenší 3D řešení daného druhu k zadaným pohledům.
+
+    Args:
+        views (dict[str, ViewMasks]): pohledy (viz view_masks)
+        size (int): počet bodů mřížky v jednom směru
+        mode (str): druh útvarů (viz MODES)
+        limit (int, optional): nejvyšší počet hledaných řešení (None = bez omezení)
+        jobs (int): počet procesů pro podstromy (0 = v tomto procesu)
+        max_nodes (int, optional): nejvyšší počet navštívených stavů (s procesy pro každý podstrom)
+
+    Returns:
+        ReconstructionResult: seřazená řešení (nejméně úseček první)
+    """
+    start = time.perf_counter()
+    problem = ReconstructionProblem(views, size, mode)
+
+    root = problem.propagate(0, 0, 0) if problem.full else None  # prázdné pohledy nemají řešení
+    found, nodes, truncated = [], 1, False
+    if root is not None:
+        children, solution = _branches(problem, *root)
+        if solution is not None:
+            found.append(root[0])
+        elif jobs and len(children) > 1:
+            views_keys = {view: masks.key() for view, masks in views.items()}
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(_search_job, views_keys, size, mode, [child], limit, max_nodes)
+                           for child in children]
+                for future in futures:
+                    part, part_nodes, part_truncated = future.result()
+                    found.extend(part)
+                    nodes += part_nodes
+                    truncated |= part_truncated
+        else:
+            found, part_nodes, truncated = _search(problem, children, limit, max_nodes)
+            nodes += part_nodes
+
+    minimal = _minimal(problem, found)
+    truncated = truncated or (limit is not None and len(minimal) > limit)
+    solutions = []
+    for chosen in minimal[:limit]:
+        masks = solution_masks(problem.solution(chosen), size)
+        solutions.append(masks_to_segments(masks, size, 3))
+    return ReconstructionResult(solutions, mode, truncated, nodes, (time.perf_counter() - start) * 1000)
+
+
+def reconstruct_auto(views: dict, size: int = 3, mode: str | None = None, limit: int | None = DEFAULT_LIMIT,
+                     jobs: int = 0, max_nodes: int | None = MAX_NODES) -> ReconstructionResult:
+    """
+    Jako reconstruct(); bez zadaného druhu zkouší tělesa, pak uzavřené útvary a nakonec úsečky
+    a vrátí první druh, pro který řešení existuje.
+    """
+    modes = [mode] if mode is not None else list(reversed(MODES))
+    nodes, elapsed_ms = 0, 0.0
+    for current in modes:
+        result = reconstruct(views, size, current, limit, jobs, max_nodes)
+        nodes += result.nodes
+        elapsed_ms += result.elapsed_ms
+        if result.count:
+            break
+    result.nodes, result.elapsed_ms = nodes, elapsed_ms
+    return result
+
+
+def reconstruct_task(task: dict, size: int = DEFAULT_SIZE, limit: int | None = DEFAULT_LIMIT, jobs: int = 0,
+                     max_nodes: int | None = MAX_NODES) -> ReconstructionResult:
+    """
+    Najde 3D řešení k pohledům úlohy (slovník jako v data.json); druh útvaru
+    se určí podle prvního neprázdného řešení autora, velikost mřížky podle klíče "size".
+    """
+    size = task_size(task, size)
+    views = {view: view_masks(task.get(view, []), size) for view in VIEWS}
+    author = next((solution for solution in task.get("data3d", []) if solution), None)
+    mode = figure_mode(author, size) if author else None
+    return reconstruct_auto(views, size, mode, limit, jobs, max_nodes)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="3D řešení úloh Cubiq🧊 z půdorysu, nárysu a bokorysu")
+    parser.add_argument("file", nargs="?", default="data.json")
+    parser.add_argument("--task", help="vypsat řešení jedné úlohy")
+    parser.add_argument("--all-types", action="store_true", help="i úlohy 3D_to_2D (jejich pohledy)")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    parser.add_argument("--jobs", type=int, default=0, help="počet procesů pro podstromy prohledávání")
+    parser.add_argument("--max-nodes", type=int, default=MAX_NODES, help="nejvyšší počet stavů (0 = bez omezení)")
+    args = parser.parse_args()
+
+    with open(args.file, encoding="utf-8") as f:
+        data = json.load(f)
+
+    if args.task:
+        if args.task not in data:
+            sys.exit(f"Úloha {args.task} neexistuje.")
+        result = reconstruct_task(data[args.task], args.size, args.limit, args.jobs, args.max_nodes or None)
+        print(f"Úloha {args.task}: {result.count} řešení ({result.mode}), "
+              f"{result.nodes} stavů, {result.elapsed_ms:.1f} ms")
+        for solution in result.solutions:
+            print(json.dumps(solution))
+        sys.exit(0)
+
+    total_ms = 0.0
+    for task_id, task in data.items():
+        if task_id == "_meta" or task.get("task_type") not in (("2D_to_3D", "3D_to_2D") if args.all_types
+                                                               else ("2D_to_3D",)):
+            continue
+        result = reconstruct_task(task, args.size, args.limit, args.jobs, args.max_nodes or None)
+        total_ms += result.elapsed_ms
+        size = task_size(task, args.size)
+        author = {solution_masks(solution, size) for solution in task.get("data3d", []) if solution}
+        found = {solution_masks(solution, size) for solution in result.solutions}
+        state = "řešení autora nalezeno" if author <= found else "ŘEŠENÍ AUTORA CHYBÍ"
+        more = "+" if result.truncated else ""
+        print(f"{task_id:>6}  {result.mode:<6} {result.count:>4}{more:<1} řešení  "
+              f"{result.elapsed_ms:8.1f} ms  {state}")
+    print(f"Celkem: {total_ms:.1f} ms")
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+startup_report.py
+-----------------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • zaznamenání časů jednotlivých kroků startu aplikace (StartupTimer),
+    • výpis doby do prvního vykresleného snímku,
+    • spuštění aplikace s "python -X importtime" a výpis nejpomalejších importů.
+
+Použití (ze složky source):
+    python -m utils.startup_report            # importy + časy startu (aplikace se po 1. snímku ukončí)
+    python main.py --startup-report           # jen časy startu při běžném spuštění
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+
+class StartupTimer:
+    """
+    Časy kroků startu aplikace.
+
+    Attributes:
+        start (float): čas začátku (time.perf_counter() před prvními importy main.py)
+        marks (list[tuple[str, float]]): (název kroku, čas od začátku v ms)
+    """
+
+    def __init__(self, start: float = None):
+        self.start = start if start is not None else time.perf_counter()
+        self.marks: list[tuple[str, float]] = []
+
+    def mark(self, name: str):
+        """Zaznamená dokončení kroku startu."""
+        self.marks.append((name, (time.perf_counter() - self.start) * 1000))
+
+    def elapsed_ms(self, name: str) -> float | None:
+        """Vrátí čas kroku od začátku (ms), nebo None pokud krok neproběhl."""
+        return next((ms for mark, ms in self.marks if mark == name), None)
+
+    def report(self) -> str:
+        """Vrátí přehled kroků startu (čas od začátku a trvání kroku)."""
+        lines = ["Start aplikace:"]
+        previous = 0.0
+        for name, ms in self.marks:
+            lines.append(f"    {name:<28} {ms:8.1f} ms  (+{ms - previous:.1f} ms)")
+            previous = ms
+        return "\n".join(lines)
+
+
+# ==================================================
+# -X importtime
+# ==================================================
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """
+    Rozparsuje výstup "python -X importtime".
+
+    Returns:
+        list: (modul, vlastní čas µs, kumulativní čas µs, hloubka zanoření)
+    """
+    imports = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return imports
+
+
+def run_report(top: int = 15, env: dict = None) -> int:
+    """
+    Spustí aplikaci s -X importtime, nechá vykreslit první snímek a vypíše
+    nejpomalejší importy a časy kroků startu.
+
+    Args:
+        top (int): počet vypsaných nejpomalejších importů
+        env (dict, optional): proměnné prostředí pro spuštěnou aplikaci
+
+    Returns:
+        int: návratový kód aplikace
+    """
+    source_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", "--startup-report", "--exit-after-first-frame"],
+        cwd=source_dir, capture_output=True, text=True, env=env,
+    )
+
+    imports = parse_importtime(result.stderr)
+    top_level = [item for item in imports if item[3] == 0]
+    project = [item for item in imports if item[0].split(".")[0] in
+               ("glob_var", "elements", "screens", "grids", "utils", "main")]
+
+    print(f"Importy celkem (nejvyšší úroveň): {sum(item[2] for item in top_level) / 1000:.1f} ms")
+    print(f"Nejpomalejší importy (kumulativně, top {top}):")
+    for module, _, cumulative_us, _ in sorted(imports, key=lambda item: -item[2])[:top]:
+        print(f"    {module:<40} {cumulative_us / 1000:8.1f} ms")
+    print("Moduly aplikace (vlastní čas):")
+    for module, self_us, _, _ in sorted(project, key=lambda item: -item[1]):
+        print(f"    {module:<40} {self_us / 1000:8.1f} ms")
+    print(result.stdout.strip())
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+    return result.returncode
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Časy startu aplikace Cubiq🧊")
+    parser.add_argument("--top", type=int, default=15, help="počet vypsaných nejpomalejších importů")
+    args = parser.parse_args()
+    sys.exit(run_report(args.top))
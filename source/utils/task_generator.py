@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+"""
+task_generator.py
+-----------------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • náhodné útvary na mřížce size×size×size podle témat kapitol –
+      úsečky ("Úsečky"), mnohoúhelníky ("Mnohoúhelníky") a konvexní mnohostěny ("Mnohostěny"),
+    • výpočet pohledů útvaru (utils/projection.py) a počtu 3D řešení k nim (utils/reconstruction.py),
+    • výběr úloh podle cíle: jednoznačné (právě jedno řešení) nebo s daným počtem řešení,
+    • vynechání úloh, které už v bance jsou (kanonický klíč z utils/validate_bank.py),
+    • generování v procesech (ProcessPoolExecutor) s reprodukovatelnými semínky
+      a přehledem propustnosti (pokusů a úloh za sekundu),
+    • zápis vybraných úloh do úložiště úloh jako nové kapitoly.
+
+Každý pokus má vlastní semínko odvozené ze semínka běhu a pořadí pokusu, a výsledky
+se vybírají v pořadí pokusů – stejné semínko dává stejné úlohy pro libovolný počet procesů.
+
+Vygenerované úlohy jsou typu 2D_to_3D: pohledy jsou zadané, data3d obsahuje všechna
+nalezená řešení (u jednoznačných úloh právě vygenerovaný útvar).
+
+Spuštění (ze složky source/):
+    python -m utils.task_generator data.json --count 20 --dry-run
+    python -m utils.task_generator data.json --count 50 --themes polyhedra --seed 7 --jobs 4
+    python -m utils.task_generator data.json --count 20 --min-solutions 2 --max-solutions 4
+"""
+
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.projection import DEFAULT_SIZE, VIEWS, dash_hidden_edges, project_to_json, solution_masks, view_masks
+from utils.reconstruction import figure_mode, reconstruct
+from utils.validate_bank import canonical_key
+
+THEMES = ("segments", "polygons", "polyhedra")
+THEME_TITLES = {"segments": "Úsečky", "polygons": "Mnohoúhelníky", "polyhedra": "Mnohostěny"}
+THEME_TEXTS = {
+    "segments": "Nakreslete danou úsečku podle jejího půdorysu, nárysu a bokorysu.",
+    "polygons": "Nakreslete daný mnohoúhelník podle jeho půdorysu, nárysu a bokorysu.",
+    "polyhedra": "Nakreslete daný mnohostěn podle jeho půdorysu, nárysu a bokorysu.",
+}
+SEGMENTS_TEXT = "Nakreslete dané úsečky podle jejich půdorysu, nárysu a bokorysu."
+
+MAX_SEGMENTS = 3        # nejvíc úseček v úloze z tématu "segments"
+MAX_POLYGON_POINTS = 6  # nejvíc vybraných bodů roviny pro mnohoúhelník
+MAX_HULL_POINTS = 8     # nejvíc vybraných bodů pro konvexní obal mnohostěnu
+MAX_NODES = 2000        # nejvyšší počet stavů hledání řešení na jeden pokus
+CHUNK_SIZE = 8          # pokusů na jednu dávku pro proces
+
+# normály rovin mnohoúhelníků: první nenulová složka kladná, složky -1, 0, 1
+PLANE_NORMALS = tuple(normal for normal in itertools.product((-1, 0, 1), repeat=3)
+                      if any(normal) and next(c for c in normal if c) > 0)
+
+
+# ==================================================
+# GEOMETRIE
+# ==================================================
+
+def _sub(a: tuple, b: tuple) -> tuple:
+    return tuple(x - y for x, y in zip(a, b))
+
+
+def _dot(a: tuple, b: tuple) -> int:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def _cross(a: tuple, b: tuple) -> tuple:
+    return a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]
+
+
+def _convex_polygon(points: list[tuple], normal: tuple) -> list[tuple]:
+    """
+    Vrcholy konvexního obalu bodů ležících v jedné rovině (v pořadí po obvodu, bez bodů
+    uprostřed hran). Body se promítnou do souřadnicové roviny, ve které se rovina nezdeformuje na úsečku.
+    """
+    drop = max(range(3), key=lambda axis: abs(normal[axis]))
+    keep = [axis for axis in range(3) if axis != drop]
+    flat = sorted(set(points), key=lambda point: (point[keep[0]], point[keep[1]]))
+    if len(flat) < 3:
+        return flat
+
+    def turn(o, a, b):
+        return ((a[keep[0]] - o[keep[0]]) * (b[keep[1]] - o[keep[1]])
+                - (a[keep[1]] - o[keep[1]]) * (b[keep[0]] - o[keep[0]]))
+
+    # Andrewův algoritmus (monotónní řetězec)
+    lower, upper = [], []
+    for point in flat:
+        while len(lower) >= 2 and turn(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    for point in reversed(flat):
+        while len(upper) >= 2 and turn(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    return lower[:-1] + upper[:-1]
+
+
+def _cycle_segments(polygon: list[tuple]) -> list[list]:
+    """Hrany mnohoúhelníku jako 3D úsečky [[c,r,l],[c,r,l],0]."""
+    return [[list(a), list(b), 0] for a, b in zip(polygon, polygon[1:] + polygon[:1])]
+
+
+def convex_hull_edges(points: list[tuple]) -> list[list] | None:
+    """
+    Hrany konvexního obalu bodů mřížky (hrubou silou přes trojice bodů – bodů je jen pár).
+
+    Returns:
+        list | None: 3D úsečky [[c,r,l],[c,r,l],0]; None, pokud body neohraničují těleso
+    """
+    points = list(set(points))
+    faces = {}
+    for a, b, c in itertools.combinations(points, 3):
+        normal = _cross(_sub(b, a), _sub(c, a))
+        if normal == (0, 0, 0):
+            continue
+        divisor = math.gcd(*normal)
+        sign = 1 if next(component for component in normal if component) > 0 else -1
+        normal = tuple(sign * component // divisor for component in normal)
+        offset = _dot(normal, a)
+        if (normal, offset) in faces:
+            continue
+        sides = [_dot(normal, point) - offset for point in points]
+        if all(side <= 0 for side in sides) or all(side >= 0 for side in sides):
+            faces[(normal, offset)] = [point for point, side in zip(points, sides) if side == 0]
+    if len(faces) < 4:
+        return None  # všechny body v jedné rovině
+
+    edges = set()
+    for (normal, _), on_face in faces.items():
+        polygon = _convex_polygon(on_face, normal)
+        for a, b in zip(polygon, polygon[1:] + polygon[:1]):
+            edges.add((a, b) if a < b else (b, a))
+    return [[list(a), list(b), 0] for a, b in sorted(edges)]
+
+
+# ==================================================
+# NÁHODNÉ ÚTVARY
+# ==================================================
+
+def _random_point(rng: random.Random, size: int) -> tuple:
+    return rng.randrange(size), rng.randrange(size), rng.randrange(size)
+
+
+def sample_segments(rng: random.Random, size: int = 3) -> list[list] | None:
+    """Jedna až MAX_SEGMENTS úseček mezi náhodnými body mřížky."""
+    segments = []
+    for _ in range(rng.randint(1, MAX_SEGMENTS)):
+        a, b = _random_point(rng, size), _random_point(rng, size)
+        if a == b:
+            return None
+        segments.append([list(a), list(b), 0])
+    return segments
+
+
+def sample_polygon(rng: random.Random, size: int = 3) -> list[list] | None:
+    """Konvexní mnohoúhelník z náhodných bodů mřížky v náhodné rovině."""
+    normal = rng.choice(PLANE_NORMALS)
+    lattice_points = list(itertools.product(range(size), repeat=3))
+    offsets = sorted({_dot(normal, point) for point in lattice_points})
+    offset = rng.choice(offsets)
+    in_plane = [point for point in lattice_points if _dot(normal, point) == offset]
+    if len(in_plane) < 3:
+        return None
+    chosen = rng.sample(in_plane, rng.randint(3, min(MAX_POLYGON_POINTS, len(in_plane))))
+    polygon = _convex_polygon(chosen, normal)
+    if len(polygon) < 3:
+        return None  # body leží na přímce
+    return _cycle_segments(polygon)
+
+
+def sample_polyhedron(rng: random.Random, size: int = 3) -> list[list] | None:
+    """Konvexní mnohostěn – konvexní obal náhodných bodů mřížky."""
+    points = [_random_point(rng, size) for _ in range(rng.randint(4, MAX_HULL_POINTS))]
+    return convex_hull_edges(points)
+
+
+SAMPLERS = {"segments": sample_segments, "polygons": sample_polygon, "polyhedra": sample_polyhedron}
+THEME_MODES = {"segments": "open", "polygons": "cycles", "polyhedra": "solid"}
+
+
+# ==================================================
+# JEDEN POKUS
+# ==================================================
+
+def attempt_rng(seed: int, attempt: int) -> random.Random:
+    """Generátor náhodných čísel pro jeden pokus (nezávisí na tom, který proces pokus počítá)."""
+    return random.Random(f"{seed}:{attempt}")
+
+
+def make_task(theme: str, segments_3d: list, size: int = 3, max_solutions: int = 1,
+              max_nodes: int | None = MAX_NODES) -> tuple[str, dict | None, int]:
+    """
+    Sestaví úlohu 2D_to_3D z útvaru a spočítá, kolik má 3D řešení.
+
+    Args:
+        theme (str): téma (viz THEMES)
+        segments_3d (list): útvar jako 3D úsečky
+        size (int): počet bodů mřížky v jednom směru
+        max_solutions (int): kolik řešení nejvýš hledat (víc řešení úlohu stejně vyřadí)
+        max_nodes (int, optional): nejvyšší počet stavů hledání
+
+    Returns:
+        tuple: (stav, úloha nebo None, počet řešení); stav je "ok" nebo důvod vyřazení
+    """
+    solution = dash_hidden_edges(segments_3d, size)
+    if figure_mode(solution, size) != THEME_MODES[theme]:
+        return "wrong_kind", None, 0  # např. úsečky, které se spojí do mnohoúhelníku
+
+    views = project_to_json(solution, size)
+    masks = {view: view_masks(views[view], size) for view in VIEWS}
+    result = reconstruct(masks, size, THEME_MODES[theme], limit=max_solutions + 1, max_nodes=max_nodes)
+    if result.truncated:
+        return "too_many_solutions", None, result.count
+
+    found = [solution_masks(found, size) for found in result.solutions]
+    if solution_masks(solution, size) not in found:
+        return "not_minimal", None, result.count  # k pohledům stačí menší útvar
+
+    text = THEME_TEXTS[theme]
+    if theme == "segments" and len(segments_3d) > 1:
+        text = SEGMENTS_TEXT
+    task = {"text": text, "task_type": "2D_to_3D", **views, "data3d": result.solutions}
+    if size != DEFAULT_SIZE:
+        task["size"] = size
+    return "ok", task, result.count
+
+
+def _generate_chunk(seed: int, attempts: list[int], themes: tuple, size: int, max_solutions: int,
+                    max_nodes: int | None) -> list[tuple]:
+    """Spočítá dávku pokusů (běží v procesu z ProcessPoolExecutor)."""
+    results = []
+    for attempt in attempts:
+        theme = themes[attempt % len(themes)]
+        segments_3d = SAMPLERS[theme](attempt_rng(seed, attempt), size)
+        if segments_3d is None:
+            results.append((attempt, theme, "degenerate", None, 0))
+            continue
+        status, task, count = make_task(theme, segments_3d, size, max_solutions, max_nodes)
+        results.append((attempt, theme, status, task, count))
+    return results
+
+
+# ==================================================
+# GENEROVÁNÍ ÚLOH
+# ==================================================
+
+def generate_tasks(count: int, themes: tuple = THEMES, seed: int = 0, size: int = 3, min_solutions: int = 1,
+                   max_solutions: int = 1, jobs: int | None = None, max_attempts: int | None = None,
+                   existing: dict = None, max_nodes: int | None = MAX_NODES) -> tuple[list[dict], dict]:
+    """
+    Vygeneruje úlohy s počtem řešení v rozmezí min_solutions..max_solutions.
+
+    Args:
+        count (int): počet úloh
+        themes (tuple): témata (viz THEMES), střídají se po pokusech
+        seed (int): semínko běhu (stejné semínko → stejné úlohy)
+        size (int): počet bodů mřížky v jednom směru
+        min_solutions (int): nejmenší počet 3D řešení (1 a max_solutions 1 = jednoznačné úlohy)
+        max_solutions (int): největší počet 3D řešení
+        jobs (int, optional): počet procesů (None = podle počtu jader, 0 nebo 1 = bez dalších procesů)
+        max_attempts (int, optional): nejvyšší počet pokusů (None = 200 pokusů na úlohu)
+        existing (dict, optional): úlohy banky (jako v data.json), které se nesmí opakovat
+        max_nodes (int, optional): nejvyšší počet stavů hledání řešení na jeden pokus
+
+    Returns:
+        tuple: (úlohy, report s propustností a důvody vyřazení)
+    """
+    start = time.perf_counter()
+    max_attempts = max_attempts if max_attempts is not None else 200 * count
+    workers = (os.cpu_count() or 1) if jobs is None else jobs
+    seen = {canonical_key(task, size) for task_id, task in (existing or {}).items() if task_id != "_meta"}
+
+    tasks = []
+    rejected: dict[str, int] = {}
+    by_theme: dict[str, int] = {}
+    attempts = 0
+
+    def consume(results):
+        """Převezme výsledky pokusů v pořadí; vrátí True, až je úloh dost."""
+        nonlocal attempts
+        for attempt, theme, status, task, solutions in results:
+            attempts = attempt + 1
+            if status == "ok" and not min_solutions <= solutions <= max_solutions:
+                status = "wrong_solution_count"
+            if status == "ok":
+                key = canonical_key(task, size)
+                if key in seen:
+                    status = "duplicate"
+                else:
+                    seen.add(key)
+                    tasks.append(task)
+                    by_theme[theme] = by_theme.get(theme, 0) + 1
+            if status != "ok":
+                rejected[status] = rejected.get(status, 0) + 1
+            if len(tasks) >= count:
+                return True
+        return False
+
+    chunks = (list(range(i, min(i + CHUNK_SIZE, max_attempts))) for i in range(0, max_attempts, CHUNK_SIZE))
+    settings = (tuple(themes), size, max_solutions, max_nodes)
+    if workers <= 1:
+        for chunk in chunks:
+            if consume(_generate_chunk(seed, chunk, *settings)):
+                break
+        workers = 0
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # vždy jen pár dávek dopředu, aby se po dosažení počtu úloh zbytečně nepočítalo
+            pending = [pool.submit(_generate_chunk, seed, chunk, *settings)
+                       for chunk in itertools.islice(chunks, 2 * workers)]
+            while pending:
+                if consume(pending.pop(0).result()):
+                    for future in pending:
+                        future.cancel()
+                    break
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append(pool.submit(_generate_chunk, seed, chunk, *settings))
+
+    elapsed = time.perf_counter() - start
+    report = {
+        "seed": seed,
+        "jobs": workers,
+        "attempts": attempts,
+        "tasks": len(tasks),
+        "by_theme": by_theme,
+        "rejected": rejected,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "attempts_per_s": round(attempts / elapsed, 1) if elapsed else 0.0,
+        "tasks_per_s": round(len(tasks) / elapsed, 2) if elapsed else 0.0,
+    }
+    return tasks, report
+
+
+def next_chapter(task_ids) -> int:
+    """Číslo první kapitoly za všemi kapitolami banky."""
+    from elements.level_data import level_chapter
+
+    return max((chapter for chapter in map(level_chapter, task_ids) if chapter is not None), default=0) + 1
+
+
+def emit_tasks(tasks: list[dict], filepath: str = "data.json", chapter: int | None = None) -> list[str]:
+    """
+    Zapíše úlohy do úložiště úloh jako levely kapitoly (za její poslední level).
+
+    Args:
+        tasks (list[dict]): úlohy (viz generate_tasks)
+        filepath (str): soubor s úlohami (data.json, binární banka nebo SQLite)
+        chapter (int, optional): číslo kapitoly (None = nová kapitola za poslední)
+
+    Returns:
+        list[str]: ID zapsaných úloh
+    """
+    from elements.level_data import level_chapter
+    from elements.task_catalog import get_catalog
+    from utils.write_behind import get_writer
+
+    catalog = get_catalog(filepath)
+    task_ids = catalog.task_ids()
+    if chapter is None:
+        chapter = next_chapter(task_ids)
+    last = max((int(task_id.split(".")[1]) for task_id in task_ids
+                if level_chapter(task_id) == chapter and task_id.split(".")[1].isdigit()), default=0)
+
+    new_ids = []
+    for number, task in enumerate(tasks, start=last + 1):
+        task_id = f"{chapter}.{number}"
+        catalog.save_task(task_id, task)
+        new_ids.append(task_id)
+    get_writer().flush()
+    return new_ids
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Generátor úloh Cubiq🧊 (2D_to_3D s kontrolou počtu řešení)")
+    parser.add_argument("file", nargs="?", default="data.json")
+    parser.add_argument("--count", type=int, default=20, help="počet úloh")
+    parser.add_argument("--themes", nargs="+", choices=THEMES, default=list(THEMES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="počet bodů mřížky v jednom směru")
+    parser.add_argument("--min-solutions", type=int, default=1)
+    parser.add_argument("--max-solutions", type=int, default=1, help="1 = jen jednoznačné úlohy")
+    parser.add_argument("--jobs", type=int, default=None, help="počet procesů (0 = bez procesů)")
+    parser.add_argument("--max-attempts", type=int, default=None)
+    parser.add_argument("--chapter", type=int, default=None, help="kapitola (jinak nová za poslední)")
+    parser.add_argument("--dry-run", action="store_true", help="úlohy jen vypsat, nezapisovat")
+    args = parser.parse_args()
+
+    from elements.task_store import get_task_store
+
+    bank = get_task_store(args.file).export_all()
+    generated, generator_report = generate_tasks(
+        args.count, tuple(args.themes), args.seed, args.size, args.min_solutions, args.max_solutions,
+        args.jobs, args.max_attempts, existing=bank,
+    )
+    if args.dry_run:
+        for generated_task in generated:
+            print(json.dumps(generated_task, ensure_ascii=False))
+    else:
+        written = emit_tasks(generated, args.file, args.chapter)
+        if written:
+            print(f"Zapsané úlohy: {written[0]} … {written[-1]}")
+
+    print(f"Úloh: {generator_report['tasks']} z {generator_report['attempts']} pokusů "
+          f"({', '.join(f'{THEME_TITLES[theme]}: {n}' for theme, n in generator_report['by_theme'].items())})")
+    print(f"Vyřazeno: {generator_report['rejected']}")
+    print(f"Čas: {generator_report['elapsed_ms']:.0f} ms, {generator_report['attempts_per_s']} pokusů/s, "
+          f"{generator_report['tasks_per_s']} úloh/s, procesů: {generator_report['jobs']}")
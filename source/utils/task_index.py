@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+task_index.py
+-------------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • zápis data.json spolu s indexem (task_id → rozsah bajtů v souboru),
+    • sestavení indexu pro libovolný existující data.json,
+    • načtení a ověření indexu (mtime a velikost, případně SHA-256 obsahu),
+    • načtení jedné úlohy přes seek bez parsování celého souboru.
+
+Index se ukládá vedle dat jako "<soubor>.idx" (JSON):
+    {"version": 1, "sha256": ..., "size": ..., "mtime_ns": ...,
+     "meta": {...}, "tasks": [[task_id, start, end], ...]}
+"""
+
+import hashlib
+import json
+import os
+
+from utils.fun_for_making_exe import writable_path
+from utils.write_behind import atomic_write
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+
+
+def index_path(filepath: str) -> str:
+    """Vrátí cestu k indexu pro daný JSON soubor."""
+    return writable_path(filepath + INDEX_SUFFIX)
+
+
+def _file_sha256(path: str) -> str:
+    """Spočítá SHA-256 obsahu souboru."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ==================================================
+# ZÁPIS
+# ==================================================
+
+def _dumps_with_offsets(all_data: dict, newline="\n") -> tuple[str, list]:
+    """
+    Serializuje data stejně jako json.dump(..., ensure_ascii=False, indent=4)
+    a zároveň vrátí pozice (ve znacích) hodnot jednotlivých klíčů.
+
+    Args:
+        all_data (dict): data všech úloh včetně "_meta"
+        newline (str): konec řádku (jako při zápisu v textovém režimu)
+
+    Returns:
+        tuple: (text, [(key, start, end), ...])
+    """
+    if not all_data:
+        return "{}", []
+
+    parts = ["{" + newline]
+    length = len(parts[0])
+    offsets = []
+    for i, (key, value) in enumerate(all_data.items()):
+        if i:
+            parts.append("," + newline)
+            length += 1 + len(newline)
+        prefix = "    " + json.dumps(key, ensure_ascii=False) + ": "
+        body = json.dumps(value, ensure_ascii=False, indent=4).replace("\n", newline + "    ")
+        parts.append(prefix)
+        length += len(prefix)
+        offsets.append((key, length, length + len(body)))
+        parts.append(body)
+        length += len(body)
+    parts.append(newline + "}")
+    return "".join(parts), offsets
+
+
+def _char_to_byte_offsets(text: str, offsets: list) -> list:
+    """Převede pozice ve znacích na pozice v bajtech (UTF-8)."""
+    byte_offsets = []
+    position = 0  # pozice ve znacích
+    byte_position = 0
+    for key, start, end in offsets:
+        byte_position += len(text[position:start].encode("utf-8"))
+        byte_start = byte_position
+        byte_position += len(text[start:end].encode("utf-8"))
+        position = end
+        byte_offsets.append((key, byte_start, byte_position))
+    return byte_offsets
+
+
+def _save_index(filepath: str, index: dict):
+    """Zapíše index atomicky (jako data.json vedle něj – při pádu nezůstane useknutý)."""
+    atomic_write(index_path(filepath), json.dumps(index, ensure_ascii=False).encode("utf-8"))
+
+
+def _write_index(filepath: str, byte_offsets: list, sha256: str, meta: dict | None) -> dict:
+    """Zapíše index k souboru, který už je na disku."""
+    stat = os.stat(writable_path(filepath))
+    index = {
+        "version": INDEX_VERSION,
+        "sha256": sha256,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "meta": meta if meta is not None else {"version": "unknown"},
+        "tasks": [[key, start, end] for key, start, end in byte_offsets if key != "_meta"],
+    }
+    _save_index(filepath, index)
+    return index
+
+
+def write_tasks_json(all_data: dict, filepath="data.json") -> dict:
+    """
+    Zapíše všechny úlohy do JSON souboru (formát indent=4 jako dosud, atomicky)
+    a rovnou k němu vytvoří index, bez dalšího čtení souboru.
+
+    Returns:
+        dict: vytvořený index
+    """
+    # stejné konce řádků jako při zápisu v textovém režimu
+    text, offsets = _dumps_with_offsets(all_data, newline=os.linesep)
+    raw = text.encode("utf-8")
+
+    # zápis přes dočasný soubor – při pádu uprostřed zápisu zůstane původní soubor celý
+    atomic_write(writable_path(filepath), raw)
+
+    return _write_index(filepath, _char_to_byte_offsets(text, offsets),
+                        hashlib.sha256(raw).hexdigest(), all_data.get("_meta"))
+
+
+# ==================================================
+# SESTAVENÍ INDEXU PRO EXISTUJÍCÍ SOUBOR
+# ==================================================
+
+def build_index(filepath="data.json") -> tuple[dict, dict]:
+    """
+    Projde celý JSON soubor, najde rozsahy hodnot jednotlivých úloh a uloží index.
+    Používá se, když index chybí nebo neodpovídá obsahu souboru.
+
+    Returns:
+        tuple: (index, all_data) – index a naparsovaná data (aby se soubor nemusel číst znovu)
+    """
+    with open(writable_path(filepath), "rb") as f:
+        raw = f.read()
+    text = raw.decode("utf-8")
+
+    decoder = json.JSONDecoder()
+    whitespace = " \t\r\n"
+
+    def skip(i):
+        while i < len(text) and text[i] in whitespace:
+            i += 1
+        return i
+
+    all_data = {}
+    offsets = []
+    i = skip(0)
+    if text[i] != "{":
+        raise ValueError(f"Soubor {filepath} neobsahuje JSON objekt.")
+    i = skip(i + 1)
+    while text[i] != "}":
+        key, i = decoder.raw_decode(text, i)
+        i = skip(i)
+        if text[i] != ":":
+            raise ValueError(f"Neplatný JSON v {filepath} na pozici {i}.")
+        start = skip(i + 1)
+        value, end = decoder.raw_decode(text, start)
+        all_data[key] = value
+        offsets.append((key, start, end))
+        i = skip(end)
+        if text[i] == ",":
+            i = skip(i + 1)
+
+    index = _write_index(filepath, _char_to_byte_offsets(text, offsets),
+                         hashlib.sha256(raw).hexdigest(), all_data.get("_meta"))
+    return index, all_data
+
+
+# ==================================================
+# ČTENÍ
+# ==================================================
+
+def load_index(filepath="data.json") -> dict | None:
+    """
+    Načte index a ověří, že odpovídá aktuálnímu obsahu souboru.
+
+    Pokud souhlasí mtime a velikost, index se použije rovnou. Jinak se spočítá
+    SHA-256 souboru a porovná s indexem (soubor mohl být jen zkopírován nebo znovu
+    vytažen z gitu); při shodě se do indexu uloží nový mtime, aby se při dalším
+    spuštění soubor znovu nehashoval.
+
+    Returns:
+        dict | None: platný index, nebo None pokud chybí či neodpovídá
+    """
+    try:
+        with open(index_path(filepath), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        stat = os.stat(writable_path(filepath))
+    except (OSError, ValueError):
+        return None
+
+    if index.get("version") != INDEX_VERSION or index.get("size") != stat.st_size:
+        return None
+
+    if index.get("mtime_ns") != stat.st_mtime_ns:
+        if _file_sha256(writable_path(filepath)) != index.get("sha256"):
+            return None
+        index["mtime_ns"] = stat.st_mtime_ns
+        try:
+            _save_index(filepath, index)
+        except OSError:
+            pass  # složka jen pro čtení – index platí, jen se příště ověří znovu
+
+    return index
+
+
+def read_task(filepath: str, start: int, end: int) -> dict:
+    """Načte a dekóduje jednu úlohu podle rozsahu bajtů z indexu."""
+    with open(writable_path(filepath), "rb") as f:
+        f.seek(start)
+        raw = f.read(end - start)
+    return json.loads(raw.decode("utf-8"))
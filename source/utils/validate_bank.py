@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+"""
+validate_bank.py
+----------------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • kontrolu celé banky úloh bez spuštění aplikace (data.json, binární banka i SQLite),
+      každá úloha nad mřížkou své velikosti (klíč "size", viz utils/projection.py),
+    • kanonický zápis úlohy (sloučené úsečky jako bitové masky, viz utils/projection.py)
+      a otisk obsahu úlohy podle něj,
+    • porovnání uložených pohledů s průměty každého 3D řešení,
+    • nalezení stejných úloh (stejný text i obsah) a ekvivalentních úloh (stejný obsah, jiný text),
+    • nalezení prázdných, degenerovaných a poškozených úloh (např. data3d: [[]] z create_empty_task),
+    • rozdělení práce mezi procesy (ProcessPoolExecutor) a strojově čitelný report (JSON),
+    • vytvoření syntetické banky (pro měření rychlosti kontroly).
+
+Úrovně nálezů:
+    error    – úloha nejde správně zobrazit nebo vyřešit (poškozená data, pohledy neodpovídají řešení)
+    warning  – úloha funguje, ale je podezřelá (výchozí text, překrývající se úsečky, ...)
+
+Spuštění (ze složky source/):
+    python -m utils.validate_bank data.json
+    python -m utils.validate_bank data.json --output report.json --jobs 4
+    python -m utils.validate_bank --synthetic 10000 --seed 1
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.projection import (DEFAULT_SIZE, MAX_SIZE, MIN_SIZE, VIEWS, get_lattice, project_solution, project_to_json,
+                              solution_masks, task_size, view_masks)
+
+TASK_TYPES = ("2D_to_3D", "3D_to_2D", "tutorial")
+PLACEHOLDER_TEXT = "text k úloze"  # text nové úlohy z create_empty_task()
+
+CHUNK_SIZE = 250  # úloh na jednu dávku pro proces
+MIN_PARALLEL_TASKS = 1000  # menší banky se kontrolují v hlavním procesu (start procesů by trval déle)
+
+
+# ==================================================
+# KONTROLA JEDNÉ ÚLOHY
+# ==================================================
+
+def _issue(severity: str, code: str, message: str) -> dict:
+    return {"severity": severity, "code": code, "message": message}
+
+
+def _segment_error(segment, size: int, dim: int) -> str | None:
+    """Popis chyby jedné úsečky [[...], [...], d], nebo None, pokud je v pořádku."""
+    if not isinstance(segment, list) or len(segment) not in (2, 3):
+        return f"úsečka {segment!r} nemá tvar [bod, bod, čárkovaná]"
+    for point in segment[:2]:
+        if not isinstance(point, list) or len(point) != dim:
+            return f"bod {point!r} nemá {dim} souřadnice"
+        if not all(type(value) is int and 0 <= value < size for value in point):
+            return f"bod {point!r} leží mimo mřížku {size}×{size}" + (f"×{size}" if dim == 3 else "")
+    if len(segment) == 3 and segment[2] not in (0, 1, True, False):
+        return f"úsečka {segment!r} má neplatný příznak čárkování"
+    return None
+
+
+def _structure_issues(task, size: int) -> list[dict]:
+    """Poškozená struktura úlohy (chybějící klíče, špatné typy, body mimo mřížku)."""
+    if not isinstance(task, dict):
+        return [_issue("error", "malformed", "úloha není objekt")]
+
+    issues = []
+    for key in ("text", "task_type", *VIEWS, "data3d"):
+        if key not in task:
+            issues.append(_issue("error", "malformed", f"chybí klíč {key!r}"))
+    if "text" in task and not isinstance(task["text"], str):
+        issues.append(_issue("error", "malformed", "text není řetězec"))
+    if "task_type" in task and task["task_type"] not in TASK_TYPES:
+        issues.append(_issue("error", "malformed", f"neznámý typ úlohy {task['task_type']!r}"))
+    if "size" in task:
+        if type(task["size"]) is not int or not MIN_SIZE <= task["size"] <= MAX_SIZE:
+            issues.append(_issue("error", "malformed", f"neplatná velikost mřížky {task['size']!r} "
+                                                       f"(povoleno {MIN_SIZE} až {MAX_SIZE})"))
+            return issues
+        size = task["size"]
+
+    for view in VIEWS:
+        segments = task.get(view, [])
+        if not isinstance(segments, list):
+            issues.append(_issue("error", "malformed", f"{view} není seznam úseček"))
+            continue
+        for segment in segments:
+            error = _segment_error(segment, size, 2)
+            if error:
+                issues.append(_issue("error", "malformed", f"{view}: {error}"))
+                break
+
+    solutions = task.get("data3d", [])
+    if not isinstance(solutions, list) or not all(isinstance(solution, list) for solution in solutions):
+        issues.append(_issue("error", "malformed", "data3d není seznam řešení"))
+    else:
+        for number, solution in enumerate(solutions, start=1):
+            for segment in solution:
+                error = _segment_error(segment, size, 3)
+                if error:
+                    issues.append(_issue("error", "malformed", f"řešení {number}: {error}"))
+                    break
+    return issues
+
+
+def _overlapping(segments, masks, lattice) -> bool:
+    """True, pokud se některé úsečky (nebo body) překrývají – kreslí se vícekrát na stejné místo."""
+    pieces = 0
+    points = []
+    for segment in segments:
+        a, b = tuple(segment[0]), tuple(segment[1])
+        if a == b:
+            points.append(a)
+        else:
+            pieces += lattice.segment_mask(a, b).bit_count()
+    return pieces > (masks.solid | masks.dashed).bit_count() or len(points) > len(set(points))
+
+
+def canonical_key(task: dict, size: int = DEFAULT_SIZE) -> tuple:
+    """
+    Kanonický zápis obsahu úlohy (bez textu): typ, masky pohledů a množina masek řešení,
+    u jiné než výchozí velikosti mřížky navíc velikost.
+    Úlohy se stejným klíčem mají stejné zadání i řešení, jen jinak zapsané
+    (jinak rozdělené úsečky, jiné pořadí úseček nebo řešení).
+    """
+    size = task_size(task, size)
+    views = tuple(view_masks(task[view], size).key() for view in VIEWS)
+    solutions = tuple(sorted({solution_masks(solution, size).key() for solution in task["data3d"]}))
+    if size != DEFAULT_SIZE:
+        return task["task_type"], views, solutions, size
+    return task["task_type"], views, solutions
+
+
+def _key_text(value) -> str:
+    """Textový zápis klíče pro otisk (čísla šestnáctkově – masky velkých mřížek mají až statisíce bitů)."""
+    if isinstance(value, tuple):
+        return "(" + ",".join(_key_text(item) for item in value) + ")"
+    if isinstance(value, int):
+        return format(value, "x")
+    return repr(value)
+
+
+def content_hash(key: tuple) -> str:
+    """Krátký otisk kanonického klíče (stejný obsah → stejný otisk, nezávisle na zápisu)."""
+    return hashlib.sha1(_key_text(key).encode("ascii")).hexdigest()[:16]
+
+
+def check_task(task, size: int = DEFAULT_SIZE) -> tuple[list[dict], tuple | None]:
+    """
+    Zkontroluje jednu úlohu.
+
+    Args:
+        task (dict): data úlohy jako v data.json
+        size (int): počet bodů mřížky v jednom směru (pro úlohy bez klíče "size")
+
+    Returns:
+        tuple: (seznam nálezů, kanonický klíč nebo None u poškozené úlohy)
+    """
+    issues = _structure_issues(task, size)
+    if issues:
+        return issues, None
+    size = task_size(task, size)
+
+    is_tutorial = task["task_type"] == "tutorial"
+    text = task["text"].strip()
+    if not text:
+        issues.append(_issue("error", "empty_text", "úloha nemá text zadání"))
+    elif text == PLACEHOLDER_TEXT:
+        issues.append(_issue("warning", "placeholder_text", "úloha má výchozí text nové úlohy"))
+
+    # ukázkové úlohy (tutorial) smí být prázdné a jejich pohledy nemusí odpovídat řešení
+    solutions = task["data3d"]
+    if not is_tutorial:
+        if not solutions:
+            issues.append(_issue("error", "no_solution", "úloha nemá žádné řešení"))
+        for view in VIEWS:
+            if not task[view]:
+                issues.append(_issue("error", "empty_view", f"{view} je prázdný"))
+
+    stored = {view: view_masks(task[view], size) for view in VIEWS}
+    for view in VIEWS:
+        if _overlapping(task[view], stored[view], get_lattice(size)):
+            issues.append(_issue("warning", "overlapping_segments", f"{view}: úsečky se překrývají"))
+
+    seen = set()
+    for number, solution in enumerate(solutions, start=1):
+        if not solution:
+            if not is_tutorial:
+                issues.append(_issue("error", "empty_solution", f"řešení {number} je prázdné"))
+            continue
+
+        masks = solution_masks(solution, size)
+        if masks.key() in seen:
+            issues.append(_issue("warning", "duplicate_solution", f"řešení {number} je stejné jako dřívější"))
+        seen.add(masks.key())
+        if _overlapping(solution, masks, get_lattice(size, 3)):
+            issues.append(_issue("warning", "overlapping_segments", f"řešení {number}: úsečky se překrývají"))
+        if is_tutorial:
+            continue
+        if not (masks.solid | masks.dashed):
+            issues.append(_issue("warning", "degenerate_solution", f"řešení {number} obsahuje jen body"))
+
+        projected = project_solution(solution, size)
+        different = [view for view in VIEWS if projected[view] != stored[view]]
+        if different:
+            issues.append(_issue("error", "view_mismatch",
+                                 f"řešení {number}: průmět neodpovídá ({', '.join(different)})"))
+
+    return issues, canonical_key(task, size)
+
+
+def _check_chunk(items: list[tuple[str, object]], size: int) -> list[tuple]:
+    """Zkontroluje dávku úloh (běží v procesu z ProcessPoolExecutor)."""
+    results = []
+    for task_id, task in items:
+        try:
+            issues, key = check_task(task, size)
+        except Exception as e:  # chyba v jedné úloze nesmí ukončit kontrolu celé banky
+            issues, key = [_issue("error", "malformed", f"kontrola selhala: {e}")], None
+        text = task.get("text", "") if isinstance(task, dict) else ""
+        results.append((task_id, issues, key, text.strip() if isinstance(text, str) else ""))
+    return results
+
+
+# ==================================================
+# KONTROLA BANKY
+# ==================================================
+
+def _has_content(key: tuple) -> bool:
+    """True, pokud úloha obsahuje aspoň jednu úsečku nebo bod (prázdné úlohy se neporovnávají)."""
+    views, solutions = key[1], key[2]
+    return any(any(masks) for masks in views + solutions)
+
+
+def validate_tasks(all_data: dict, size: int = DEFAULT_SIZE, jobs: int | None = None) -> dict:
+    """
+    Zkontroluje všechny úlohy a sestaví report.
+
+    Args:
+        all_data (dict): úlohy jako v data.json (klíč "_meta" se přeskočí)
+        size (int): počet bodů mřížky v jednom směru (pro úlohy bez klíče "size")
+        jobs (int, optional): počet procesů (None = podle počtu jader, 0 nebo 1 = bez dalších procesů)
+
+    Returns:
+        dict: report (počty, nálezy, stejné a ekvivalentní úlohy, otisky obsahu)
+    """
+    start = time.perf_counter()
+    items = [(task_id, task) for task_id, task in all_data.items() if task_id != "_meta"]
+
+    workers = (os.cpu_count() or 1) if jobs is None else jobs
+    if workers <= 1 or len(items) < MIN_PARALLEL_TASKS:
+        # jeden proces navíc by jen přidal režii (přenos úloh a výsledků mezi procesy)
+        results = _check_chunk(items, size)
+        workers = 0
+    else:
+        chunks = [items[i:i + CHUNK_SIZE] for i in range(0, len(items), CHUNK_SIZE)]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_results in pool.map(_check_chunk, chunks, [size] * len(chunks)):
+                results.extend(chunk_results)
+
+    issues = []
+    hashes = {}
+    groups: dict[tuple, list[tuple[str, str]]] = {}
+    for task_id, task_issues, key, text in results:
+        issues.extend({"task_id": task_id, **issue} for issue in task_issues)
+        if key is None:
+            continue
+        hashes[task_id] = content_hash(key)
+        if _has_content(key):
+            groups.setdefault(key, []).append((task_id, text))
+
+    # stejný obsah: se stejným textem jde o duplikát, s jiným o ekvivalentní úlohu
+    duplicates, equivalent = [], []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        by_text: dict[str, list[str]] = {}
+        for task_id, text in members:
+            by_text.setdefault(text, []).append(task_id)
+        duplicates.extend(ids for ids in by_text.values() if len(ids) > 1)
+        if len(by_text) > 1:
+            equivalent.append([task_id for task_id, _ in members])
+    for ids in duplicates:
+        issues.append({"task_id": ids[0], **_issue("warning", "duplicate_task",
+                                                   f"stejné úlohy: {', '.join(ids)}")})
+
+    return {
+        "tasks": len(items),
+        "errors": sum(1 for issue in issues if issue["severity"] == "error"),
+        "warnings": sum(1 for issue in issues if issue["severity"] == "warning"),
+        "jobs": workers,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        "issues": issues,
+        "duplicates": duplicates,
+        "equivalent": equivalent,
+        "hashes": hashes,
+    }
+
+
+def validate_bank(filepath: str = "data.json", size: int = DEFAULT_SIZE, jobs: int | None = None) -> dict:
+    """Načte banku úloh (data.json, binární banku nebo SQLite) a zkontroluje ji (viz validate_tasks)."""
+    from elements.task_store import get_task_store
+
+    start = time.perf_counter()
+    all_data = get_task_store(filepath).export_all()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    report = {"file": filepath, "load_ms": round(load_ms, 1)}
+    report.update(validate_tasks(all_data, size, jobs))
+    return report
+
+
+# ==================================================
+# SYNTETICKÁ BANKA
+# ==================================================
+
+def synthetic_bank(task_count: int, seed: int = 0, size: int = DEFAULT_SIZE) -> dict:
+    """
+    Vytvoří banku náhodných úloh se správně spočítanými pohledy a několika
+    procenty úmyslně vadných úloh (prázdné, poškozené, špatný pohled, duplikáty).
+
+    Args:
+        task_count (int): počet úloh
+        seed (int): semínko náhodných čísel (stejné semínko → stejná banka)
+        size (int): počet bodů mřížky v jednom směru (jiná než výchozí se uloží do klíče "size")
+
+    Returns:
+        dict: úlohy jako v data.json (včetně "_meta")
+    """
+    import random
+
+    rng = random.Random(seed)
+    all_data = {"_meta": {"version": "synthetic", "description": f"syntetická banka ({task_count} úloh, seed {seed})"}}
+    task_ids = []
+
+    def random_point():
+        return [rng.randrange(size), rng.randrange(size), rng.randrange(size)]
+
+    for i in range(task_count):
+        task_id = f"{10 + i // 1000}.{i % 1000 + 1}"
+        roll = rng.random()
+
+        if roll < 0.01 and task_ids:
+            # duplikát dřívější úlohy
+            task = json.loads(json.dumps(all_data[rng.choice(task_ids)]))
+        elif roll < 0.02 and task_ids:
+            # ekvivalentní úloha: stejný obsah, jiný text a opačné pořadí úseček
+            task = json.loads(json.dumps(all_data[rng.choice(task_ids)]))
+            task["text"] = f"Jinak zadaná úloha {task_id}."
+            task["narys"].reverse()
+            task["data3d"] = [solution[::-1] for solution in task["data3d"]]
+        elif roll < 0.04:
+            # nová prázdná úloha z editoru
+            task = {"text": PLACEHOLDER_TEXT, "task_type": "3D_to_2D",
+                    "pudorys": [], "narys": [], "bokorys": [], "data3d": [[]]}
+        else:
+            solution = []
+            for _ in range(rng.randint(1, 6)):
+                a, b = random_point(), random_point()
+                solution.append([a, b, int(rng.random() < 0.2)])
+            task = {"text": f"Syntetická úloha {task_id}.",
+                    "task_type": rng.choice(("2D_to_3D", "3D_to_2D")),
+                    **project_to_json(solution, size), "data3d": [solution]}
+            if roll < 0.06 and len(task["narys"]) > 1:
+                task["narys"].pop()  # pohled neodpovídá řešení
+            elif roll < 0.07:
+                task["data3d"][0][0][0] = [size, 0, 0]  # bod mimo mřížku
+        if size != DEFAULT_SIZE:
+            task["size"] = size
+
+        all_data[task_id] = task
+        task_ids.append(task_id)
+    return all_data
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Kontrola banky úloh Cubiq🧊")
+    parser.add_argument("file", nargs="?", default="data.json")
+    parser.add_argument("--size", type=int, default=3, help="počet bodů mřížky v jednom směru (úlohy bez klíče size, syntetická banka)")
+    parser.add_argument("--jobs", type=int, default=None, help="počet procesů (0 = bez procesů)")
+    parser.add_argument("--output", help="zapsat report do souboru JSON (jinak se vypíše shrnutí)")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="zkontrolovat syntetickou banku N úloh")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        bank_report = {"file": f"synthetic:{args.synthetic}:{args.seed}"}
+        bank_report.update(validate_tasks(synthetic_bank(args.synthetic, args.seed, args.size), args.size, args.jobs))
+    else:
+        bank_report = validate_bank(args.file, args.size, args.jobs)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(bank_report, f, ensure_ascii=False, indent=2)
+    else:
+        for found in bank_report["issues"]:
+            print(f"{found['task_id']}: {found['severity']} {found['code']} – {found['message']}")
+        for ids in bank_report["equivalent"]:
+            print(f"ekvivalentní úlohy: {', '.join(ids)}")
+    print(f"Úloh: {bank_report['tasks']}, chyb: {bank_report['errors']}, varování: {bank_report['warnings']}, "
+          f"procesů: {bank_report['jobs']}, čas: {bank_report['elapsed_ms']:.0f} ms")
+    sys.exit(1 if bank_report["errors"] else 0)
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+warm_start.py
+-------------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • uložení snímku startu (startup.snapshot) při ukončení aplikace,
+    • načtení snímku při dalším startu a převzetí jeho obsahu místo načítání
+      data.json, hledání systémových fontů a přepočítání rozložení obrazovky,
+    • automatické zahození snímku, když se změní soubor s úlohami, verze aplikace
+      (nebo Pythonu) nebo velikost displeje.
+
+Snímek obsahuje:
+    • celý katalog úloh (metadata, ID úloh v pořadí ze souboru, data úloh jako v data.json),
+    • index levelů (seřazené levely jednotlivých kapitol),
+    • cesty k souborům fontů,
+    • Layout pro poslední velikost okna.
+
+Formát (little-endian):
+    hlavička:   b"CUBS", uint16 verze formátu, uint16 rezerva, uint32 délka dat,
+                32 B SHA-256 kontrolní součet dat
+    data:       marshal slovníku s obsahem snímku (jen prosté typy: dict, list, tuple, str, čísla)
+
+Poškozený nebo neplatný snímek se tiše ignoruje (aplikace se spustí jako bez něj).
+
+Spuštění (ze složky source/):
+    python -m utils.warm_start info
+    python -m utils.warm_start clear
+"""
+
+import hashlib
+import marshal
+import os
+import struct
+import sys
+
+import glob_var
+from utils.fun_for_making_exe import writable_path
+
+MAGIC = b"CUBS"
+FORMAT_VERSION = 1
+SNAPSHOT_FILE = "startup.snapshot"
+
+_HEADER = struct.Struct("<4sHHI32s")
+
+
+# ==================================================
+# KLÍČ PLATNOSTI
+# ==================================================
+
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    """Vrátí (mtime, velikost) souboru, nebo None pokud soubor neexistuje."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _data_stamp(data_file: str) -> tuple:
+    """
+    Podpis souborů, ze kterých se mohou číst úlohy (data.json, binární banka, SQLite).
+    Změní se, kdykoli se kterýkoli z nich změní, vznikne nebo zmizí.
+    """
+    # stejné cesty jako binary_path_for() a sqlite_path_for() – bez importu úložiště (sqlite3) při startu
+    base = os.path.splitext(data_file)[0]
+    paths = (data_file, base + ".cubq", base + ".db", base + ".db-wal")
+    return tuple(_file_stamp(writable_path(path)) for path in paths)
+
+
+def snapshot_key(display_size: tuple[int, int], data_file: str = "data.json") -> tuple:
+    """
+    Klíč, pro který snímek platí: formát, verze aplikace a Pythonu (marshal),
+    sestavení .exe, soubory s úlohami a velikost displeje.
+    """
+    build = _file_stamp(sys.executable) if hasattr(sys, "_MEIPASS") else None
+    return (FORMAT_VERSION, glob_var.APP_VERSION, tuple(sys.version_info[:2]), build,
+            _data_stamp(data_file), tuple(display_size))
+
+
+# ==================================================
+# ČTENÍ A ZÁPIS
+# ==================================================
+
+def encode_snapshot(snapshot: dict) -> bytes:
+    """Zakóduje snímek do binárního formátu (hlavička s kontrolním součtem + data)."""
+    payload = marshal.dumps(snapshot)
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(payload), hashlib.sha256(payload).digest()) + payload
+
+
+def decode_snapshot(blob: bytes) -> dict | None:
+    """Rozbalí snímek; vrátí None, pokud má jiný formát nebo nesedí kontrolní součet."""
+    if len(blob) < _HEADER.size:
+        return None
+    magic, version, _, length, checksum = _HEADER.unpack_from(blob)
+    payload = blob[_HEADER.size:]
+    if magic != MAGIC or version != FORMAT_VERSION or len(payload) != length:
+        return None
+    if hashlib.sha256(payload).digest() != checksum:
+        return None
+    try:
+        snapshot = marshal.loads(payload)
+    except (EOFError, ValueError, TypeError):
+        return None
+    return snapshot if isinstance(snapshot, dict) else None
+
+
+def load_snapshot(display_size: tuple[int, int], data_file: str = "data.json",
+                  path: str = SNAPSHOT_FILE) -> dict | None:
+    """
+    Načte snímek startu, pokud existuje a platí pro aktuální stav.
+
+    Args:
+        display_size (tuple): velikost displeje (šířka, výška)
+        data_file (str): soubor s úlohami
+        path (str): soubor se snímkem (relativně k writable_path)
+
+    Returns:
+        dict | None: obsah snímku, nebo None (snímek chybí, je poškozený nebo zastaralý)
+    """
+    try:
+        with open(writable_path(path), "rb") as f:
+            snapshot = decode_snapshot(f.read())
+    except OSError:
+        return None
+    if snapshot is None or snapshot.get("key") != snapshot_key(display_size, data_file):
+        return None
+    return snapshot
+
+
+def save_snapshot(snapshot: dict, path: str = SNAPSHOT_FILE):
+    """Zapíše snímek na pozadí (atomicky, přes sdílený zapisovač)."""
+    from utils.write_behind import get_writer
+
+    get_writer().submit(writable_path(path), encode_snapshot(snapshot))
+
+
+# ==================================================
+# PŘEVZETÍ A SESTAVENÍ SNÍMKU
+# ==================================================
+
+def apply_fonts(snapshot: dict):
+    """Převezme cesty k fontům (volá se před vytvořením prvních fontů)."""
+    from utils.initiating_length import set_font_paths
+
+    set_font_paths(snapshot.get("fonts", {}))
+
+
+def apply_layout(snapshot: dict):
+    """Převezme Layout pro poslední velikost okna (volá se po initiate_length)."""
+    from utils.layout import prime_layout
+
+    if snapshot.get("layout") is not None:
+        prime_layout(snapshot["layout"])
+
+
+def prime_catalog(snapshot: dict, data_file: str = "data.json") -> list[list[str]] | None:
+    """
+    Převezme katalog úloh ze snímku, pokud soubor s úlohami od startu nikdo nezměnil.
+
+    Returns:
+        list[list[str]] | None: levely kapitol pro LevelData, nebo None (katalog se načte ze souboru)
+    """
+    from elements.task_catalog import get_catalog
+
+    catalog_data = snapshot.get("catalog")
+    if catalog_data is None or snapshot["key"][4] != _data_stamp(data_file):
+        return None
+    get_catalog(data_file).prime(catalog_data["meta"], catalog_data["task_ids"], catalog_data["tasks"])
+    return catalog_data["levels"]
+
+
+def build_snapshot(display_size: tuple[int, int], level_data=None, data_file: str = "data.json") -> dict:
+    """
+    Sestaví snímek z aktuálního stavu aplikace (volá se při ukončení,
+    až jsou všechny úpravy úloh zapsané na disku).
+
+    Args:
+        display_size (tuple): velikost displeje
+        level_data (LevelData, optional): už načtené levely (jinak se vytvoří)
+        data_file (str): soubor s úlohami
+    """
+    from elements.level_data import LevelData
+    from elements.task_catalog import get_catalog
+    from utils.initiating_length import font_paths
+    from utils.layout import get_layout
+
+    if level_data is None:
+        level_data = LevelData(data_file)
+    meta, task_ids, tasks = get_catalog(data_file).export_tasks()
+    layout = get_layout()  # před font_paths() – vytvoří i font pro symboly
+
+    return {
+        "key": snapshot_key(display_size, data_file),
+        "catalog": {
+            "meta": meta,
+            "task_ids": task_ids,
+            "tasks": tasks,
+            "levels": [list(chapter["levels"]) for chapter in level_data.get_chapters()],
+        },
+        "fonts": font_paths(),
+        "layout": layout.to_snapshot(),
+    }
+
+
+def update_snapshot(previous: dict | None, display_size: tuple[int, int], level_data=None,
+                    data_file: str = "data.json", path: str = SNAPSHOT_FILE) -> bool:
+    """
+    Zapíše nový snímek, pokud chybí, je zastaralý nebo se změnila velikost okna.
+
+    Returns:
+        bool: True pokud se snímek zapisuje
+    """
+    if previous is not None and previous["key"] == snapshot_key(display_size, data_file):
+        layout = previous.get("layout") or {}
+        if (layout.get("width"), layout.get("height")) == (glob_var.SCREEN_WIDTH, glob_var.SCREEN_HEIGHT):
+            return False
+    save_snapshot(build_snapshot(display_size, level_data, data_file), path)
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Snímek startu aplikace Cubiq🧊")
+    parser.add_argument("command", choices=["info", "clear"])
+    parser.add_argument("--path", default=SNAPSHOT_FILE)
+    args = parser.parse_args()
+
+    snapshot_path = writable_path(args.path)
+    if args.command == "clear":
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+        print(f"Smazáno: {snapshot_path}")
+    else:
+        try:
+            with open(snapshot_path, "rb") as f:
+                blob = f.read()
+        except OSError:
+            sys.exit(f"Snímek {snapshot_path} neexistuje.")
+        snapshot = decode_snapshot(blob)
+        if snapshot is None:
+            sys.exit(f"Snímek {snapshot_path} je poškozený nebo má jiný formát.")
+        catalog_data = snapshot.get("catalog") or {}
+        layout = snapshot.get("layout") or {}
+        print(f"Snímek: {snapshot_path} ({len(blob)} B)")
+        print(f"Klíč: {snapshot['key']}")
+        print(f"Úlohy: {len(catalog_data.get('task_ids', []))}, "
+              f"kapitoly: {len(catalog_data.get('levels', []))}")
+        print(f"Fonty: {snapshot.get('fonts')}")
+        print(f"Rozložení: {layout.get('width')}×{layout.get('height')}")
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+write_behind.py
+---------------
+Pomocné funkce pro aplikaci Cubiq🧊.
+
+Obsahuje nástroje pro:
+    • atomický zápis souboru (dočasný soubor + přejmenování),
+    • vlákno pro všechny zápisy na disk s odložením (debounce), slučováním zápisů
+      do stejného souboru (nebo stejného řádku databáze) a omezenou frontou,
+    • callbacky po dokončení zápisu (např. stav "uloženo" v editoru),
+    • počítadla zápisů (kolik se jich vyžádalo, sloučilo a skutečně zapsalo).
+
+Hlavní smyčka jen předá nový obsah souboru (nebo funkci, která zápis provede);
+vlákno na pozadí ho zapíše až po krátké prodlevě. Když mezitím přijde novější
+obsah stejného souboru, starší se zahodí a zapíše se jen ten poslední.
+"""
+
+import atexit
+import os
+import threading
+import time
+
+
+def atomic_write(path: str, data: bytes):
+    """
+    Zapíše data do souboru atomicky – při pádu uprostřed zápisu
+    zůstane na disku buď celý původní, nebo celý nový soubor.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class WriteBehindWriter:
+    """
+    Zápis souborů na pozadí s odložením a slučováním.
+
+    Každý zápis má klíč (cestu k souboru, případně jiný klíč, např. řádek databáze);
+    čekající zápis se stejným klíčem se nahradí novějším. Fronta je omezená:
+    když v ní čeká max_pending různých klíčů, další požadavek počká, než se uvolní místo.
+
+    Attributes:
+        delay (float): prodleva od posledního požadavku do zápisu (s)
+        max_delay (float): nejdelší doba, o kterou se zápis může odložit (s)
+        max_pending (int): nejvyšší počet čekajících zápisů (různých klíčů)
+        stats (dict): počítadla zápisů
+    """
+
+    def __init__(self, delay: float = 0.5, max_delay: float = 2.0, max_pending: int = 256):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self._pending: dict = {}  # klíč → [zápis, čas prvního požadavku, čas posledního, callbacky, bajty]
+        self._writing: set = set()  # klíče, které se právě zapisují
+        self._flush_requested = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+        self.stats = {
+            "requested": 0,  # kolikrát se zápis vyžádal
+            "coalesced": 0,  # kolik požadavků nahradil novější obsah
+            "written": 0,  # kolikrát se soubor skutečně zapsal
+            "bytes_written": 0,  # celkem zapsaných bajtů
+            "errors": 0,  # neúspěšné zápisy
+            "blocked": 0,  # kolikrát se čekalo na místo v plné frontě
+        }
+
+    # ------------------------
+    # Požadavky z hlavního vlákna
+    # ------------------------
+    def submit(self, path: str, data: bytes, callback=None):
+        """
+        Naplánuje zápis celého obsahu souboru.
+
+        Args:
+            path (str): cesta k souboru (už převedená přes writable_path)
+            data (bytes): nový obsah souboru
+            callback (callable, optional): zavolá se po zápisu jako callback(path, ok)
+                (ve vlákně zapisovače); při sloučení se zavolají všechny callbacky
+        """
+        self.submit_job(path, lambda: atomic_write(path, data), callback, size=len(data))
+
+    def submit_job(self, key, job, callback=None, size: int = 0):
+        """
+        Naplánuje libovolný zápis (např. transakci v databázi).
+
+        Args:
+            key: klíč pro slučování (čekající zápis se stejným klíčem se nahradí)
+            job (callable): funkce bez parametrů, která zápis provede (ve vlákně zapisovače)
+            callback (callable, optional): zavolá se po zápisu jako callback(key, ok)
+            size (int): počet zapisovaných bajtů (jen pro počítadla)
+        """
+        callbacks = [callback] if callback is not None else []
+        with self._cond:
+            self._ensure_thread()
+            if key not in self._pending and len(self._pending) >= self.max_pending:
+                # plná fronta → počkáme, až vlákno něco zapíše
+                self.stats["blocked"] += 1
+                self._flush_requested = True
+                self._cond.notify_all()
+                while key not in self._pending and len(self._pending) >= self.max_pending:
+                    self._cond.wait()
+
+            now = time.monotonic()
+            self.stats["requested"] += 1
+            if key in self._pending:
+                self.stats["coalesced"] += 1
+                item = self._pending[key]
+                item[0] = job
+                item[2] = now
+                item[3].extend(callbacks)
+                item[4] = size
+            else:
+                self._pending[key] = [job, now, now, callbacks, size]
+            self._cond.notify_all()
+
+    def flush(self, path: str = None):
+        """
+        Okamžitě zapíše čekající data a počká na dokončení.
+
+        Args:
+            path (str, optional): jen daný soubor (klíč); bez parametru všechny
+        """
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                # vlákno neběží (např. při ukončování) → zapíšeme sami
+                self._write_pending_now(path)
+                return
+            if self._pending:
+                self._flush_requested = True
+                self._cond.notify_all()
+            while (path in self._pending or path in self._writing) if path is not None else (
+                    self._pending or self._writing):
+                self._cond.wait()
+
+    def close(self):
+        """Zapíše vše, co čeká, a ukončí vlákno na pozadí."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # ------------------------
+    # Vlákno na pozadí
+    # ------------------------
+    def _ensure_thread(self):
+        """Spustí vlákno zapisovače, pokud ještě neběží (volá se pod zámkem)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._closed = False
+            self._thread = threading.Thread(target=self._run, name="cubiq-writer", daemon=True)
+            self._thread.start()
+
+    def _due_time(self, item) -> float:
+        """Čas, kdy se má soubor zapsat (debounce, ale nejpozději po max_delay)."""
+        _, first, last, _, _ = item
+        return min(last + self.delay, first + self.max_delay)
+
+    def _run(self):
+        with self._cond:
+            while not self._closed:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+
+                now = time.monotonic()
+                if self._flush_requested:
+                    due = list(self._pending)
+                else:
+                    due = [path for path, item in self._pending.items() if self._due_time(item) <= now]
+
+                if not due:
+                    next_due = min(self._due_time(item) for item in self._pending.values())
+                    self._cond.wait(next_due - now)
+                    continue
+
+                batch = {path: self._pending.pop(path) for path in due}
+                self._writing.update(batch)
+                self._cond.release()
+                try:
+                    for key, (job, _, _, callbacks, size) in batch.items():
+                        self._write(key, job, callbacks, size)
+                finally:
+                    self._cond.acquire()
+                    self._writing.difference_update(batch)
+                    if not self._pending:
+                        self._flush_requested = False
+                    self._cond.notify_all()
+
+    def _write_pending_now(self, path: str = None):
+        """Zapíše čekající data v aktuálním vlákně (volá se pod zámkem)."""
+        for key in [path] if path is not None else list(self._pending):
+            if key in self._pending:
+                job, _, _, callbacks, size = self._pending.pop(key)
+                self._write(key, job, callbacks, size)
+
+    def _write(self, key, job, callbacks=(), size: int = 0):
+        """Provede jeden zápis, započítá ho a zavolá callbacky."""
+        try:
+            job()
+            self.stats["written"] += 1
+            self.stats["bytes_written"] += size
+            ok = True
+        except Exception as e:  # chyba zápisu nesmí ukončit vlákno zapisovače
+            self.stats["errors"] += 1
+            print(f"Zápis {key} se nepodařil: {e}")
+            ok = False
+        for callback in callbacks:
+            try:
+                callback(key, ok)
+            except Exception as e:
+                print(f"Callback po zápisu {key} selhal: {e}")
+
+
+# sdílený zapisovač pro celou aplikaci
+_writer = None
+
+
+def get_writer() -> WriteBehindWriter:
+    """Vrátí sdílený zapisovač (při ukončení programu zapíše vše, co čeká)."""
+    global _writer
+    if _writer is None:
+        _writer = WriteBehindWriter()
+        atexit.register(_writer.close)
+    return _writer